@@ -3,15 +3,12 @@ Core package for Atlas application.
 
 This package contains the central application logic, configuration,
 event handling, plugin system, and module registry.
+
+The exported names are imported on first access, so importing a single core
+module does not pull in the application and its Qt dependency.
 """
 
-# Core components
-from core.application import AtlasApplication
-from core.config import Config, ConfigManager, get_config
-from core.event_bus import EventBus
-from core.module_registry import ModuleBase, ModuleRegistry
-from core.plugin_system import PluginBase, PluginSystem
-from core.self_healing import SelfHealingManager, SelfHealingSystem
+from core.lazy_loader import lazy_exports
 
 __all__ = [
     "AtlasApplication",
@@ -26,3 +23,21 @@ __all__ = [
     "SelfHealingSystem",
     "SelfHealingManager",
 ]
+
+# Core components
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "AtlasApplication": "core.application",
+        "Config": "core.config",
+        "ConfigManager": "core.config",
+        "get_config": "core.config",
+        "EventBus": "core.event_bus",
+        "ModuleBase": "core.module_registry",
+        "ModuleRegistry": "core.module_registry",
+        "PluginBase": "core.plugin_system",
+        "PluginSystem": "core.plugin_system",
+        "SelfHealingManager": "core.self_healing",
+        "SelfHealingSystem": "core.self_healing",
+    },
+)
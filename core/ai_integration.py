@@ -3,19 +3,34 @@ AI Integration Module for Atlas
 
 This module provides integration with AI models for natural language processing,
 context-aware suggestions, and automation capabilities.
+
+HTTP providers share one pooled keep-alive session. Besides the blocking ``infer``
+the manager offers ``infer_stream`` (tokens as they arrive), ``infer_async``
+(cancellable, for asyncio callers) and ``infer_batch`` (ordered fan-out), all
+bounded by a per-provider concurrency limit.
+
+With ``ai_selection_policy: adaptive`` models are chosen by ``core.ai_router``
+from observed latency, success rate and cost, and ``infer_routed`` hedges slow
+requests by racing a second model once the first exceeds its p95 latency.
 """
 
+import asyncio
 import json
 import logging
 import os
-import statistics
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
 
+from core.ai_response_cache import CACHE_MISS, ResponseCache
+from core.ai_router import ModelRouter
 from core.logging import get_logger
+from core.metrics import MetricsStore
 
 try:
     from core.config import load_config
@@ -31,8 +46,14 @@ except ImportError:
 # Set up logging
 logger = get_logger("AIIntegration")
 
-# Performance metrics storage
-_performance_metrics = {"inference_times": {}, "success_rates": {}, "error_counts": {}}
+# Performance metrics storage; latencies live in fixed-memory histograms
+_performance_metrics = {
+    "success_rates": {},
+    "error_counts": {},
+    "cache": {},
+}
+_latency_metrics = MetricsStore()
+_metrics_lock = threading.Lock()
 
 
 class AIIntegrationError(Exception):
@@ -41,6 +62,26 @@ class AIIntegrationError(Exception):
     pass
 
 
+# Model selection policies of AIModelManager.select_model
+SELECTION_STATIC = "static"
+SELECTION_ADAPTIVE = "adaptive"
+
+# Latency samples required before a model's p95 is trusted as hedge delay
+DEFAULT_HEDGE_MIN_SAMPLES = 20
+# Seconds to wait before hedging a model with too few latency samples
+DEFAULT_HEDGE_DELAY = 2.0
+
+
+class InferenceCancelledError(AIIntegrationError):
+    """Raised when an in-flight inference is cancelled by the caller."""
+
+    pass
+
+
+# Default number of concurrent in-flight requests per provider
+DEFAULT_PROVIDER_CONCURRENCY = 4
+
+
 class AIModelManager:
     """Manages AI model integration and inference for Atlas."""
 
@@ -79,6 +120,18 @@ class AIModelManager:
                 self.config.get("ai_models_storage", "config/ai_models.json")
             )
             self.api_keys: Dict[str, str] = self.config.get("api_keys", {})
+            self.provider_concurrency: Dict[str, int] = self.config.get(
+                "ai_provider_concurrency", {}
+            )
+            self._session: Optional[requests.Session] = None
+            self._executor: Optional[ThreadPoolExecutor] = None
+            self._provider_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+            self._setup_lock = threading.Lock()
+            self.response_cache = self._create_response_cache()
+            self.selection_policy: str = self.config.get(
+                "ai_selection_policy", SELECTION_STATIC
+            )
+            self.router = ModelRouter.from_config(self.config.get("ai_router", {}))
             self.setup_logging()
             self.load_models()
             self._initialized = True
@@ -86,6 +139,18 @@ class AIModelManager:
                 "AIModelManager initialized for environment: %s", self.environment
             )
 
+    def _create_response_cache(self) -> Optional[ResponseCache]:
+        """Create the prompt/response cache from the ``ai_response_cache`` config."""
+        cache_config = self.config.get("ai_response_cache", {})
+        if not cache_config.get("enabled", True):
+            return None
+        return ResponseCache(
+            ttl=cache_config.get("ttl", 3600),
+            max_entries=cache_config.get("max_entries", 512),
+            similarity_threshold=cache_config.get("similarity_threshold"),
+            persist_path=cache_config.get("path"),
+        )
+
     def setup_logging(self) -> None:
         """Set up logging configuration for AI integration."""
         log_level = self.config.get("logging", {}).get("level", "INFO")
@@ -198,26 +263,421 @@ class AIModelManager:
 
         provider = model_config.get("provider", "")
         try:
-            if provider.lower() == "openai":
-                result = self._infer_openai(model_config, input_data, context)
-                _record_performance(model_name, start_time, True)
-                return result
-            elif provider.lower() == "anthropic":
-                result = self._infer_anthropic(model_config, input_data, context)
-                _record_performance(model_name, start_time, True)
-                return result
-            elif provider.lower() == "local":
-                result = self._infer_local(model_config, input_data, context)
-                _record_performance(model_name, start_time, True)
-                return result
-            else:
-                raise AIIntegrationError(
-                    f"Unsupported provider {provider} for model {model_name}"
-                )
+            with self._provider_slot(provider):
+                if provider.lower() == "openai":
+                    result = self._infer_openai(model_config, input_data, context)
+                elif provider.lower() == "anthropic":
+                    result = self._infer_anthropic(model_config, input_data, context)
+                elif provider.lower() == "local":
+                    result = self._infer_local(model_config, input_data, context)
+                else:
+                    raise AIIntegrationError(
+                        f"Unsupported provider {provider} for model {model_name}"
+                    )
+            _record_performance(model_name, start_time, True)
+            self.router.record(model_name, provider, time.time() - start_time, True)
+            return result
         except Exception as e:
             _record_performance(model_name, start_time, False, str(e))
+            self.router.record(model_name, provider, time.time() - start_time, False)
             raise
 
+    def select_model(
+        self,
+        context: Dict,
+        input_data: Any = None,
+        exclude: Sequence[str] = (),
+    ) -> str:
+        """
+        Select the model for a request using the configured selection policy.
+
+        The ``static`` policy uses ``optimize_model_selection``; the
+        ``adaptive`` policy asks the router, which honours per-task-type
+        latency SLOs, cost budgets and provider circuit breakers.
+
+        Args:
+            context: Context information including ``task_type``
+            input_data: Prompt, used by the router to estimate the cost
+            exclude: Model names that must not be chosen
+
+        Returns:
+            str: Name of the model to use
+        """
+        if self.selection_policy != SELECTION_ADAPTIVE:
+            return optimize_model_selection(context)
+
+        model_name = self.router.select(
+            self.models,
+            task_type=context.get("task_type", "general"),
+            input_data=input_data,
+            exclude=exclude,
+        )
+        if model_name is None:
+            raise AIIntegrationError(
+                "No AI model available: all provider circuits are open"
+            )
+        return model_name
+
+    def infer_routed(
+        self,
+        input_data: Any,
+        context: Optional[Dict] = None,
+        hedge: bool = True,
+        hedge_after: Optional[float] = None,
+    ) -> Any:
+        """
+        Perform inference on a model chosen by ``select_model``, with hedging.
+
+        If the chosen model has not answered after its p95 latency (or
+        ``hedge_after`` seconds), the same request is also sent to the next
+        best model and the first successful answer is returned. A failed first
+        attempt is retried on another model right away.
+
+        Args:
+            input_data: Input data for the model
+            context: Optional context information, including ``task_type``
+            hedge: Race a second model when the first one is slow
+            hedge_after: Seconds to wait before hedging; defaults to the
+                model's p95 latency once enough samples are recorded, and to
+                ``ai_router.hedge_default_delay`` until then
+
+        Returns:
+            Any: Inference results
+        """
+        context = context or {}
+        primary = self.select_model(context, input_data)
+        executor = self._get_executor()
+        futures: Dict[Future, str] = {
+            executor.submit(self._routed_attempt, primary, input_data, context): primary
+        }
+
+        first = next(iter(futures))
+        if not hedge:
+            return first.result()
+
+        delay = hedge_after if hedge_after is not None else self._hedge_delay(primary)
+        done, _ = wait(futures, timeout=delay)
+        if done and first.exception() is None:
+            return first.result()
+
+        try:
+            backup = self.select_model(context, input_data, exclude=[primary])
+        except AIIntegrationError:
+            backup = None
+        if backup is None or backup == primary:
+            return first.result()
+        logger.info(
+            "Hedging request to %s with %s after %s",
+            primary,
+            backup,
+            "failure" if done else f"{delay:.2f}s",
+        )
+        futures[executor.submit(self._routed_attempt, backup, input_data, context)] = (
+            backup
+        )
+
+        pending = set(futures)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def _routed_attempt(
+        self, model_name: str, input_data: Any, context: Optional[Dict]
+    ) -> Any:
+        """Run one routed inference if the provider's circuit lets it through."""
+        provider = (self.get_model(model_name) or {}).get("provider", "")
+        if not self.router.breaker(provider).allow_request():
+            raise AIIntegrationError(f"Circuit open for provider {provider}")
+        return self.infer(model_name, input_data, context)
+
+    def _hedge_delay(self, model_name: str) -> Optional[float]:
+        """
+        Return the p95 latency of a model, or the default delay while the
+        model has too few samples. A default of None disables hedging then.
+        """
+        router_config = self.config.get("ai_router", {})
+        min_samples = router_config.get("hedge_min_samples", DEFAULT_HEDGE_MIN_SAMPLES)
+        for recent in (True, False):
+            summary = _latency_metrics.summary(model_name, recent=recent)
+            if summary and summary["count"] >= min_samples:
+                return summary["p95"]
+        return router_config.get("hedge_default_delay", DEFAULT_HEDGE_DELAY)
+
+    def infer_stream(
+        self,
+        model_name: str,
+        input_data: Any,
+        context: Optional[Dict] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Iterator[str]:
+        """
+        Perform inference and yield response tokens as they arrive.
+
+        OpenAI and Anthropic models use server-sent event streaming; the local
+        provider yields its complete result as a single chunk.
+
+        Args:
+            model_name: Name of the AI model to use for inference
+            input_data: Input data for the model
+            context: Optional context information for context-aware processing
+            cancel_event: Optional event; setting it aborts the stream and
+                raises InferenceCancelledError
+
+        Yields:
+            str: Response text fragments in arrival order
+        """
+        logger.info("Performing streaming inference with model: %s", model_name)
+        start_time = time.time()
+        model_config = self.get_model(model_name)
+        if not model_config:
+            raise AIIntegrationError(f"Model {model_name} not found")
+
+        provider_name = model_config.get("provider", "")
+        provider = provider_name.lower()
+        try:
+            with self._provider_slot(provider, cancel_event):
+                if provider == "openai":
+                    request = self._build_openai_request(
+                        model_config, input_data, context
+                    )
+                    chunks = self._stream_sse(
+                        request, _extract_openai_delta, cancel_event
+                    )
+                elif provider == "anthropic":
+                    request = self._build_anthropic_request(
+                        model_config, input_data, context
+                    )
+                    chunks = self._stream_sse(
+                        request, _extract_anthropic_delta, cancel_event
+                    )
+                elif provider == "local":
+                    chunks = iter(
+                        [self._infer_local(model_config, input_data, context)]
+                    )
+                else:
+                    raise AIIntegrationError(
+                        f"Unsupported provider {provider} for model {model_name}"
+                    )
+                yield from chunks
+            _record_performance(model_name, start_time, True)
+            self.router.record(
+                model_name, provider_name, time.time() - start_time, True
+            )
+        except Exception as e:
+            _record_performance(model_name, start_time, False, str(e))
+            # Cancellation is not a provider failure
+            if not isinstance(e, InferenceCancelledError):
+                self.router.record(
+                    model_name, provider_name, time.time() - start_time, False
+                )
+            raise
+
+    async def infer_async(
+        self,
+        model_name: str,
+        input_data: Any,
+        context: Optional[Dict] = None,
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """
+        Perform inference without blocking the event loop.
+
+        The request runs on the manager's worker pool using the streaming
+        path, so cancelling the awaiting task aborts the HTTP response.
+
+        Args:
+            model_name: Name of the AI model to use for inference
+            input_data: Input data for the model
+            context: Optional context information for context-aware processing
+            on_token: Optional callback invoked from the worker thread with
+                every text fragment as it arrives
+
+        Returns:
+            str: The complete response text
+        """
+        cancel_event = threading.Event()
+
+        def run() -> str:
+            parts = []
+            for token in self.infer_stream(
+                model_name, input_data, context, cancel_event
+            ):
+                parts.append(token)
+                if on_token is not None:
+                    on_token(token)
+            return "".join(parts)
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._get_executor(), run)
+        # Retrieve the outcome even if the caller stopped waiting for it
+        future.add_done_callback(lambda done: done.cancelled() or done.exception())
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            cancel_event.set()
+            raise
+
+    def infer_batch(
+        self,
+        model_name: str,
+        inputs: Sequence[Any],
+        context: Optional[Dict] = None,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """
+        Run inference for several inputs concurrently.
+
+        Requests are spread over the shared worker pool and limited by the
+        provider's concurrency setting.
+
+        Args:
+            model_name: Name of the AI model to use for inference
+            inputs: Input data items
+            context: Optional context shared by every request
+            return_exceptions: Put exceptions into the result list instead of
+                raising the first one
+
+        Returns:
+            List[Any]: Results in the same order as ``inputs``
+        """
+        executor = self._get_executor()
+        futures = [
+            executor.submit(self.infer, model_name, item, context) for item in inputs
+        ]
+        results: List[Any] = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                if not return_exceptions:
+                    for pending in futures:
+                        pending.cancel()
+                    raise
+                results.append(e)
+        return results
+
+    def _cached_infer(
+        self, model_name: str, input_data: Any, context: Optional[Dict] = None
+    ) -> Any:
+        """
+        Perform inference through the response cache.
+
+        Args:
+            model_name: Name of the AI model to use for inference
+            input_data: Input data for the model
+            context: Optional context information for context-aware processing
+
+        Returns:
+            Any: Cached or freshly inferred result
+        """
+        if self.response_cache is None:
+            return self.infer(model_name, input_data, context)
+
+        cached, outcome = self.response_cache.get(model_name, input_data, context)
+        _record_cache_lookup(model_name, outcome)
+        if outcome != CACHE_MISS:
+            logger.info("Serving cached response for model: %s", model_name)
+            return cached
+
+        result = self.infer(model_name, input_data, context)
+        self.response_cache.put(model_name, input_data, result, context)
+        return result
+
+    def close(self) -> None:
+        """Release the pooled HTTP session and the inference worker pool."""
+        if self.response_cache is not None:
+            self.response_cache.save()
+        with self._setup_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _get_session(self) -> requests.Session:
+        """Return the shared keep-alive HTTP session, creating it on first use."""
+        with self._setup_lock:
+            if self._session is None:
+                pool_size = max(
+                    [DEFAULT_PROVIDER_CONCURRENCY, *self.provider_concurrency.values()]
+                )
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session = session
+            return self._session
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Return the worker pool used by ``infer_async`` and ``infer_batch``."""
+        with self._setup_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.config.get("ai_max_workers", 8),
+                    thread_name_prefix="AIInference",
+                )
+            return self._executor
+
+    def _provider_slot(
+        self, provider: str, cancel_event: Optional[threading.Event] = None
+    ) -> "_ProviderSlot":
+        """Acquire one of the provider's concurrent request slots."""
+        provider = provider.lower()
+        with self._setup_lock:
+            semaphore = self._provider_semaphores.get(provider)
+            if semaphore is None:
+                limit = self.provider_concurrency.get(
+                    provider, DEFAULT_PROVIDER_CONCURRENCY
+                )
+                semaphore = threading.BoundedSemaphore(limit)
+                self._provider_semaphores[provider] = semaphore
+        return _ProviderSlot(semaphore, cancel_event)
+
+    def _stream_sse(
+        self,
+        request: Tuple[str, Dict[str, str], Dict[str, Any]],
+        extract: Callable[[Dict[str, Any]], Optional[str]],
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Iterator[str]:
+        """
+        POST a streaming request and yield text from server-sent events.
+
+        Args:
+            request: Endpoint, headers and payload from a ``_build_*_request``
+            extract: Returns the text fragment of one decoded event, if any
+            cancel_event: Optional event that aborts the stream when set
+        """
+        endpoint, headers, payload = request
+        payload = {**payload, "stream": True}
+        response = self._get_session().post(
+            endpoint, headers=headers, json=payload, timeout=30, stream=True
+        )
+        try:
+            response.raise_for_status()
+            for line in response.iter_lines(decode_unicode=True):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise InferenceCancelledError("Inference cancelled")
+                if not line or not line.startswith("data:"):
+                    continue
+                data = line[len("data:") :].strip()
+                if data == "[DONE]":
+                    break
+                try:
+                    text = extract(json.loads(data))
+                except json.JSONDecodeError:
+                    logger.debug("Skipping malformed stream event: %s", data)
+                    continue
+                if text:
+                    yield text
+        finally:
+            response.close()
+
     def _infer_openai(
         self, model_config: Dict, input_data: Any, context: Optional[Dict] = None
     ) -> Any:
@@ -234,37 +694,10 @@ class AIModelManager:
         """
         logger.debug("Using OpenAI provider for inference")
         try:
-            api_key = self.api_keys.get("openai", os.environ.get("OPENAI_API_KEY", ""))
-            if not api_key:
-                raise AIIntegrationError("OpenAI API key not found")
-
-            endpoint = model_config.get(
-                "endpoint", "https://api.openai.com/v1/chat/completions"
+            endpoint, headers, payload = self._build_openai_request(
+                model_config, input_data, context
             )
-            model_id = model_config.get("model_id", "gpt-3.5-turbo")
-
-            headers = {
-                "Authorization": f"Bearer {api_key}",
-                "Content-Type": "application/json",
-            }
-
-            messages = []
-            if context and context.get("history"):
-                messages.extend(context.get("history", []))
-
-            if isinstance(input_data, str):
-                messages.append({"role": "user", "content": input_data})
-            else:
-                messages.append({"role": "user", "content": json.dumps(input_data)})
-
-            payload = {
-                "model": model_id,
-                "messages": messages,
-                "temperature": model_config.get("temperature", 0.7),
-                "max_tokens": model_config.get("max_tokens", 2048),
-            }
-
-            response = requests.post(
+            response = self._get_session().post(
                 endpoint, headers=headers, json=payload, timeout=30
             )
             response.raise_for_status()
@@ -291,40 +724,10 @@ class AIModelManager:
         """
         logger.debug("Using Anthropic provider for inference")
         try:
-            api_key = self.api_keys.get(
-                "anthropic", os.environ.get("ANTHROPIC_API_KEY", "")
+            endpoint, headers, payload = self._build_anthropic_request(
+                model_config, input_data, context
             )
-            if not api_key:
-                raise AIIntegrationError("Anthropic API key not found")
-
-            endpoint = model_config.get(
-                "endpoint", "https://api.anthropic.com/v1/messages"
-            )
-            model_id = model_config.get("model_id", "claude-3-opus-20240229")
-
-            headers = {
-                "x-api-key": api_key,
-                "anthropic-version": "2023-06-01",
-                "Content-Type": "application/json",
-            }
-
-            messages = []
-            if context and context.get("history"):
-                messages.extend(context.get("history", []))
-
-            if isinstance(input_data, str):
-                messages.append({"role": "user", "content": input_data})
-            else:
-                messages.append({"role": "user", "content": json.dumps(input_data)})
-
-            payload = {
-                "model": model_id,
-                "messages": messages,
-                "max_tokens": model_config.get("max_tokens", 2048),
-                "temperature": model_config.get("temperature", 0.7),
-            }
-
-            response = requests.post(
+            response = self._get_session().post(
                 endpoint, headers=headers, json=payload, timeout=30
             )
             response.raise_for_status()
@@ -335,6 +738,73 @@ class AIModelManager:
             logger.error("Error in Anthropic inference: %s", str(e), exc_info=True)
             raise AIIntegrationError(f"Anthropic inference failed: {str(e)}") from e
 
+    def _build_openai_request(
+        self, model_config: Dict, input_data: Any, context: Optional[Dict] = None
+    ) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+        """
+        Build the endpoint, headers and payload of an OpenAI chat request.
+
+        Args:
+            model_config: Configuration for the OpenAI model
+            input_data: Input data for the model
+            context: Optional context information
+
+        Returns:
+            Tuple: (endpoint, headers, payload)
+        """
+        api_key = self.api_keys.get("openai", os.environ.get("OPENAI_API_KEY", ""))
+        if not api_key:
+            raise AIIntegrationError("OpenAI API key not found")
+
+        endpoint = model_config.get(
+            "endpoint", "https://api.openai.com/v1/chat/completions"
+        )
+        headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        }
+        payload = {
+            "model": model_config.get("model_id", "gpt-3.5-turbo"),
+            "messages": _build_messages(input_data, context),
+            "temperature": model_config.get("temperature", 0.7),
+            "max_tokens": model_config.get("max_tokens", 2048),
+        }
+        return endpoint, headers, payload
+
+    def _build_anthropic_request(
+        self, model_config: Dict, input_data: Any, context: Optional[Dict] = None
+    ) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+        """
+        Build the endpoint, headers and payload of an Anthropic messages request.
+
+        Args:
+            model_config: Configuration for the Anthropic model
+            input_data: Input data for the model
+            context: Optional context information
+
+        Returns:
+            Tuple: (endpoint, headers, payload)
+        """
+        api_key = self.api_keys.get(
+            "anthropic", os.environ.get("ANTHROPIC_API_KEY", "")
+        )
+        if not api_key:
+            raise AIIntegrationError("Anthropic API key not found")
+
+        endpoint = model_config.get("endpoint", "https://api.anthropic.com/v1/messages")
+        headers = {
+            "x-api-key": api_key,
+            "anthropic-version": "2023-06-01",
+            "Content-Type": "application/json",
+        }
+        payload = {
+            "model": model_config.get("model_id", "claude-3-opus-20240229"),
+            "messages": _build_messages(input_data, context),
+            "max_tokens": model_config.get("max_tokens", 2048),
+            "temperature": model_config.get("temperature", 0.7),
+        }
+        return endpoint, headers, payload
+
     def _infer_local(
         self, model_config: Dict, input_data: Any, context: Optional[Dict] = None
     ) -> Any:
@@ -390,7 +860,7 @@ class AIModelManager:
         else:
             input_text = self._craft_general_prompt(context)
 
-        return self.infer(model_name, input_text, context)
+        return self._cached_infer(model_name, input_text, context)
 
     def _craft_code_prompt(self, context: Dict) -> str:
         """
@@ -484,7 +954,7 @@ Format your response as a JSON object with 'steps' as a list of objects with 'st
 Additional context:
 {json.dumps(context, indent=2)}"""
 
-        response = self.infer(model_name, prompt, context)
+        response = self._cached_infer(model_name, prompt, context)
         try:
             # Attempt to parse response as JSON
             return json.loads(response)
@@ -495,6 +965,54 @@ Additional context:
             return {"steps": [], "raw_response": response}
 
 
+class _ProviderSlot:
+    """Context manager holding one provider concurrency slot."""
+
+    def __init__(
+        self,
+        semaphore: threading.BoundedSemaphore,
+        cancel_event: Optional[threading.Event] = None,
+    ):
+        self._semaphore = semaphore
+        self._cancel_event = cancel_event
+
+    def __enter__(self) -> "_ProviderSlot":
+        # Poll so that a cancelled caller does not wait for a free slot forever
+        while not self._semaphore.acquire(timeout=0.1):
+            if self._cancel_event is not None and self._cancel_event.is_set():
+                raise InferenceCancelledError("Inference cancelled")
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._semaphore.release()
+
+
+def _build_messages(input_data: Any, context: Optional[Dict] = None) -> List[Dict]:
+    """Build a chat message list from the context history and the input."""
+    messages = []
+    if context and context.get("history"):
+        messages.extend(context.get("history", []))
+
+    if isinstance(input_data, str):
+        messages.append({"role": "user", "content": input_data})
+    else:
+        messages.append({"role": "user", "content": json.dumps(input_data)})
+    return messages
+
+
+def _extract_openai_delta(event: Dict[str, Any]) -> Optional[str]:
+    """Return the text of an OpenAI chat completion stream chunk."""
+    choices = event.get("choices") or [{}]
+    return choices[0].get("delta", {}).get("content")
+
+
+def _extract_anthropic_delta(event: Dict[str, Any]) -> Optional[str]:
+    """Return the text of an Anthropic ``content_block_delta`` stream event."""
+    if event.get("type") != "content_block_delta":
+        return None
+    return event.get("delta", {}).get("text")
+
+
 def _record_performance(
     model_name: str, start_time: float, success: bool, error_message: str = None
 ):
@@ -510,31 +1028,64 @@ def _record_performance(
     duration = time.time() - start_time
 
     # Update inference times
-    if model_name not in _performance_metrics["inference_times"]:
-        _performance_metrics["inference_times"][model_name] = []
-    _performance_metrics["inference_times"][model_name].append(duration)
-
-    # Update success rates
-    if model_name not in _performance_metrics["success_rates"]:
-        _performance_metrics["success_rates"][model_name] = {"success": 0, "total": 0}
-    _performance_metrics["success_rates"][model_name]["total"] += 1
-    if success:
-        _performance_metrics["success_rates"][model_name]["success"] += 1
-
-    # Update error counts
-    if not success:
-        if model_name not in _performance_metrics["error_counts"]:
-            _performance_metrics["error_counts"][model_name] = {}
-        error_type = error_message.split(":")[0] if error_message else "Unknown"
-        _performance_metrics["error_counts"][model_name][error_type] = (
-            _performance_metrics["error_counts"][model_name].get(error_type, 0) + 1
-        )
+    _latency_metrics.record(model_name, duration)
+
+    with _metrics_lock:
+        # Update success rates
+        if model_name not in _performance_metrics["success_rates"]:
+            _performance_metrics["success_rates"][model_name] = {
+                "success": 0,
+                "total": 0,
+            }
+        _performance_metrics["success_rates"][model_name]["total"] += 1
+        if success:
+            _performance_metrics["success_rates"][model_name]["success"] += 1
+
+        # Update error counts
+        if not success:
+            if model_name not in _performance_metrics["error_counts"]:
+                _performance_metrics["error_counts"][model_name] = {}
+            error_type = error_message.split(":")[0] if error_message else "Unknown"
+            _performance_metrics["error_counts"][model_name][error_type] = (
+                _performance_metrics["error_counts"][model_name].get(error_type, 0) + 1
+            )
 
     logger.debug(
         f"Performance recorded for {model_name}: Duration={duration:.2f}s, Success={success}"
     )
 
 
+def _record_cache_lookup(model_name: str, outcome: str) -> None:
+    """
+    Record the outcome of a response cache lookup.
+
+    Args:
+        model_name: Name of the AI model
+        outcome: One of the ``core.ai_response_cache`` lookup outcomes
+    """
+    with _metrics_lock:
+        counters = _performance_metrics["cache"].setdefault(
+            model_name, {"hit": 0, "semantic_hit": 0, "miss": 0}
+        )
+        counters[outcome] += 1
+
+
+def _cache_report(model_name: str) -> Dict:
+    """Summarize the response cache counters of a model."""
+    counters = _performance_metrics["cache"].get(
+        model_name, {"hit": 0, "semantic_hit": 0, "miss": 0}
+    )
+    lookups = counters["hit"] + counters["semantic_hit"] + counters["miss"]
+    return {
+        "hits": counters["hit"],
+        "semantic_hits": counters["semantic_hit"],
+        "misses": counters["miss"],
+        "hit_rate": (
+            (counters["hit"] + counters["semantic_hit"]) / lookups if lookups else 0
+        ),
+    }
+
+
 def get_performance_report(model_name: str = None) -> Dict:
     """
     Generate a performance report for AI models.
@@ -543,16 +1094,20 @@ def get_performance_report(model_name: str = None) -> Dict:
         model_name: Optional specific model name to report on
 
     Returns:
-        Dict: Performance statistics for the specified model or all models
+        Dict: Performance statistics for the specified model or all models.
+            Latencies include p50/p95/p99 over all calls, and ``recent`` holds
+            the same summary for the rolling window of the last ten minutes.
     """
     report = {}
-    models = (
-        [model_name] if model_name else _performance_metrics["inference_times"].keys()
-    )
+    if model_name:
+        models = [model_name]
+    else:
+        models = dict.fromkeys(_latency_metrics.names())
+        models.update(dict.fromkeys(_performance_metrics["cache"]))
 
     for model in models:
-        if model in _performance_metrics["inference_times"]:
-            times = _performance_metrics["inference_times"][model]
+        summary = _latency_metrics.summary(model)
+        if summary is not None:
             success_data = _performance_metrics["success_rates"].get(
                 model, {"success": 0, "total": 0}
             )
@@ -563,13 +1118,20 @@ def get_performance_report(model_name: str = None) -> Dict:
             )
 
             report[model] = {
-                "average_time": statistics.mean(times) if times else 0,
-                "min_time": min(times) if times else 0,
-                "max_time": max(times) if times else 0,
-                "total_calls": len(times),
+                "average_time": summary["mean"],
+                "min_time": summary["min"],
+                "max_time": summary["max"],
+                "p50_time": summary["p50"],
+                "p95_time": summary["p95"],
+                "p99_time": summary["p99"],
+                "total_calls": summary["count"],
+                "recent": _latency_metrics.summary(model, recent=True),
                 "success_rate": success_rate,
-                "errors": _performance_metrics["error_counts"].get(model, {}),
+                "errors": dict(_performance_metrics["error_counts"].get(model, {})),
+                "cache": _cache_report(model),
             }
+        elif model in _performance_metrics["cache"]:
+            report[model] = {"total_calls": 0, "cache": _cache_report(model)}
 
     return report
 
@@ -601,9 +1163,14 @@ def optimize_model_selection(context: Dict) -> str:
         best_score = -1
 
         for model, metrics in performance_report.items():
-            # Calculate a simple performance score (lower time, higher success rate = better)
+            if not metrics["total_calls"]:
+                continue
+            # Rank by tail latency: prefer the recent window, fall back to all
+            # calls when the model has not been used lately
+            recent = metrics["recent"]
+            tail_latency = recent["p95"] if recent["count"] else metrics["p95_time"]
             score = metrics["success_rate"] / (
-                metrics["average_time"] + 1
+                tail_latency + 1
             )  # +1 to avoid division by zero
             if score > best_score:
                 best_score = score
@@ -0,0 +1,370 @@
+"""
+Response cache for AI inference in Atlas.
+
+This module caches model responses keyed by a normalized hash of the model,
+prompt and context, so repeated suggestions and automation plans do not pay
+the full LLM latency and cost again. Entries expire after a TTL, the cache is
+capped in LRU order by entry count and optionally by encoded size, and it can
+be persisted to disk between runs.
+
+Optionally, a near-duplicate lookup compares prompt embeddings with cosine
+similarity and reuses the response of a sufficiently similar earlier prompt.
+"""
+
+import hashlib
+import json
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from core.logging import get_logger
+
+logger = get_logger("AIResponseCache")
+
+# Lookup outcomes reported to the performance metrics
+CACHE_HIT = "hit"
+CACHE_SEMANTIC_HIT = "semantic_hit"
+CACHE_MISS = "miss"
+
+_WHITESPACE = re.compile(r"\s+")
+_WORD = re.compile(r"\w+")
+
+Embedding = List[float]
+
+
+def normalize_prompt(prompt: Any) -> str:
+    """Normalize a prompt so that formatting-only differences hash the same."""
+    if not isinstance(prompt, str):
+        prompt = json.dumps(prompt, sort_keys=True, default=str)
+    return _WHITESPACE.sub(" ", prompt).strip()
+
+
+def make_cache_key(model_name: str, prompt: Any, context: Optional[Dict] = None) -> str:
+    """
+    Build the cache key of a model/prompt/context combination.
+
+    Args:
+        model_name: Name of the AI model
+        prompt: Prompt text or structured input
+        context: Optional context dictionary; key order does not matter
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    material = json.dumps(
+        [model_name, normalize_prompt(prompt), context or {}],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _conversation_key(model_name: str, context: Optional[Dict] = None) -> str:
+    """Key of what the model sees besides the prompt: the model and the history."""
+    history = (context or {}).get("history") or []
+    return make_cache_key(model_name, "", {"history": history})
+
+
+def hashed_ngram_embedding(text: str, dimensions: int = 256) -> Embedding:
+    """
+    Embed text as a normalized bag of hashed words and character trigrams.
+
+    This dependency-free embedding is good enough to catch prompts that
+    differ only by a few words; pass a model-backed embedder to
+    ``ResponseCache`` for true semantic matching.
+
+    Args:
+        text: Text to embed
+        dimensions: Size of the embedding vector
+
+    Returns:
+        List[float]: Unit-length embedding vector
+    """
+    vector = [0.0] * dimensions
+    text = normalize_prompt(text).lower()
+    features = _WORD.findall(text)
+    features.extend(text[i : i + 3] for i in range(max(len(text) - 2, 0)))
+    for feature in features:
+        digest = hashlib.md5(feature.encode("utf-8"), usedforsecurity=False).digest()
+        index = int.from_bytes(digest[:4], "little") % dimensions
+        vector[index] += 1.0 if digest[4] & 1 else -1.0
+    norm = math.sqrt(sum(value * value for value in vector))
+    return [value / norm for value in vector] if norm else vector
+
+
+def _cosine(a: Sequence[float], b: Sequence[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b, strict=True))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU + TTL cache of AI model responses.
+
+    Example:
+        ```python
+        cache = ResponseCache(ttl=3600, max_entries=500, similarity_threshold=0.9)
+        response, outcome = cache.get("gpt-4", prompt, context)
+        if outcome == CACHE_MISS:
+            response = manager.infer("gpt-4", prompt, context)
+            cache.put("gpt-4", prompt, response, context)
+        ```
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[float] = 3600.0,
+        max_entries: int = 512,
+        similarity_threshold: Optional[float] = None,
+        embedder: Optional[Callable[[str], Sequence[float]]] = None,
+        persist_path: Optional[str] = None,
+        autosave_every: int = 20,
+        max_bytes: Optional[int] = None,
+    ):
+        """
+        Initialize the response cache.
+
+        Args:
+            ttl: Seconds a response stays valid; None disables expiry
+            max_entries: Maximum number of cached responses
+            similarity_threshold: Minimum cosine similarity (0-1] for a
+                near-duplicate hit; None disables the near-duplicate lookup
+            embedder: Function mapping prompt text to an embedding; defaults
+                to ``hashed_ngram_embedding`` when a threshold is set
+            persist_path: Optional JSON file to load from and save to
+            autosave_every: Save to ``persist_path`` after this many writes
+            max_bytes: Maximum total JSON size of the cached responses; None
+                only caps the number of entries
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.embedder = embedder or hashed_ngram_embedding
+        self.persist_path = Path(persist_path) if persist_path else None
+        self.autosave_every = autosave_every
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._unsaved_writes = 0
+        self._bytes = 0
+        self._stats = {
+            "hits": 0,
+            "semantic_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+        }
+        if self.persist_path is not None:
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(
+        self, model_name: str, prompt: Any, context: Optional[Dict] = None
+    ) -> Tuple[Any, str]:
+        """
+        Look up a cached response.
+
+        Args:
+            model_name: Name of the AI model
+            prompt: Prompt text or structured input
+            context: Optional context dictionary
+
+        Returns:
+            Tuple[Any, str]: The response (None on a miss) and the outcome,
+                one of CACHE_HIT, CACHE_SEMANTIC_HIT or CACHE_MISS
+        """
+        key = make_cache_key(model_name, prompt, context)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self._expired(entry, now):
+                    self._remove(key)
+                    self._stats["expirations"] += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return entry["response"], CACHE_HIT
+
+            if self.similarity_threshold is None:
+                self._stats["misses"] += 1
+                return None, CACHE_MISS
+
+            # Only entries sent with the same model and conversation history
+            # are eligible near-duplicates
+            context_key = _conversation_key(model_name, context)
+            embedding = self.embedder(normalize_prompt(prompt))
+            best_key, best_score = None, self.similarity_threshold
+            for candidate_key, candidate in list(self._entries.items()):
+                # Entries embedded by another embedder cannot be compared
+                if (
+                    candidate["context_key"] != context_key
+                    or not candidate["embedding"]
+                    or len(candidate["embedding"]) != len(embedding)
+                ):
+                    continue
+                if self._expired(candidate, now):
+                    self._remove(candidate_key)
+                    self._stats["expirations"] += 1
+                    continue
+                score = _cosine(embedding, candidate["embedding"])
+                if score >= best_score:
+                    best_key, best_score = candidate_key, score
+            if best_key is None:
+                self._stats["misses"] += 1
+                return None, CACHE_MISS
+            self._entries.move_to_end(best_key)
+            self._stats["semantic_hits"] += 1
+            logger.debug("Near-duplicate cache hit with similarity %.3f", best_score)
+            return self._entries[best_key]["response"], CACHE_SEMANTIC_HIT
+
+    def put(
+        self,
+        model_name: str,
+        prompt: Any,
+        response: Any,
+        context: Optional[Dict] = None,
+    ) -> None:
+        """
+        Store a response.
+
+        Args:
+            model_name: Name of the AI model
+            prompt: Prompt text or structured input
+            response: JSON-serializable model response
+            context: Optional context dictionary
+        """
+        entry = {
+            "model": model_name,
+            "response": response,
+            "created_at": time.time(),
+            "context_key": _conversation_key(model_name, context),
+            "embedding": None,
+            "size": _encoded_size(response),
+        }
+        if self.similarity_threshold is not None:
+            entry["embedding"] = list(self.embedder(normalize_prompt(prompt)))
+
+        key = make_cache_key(model_name, prompt, context)
+        if self.max_bytes is not None and entry["size"] > self.max_bytes:
+            return  # Would evict everything else
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = entry
+            self._bytes += entry["size"]
+            self._evict()
+            self._unsaved_writes += 1
+            should_save = (
+                self.persist_path is not None
+                and self._unsaved_writes >= self.autosave_every
+            )
+        if should_save:
+            self.save()
+
+    def clear(self, model_name: Optional[str] = None) -> int:
+        """Remove all entries, or only those of one model, and return how many."""
+        with self._lock:
+            stale = [
+                key
+                for key, entry in self._entries.items()
+                if model_name is None or entry["model"] == model_name
+            ]
+            for key in stale:
+                self._remove(key)
+            return len(stale)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the cache counters.
+
+        Returns:
+            Dict[str, Any]: Hits, near-duplicate hits, misses, hit rate,
+                evictions, expirations, and the number and JSON size of entries
+        """
+        with self._lock:
+            hits = self._stats["hits"] + self._stats["semantic_hits"]
+            lookups = hits + self._stats["misses"]
+            return dict(
+                self._stats,
+                hit_rate=hits / lookups if lookups else 0.0,
+                entries=len(self._entries),
+                bytes=self._bytes,
+            )
+
+    def save(self) -> None:
+        """Write the non-expired entries to ``persist_path``."""
+        if self.persist_path is None:
+            return
+        now = time.time()
+        with self._lock:
+            entries = {
+                key: entry
+                for key, entry in self._entries.items()
+                if not self._expired(entry, now)
+            }
+            self._unsaved_writes = 0
+            # Under the lock so concurrent saves do not share the tmp file
+            try:
+                self.persist_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.persist_path.with_suffix(".tmp")
+                with open(tmp_path, "w") as f:
+                    json.dump(entries, f)
+                tmp_path.replace(self.persist_path)
+            except (OSError, TypeError, ValueError) as e:
+                logger.error("Error saving AI response cache: %s", str(e))
+
+    def load(self) -> None:
+        """Load previously saved entries from ``persist_path``."""
+        if self.persist_path is None or not self.persist_path.exists():
+            return
+        try:
+            with open(self.persist_path, "r") as f:
+                stored = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error("Error loading AI response cache: %s", str(e))
+            return
+
+        now = time.time()
+        with self._lock:
+            for key, entry in sorted(
+                stored.items(), key=lambda item: item[1].get("created_at", 0)
+            ):
+                if self._expired(entry, now):
+                    continue
+                entry.setdefault("size", _encoded_size(entry.get("response")))
+                self._remove(key)
+                self._entries[key] = entry
+                self._bytes += entry["size"]
+            self._evict()
+        logger.info("Loaded %d cached AI responses", len(self._entries))
+
+    def _expired(self, entry: Dict[str, Any], now: float) -> bool:
+        return self.ttl is not None and now - entry["created_at"] > self.ttl
+
+    def _remove(self, key: str) -> None:
+        """Drop an entry and its size from the totals."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry["size"]
+
+    def _evict(self) -> None:
+        """Evict least recently used entries until both caps are met."""
+        while len(self._entries) > self.max_entries or (
+            self.max_bytes is not None and self._bytes > self.max_bytes
+        ):
+            self._remove(next(iter(self._entries)))
+            self._stats["evictions"] += 1
+
+
+def _encoded_size(response: Any) -> int:
+    """Size of a response as stored, used for the byte budget."""
+    return len(json.dumps(response, default=str))
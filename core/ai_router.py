@@ -0,0 +1,350 @@
+"""
+Adaptive model routing for Atlas.
+
+This module picks which AI model serves a request from observed behaviour
+instead of a fixed table. Each model keeps exponentially weighted averages of
+its latency and success rate; the router scores models against per-task-type
+latency SLOs, skips models whose estimated token cost exceeds the task's
+budget, and stops sending traffic to providers whose circuit breaker is open.
+
+Two policies are available: ``"ewma"`` always exploits the best current score,
+``"bandit"`` adds a UCB1 exploration bonus so rarely used models are retried.
+"""
+
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from core.logging import get_logger
+
+logger = get_logger("AIRouter")
+
+POLICY_EWMA = "ewma"
+POLICY_BANDIT = "bandit"
+
+CIRCUIT_CLOSED = "CLOSED"
+CIRCUIT_OPEN = "OPEN"
+CIRCUIT_HALF_OPEN = "HALF_OPEN"
+
+# Rough characters-per-token ratio used for cost estimates
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(input_data: Any) -> int:
+    """Estimate the token count of a prompt from its length."""
+    return max(1, len(str(input_data)) // CHARS_PER_TOKEN)
+
+
+class ProviderCircuitBreaker:
+    """
+    Thread-safe circuit breaker for one provider.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and the
+    provider is skipped. Once ``recovery_timeout`` seconds have passed a single
+    probe request is let through (half-open); its outcome closes or reopens
+    the circuit.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            recovery_timeout: Seconds to wait before probing an open circuit
+            clock: Monotonic time source, injectable for tests
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CIRCUIT_CLOSED
+        self.failure_count = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def available(self) -> bool:
+        """Return True if a request could currently be sent, without reserving it."""
+        with self._lock:
+            self._refresh()
+            return self._state == CIRCUIT_CLOSED or (
+                self._state == CIRCUIT_HALF_OPEN and not self._probe_in_flight
+            )
+
+    def allow_request(self) -> bool:
+        """Reserve permission to send a request; reserves the probe when half-open."""
+        with self._lock:
+            self._refresh()
+            if self._state == CIRCUIT_CLOSED:
+                return True
+            if self._state == CIRCUIT_HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CIRCUIT_CLOSED
+            self.failure_count = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failure_count += 1
+            self._probe_in_flight = False
+            if (
+                self._state == CIRCUIT_HALF_OPEN
+                or self.failure_count >= self.failure_threshold
+            ):
+                if self._state != CIRCUIT_OPEN:
+                    logger.warning(
+                        "Circuit opened after %d failures", self.failure_count
+                    )
+                self._state = CIRCUIT_OPEN
+                self._opened_at = self._clock()
+
+    def _refresh(self) -> None:
+        if (
+            self._state == CIRCUIT_OPEN
+            and self._clock() - self._opened_at >= self.recovery_timeout
+        ):
+            self._state = CIRCUIT_HALF_OPEN
+            self._probe_in_flight = False
+
+
+class _ModelStats:
+    """Exponentially weighted latency and success rate of one model."""
+
+    __slots__ = ("calls", "latency", "success")
+
+    def __init__(self):
+        self.calls = 0
+        self.latency = 0.0
+        self.success = 1.0
+
+    def update(self, latency: float, success: bool, alpha: float) -> None:
+        if self.calls == 0:
+            self.latency = latency
+            self.success = 1.0 if success else 0.0
+        else:
+            self.latency += alpha * (latency - self.latency)
+            self.success += alpha * ((1.0 if success else 0.0) - self.success)
+        self.calls += 1
+
+
+class ModelRouter:
+    """
+    Latency- and cost-aware model selection.
+
+    Example:
+        ```python
+        router = ModelRouter(slos={"code": 4.0}, cost_budgets={"code": 0.02})
+        model = router.select(manager.models, task_type="code", input_data=prompt)
+        ...
+        router.record(model, provider, latency, success)
+        ```
+    """
+
+    def __init__(
+        self,
+        policy: str = POLICY_EWMA,
+        slos: Optional[Dict[str, float]] = None,
+        cost_budgets: Optional[Dict[str, float]] = None,
+        default_slo: float = 10.0,
+        alpha: float = 0.2,
+        exploration: float = 0.5,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the router.
+
+        Args:
+            policy: ``"ewma"`` or ``"bandit"``
+            slos: Latency objective in seconds per task type
+            cost_budgets: Maximum estimated cost per request per task type, in
+                the unit of the models' ``cost_per_1k_tokens`` setting
+            default_slo: Latency objective for task types without an SLO
+            alpha: EWMA smoothing factor in (0, 1]
+            exploration: UCB exploration weight of the bandit policy
+            failure_threshold: Consecutive failures that open a provider circuit
+            recovery_timeout: Seconds before an open circuit is probed again
+            clock: Monotonic time source, injectable for tests
+        """
+        if policy not in (POLICY_EWMA, POLICY_BANDIT):
+            raise ValueError(f"Unknown routing policy: {policy}")
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+        self.policy = policy
+        self.slos = dict(slos or {})
+        self.cost_budgets = dict(cost_budgets or {})
+        self.default_slo = default_slo
+        self.alpha = alpha
+        self.exploration = exploration
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stats: Dict[str, _ModelStats] = {}
+        self._breakers: Dict[str, ProviderCircuitBreaker] = {}
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "ModelRouter":
+        """Create a router from the ``ai_router`` configuration section."""
+        return cls(
+            policy=config.get("policy", POLICY_EWMA),
+            slos=config.get("slos"),
+            cost_budgets=config.get("cost_budgets"),
+            default_slo=config.get("default_slo", 10.0),
+            alpha=config.get("alpha", 0.2),
+            exploration=config.get("exploration", 0.5),
+            failure_threshold=config.get("failure_threshold", 5),
+            recovery_timeout=config.get("recovery_timeout", 60.0),
+        )
+
+    def breaker(self, provider: str) -> ProviderCircuitBreaker:
+        """Return the circuit breaker of a provider, creating it on first use."""
+        provider = provider.lower()
+        with self._lock:
+            breaker = self._breakers.get(provider)
+            if breaker is None:
+                breaker = self._breakers[provider] = ProviderCircuitBreaker(
+                    self.failure_threshold, self.recovery_timeout, self._clock
+                )
+            return breaker
+
+    def record(
+        self, model_name: str, provider: str, latency: float, success: bool
+    ) -> None:
+        """
+        Record the outcome of a request.
+
+        Args:
+            model_name: Name of the AI model
+            provider: Provider that served the request
+            latency: Request duration in seconds
+            success: Whether the request succeeded
+        """
+        with self._lock:
+            stats = self._stats.setdefault(model_name, _ModelStats())
+            stats.update(latency, success, self.alpha)
+        breaker = self.breaker(provider)
+        if success:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+
+    def estimate_cost(
+        self, model_config: Dict[str, Any], input_data: Any = None
+    ) -> float:
+        """Estimate the cost of sending ``input_data`` to a model."""
+        cost_per_1k = model_config.get("cost_per_1k_tokens", 0.0)
+        # Budget against the worst case: the prompt plus a full completion
+        tokens = estimate_tokens(input_data) + model_config.get("max_tokens", 2048)
+        return cost_per_1k * tokens / 1000.0
+
+    def select(
+        self,
+        models: Dict[str, Dict[str, Any]],
+        task_type: str = "general",
+        input_data: Any = None,
+        exclude: Iterable[str] = (),
+    ) -> Optional[str]:
+        """
+        Choose the model to serve a request.
+
+        Args:
+            models: Candidate model configurations by name
+            task_type: Task type used to look up the SLO and cost budget
+            input_data: Prompt, used to estimate the token cost
+            exclude: Model names that must not be chosen
+
+        Returns:
+            Optional[str]: Name of the chosen model, or None if no model has a
+                closed circuit
+        """
+        exclude = set(exclude)
+        candidates = {
+            name: config
+            for name, config in models.items()
+            if name not in exclude
+            and self.breaker(config.get("provider", "")).available()
+        }
+        if not candidates:
+            return None
+
+        budget = self.cost_budgets.get(task_type)
+        if budget is not None:
+            affordable = {
+                name: config
+                for name, config in candidates.items()
+                if self.estimate_cost(config, input_data) <= budget
+            }
+            if affordable:
+                candidates = affordable
+            else:
+                # Nothing fits the budget: degrade to the cheapest model
+                cheapest = min(
+                    candidates,
+                    key=lambda name: self.estimate_cost(candidates[name], input_data),
+                )
+                return cheapest
+
+        slo = self.slos.get(task_type, self.default_slo)
+        with self._lock:
+            total_calls = sum(
+                self._stats[name].calls for name in candidates if name in self._stats
+            )
+            best_name, best_score = None, -math.inf
+            for name in candidates:
+                score = self._score(self._stats.get(name), slo, total_calls)
+                if score > best_score:
+                    best_name, best_score = name, score
+        return best_name
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return the tracked averages per model and circuit state per provider."""
+        with self._lock:
+            models = {
+                name: {
+                    "calls": stats.calls,
+                    "ewma_latency": stats.latency,
+                    "ewma_success": stats.success,
+                }
+                for name, stats in self._stats.items()
+            }
+            breakers = dict(self._breakers)
+        return {
+            "policy": self.policy,
+            "models": models,
+            "circuits": {
+                provider: breaker.state for provider, breaker in breakers.items()
+            },
+        }
+
+    def _score(
+        self, stats: Optional[_ModelStats], slo: float, total_calls: int
+    ) -> float:
+        if stats is None or stats.calls == 0:
+            # Untried models go first so every model gets measured
+            return math.inf
+        # Reward in [0, 1]: success rate, scaled down when the latency misses the SLO
+        reward = stats.success * min(1.0, slo / stats.latency if stats.latency else 1.0)
+        if self.policy == POLICY_BANDIT:
+            reward += self.exploration * math.sqrt(
+                2 * math.log(max(total_calls, 1)) / stats.calls
+            )
+        return reward
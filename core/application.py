@@ -36,14 +36,16 @@ class AtlasApplication:
         # Initialize the Atlas application with all core systems
         self.qt_app: Optional[QApplication] = None
         self.config = Config()
-        self.event_bus = EventBus()
+        self.event_bus = EventBus(**self.config.get("events", {}))
         self.module_registry = ModuleRegistry(self.event_bus)
-        self.plugin_system = PluginSystem(self.event_bus)
+        # In lazy startup mode plugins and tools are imported on first use
+        lazy = self.config.get("startup.lazy_imports", False)
+        self.plugin_system = PluginSystem(self.event_bus, lazy=lazy)
 
         # Import ToolManager here to avoid circular imports
         from tools.tool_manager import ToolManager
 
-        self.tool_manager = ToolManager(self.event_bus)
+        self.tool_manager = ToolManager(self.event_bus, lazy=lazy)
 
         self.self_healing = SelfHealingSystem(self.event_bus)
         self.main_window = None
@@ -131,6 +133,8 @@ class AtlasApplication:
 
         # Publish shutdown event
         self.event_bus.publish("app_shutdown")
+        # Deliver pending events and stop the dispatch workers in async mode
+        self.event_bus.shutdown(wait=True, timeout=5.0)
 
         # Cleanup plugin system
         if self.plugin_system:
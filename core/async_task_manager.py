@@ -1,79 +1,379 @@
 # core/async_task_manager.py
 
+import itertools
 import logging
 import queue
 import threading
 import time
-from typing import Any, Callable, Optional
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Deque, Dict, List, Optional, Union
+
+from core.metrics import MetricsStore
 
 logger = logging.getLogger("AsyncTaskManager")
 
+# Priority lanes; lower values are served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+PRIORITY_LANES = {
+    "interactive": PRIORITY_INTERACTIVE,
+    "background": PRIORITY_BACKGROUND,
+}
+
+EXECUTOR_THREAD = "thread"
+EXECUTOR_PROCESS = "process"
+
+# Queued ahead of every task so stop() does not wait for the backlog
+_STOP_PRIORITY = -1
+
+
+class TaskDeadlineExceeded(Exception):
+    """Raised on a task's future when its deadline passes before it finishes."""
+
+    pass
+
+
+class _TaskItem:
+    """A submitted task together with its future and bookkeeping."""
+
+    __slots__ = (
+        "callback",
+        "deadline",
+        "executor",
+        "future",
+        "name",
+        "priority",
+        "submitted_at",
+        "task",
+        "task_type",
+    )
+
+    def __init__(
+        self,
+        task: Callable[[], Any],
+        callback: Optional[Callable[[Any], None]],
+        priority: int,
+        name: str,
+        task_type: Optional[str],
+        deadline: Optional[float],
+        executor: str,
+    ):
+        self.task = task
+        self.callback = callback
+        self.priority = priority
+        self.name = name
+        self.task_type = task_type
+        self.deadline = deadline
+        self.executor = executor
+        self.future: Future = Future()
+        self.submitted_at = time.monotonic()
+
 
 class AsyncTaskManager:
-    """Manages asynchronous execution of tasks to prevent UI blocking."""
+    """Manages asynchronous execution of tasks to prevent UI blocking.
+
+    Tasks run on a pool of worker threads, or in a process pool for CPU-bound
+    work, and are served from priority lanes so interactive jobs overtake
+    background ones. ``submit_task`` returns a ``concurrent.futures.Future``
+    that supports cancellation while the task is still queued.
+    """
 
-    def __init__(self):
-        self.task_queue = queue.Queue()
+    def __init__(
+        self,
+        num_workers: int = 4,
+        process_workers: Optional[int] = None,
+        concurrency_limits: Optional[Dict[str, int]] = None,
+    ):
+        """Initialize the task manager.
+
+        Args:
+            num_workers: Number of worker threads.
+            process_workers: Size of the process pool used for tasks submitted
+                with ``executor="process"``; defaults to the CPU count.
+            concurrency_limits: Maximum number of concurrently running tasks
+                per task type, e.g. ``{"ui": 1}``.
+        """
+        if num_workers < 1:
+            raise ValueError("num_workers must be at least 1")
+        self.num_workers = num_workers
+        self.process_workers = process_workers
+        self.concurrency_limits: Dict[str, int] = dict(concurrency_limits or {})
+        self.task_queue: "queue.PriorityQueue" = queue.PriorityQueue()
         self.is_running = False
         self.worker_thread: Optional[threading.Thread] = None
+        self.worker_threads: List[threading.Thread] = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._running_by_type: Dict[str, int] = {}
+        self._deferred: Dict[str, Deque[_TaskItem]] = {}
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._metrics = MetricsStore()
+        self._counters: Dict[str, Dict[str, int]] = {}
         logger.info("AsyncTaskManager initialized")
 
     def start(self):
-        """Start the worker thread to process tasks asynchronously."""
+        """Start the worker threads to process tasks asynchronously."""
         if not self.is_running:
             self.is_running = True
-            self.worker_thread = threading.Thread(
-                target=self._process_tasks, daemon=True
+            self.worker_threads = [
+                threading.Thread(
+                    target=self._process_tasks,
+                    name=f"AsyncTaskWorker-{i}",
+                    daemon=True,
+                )
+                for i in range(self.num_workers)
+            ]
+            for worker in self.worker_threads:
+                worker.start()
+            self.worker_thread = self.worker_threads[0]
+            logger.info(
+                f"AsyncTaskManager started with {self.num_workers} worker threads"
             )
-            self.worker_thread.start()
-            logger.info("AsyncTaskManager started")
 
-    def stop(self):
-        """Stop the worker thread and wait for it to finish."""
+    def stop(self, wait: bool = True, timeout: Optional[float] = None):
+        """Stop the workers and cancel tasks that have not started yet.
+
+        Workers finish the task they are running and exit immediately after,
+        without polling.
+
+        Args:
+            wait: Wait for the worker threads to exit.
+            timeout: Maximum seconds to wait for each worker.
+        """
         if self.is_running:
             self.is_running = False
-            if self.worker_thread:
-                self.worker_thread.join()
-                self.worker_thread = None
+            for _ in self.worker_threads:
+                self.task_queue.put((_STOP_PRIORITY, next(self._sequence), None))
+            if wait:
+                for worker in self.worker_threads:
+                    if worker is not threading.current_thread():
+                        worker.join(timeout)
+            self.worker_threads = []
+            self.worker_thread = None
+            self._cancel_pending()
+            with self._lock:
+                process_pool, self._process_pool = self._process_pool, None
+            if process_pool is not None:
+                process_pool.shutdown(wait=wait, cancel_futures=True)
             logger.info("AsyncTaskManager stopped")
 
     def submit_task(
-        self, task: Callable[[], Any], callback: Optional[Callable[[Any], None]] = None
-    ):
+        self,
+        task: Callable[[], Any],
+        callback: Optional[Callable[[Any], None]] = None,
+        priority: Union[str, int] = "background",
+        name: Optional[str] = None,
+        task_type: Optional[str] = None,
+        deadline: Optional[float] = None,
+        executor: str = EXECUTOR_THREAD,
+    ) -> Future:
         """Submit a task to be executed asynchronously.
 
         Args:
-            task: The task function to execute.
+            task: The task function to execute. Tasks run in the process pool
+                must be picklable, e.g. module-level functions or partials.
             callback: Optional callback function to call with the result after task completion.
+            priority: ``"interactive"``, ``"background"`` or an integer where
+                lower values run first.
+            name: Name used in the metrics; defaults to the function name.
+            task_type: Type used for the per-type concurrency limits.
+            deadline: Seconds from now after which the task is abandoned with
+                ``TaskDeadlineExceeded``. Queued tasks are never started after
+                their deadline; a running process task stops being waited for,
+                but a running thread task cannot be interrupted.
+            executor: ``"thread"`` or ``"process"``.
+
+        Returns:
+            Future: Future resolving to the task result; ``cancel()`` works
+                until the task starts.
         """
-        self.task_queue.put((task, callback))
+        if isinstance(priority, str):
+            if priority not in PRIORITY_LANES:
+                raise ValueError(f"Unknown priority lane: {priority}")
+            priority = PRIORITY_LANES[priority]
+        if executor not in (EXECUTOR_THREAD, EXECUTOR_PROCESS):
+            raise ValueError(f"Unknown executor: {executor}")
+
+        item = _TaskItem(
+            task,
+            callback,
+            priority,
+            name or getattr(task, "__qualname__", None) or repr(task),
+            task_type,
+            time.monotonic() + deadline if deadline is not None else None,
+            executor,
+        )
+        self._enqueue(item)
         logger.debug(
             f"Task submitted to queue, current queue size: {self.task_queue.qsize()}"
         )
+        return item.future
+
+    def _enqueue(self, item: _TaskItem) -> None:
+        self.task_queue.put((item.priority, next(self._sequence), item))
 
     def _process_tasks(self):
-        """Process tasks from the queue in a separate thread."""
-        while self.is_running:
+        """Process tasks from the queue in a worker thread."""
+        while True:
+            _, _, item = self.task_queue.get()
             try:
-                # Get a task from the queue with a timeout to check if still running
-                task, callback = self.task_queue.get(timeout=1.0)
-                logger.debug("Processing task from queue")
+                if item is None:
+                    return
+                if not self._acquire_type_slot(item):
+                    continue
                 try:
-                    result = task()
-                    if callback:
-                        callback(result)
-                    logger.debug("Task completed successfully")
-                except Exception as e:
-                    logger.error(f"Error executing task: {str(e)}", exc_info=True)
+                    self._run(item)
                 finally:
-                    self.task_queue.task_done()
-            except queue.Empty:
-                continue  # Queue is empty, check if still running
+                    self._release_type_slot(item)
             except Exception as e:
                 logger.error(
                     f"Unexpected error in task processing: {str(e)}", exc_info=True
                 )
-                time.sleep(1)  # Prevent tight CPU loop in case of repeated errors
+            finally:
+                self.task_queue.task_done()
+
+    def _acquire_type_slot(self, item: _TaskItem) -> bool:
+        """Reserve a slot for the task's type, deferring it when the type is at its limit."""
+        limit = self.concurrency_limits.get(item.task_type)
+        if limit is None:
+            return True
+        with self._lock:
+            running = self._running_by_type.get(item.task_type, 0)
+            if running >= limit:
+                self._deferred.setdefault(item.task_type, deque()).append(item)
+                return False
+            self._running_by_type[item.task_type] = running + 1
+            return True
+
+    def _release_type_slot(self, item: _TaskItem) -> None:
+        """Free the task's type slot and requeue the next deferred task of that type."""
+        if item.task_type not in self.concurrency_limits:
+            return
+        with self._lock:
+            self._running_by_type[item.task_type] -= 1
+            deferred = self._deferred.get(item.task_type)
+            next_item = deferred.popleft() if deferred else None
+        if next_item is not None:
+            self._enqueue(next_item)
+
+    def _run(self, item: _TaskItem) -> None:
+        """Run one task and resolve its future."""
+        if not item.future.set_running_or_notify_cancel():
+            self._count(item.name, "cancelled")
+            return
+
+        started_at = time.monotonic()
+        self._metrics.record(
+            f"{item.name}.queue_latency", started_at - item.submitted_at
+        )
+        if item.deadline is not None and started_at >= item.deadline:
+            self._count(item.name, "expired")
+            item.future.set_exception(
+                TaskDeadlineExceeded(f"Task {item.name} expired before it started")
+            )
+            return
+
+        logger.debug(f"Processing task {item.name}")
+        try:
+            result = (
+                self._run_in_process(item)
+                if item.executor == EXECUTOR_PROCESS
+                else item.task()
+            )
+        except Exception as e:
+            self._metrics.record(f"{item.name}.run_time", time.monotonic() - started_at)
+            if isinstance(e, TaskDeadlineExceeded):
+                self._count(item.name, "expired")
+            else:
+                self._count(item.name, "failed")
+                logger.error(f"Error executing task: {str(e)}", exc_info=True)
+            item.future.set_exception(e)
+            return
+
+        self._metrics.record(f"{item.name}.run_time", time.monotonic() - started_at)
+        self._count(item.name, "completed")
+        item.future.set_result(result)
+        if item.callback:
+            try:
+                item.callback(result)
+            except Exception as e:
+                logger.error(f"Error in task callback: {str(e)}", exc_info=True)
+        logger.debug("Task completed successfully")
+
+    def _run_in_process(self, item: _TaskItem) -> Any:
+        """Run a task in the process pool, honouring its deadline."""
+        with self._lock:
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.process_workers
+                )
+            process_pool = self._process_pool
+        process_future = process_pool.submit(item.task)
+        timeout = (
+            max(item.deadline - time.monotonic(), 0)
+            if item.deadline is not None
+            else None
+        )
+        try:
+            return process_future.result(timeout=timeout)
+        except FutureTimeoutError:
+            process_future.cancel()
+            raise TaskDeadlineExceeded(
+                f"Task {item.name} exceeded its deadline"
+            ) from None
+
+    def _cancel_pending(self) -> None:
+        """Cancel every queued or deferred task."""
+        pending: List[_TaskItem] = []
+        sentinels = []
+        while True:
+            try:
+                entry = self.task_queue.get_nowait()
+            except queue.Empty:
+                break
+            self.task_queue.task_done()
+            if entry[2] is None:
+                sentinels.append(entry)
+            else:
+                pending.append(entry[2])
+        # Workers that are still running a task must still find their sentinel
+        for entry in sentinels:
+            self.task_queue.put(entry)
+        with self._lock:
+            for deferred in self._deferred.values():
+                pending.extend(deferred)
+                deferred.clear()
+        for item in pending:
+            if item.future.cancel():
+                self._count(item.name, "cancelled")
+
+    def _count(self, name: str, outcome: str) -> None:
+        with self._lock:
+            counters = self._counters.setdefault(
+                name, {"completed": 0, "failed": 0, "cancelled": 0, "expired": 0}
+            )
+            counters[outcome] += 1
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Get queue latency, run time and outcome counts per task name.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: For each task name, ``queue_latency`` and
+                ``run_time`` summaries (count, mean, min, max, p50, p95, p99 in
+                seconds) plus completed/failed/cancelled/expired counts.
+        """
+        with self._lock:
+            counters = {name: dict(values) for name, values in self._counters.items()}
+        return {
+            name: {
+                "queue_latency": self._metrics.summary(f"{name}.queue_latency"),
+                "run_time": self._metrics.summary(f"{name}.run_time"),
+                **values,
+            }
+            for name, values in counters.items()
+        }
 
     def get_queue_size(self) -> int:
         """Get the current number of tasks in the queue.
@@ -81,4 +381,6 @@ class AsyncTaskManager:
         Returns:
             int: Number of tasks waiting to be processed.
         """
-        return self.task_queue.qsize()
+        with self._lock:
+            deferred = sum(len(items) for items in self._deferred.values())
+        return self.task_queue.qsize() + deferred
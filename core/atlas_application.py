@@ -6,9 +6,7 @@ module and plugin management, and application lifecycle.
 """
 
 import sys
-from typing import Any, Dict, Optional
-
-from PySide6.QtWidgets import QApplication
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
 from core.alerting import initialize_alerting, raise_alert
 from core.config import ConfigManager, get_config
@@ -32,13 +30,14 @@ except ImportError:
         return True
 
 
-from core.ai_integration import get_ai_model_manager
-from core.async_task_manager import AsyncTaskManager
-from core.feature_flags import get_feature_flag_manager
-from core.network_client import NetworkClient
-from core.self_healing import SelfHealingManager, initialize_self_healing
-from core.workflow_manager import WorkflowManager
-from security.rbac import get_rbac_manager
+# Qt and the subsystems below are imported by ``initialize``, so that importing
+# this module and constructing the application stay cheap
+if TYPE_CHECKING:
+    from PySide6.QtWidgets import QApplication
+
+    from core.async_task_manager import AsyncTaskManager
+    from core.self_healing import SelfHealingManager
+    from core.workflow_manager import WorkflowManager
 
 logger = get_logger("AtlasApplication")
 
@@ -71,7 +70,7 @@ class AtlasApplication:
         initialize_security()
 
         # Initialize core components
-        self.app: Optional[QApplication] = None
+        self.app: Optional["QApplication"] = None
         self.config_manager = ConfigManager()
         self.event_bus = EventBus()
         self.module_registry = ModuleRegistry()
@@ -81,9 +80,9 @@ class AtlasApplication:
         self.rbac_manager = None
         self.feature_flags = None
         self.ai_manager = None
-        self.self_healing_manager: Optional[SelfHealingManager] = None
-        self.workflow_manager: Optional[WorkflowManager] = None
-        self.async_task_manager: Optional[AsyncTaskManager] = None
+        self.self_healing_manager: Optional["SelfHealingManager"] = None
+        self.workflow_manager: Optional["WorkflowManager"] = None
+        self.async_task_manager: Optional["AsyncTaskManager"] = None
 
         # Check environment security
         if not check_environment_security():
@@ -162,6 +161,8 @@ class AtlasApplication:
 
         try:
             # Initialize network client
+            from core.network_client import NetworkClient
+
             network_config = self.config.get("network", {})
             self.network_client = NetworkClient(
                 {
@@ -181,6 +182,8 @@ class AtlasApplication:
 
         try:
             # Initialize RBAC manager
+            from security.rbac import get_rbac_manager
+
             self.rbac_manager = get_rbac_manager()
             logger.info("RBAC manager initialized successfully")
         except Exception as e:
@@ -193,6 +196,8 @@ class AtlasApplication:
 
         try:
             # Initialize feature flags
+            from core.feature_flags import get_feature_flag_manager
+
             self.feature_flags = get_feature_flag_manager()
             logger.info("Feature flags initialized successfully")
         except Exception as e:
@@ -205,6 +210,8 @@ class AtlasApplication:
 
         try:
             # Initialize AI model manager
+            from core.ai_integration import get_ai_model_manager
+
             self.ai_manager = get_ai_model_manager()
             logger.info("AI model manager initialized successfully")
         except Exception as e:
@@ -217,6 +224,8 @@ class AtlasApplication:
 
         try:
             # Initialize self-healing system
+            from core.self_healing import initialize_self_healing
+
             self.self_healing_manager = initialize_self_healing(
                 {"plugin_registry": self.plugin_registry}
             )
@@ -229,6 +238,8 @@ class AtlasApplication:
 
         try:
             # Initialize workflow manager
+            from core.workflow_manager import WorkflowManager
+
             self.workflow_manager = WorkflowManager()
             logger.info("Workflow manager initialized")
         except Exception as e:
@@ -239,7 +250,11 @@ class AtlasApplication:
 
         try:
             # Initialize async task manager for UI responsiveness
-            self.async_task_manager = AsyncTaskManager()
+            from core.async_task_manager import AsyncTaskManager
+
+            self.async_task_manager = AsyncTaskManager(
+                **self.config.get("async_tasks", {})
+            )
             self.async_task_manager.start()
             logger.info("Async task manager initialized and started")
         except Exception as e:
@@ -314,6 +329,8 @@ class AtlasApplication:
 
         # Initialize UI application
         if not self.app:
+            from PySide6.QtWidgets import QApplication
+
             self.app = QApplication(sys.argv)
             logger.info("QApplication initialized successfully")
 
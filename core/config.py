@@ -9,6 +9,8 @@ import logging
 import os
 from typing import Any, Dict, Optional
 
+from core.lazy_loader import is_lazy_startup
+
 # Logger for configuration operations
 logger = logging.getLogger("Config")
 
@@ -54,6 +56,19 @@ class Config:
                 "level": os.getenv("ATLAS_LOG_LEVEL", "INFO"),
                 "file": os.getenv("ATLAS_LOG_FILE", "atlas.log"),
             },
+            "startup": {
+                "lazy_imports": is_lazy_startup(),
+            },
+            "events": {
+                "dispatch_mode": os.getenv("ATLAS_EVENT_DISPATCH", "sync"),
+                "num_workers": int(os.getenv("ATLAS_EVENT_WORKERS", "4")),
+                "max_queue_size": int(os.getenv("ATLAS_EVENT_QUEUE_SIZE", "1000")),
+                "backpressure": os.getenv("ATLAS_EVENT_BACKPRESSURE", "block"),
+            },
+            "async_tasks": {
+                "num_workers": int(os.getenv("ATLAS_TASK_WORKERS", "4")),
+                "concurrency_limits": {"ui": 1},
+            },
         }
 
         self._loaded = True
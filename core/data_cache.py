@@ -1,12 +1,16 @@
 """
 Data Cache Module for Atlas.
 This module integrates caching to store frequently accessed data, reducing database load and improving response times.
+
+Hot keys are served from an in-process LRU cache in front of Redis; without Redis the
+cache runs purely in memory. Every user key is tagged ``user:{user_id}`` so all of a
+user's entries can be invalidated in one call.
 """
 
 import asyncio
 import os
 import sys
-from typing import Optional
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Union
 
 # Ensure utils path is correctly referenced
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
@@ -24,6 +28,9 @@ class DataCache:
         host: str = "localhost",
         port: int = 6379,
         db: int = 0,
+        backend: str = "auto",
+        l1_max_size: int = 1024,
+        l1_ttl: Optional[float] = 30.0,
     ):
         """
         Initialize the DataCache with a CacheManager instance.
@@ -33,20 +40,32 @@ class DataCache:
             host (str): Redis server host.
             port (int): Redis server port.
             db (int): Redis database number.
+            backend (str): ``"auto"``, ``"redis"`` or ``"memory"``; see CacheManager.
+            l1_max_size (int): Maximum number of entries in the in-process cache.
+            l1_ttl (float, optional): Maximum age of in-process copies of Redis values.
         """
         self.cache_ttl = cache_ttl
-        self.cache_manager = CacheManager(host=host, port=port, db=db)
+        self.cache_manager = CacheManager(
+            host=host,
+            port=port,
+            db=db,
+            backend=backend,
+            l1_max_size=l1_max_size,
+            l1_ttl=l1_ttl,
+        )
         self.initialized = False
 
     async def initialize(self) -> None:
         """
-        Initialize the cache by connecting to Redis.
+        Initialize the cache by connecting to Redis, falling back to memory.
         """
         if not self.initialized:
             await self.cache_manager.connect()
-            self.initialized = self.cache_manager.connected
-            if not self.initialized:
-                print("DataCache initialization failed: Could not connect to Redis.")
+            self.initialized = True
+            if not self.cache_manager.connected:
+                print(
+                    "DataCache initialized with in-memory backend (Redis unavailable)."
+                )
             else:
                 print("DataCache initialized successfully.")
 
@@ -100,7 +119,83 @@ class DataCache:
             return False
 
         key = f"user:{user_id}:data"
-        return await self.cache_manager.set(key, data, ttl or self.cache_ttl)
+        return await self.cache_manager.set(
+            key, data, ttl or self.cache_ttl, tags=[self._user_tag(user_id)]
+        )
+
+    async def get_users_data(
+        self, user_ids: Iterable[str]
+    ) -> Dict[str, Optional[dict]]:
+        """
+        Retrieve data for several users with one batched cache lookup.
+
+        Args:
+            user_ids (Iterable[str]): Unique identifiers of the users.
+
+        Returns:
+            Dict[str, Optional[dict]]: Cached data per user id, None when not cached.
+        """
+        user_ids = list(user_ids)
+        if not self.initialized:
+            await self.initialize()
+
+        keys = {f"user:{user_id}:data": user_id for user_id in user_ids}
+        values = await self.cache_manager.mget(keys)
+        return {keys[key]: value for key, value in values.items()}
+
+    async def set_users_data(
+        self, users: Dict[str, dict], ttl: Optional[int] = None
+    ) -> bool:
+        """
+        Cache data for several users with one pipelined write.
+
+        Args:
+            users (Dict[str, dict]): User data by user id.
+            ttl (int, optional): Time to live in seconds. Defaults to class TTL.
+
+        Returns:
+            bool: True if caching was successful, False otherwise.
+        """
+        if not self.initialized:
+            await self.initialize()
+
+        mapping = {f"user:{user_id}:data": data for user_id, data in users.items()}
+        tags = {f"user:{user_id}:data": [self._user_tag(user_id)] for user_id in users}
+        return await self.cache_manager.mset(mapping, ttl or self.cache_ttl, tags=tags)
+
+    async def get_or_load_user_data(
+        self,
+        user_id: str,
+        loader: Callable[[], Union[dict, Awaitable[dict]]],
+        ttl: Optional[int] = None,
+    ) -> Optional[dict]:
+        """
+        Retrieve user data, loading it once on a miss even under concurrent requests.
+
+        Args:
+            user_id (str): Unique identifier for the user.
+            loader (Callable): Sync or async function returning the user data.
+            ttl (int, optional): Time to live in seconds. Defaults to class TTL.
+
+        Returns:
+            Optional[dict]: Cached or freshly loaded user data.
+        """
+        if not self.initialized:
+            await self.initialize()
+
+        key = f"user:{user_id}:data"
+        return await self.cache_manager.get_or_load(
+            key, loader, ttl or self.cache_ttl, tags=[self._user_tag(user_id)]
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache hit/miss and latency statistics.
+
+        Returns:
+            Dict[str, Any]: Statistics reported by the underlying CacheManager.
+        """
+        return self.cache_manager.get_stats()
 
     async def get_task_list(self, user_id: str, list_id: str) -> Optional[list]:
         """
@@ -145,7 +240,9 @@ class DataCache:
             return False
 
         key = f"user:{user_id}:tasks:{list_id}"
-        return await self.cache_manager.set(key, tasks, ttl or self.cache_ttl)
+        return await self.cache_manager.set(
+            key, tasks, ttl or self.cache_ttl, tags=[self._user_tag(user_id)]
+        )
 
     async def invalidate_user_cache(self, user_id: str) -> bool:
         """
@@ -162,19 +259,32 @@ class DataCache:
         if not self.initialized:
             return False
 
-        # This is a simplified approach. In a real scenario, you'd use Redis SCAN or KEYS
-        # to delete all keys matching a pattern. For now, we'll delete known key patterns.
-        keys_to_delete = [f"user:{user_id}:data", f"user:{user_id}:tasks:*"]
-        success = True
-        for key in keys_to_delete:
-            if "*" in key:
-                # Would need a more complex pattern matching in real Redis setup
-                continue
-            if not await self.cache_manager.delete(key):
-                success = False
+        # Every user key is tagged on write, so the tag index covers the task
+        # lists as well; the data key is deleted explicitly for entries cached
+        # before tagging was introduced.
+        await self.cache_manager.invalidate_tag(self._user_tag(user_id))
+        success = await self.cache_manager.delete(f"user:{user_id}:data")
         print(f"Cache invalidated for user: {user_id}")
         return success
 
+    async def invalidate_tag(self, tag: str) -> int:
+        """
+        Invalidate every cached entry stored with a tag.
+
+        Args:
+            tag (str): Tag to invalidate, e.g. ``user:123``.
+
+        Returns:
+            int: Number of entries removed.
+        """
+        if not self.initialized:
+            await self.initialize()
+        return await self.cache_manager.invalidate_tag(tag)
+
+    @staticmethod
+    def _user_tag(user_id: str) -> str:
+        return f"user:{user_id}"
+
 
 # Example usage
 if __name__ == "__main__":
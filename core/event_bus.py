@@ -3,9 +3,162 @@ Event Bus system for Atlas application.
 
 This module provides a centralized event handling system that allows different
 components of the application to communicate through a publish-subscribe pattern.
+
+Topics are hierarchical: segments are separated by ``.`` or ``:`` and a
+subscription may use ``*`` to match exactly one segment or ``#`` to match
+zero or more segments (``module.*.error``, ``workflow.#``). Wildcard patterns
+live in a trie and the resolved listener list of every published topic is
+cached, so publishing costs the same no matter how many topics exist.
+
+By default events are dispatched synchronously in the publisher's thread. An
+opt-in asynchronous mode hands events to a pool of worker threads through
+bounded per-topic queues, so a slow listener no longer stalls the publisher.
 """
 
-from typing import Any, Callable, Dict, List
+import itertools
+import logging
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+DISPATCH_SYNC = "sync"
+DISPATCH_ASYNC = "async"
+
+BACKPRESSURE_BLOCK = "block"
+BACKPRESSURE_DROP_OLDEST = "drop_oldest"
+BACKPRESSURE_COALESCE = "coalesce"
+
+_DISPATCH_MODES = (DISPATCH_SYNC, DISPATCH_ASYNC)
+_BACKPRESSURE_POLICIES = (
+    BACKPRESSURE_BLOCK,
+    BACKPRESSURE_DROP_OLDEST,
+    BACKPRESSURE_COALESCE,
+)
+
+WILDCARD_ONE = "*"
+WILDCARD_MANY = "#"
+
+_SEGMENT_SEPARATOR = re.compile(r"[.:]")
+_MAX_RESOLVED_TOPICS = 4096
+
+
+def _listener_name(callback: Callable[..., Any]) -> str:
+    """Return a stable, human readable name for a listener callback."""
+    name = getattr(callback, "__qualname__", None) or getattr(
+        callback, "__name__", None
+    )
+    if name is None:
+        return repr(callback)
+    module = getattr(callback, "__module__", None)
+    return f"{module}.{name}" if module else name
+
+
+def split_topic(topic: str) -> List[str]:
+    """Split a topic or pattern into its hierarchical segments."""
+    return _SEGMENT_SEPARATOR.split(topic)
+
+
+def is_pattern(topic: str) -> bool:
+    """Return True if the topic contains a ``*`` or ``#`` wildcard segment."""
+    if WILDCARD_ONE not in topic and WILDCARD_MANY not in topic:
+        return False
+    return any(
+        segment in (WILDCARD_ONE, WILDCARD_MANY) for segment in split_topic(topic)
+    )
+
+
+class _TrieNode:
+    """A single segment node of the wildcard pattern trie."""
+
+    __slots__ = ("children", "patterns")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.patterns: Set[str] = set()
+
+
+class TopicMatcher:
+    """
+    Trie of wildcard topic patterns.
+
+    Every pattern is inserted segment by segment; ``*`` and ``#`` are stored
+    as ordinary child keys. Matching a topic walks the trie once, so the cost
+    depends on the depth of the topic and the number of wildcard branches on
+    its path, not on the total number of patterns.
+
+    Example:
+        ```python
+        matcher = TopicMatcher()
+        matcher.add("module.*.error")
+        matcher.add("workflow.#")
+        matcher.match("module.db.error")  # {"module.*.error"}
+        matcher.match("workflow")  # {"workflow.#"}
+        ```
+    """
+
+    def __init__(self) -> None:
+        self._root = _TrieNode()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, pattern: str) -> None:
+        """Insert a pattern into the trie."""
+        node = self._root
+        for segment in split_topic(pattern):
+            node = node.children.setdefault(segment, _TrieNode())
+        if pattern not in node.patterns:
+            node.patterns.add(pattern)
+            self._size += 1
+
+    def remove(self, pattern: str) -> None:
+        """Remove a pattern from the trie, pruning empty branches."""
+        path = [self._root]
+        segments = split_topic(pattern)
+        for segment in segments:
+            child = path[-1].children.get(segment)
+            if child is None:
+                return
+            path.append(child)
+        if pattern not in path[-1].patterns:
+            return
+        path[-1].patterns.discard(pattern)
+        self._size -= 1
+        for depth in range(len(segments), 0, -1):
+            node = path[depth]
+            if node.patterns or node.children:
+                break
+            del path[depth - 1].children[segments[depth - 1]]
+
+    def match(self, topic: str) -> Set[str]:
+        """Return every stored pattern that matches the given topic."""
+        matched: Set[str] = set()
+        if self._size:
+            self._match(self._root, split_topic(topic), 0, matched)
+        return matched
+
+    def _match(
+        self, node: _TrieNode, segments: List[str], index: int, matched: Set[str]
+    ) -> None:
+        many = node.children.get(WILDCARD_MANY)
+        if many is not None:
+            # "#" absorbs zero or more of the remaining segments
+            for rest in range(index, len(segments) + 1):
+                self._match(many, segments, rest, matched)
+        if index == len(segments):
+            matched.update(node.patterns)
+            return
+        exact = node.children.get(segments[index])
+        if exact is not None:
+            self._match(exact, segments, index + 1, matched)
+        one = node.children.get(WILDCARD_ONE)
+        if one is not None:
+            self._match(one, segments, index + 1, matched)
 
 
 class EventBus:
@@ -30,17 +183,96 @@ class EventBus:
         # Publish an event
         event_bus.publish("user_login", user_id="123")
         ```
+
+    Asynchronous dispatch:
+        ```python
+        event_bus = EventBus(
+            dispatch_mode="async", num_workers=4, backpressure="drop_oldest"
+        )
+        event_bus.subscribe("ui_refresh_requested", refresh, priority=10)
+        event_bus.publish("ui_refresh_requested", component="chat")  # returns at once
+        event_bus.flush(timeout=1.0)
+        ```
+
+        In async mode events of one topic are delivered in publish order by
+        one worker at a time, while different topics are processed in
+        parallel. Listener exceptions are logged instead of being raised to
+        the publisher.
     """
 
-    def __init__(self) -> None:
-        """Initialize the event bus with an empty listeners dictionary."""
+    def __init__(
+        self,
+        dispatch_mode: str = DISPATCH_SYNC,
+        num_workers: int = 4,
+        max_queue_size: int = 1000,
+        backpressure: str = BACKPRESSURE_BLOCK,
+        propagate_errors: bool = True,
+    ) -> None:
+        """
+        Initialize the event bus.
+
+        Args:
+            dispatch_mode (str): ``"sync"`` (default) calls listeners in the
+                publisher's thread; ``"async"`` queues events for worker threads.
+            num_workers (int): Number of worker threads used in async mode.
+            max_queue_size (int): Maximum number of pending events per topic
+                in async mode.
+            backpressure (str): What ``publish`` does when a topic queue is
+                full in async mode: ``"block"`` waits for free space,
+                ``"drop_oldest"`` discards the oldest pending event and
+                ``"coalesce"`` replaces all pending events with the new one.
+            propagate_errors (bool): In sync mode, re-raise listener
+                exceptions to the publisher (default) or log them and keep
+                calling the remaining listeners.
+
+        Raises:
+            ValueError: If an option has an unsupported value.
+        """
+        if dispatch_mode not in _DISPATCH_MODES:
+            raise ValueError(f"Unsupported dispatch mode: {dispatch_mode}")
+        if backpressure not in _BACKPRESSURE_POLICIES:
+            raise ValueError(f"Unsupported backpressure policy: {backpressure}")
+        if num_workers < 1:
+            raise ValueError("num_workers must be at least 1")
+        if max_queue_size < 1:
+            raise ValueError("max_queue_size must be at least 1")
+
         self._listeners: Dict[str, List[Callable[..., Any]]] = {}
+        # Per subscription (priority, sequence) sort keys; also serves as the
+        # O(1) membership index for duplicate detection.
+        self._priorities: Dict[str, Dict[Callable[..., Any], Tuple[int, int]]] = {}
+        self._sequence = itertools.count()
+        self._matcher = TopicMatcher()
+        self._resolved: Dict[str, Tuple[Callable[..., Any], ...]] = {}
+        self._lock = threading.RLock()
+        self.propagate_errors = propagate_errors
+
+        self.dispatch_mode = dispatch_mode
+        self.num_workers = num_workers
+        self.max_queue_size = max_queue_size
+        self.backpressure = backpressure
+
+        # Async dispatch state, guarded by ``_condition``
+        self._condition = threading.Condition()
+        self._topic_queues: Dict[str, Deque[Tuple[tuple, dict, float]]] = {}
+        self._ready_topics: Deque[str] = deque()
+        self._scheduled_topics: Set[str] = set()
+        self._in_flight = 0
+        self._workers: List[threading.Thread] = []
+        self._running = False
+        self._topic_stats: Dict[str, Dict[str, Any]] = {}
+        self._listener_stats: Dict[str, Dict[str, Any]] = {}
+
+        if self.dispatch_mode == DISPATCH_ASYNC:
+            self._start_workers()
 
     def __iter__(self):
         """Allow iteration over event types in the listeners dictionary."""
-        return iter(self._listeners.keys())
+        return iter(list(self._listeners.keys()))
 
-    def subscribe(self, event_type: str, callback: Callable[..., Any]) -> None:
+    def subscribe(
+        self, event_type: str, callback: Callable[..., Any], priority: int = 0
+    ) -> None:
         """
         Subscribe a callback function to a specific event type.
 
@@ -48,6 +280,13 @@ class EventBus:
             event_type (str): The type of event to subscribe to.
             callback (Callable): The function to call when the event is published.
                 The callback can accept any number of positional and keyword arguments.
+            priority (int): Listeners with a higher priority are called first.
+                Listeners with equal priority keep their subscription order.
+
+        Note:
+            ``event_type`` may be a wildcard pattern: ``*`` matches exactly
+            one segment and ``#`` matches zero or more segments, where
+            segments are separated by ``.`` or ``:``.
 
         Raises:
             ValueError: If event_type is empty or None.
@@ -59,6 +298,7 @@ class EventBus:
                 print(f"File saved: {filename}")
 
             event_bus.subscribe("file_saved", handle_save)
+            event_bus.subscribe("module.*.error", handle_module_error)
             ```
         """
         if not event_type:
@@ -72,10 +312,22 @@ class EventBus:
         if not callable(callback):
             raise TypeError("Callback must be callable")
 
-        if event_type not in self._listeners:
-            self._listeners[event_type] = []
-        if callback not in self._listeners[event_type]:
-            self._listeners[event_type].append(callback)
+        with self._lock:
+            if event_type not in self._listeners:
+                self._listeners[event_type] = []
+                self._priorities[event_type] = {}
+                if is_pattern(event_type):
+                    self._matcher.add(event_type)
+            priorities = self._priorities[event_type]
+            if callback in priorities:
+                return
+            priorities[callback] = (-priority, next(self._sequence))
+            # Copy-on-write so that threads iterating over the previous list
+            # are never affected by concurrent subscriptions.
+            listeners = [*self._listeners[event_type], callback]
+            listeners.sort(key=priorities.__getitem__)
+            self._listeners[event_type] = listeners
+            self._resolved = {}
 
     def unsubscribe(self, event_type: str, callback: Callable[..., Any]) -> None:
         """
@@ -105,10 +357,23 @@ class EventBus:
         if not isinstance(event_type, str):
             raise TypeError("Event type must be a string")
 
-        if event_type in self._listeners and callback in self._listeners[event_type]:
-            self._listeners[event_type].remove(callback)
-            if not self._listeners[event_type]:
-                del self._listeners[event_type]
+        with self._lock:
+            priorities = self._priorities.get(event_type)
+            if event_type not in self._listeners or not priorities:
+                return
+            if callback not in priorities:
+                return
+            del priorities[callback]
+            listeners = [
+                listener
+                for listener in self._listeners[event_type]
+                if listener is not callback
+            ]
+            if listeners:
+                self._listeners[event_type] = listeners
+            else:
+                self._drop_event_type(event_type)
+            self._resolved = {}
 
     def publish(self, event_type: str, *args: Any, **kwargs: Any) -> None:
         """
@@ -125,8 +390,11 @@ class EventBus:
 
         Note:
             If no callbacks are subscribed to the event type, this method
-            does nothing. All subscribed callbacks are called synchronously
-            in the order they were subscribed.
+            does nothing. In sync mode all subscribed callbacks are called
+            synchronously in priority order, then in the order they were
+            subscribed. Listeners of every matching wildcard pattern are
+            merged into the same order. In async mode the event is queued
+            and this method returns without waiting for the listeners.
 
         Example:
             ```python
@@ -144,14 +412,31 @@ class EventBus:
         if not isinstance(event_type, str):
             raise TypeError("Event type must be a string")
 
-        if event_type in self._listeners:
-            for callback in self._listeners[event_type]:
+        if self.dispatch_mode == DISPATCH_ASYNC:
+            self._enqueue(event_type, args, kwargs)
+            return
+
+        listeners = self._resolved.get(event_type)
+        if listeners is None:
+            listeners = self._resolve(event_type)
+        if self.propagate_errors:
+            for callback in listeners:
                 callback(*args, **kwargs)
+            return
+        for callback in listeners:
+            try:
+                callback(*args, **kwargs)
+            except Exception as e:
+                logger.error(f"Error in callback for event {event_type}: {e}")
 
     def get_listeners(self, event_type: str) -> List[Callable[..., Any]]:
         """
         Get all callback functions subscribed to a specific event type.
 
+        For a wildcard pattern this returns the listeners subscribed to that
+        exact pattern; use ``get_matching_listeners`` to see every listener a
+        published topic would reach.
+
         Args:
             event_type (str): The type of event to get listeners for.
 
@@ -167,6 +452,19 @@ class EventBus:
         """
         return self._listeners.get(event_type, [])
 
+    def get_matching_listeners(self, event_type: str) -> List[Callable[..., Any]]:
+        """
+        Get every callback that a publish of ``event_type`` would call.
+
+        Args:
+            event_type (str): A concrete topic.
+
+        Returns:
+            List[Callable]: Listeners of the exact topic and of all matching
+                wildcard patterns, in call order.
+        """
+        return list(self._resolve(event_type))
+
     def clear_listeners(self, event_type: str) -> None:
         """
         Remove all callback functions subscribed to a specific event type.
@@ -179,8 +477,11 @@ class EventBus:
             event_bus.clear_listeners("user_login")
             ```
         """
-        if event_type in self._listeners:
-            self._listeners[event_type].clear()
+        with self._lock:
+            if event_type in self._listeners:
+                self._listeners[event_type] = []
+                self._priorities[event_type] = {}
+            self._resolved = {}
 
     def clear_all_listeners(self) -> None:
         """
@@ -195,4 +496,224 @@ class EventBus:
             event_bus.clear_all_listeners()
             ```
         """
-        self._listeners.clear()
+        with self._lock:
+            self._listeners.clear()
+            self._priorities.clear()
+            self._matcher = TopicMatcher()
+            self._resolved = {}
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued event has been delivered.
+
+        In sync mode there is never anything pending and this returns at once.
+
+        Args:
+            timeout (Optional[float]): Maximum number of seconds to wait.
+                ``None`` waits indefinitely.
+
+        Returns:
+            bool: True if all queues drained, False if the timeout expired.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._ready_topics or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def shutdown(self, wait: bool = True, timeout: Optional[float] = None) -> None:
+        """
+        Stop the async worker threads.
+
+        Args:
+            wait (bool): Deliver the already queued events before stopping.
+            timeout (Optional[float]): Maximum number of seconds to wait for
+                the queues to drain when ``wait`` is True.
+        """
+        if not self._running:
+            return
+        # A listener shutting the bus down cannot wait for its own delivery
+        if wait and threading.current_thread() not in self._workers:
+            self.flush(timeout)
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        for worker in self._workers:
+            if worker is not threading.current_thread():
+                worker.join(timeout)
+        self._workers = []
+
+    def get_stats(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Get async dispatch counters.
+
+        Returns:
+            Dict: ``{"topics": {...}, "listeners": {...}}`` where each topic
+            entry holds the current and peak queue depth, published, dropped
+            and coalesced counts and the total/max queue wait in seconds, and
+            each listener entry holds the call
+            count, error count, total/average/max latency in seconds.
+        """
+        with self._condition:
+            topics = {}
+            for topic, stats in self._topic_stats.items():
+                topics[topic] = dict(stats)
+                topics[topic]["queue_depth"] = len(self._topic_queues.get(topic, ()))
+            listeners = {}
+            for name, stats in self._listener_stats.items():
+                listeners[name] = dict(stats)
+                listeners[name]["avg_latency"] = (
+                    stats["total_latency"] / stats["calls"] if stats["calls"] else 0.0
+                )
+        return {"topics": topics, "listeners": listeners}
+
+    def _drop_event_type(self, event_type: str) -> None:
+        """Forget an event type that has no listeners left."""
+        del self._listeners[event_type]
+        del self._priorities[event_type]
+        if is_pattern(event_type):
+            self._matcher.remove(event_type)
+
+    def _resolve(self, event_type: str) -> Tuple[Callable[..., Any], ...]:
+        """
+        Resolve and cache the ordered listeners for a concrete topic.
+
+        The cache is rebuilt lazily after every subscription change, so the
+        trie walk and the merge only happen on the first publish of a topic.
+        """
+        with self._lock:
+            resolved = self._resolved.get(event_type)
+            if resolved is not None:
+                return resolved
+
+            exact = self._listeners.get(event_type, ())
+            patterns = self._matcher.match(event_type)
+            patterns.discard(event_type)
+            if not patterns:
+                resolved = tuple(exact)
+            else:
+                keyed: Dict[Callable[..., Any], Tuple[int, int]] = {}
+                for topic in (event_type, *patterns):
+                    priorities = self._priorities.get(topic, {})
+                    for callback in self._listeners.get(topic, ()):
+                        key = priorities.get(callback, (0, 0))
+                        if callback not in keyed or key < keyed[callback]:
+                            keyed[callback] = key
+                resolved = tuple(sorted(keyed, key=keyed.__getitem__))
+
+            if len(self._resolved) >= _MAX_RESOLVED_TOPICS:
+                self._resolved = {}
+            self._resolved[event_type] = resolved
+            return resolved
+
+    def _start_workers(self) -> None:
+        """Start the async dispatch worker threads."""
+        self._running = True
+        for index in range(self.num_workers):
+            worker = threading.Thread(
+                target=self._worker_loop,
+                name=f"EventBusWorker-{index}",
+                daemon=True,
+            )
+            worker.start()
+            self._workers.append(worker)
+
+    def _enqueue(self, event_type: str, args: tuple, kwargs: dict) -> None:
+        """Queue an event for async dispatch, applying the backpressure policy."""
+        with self._condition:
+            if not self._running:
+                raise RuntimeError("EventBus has been shut down")
+
+            stats = self._topic_stats.get(event_type)
+            if stats is None:
+                stats = {
+                    "published": 0,
+                    "dropped": 0,
+                    "coalesced": 0,
+                    "max_depth": 0,
+                    "total_wait": 0.0,
+                    "max_wait": 0.0,
+                }
+                self._topic_stats[event_type] = stats
+            topic_queue = self._topic_queues.setdefault(event_type, deque())
+
+            if len(topic_queue) >= self.max_queue_size:
+                if self.backpressure == BACKPRESSURE_BLOCK:
+                    while self._running and len(topic_queue) >= self.max_queue_size:
+                        self._condition.wait()
+                elif self.backpressure == BACKPRESSURE_DROP_OLDEST:
+                    topic_queue.popleft()
+                    stats["dropped"] += 1
+                else:
+                    stats["coalesced"] += len(topic_queue)
+                    topic_queue.clear()
+
+            topic_queue.append((args, kwargs, time.monotonic()))
+            stats["published"] += 1
+            stats["max_depth"] = max(stats["max_depth"], len(topic_queue))
+
+            if event_type not in self._scheduled_topics:
+                self._scheduled_topics.add(event_type)
+                self._ready_topics.append(event_type)
+                self._condition.notify_all()
+
+    def _worker_loop(self) -> None:
+        """Deliver queued events until the bus is shut down."""
+        while True:
+            with self._condition:
+                while self._running and not self._ready_topics:
+                    self._condition.wait()
+                if not self._ready_topics:
+                    return
+                event_type = self._ready_topics.popleft()
+                args, kwargs, enqueued_at = self._topic_queues[event_type].popleft()
+                stats = self._topic_stats[event_type]
+                wait = time.monotonic() - enqueued_at
+                stats["total_wait"] += wait
+                stats["max_wait"] = max(stats["max_wait"], wait)
+                self._in_flight += 1
+                # Wake publishers blocked on a full queue
+                self._condition.notify_all()
+
+            try:
+                self._deliver(event_type, args, kwargs)
+            finally:
+                with self._condition:
+                    self._in_flight -= 1
+                    if self._topic_queues[event_type]:
+                        # Re-schedule behind other topics to keep them fair
+                        self._ready_topics.append(event_type)
+                    else:
+                        self._scheduled_topics.discard(event_type)
+                    self._condition.notify_all()
+
+    def _deliver(self, event_type: str, args: tuple, kwargs: dict) -> None:
+        """Call every listener of an event, recording latency and errors."""
+        for callback in self._resolve(event_type):
+            started = time.perf_counter()
+            failed = False
+            try:
+                callback(*args, **kwargs)
+            except Exception as e:
+                failed = True
+                logger.error(f"Error in callback for event {event_type}: {e}")
+            elapsed = time.perf_counter() - started
+
+            name = _listener_name(callback)
+            with self._condition:
+                stats = self._listener_stats.get(name)
+                if stats is None:
+                    stats = {
+                        "calls": 0,
+                        "errors": 0,
+                        "total_latency": 0.0,
+                        "max_latency": 0.0,
+                    }
+                    self._listener_stats[name] = stats
+                stats["calls"] += 1
+                stats["errors"] += int(failed)
+                stats["total_latency"] += elapsed
+                stats["max_latency"] = max(stats["max_latency"], elapsed)
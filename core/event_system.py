@@ -8,55 +8,29 @@ allowing different components to publish and subscribe to events.
 import logging
 from typing import Any, Callable, Dict, List
 
-logger = logging.getLogger(__name__)
-
+from core.event_bus import EventBus as _CoreEventBus
 
-class EventBus:
-    """Central event bus for publishing and subscribing to events."""
+logger = logging.getLogger(__name__)
 
-    def __init__(self):
-        """Initialize the event bus with an empty subscriber dictionary."""
-        self._subscribers: Dict[str, List[Callable[..., None]]] = {}
 
-    def __iter__(self):
-        """Allow iteration over event types in the subscribers dictionary."""
-        return iter(self._subscribers.keys())
+class EventBus(_CoreEventBus):
+    """
+    Central event bus for publishing and subscribing to events.
 
-    def subscribe(self, event_type: str, callback: Callable[..., None]) -> None:
-        """Subscribe a callback function to a specific event type."""
-        if not isinstance(event_type, str):
-            raise TypeError("Event type must be a string")
-        if not event_type:
-            raise ValueError("Event type cannot be empty")
-        if not callable(callback):
-            raise TypeError("Callback must be callable")
-        if event_type not in self._subscribers:
-            self._subscribers[event_type] = []
-        self._subscribers[event_type].append(callback)
-        logger.debug(f"Subscribed to event: {event_type}")
+    This is the shared ``core.event_bus.EventBus`` (including wildcard topic
+    routing and the async dispatch mode) configured to log listener errors
+    instead of propagating them to the publisher.
+    """
 
-    def unsubscribe(self, event_type: str, callback: Callable[..., None]) -> None:
-        """Unsubscribe a callback function from a specific event type."""
-        if not isinstance(event_type, str):
-            raise TypeError("Event type must be a string")
-        if (
-            event_type in self._subscribers
-            and callback in self._subscribers[event_type]
-        ):
-            self._subscribers[event_type].remove(callback)
-            logger.debug(f"Unsubscribed from event: {event_type}")
+    def __init__(self, **kwargs: Any):
+        """Initialize the event bus; accepts the ``core.event_bus`` options."""
+        kwargs.setdefault("propagate_errors", False)
+        super().__init__(**kwargs)
 
-    def publish(self, event_type: str, *args: Any, **kwargs: Any) -> None:
-        """Publish an event to all subscribed callbacks."""
-        if not isinstance(event_type, str):
-            raise TypeError("Event type must be a string")
-        if event_type in self._subscribers:
-            for callback in self._subscribers[event_type]:
-                try:
-                    callback(*args, **kwargs)
-                except Exception as e:
-                    logger.error(f"Error in callback for event {event_type}: {e}")
-        logger.debug(f"Published event: {event_type}")
+    @property
+    def _subscribers(self) -> Dict[str, List[Callable[..., Any]]]:
+        """Backward compatible alias of the listeners dictionary."""
+        return self._listeners
 
 
 # Global event bus instance
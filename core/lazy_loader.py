@@ -1,21 +1,61 @@
 """
 Lazy Loader for Atlas
 
-This module provides utilities for lazy loading to prevent circular imports.
+This module provides utilities for lazy loading, both to prevent circular imports
+and to keep application startup fast: heavy modules are only imported on first
+use. ``lazy_exports`` turns a package's public names into lazily imported ones
+(PEP 562), and the time spent in each deferred import is recorded so it can be
+reported next to the startup import profile.
 """
 
 import importlib
 import logging
+import os
+import threading
+import time
 from types import ModuleType
-from typing import Any, Generic, TypeVar, cast
+from typing import Any, Callable, Dict, Generic, List, Mapping, Tuple, TypeVar, cast
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
+# Seconds spent importing each lazily loaded module
+_load_times: Dict[str, float] = {}
+_load_lock = threading.RLock()
+
+
+def is_lazy_startup() -> bool:
+    """Return True if lazy startup was enabled with ``ATLAS_LAZY_STARTUP=1``."""
+    return os.getenv("ATLAS_LAZY_STARTUP", "false").lower() in ("1", "true", "yes")
+
+
+def get_lazy_load_stats() -> Dict[str, float]:
+    """Get the import time in seconds of every module loaded through this module."""
+    with _load_lock:
+        return dict(_load_times)
+
+
+def _import(module_name: str) -> ModuleType:
+    """Import a module and record how long the first import took."""
+    start = time.perf_counter()
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError as e:
+        logger.error(f"Failed to lazily load module {module_name}: {e}")
+        raise ImportError(f"Failed to lazily load module {module_name}: {e}") from e
+    with _load_lock:
+        _load_times.setdefault(module_name, time.perf_counter() - start)
+    logger.debug(f"Module {module_name} loaded lazily")
+    return module
+
 
 class LazyLoader(Generic[T]):
-    """A class that delays the import of a module or attribute until it is accessed."""
+    """A class that delays the import of a module or attribute until it is accessed.
+
+    After the first load every access is served from the cached module or
+    attribute without locking or logging.
+    """
 
     def __init__(self, module_name: str, attribute_name: str = "") -> None:
         """Initialize the lazy loader with the module and optional attribute to load.
@@ -28,76 +68,54 @@ class LazyLoader(Generic[T]):
         self.attribute_name = attribute_name
         self._module: ModuleType | None = None
         self._attribute: Any = None
-        logger.debug(
-            f"Initialized LazyLoader for module {module_name} with attribute {attribute_name}"
-        )
 
-    def __getattr__(self, name: str) -> T:
-        """Load the module or attribute on first access."""
-        logger.debug(f"Accessing attribute {name} on LazyLoader for {self.module_name}")
-        if name == "_attribute":
+    @property
+    def loaded(self) -> bool:
+        """Whether the module has been imported."""
+        return self._module is not None
+
+    def _load(self) -> Any:
+        """Import the module and resolve the attribute on first use."""
+        with _load_lock:
             if self._module is None:
-                try:
-                    self._module = importlib.import_module(self.module_name)
-                    logger.debug(
-                        f"Module {self.module_name} loaded during attribute access"
-                    )
-                except ImportError as e:
-                    logger.error(
-                        f"Failed to load module during attribute access {self.module_name}: {e}"
-                    )
-                    raise ImportError(
-                        f"Failed to lazily load module {self.module_name}: {e}"
-                    ) from e
-            if self._attribute is None and self.attribute_name:
+                self._module = _import(self.module_name)
+            if self.attribute_name and self._attribute is None:
                 self._attribute = getattr(self._module, self.attribute_name)
-                logger.debug(f"Attribute {self.attribute_name} loaded")
-            return cast(T, self._attribute)
-        else:
-            if self._module is None:
-                try:
-                    self._module = importlib.import_module(self.module_name)
-                    logger.debug(
-                        f"Module {self.module_name} loaded during direct attribute access"
-                    )
-                except ImportError as e:
-                    logger.error(
-                        f"Failed to load module during direct attribute access {self.module_name}: {e}"
-                    )
-                    raise ImportError(
-                        f"Failed to lazily load module {self.module_name}: {e}"
-                    ) from e
-            if self.attribute_name:
-                if self._attribute is None:
-                    self._attribute = getattr(self._module, self.attribute_name)
-                    logger.debug(
-                        f"Attribute {self.attribute_name} loaded during direct access"
-                    )
-                if name == self.attribute_name:
-                    return cast(T, self._attribute)
-                return cast(T, getattr(self._attribute, name))
-            return cast(T, getattr(self._module, name))
+        return self._attribute if self.attribute_name else self._module
+
+    def __getattr__(self, name: str) -> T:
+        """Load the module or attribute on first access."""
+        # Only reached for names that are not instance attributes
+        if (name.startswith("__") and name.endswith("__")) or name in (
+            "_module",
+            "_attribute",
+            "module_name",
+            "attribute_name",
+        ):
+            raise AttributeError(name)
+        target = self._load()
+        if self.attribute_name and name == self.attribute_name:
+            return cast(T, target)
+        return cast(T, getattr(target, name))
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        """Call the loaded attribute, e.g. to instantiate a lazily imported class."""
+        return self._load()(*args, **kwargs)
 
     def get(self) -> T:
-        logger.debug(
-            f"Getting value for module_name={self.module_name}, attribute_name={self.attribute_name}"
-        )
+        """Return the loaded module, or the attribute if one was given."""
         if self.attribute_name:
-            logger.debug(f"Attempting to get attribute {self.attribute_name}")
-            return self.__getattr__("_attribute")
-        else:
-            logger.debug("Loading module if not already loaded")
-            if self._module is None:
-                try:
-                    self._module = importlib.import_module(self.module_name)
-                    logger.debug(f"Module {self.module_name} loaded successfully")
-                except ImportError as e:
-                    logger.error(f"Failed to load module {self.module_name}: {e}")
-                    raise ImportError(
-                        f"Failed to lazily load module {self.module_name}: {e}"
-                    ) from e
-            logger.debug(f"Returning module {self._module}")
-            return cast(T, self._module)
+            if self._attribute is None:
+                self._load()
+            return cast(T, self._attribute)
+        if self._module is None:
+            self._load()
+        return cast(T, self._module)
+
+    def __repr__(self) -> str:
+        target = f"{self.module_name}.{self.attribute_name}".rstrip(".")
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<LazyLoader {target} ({state})>"
 
 
 def lazy_import(module_name: str, attribute_name: str = "") -> LazyLoader:
@@ -113,6 +131,43 @@ def lazy_import(module_name: str, attribute_name: str = "") -> LazyLoader:
     return LazyLoader(module_name, attribute_name)
 
 
+def lazy_exports(
+    package_name: str, exports: Mapping[str, str]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """Build module-level ``__getattr__`` and ``__dir__`` that import names on first use.
+
+    Example:
+        ```python
+        __getattr__, __dir__ = lazy_exports(__name__, {"AtlasApplication": "core.application"})
+        ```
+
+    Args:
+        package_name: ``__name__`` of the package defining the exports.
+        exports: Exported name to the module defining it; relative module
+            names (``".ocr_tool"``) are resolved against the package.
+
+    Returns:
+        The ``__getattr__`` and ``__dir__`` functions for the package.
+    """
+    package = importlib.import_module(package_name)
+
+    def __getattr__(name: str) -> Any:
+        module_name = exports.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package_name!r} has no attribute {name!r}")
+        if module_name.startswith("."):
+            module_name = package_name + module_name
+        value = getattr(_import(module_name), name)
+        # Cache on the package so later lookups bypass __getattr__
+        setattr(package, name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(package)) | set(exports))
+
+    return __getattr__, __dir__
+
+
 # Example usage:
 # my_module = lazy_import('my_module')
 # my_class = lazy_import('my_module', 'MyClass')
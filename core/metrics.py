@@ -0,0 +1,286 @@
+"""
+Streaming latency metrics for Atlas.
+
+This module provides fixed-memory latency histograms in the spirit of
+HDR-histogram: samples are counted in logarithmic buckets with a bounded
+relative error, so percentiles (p50/p95/p99) can be reported at any time
+without keeping the raw samples. ``MetricsStore`` keeps one all-time and one
+rolling time-window histogram per metric name and is safe to share between
+threads.
+"""
+
+import math
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Values below this are counted in the first bucket (seconds)
+DEFAULT_MIN_VALUE = 1e-6
+# Relative width of a bucket; reported percentiles are within this error
+DEFAULT_PRECISION = 0.01
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed histogram with bounded relative error.
+
+    Memory is proportional to the number of distinct buckets hit, which is
+    bounded by ``log(max_value / min_value) / log(1 + precision)`` (about two
+    thousand buckets for one microsecond to one hour at 1% precision),
+    independent of the number of recorded samples.
+
+    Example:
+        ```python
+        histogram = LatencyHistogram()
+        for duration in durations:
+            histogram.record(duration)
+        histogram.percentile(95)
+        ```
+    """
+
+    __slots__ = ("_buckets", "_log_base", "count", "max", "min", "min_value", "total")
+
+    def __init__(
+        self, min_value: float = DEFAULT_MIN_VALUE, precision: float = DEFAULT_PRECISION
+    ):
+        """
+        Initialize the histogram.
+
+        Args:
+            min_value: Smallest distinguishable value
+            precision: Relative bucket width, e.g. 0.01 for 1%
+        """
+        if min_value <= 0 or precision <= 0:
+            raise ValueError("min_value and precision must be positive")
+        self.min_value = min_value
+        self._log_base = math.log1p(precision)
+        self._buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def record(self, value: float, count: int = 1) -> None:
+        """Record ``count`` occurrences of a value."""
+        index = self._bucket_index(value)
+        self._buckets[index] = self._buckets.get(index, 0) + count
+        self.count += count
+        self.total += value * count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add the samples of another histogram with the same bucket layout."""
+        for index, count in other._buckets.items():
+            self._buckets[index] = self._buckets.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percentile: float) -> float:
+        """
+        Return the approximate value at a percentile.
+
+        Args:
+            percentile: Percentile in the range [0, 100]
+
+        Returns:
+            float: Value within the histogram precision, 0.0 if empty
+        """
+        return self.percentiles([percentile])[0]
+
+    def percentiles(self, percentiles: Iterable[float]) -> List[float]:
+        """Return several percentiles with a single pass over the buckets."""
+        percentiles = list(percentiles)
+        if not self.count:
+            return [0.0] * len(percentiles)
+
+        order = sorted(range(len(percentiles)), key=lambda i: percentiles[i])
+        results = [0.0] * len(percentiles)
+        position = 0
+        seen = 0
+        buckets = sorted(self._buckets.items())
+        for bucket_index, bucket_count in buckets:
+            seen += bucket_count
+            while position < len(order):
+                target = percentiles[order[position]]
+                rank = max(1, math.ceil(target / 100.0 * self.count))
+                if seen < rank:
+                    break
+                results[order[position]] = self._bucket_value(bucket_index)
+                position += 1
+            if position == len(order):
+                break
+        # Clamp to the exactly tracked extremes
+        return [min(max(value, self.min), self.max) for value in results]
+
+    def _bucket_index(self, value: float) -> int:
+        if value <= self.min_value:
+            return 0
+        return int(math.log(value / self.min_value) / self._log_base) + 1
+
+    def _bucket_value(self, index: int) -> float:
+        if index == 0:
+            return self.min_value
+        # Geometric midpoint of the bucket bounds
+        return self.min_value * math.exp((index - 0.5) * self._log_base)
+
+
+class RollingHistogram:
+    """
+    Histogram over a sliding time window made of fixed-size slots.
+
+    The window is ``slot_seconds * num_slots`` long; samples older than that
+    are discarded slot by slot, so memory stays bounded.
+    """
+
+    def __init__(
+        self,
+        slot_seconds: float = 60.0,
+        num_slots: int = 10,
+        clock: Callable[[], float] = time.monotonic,
+        min_value: float = DEFAULT_MIN_VALUE,
+        precision: float = DEFAULT_PRECISION,
+    ):
+        """
+        Initialize the rolling histogram.
+
+        Args:
+            slot_seconds: Duration covered by one slot
+            num_slots: Number of slots in the window
+            clock: Monotonic time source, injectable for tests
+            min_value: Smallest distinguishable value
+            precision: Relative bucket width
+        """
+        if slot_seconds <= 0 or num_slots < 1:
+            raise ValueError("slot_seconds and num_slots must be positive")
+        self.slot_seconds = slot_seconds
+        self.num_slots = num_slots
+        self._clock = clock
+        self._min_value = min_value
+        self._precision = precision
+        self._slots: List[Tuple[int, LatencyHistogram]] = []
+
+    def record(self, value: float) -> None:
+        """Record a value in the current slot."""
+        slot_id = int(self._clock() // self.slot_seconds)
+        self._expire(slot_id)
+        if not self._slots or self._slots[-1][0] != slot_id:
+            self._slots.append(
+                (slot_id, LatencyHistogram(self._min_value, self._precision))
+            )
+        self._slots[-1][1].record(value)
+
+    def snapshot(self) -> LatencyHistogram:
+        """Return a merged histogram of the samples inside the window."""
+        self._expire(int(self._clock() // self.slot_seconds))
+        merged = LatencyHistogram(self._min_value, self._precision)
+        for _, histogram in self._slots:
+            merged.merge(histogram)
+        return merged
+
+    def _expire(self, current_slot: int) -> None:
+        oldest = current_slot - self.num_slots + 1
+        while self._slots and self._slots[0][0] < oldest:
+            self._slots.pop(0)
+
+
+class MetricsStore:
+    """
+    Thread-safe collection of named latency histograms.
+
+    Each name has an all-time histogram and a rolling window histogram, so
+    reports can show both lifetime and recent tail latency.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = 600.0,
+        num_slots: int = 10,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            window_seconds: Length of the rolling window
+            num_slots: Number of slots the window is divided into
+            clock: Monotonic time source, injectable for tests
+        """
+        self.window_seconds = window_seconds
+        self.num_slots = num_slots
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._all_time: Dict[str, LatencyHistogram] = {}
+        self._recent: Dict[str, RollingHistogram] = {}
+
+    def record(self, name: str, value: float) -> None:
+        """Record a latency sample in seconds."""
+        with self._lock:
+            histogram = self._all_time.get(name)
+            if histogram is None:
+                histogram = self._all_time[name] = LatencyHistogram()
+                self._recent[name] = RollingHistogram(
+                    self.window_seconds / self.num_slots, self.num_slots, self._clock
+                )
+            histogram.record(value)
+            self._recent[name].record(value)
+
+    def names(self) -> List[str]:
+        """Return the names that have samples."""
+        with self._lock:
+            return list(self._all_time.keys())
+
+    def summary(self, name: str, recent: bool = False) -> Optional[Dict[str, float]]:
+        """
+        Summarize a metric.
+
+        Args:
+            name: Metric name
+            recent: Summarize only the rolling window instead of all samples
+
+        Returns:
+            Optional[Dict[str, float]]: count, mean, min, max, p50, p95 and
+                p99, or None if the metric has no samples
+        """
+        with self._lock:
+            if name not in self._all_time:
+                return None
+            histogram = (
+                self._recent[name].snapshot() if recent else self._all_time[name]
+            )
+            if not histogram.count:
+                return {
+                    "count": 0,
+                    "mean": 0.0,
+                    "min": 0.0,
+                    "max": 0.0,
+                    "p50": 0.0,
+                    "p95": 0.0,
+                    "p99": 0.0,
+                }
+            p50, p95, p99 = histogram.percentiles([50, 95, 99])
+            return {
+                "count": histogram.count,
+                "mean": histogram.mean,
+                "min": histogram.min,
+                "max": histogram.max,
+                "p50": p50,
+                "p95": p95,
+                "p99": p99,
+            }
+
+    def reset(self, name: Optional[str] = None) -> None:
+        """Forget one metric, or all metrics."""
+        with self._lock:
+            if name is None:
+                self._all_time.clear()
+                self._recent.clear()
+            else:
+                self._all_time.pop(name, None)
+                self._recent.pop(name, None)
@@ -185,18 +185,23 @@ class PluginSystem:
     including discovery, loading, activation, and lifecycle management.
     """
 
-    def __init__(self, plugin_dirs: list[str] = None):
+    def __init__(self, plugin_dirs: list[str] = None, lazy: bool = False):
         """
         Initialize the PluginSystem.
 
         Args:
             plugin_dirs (list[str], optional): List of directories to search for plugins. Defaults to empty list if None.
+            lazy (bool): Defer plugin discovery, which imports every plugin module,
+                until a plugin is first requested.
         """
         self.plugins: dict[str, PluginBase] = {}
         self.active_plugins: dict[str, PluginBase] = {}
         self.plugin_metadata: dict[str, PluginMetadata] = {}
         self.plugin_dirs = plugin_dirs or []
-        self._discover_plugins()
+        self.lazy = lazy
+        self._discovered = False
+        if not lazy:
+            self._discover_plugins()
 
     def _discover_plugins(self) -> None:
         """
@@ -208,6 +213,7 @@ class PluginSystem:
         from pathlib import Path
 
         self.plugin_metadata.clear()
+        self._discovered = True
         for plugin_dir in self.plugin_dirs:
             plugin_dir_path = Path(plugin_dir)
             if not plugin_dir_path.exists():
@@ -263,6 +269,9 @@ class PluginSystem:
             logger.info(f"Plugin {plugin_name} already loaded")
             return True
 
+        if not self._discovered:
+            self._discover_plugins()
+
         if plugin_name not in self.plugin_metadata:
             logger.error(f"Plugin {plugin_name} not found in metadata")
             return False
@@ -365,6 +374,10 @@ class PluginSystem:
         """Initialize the plugin system and discover available plugins."""
         logger.info("Initializing plugin system")
 
+        if self.lazy:
+            logger.info("Plugin discovery deferred until a plugin is first requested")
+            return
+
         # Discover available plugins
         plugin_names = self._discover_plugins()
 
@@ -10,7 +10,6 @@ try:
 except ImportError:
     asyncio = None
 
-from core.application import AtlasApplication
 from sentry_config import init_sentry
 
 # Configure logging before any other code
@@ -48,6 +47,9 @@ def main():
         logging.getLogger().setLevel(logging.DEBUG)
         logger.info("Debug mode enabled")
 
+    # Imported here so that argument parsing does not wait for Qt and the core systems
+    from core.application import AtlasApplication
+
     try:
         # Create and run the Atlas application
         app = AtlasApplication()
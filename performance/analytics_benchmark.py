@@ -0,0 +1,192 @@
+"""Benchmark WorkflowAnalytics ingestion and query latency.
+
+Loads the same synthetic data (1M action rows by default) into a database
+with the original, unindexed analytics schema and into one managed by
+WorkflowAnalytics, then times the analytics queries against both.
+
+Usage:
+    python performance/analytics_benchmark.py --rows 1000000
+"""
+
+import argparse
+import logging
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Callable, Dict, List
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from workflow.analytics import WorkflowAnalytics  # noqa: E402
+
+logging.getLogger().setLevel(logging.WARNING)
+logger = logging.getLogger(__name__)
+
+ACTIONS_PER_EXECUTION = 20
+WORKFLOWS = 50
+ERRORS = ["timeout after 30s", "permission denied", "resource not found"]
+
+BASELINE_SCHEMA = [
+    """
+    CREATE TABLE workflow_executions (
+        execution_id TEXT PRIMARY KEY, workflow_id TEXT NOT NULL,
+        start_time TIMESTAMP, end_time TIMESTAMP, duration_seconds REAL,
+        status TEXT, actions_count INTEGER, failed_actions_count INTEGER, details TEXT
+    )
+    """,
+    """
+    CREATE TABLE action_executions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, execution_id TEXT NOT NULL,
+        action_name TEXT NOT NULL, start_time TIMESTAMP, end_time TIMESTAMP,
+        duration_seconds REAL, status TEXT, error_message TEXT
+    )
+    """,
+]
+
+
+def generate(rows: int, seed: int = 42):
+    """Yield (workflow_id, execution_id, start, status, actions) per synthetic execution."""
+    rng = random.Random(seed)
+    base = datetime(2024, 1, 1)
+    for n in range(rows // ACTIONS_PER_EXECUTION):
+        workflow_id = f"wf_{n % WORKFLOWS}"
+        started = base + timedelta(minutes=n)
+        actions = []
+        for a in range(ACTIONS_PER_EXECUTION):
+            failed = rng.random() < 0.05
+            start = started + timedelta(seconds=a)
+            actions.append(
+                (
+                    f"action_{a}",
+                    start,
+                    start + timedelta(seconds=rng.random()),
+                    "failed" if failed else "success",
+                    rng.choice(ERRORS) if failed else None,
+                )
+            )
+        status = "failed" if any(a[3] == "failed" for a in actions) else "completed"
+        yield workflow_id, f"exec_{n}", started, status, actions
+
+
+def load_baseline(path: str, rows: int) -> sqlite3.Connection:
+    """Load the data into the unindexed schema with plain bulk inserts."""
+    conn = sqlite3.connect(path)
+    for statement in BASELINE_SCHEMA:
+        conn.execute(statement)
+    for workflow_id, execution_id, started, status, actions in generate(rows):
+        conn.execute(
+            "INSERT INTO workflow_executions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (execution_id, workflow_id, started, started, 20.0, status, 20, 0, ""),
+        )
+        conn.executemany(
+            """
+            INSERT INTO action_executions (execution_id, action_name, start_time,
+                end_time, duration_seconds, status, error_message)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+            [
+                (execution_id, name, s, e, (e - s).total_seconds(), st, err or "")
+                for name, s, e, st, err in actions
+            ],
+        )
+    conn.commit()
+    return conn
+
+
+def load_analytics(path: str, rows: int) -> WorkflowAnalytics:
+    """Load the data through the buffered WorkflowAnalytics ingestion path."""
+    analytics = WorkflowAnalytics(path, batch_size=5000, flush_interval=60)
+    for workflow_id, execution_id, _, status, actions in generate(rows):
+        analytics.start_execution(execution_id, workflow_id)
+        for name, start, end, action_status, error in actions:
+            analytics.record_action(
+                execution_id, name, start, end, action_status, error
+            )
+        analytics.end_execution(execution_id, status)
+    analytics.flush()
+    return analytics
+
+
+def time_query(func: Callable[[], object], repeat: int = 5) -> float:
+    """Return the best of ``repeat`` runs in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def run(rows: int) -> Dict[str, Dict[str, float]]:
+    """Run the benchmark and return latencies in ms per query and variant."""
+    with tempfile.TemporaryDirectory(prefix="analytics_bench_") as workdir:
+        started = time.perf_counter()
+        baseline = load_baseline(os.path.join(workdir, "baseline.db"), rows)
+        baseline_load = time.perf_counter() - started
+        started = time.perf_counter()
+        analytics = load_analytics(os.path.join(workdir, "analytics.db"), rows)
+        analytics_load = time.perf_counter() - started
+        print(
+            f"Loaded {rows} action rows: baseline {baseline_load:.1f}s, "
+            f"WorkflowAnalytics {analytics_load:.1f}s"
+        )
+
+        # Hand the baseline connection to a WorkflowAnalytics instance so both sides
+        # run the same query code
+        before = WorkflowAnalytics.__new__(WorkflowAnalytics)
+        before.__dict__.update(analytics.__dict__)
+        before.conn = baseline
+        before._action_buffer = []
+
+        execution_id = f"exec_{rows // ACTIONS_PER_EXECUTION // 2}"
+        queries: Dict[str, Callable[[WorkflowAnalytics], object]] = {
+            "get_workflow_performance": lambda a: a.get_workflow_performance("wf_7"),
+            "get_action_performance": lambda a: a.get_action_performance(execution_id),
+            "analyze_failures": lambda a: a.analyze_failures("wf_7"),
+        }
+        results: Dict[str, Dict[str, float]] = {}
+        for name, query in queries.items():
+            results[name] = {
+                "before": time_query(partial(query, before)),
+                "after": time_query(partial(query, analytics)),
+            }
+
+        hourly_sql = """
+            SELECT strftime('%Y-%m-%d %H:00', we.start_time), COUNT(*),
+                   SUM(ae.status = 'failed'), SUM(ae.duration_seconds)
+            FROM action_executions ae
+            JOIN workflow_executions we ON ae.execution_id = we.execution_id
+            WHERE we.workflow_id = ? GROUP BY 1
+        """
+        results["hourly_stats"] = {
+            "before": time_query(
+                lambda: baseline.execute(hourly_sql, ("wf_7",)).fetchall()
+            ),
+            "after": time_query(lambda: analytics.get_hourly_rollup("wf_7")),
+        }
+        analytics.close()
+        baseline.close()
+        return results
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+
+    results = run(args.rows)
+    print(f"{'query':<28}{'before ms':>12}{'after ms':>12}{'speedup':>10}")
+    for name, timings in results.items():
+        speedup = timings["before"] / max(timings["after"], 1e-6)
+        print(
+            f"{name:<28}{timings['before']:>12.2f}{timings['after']:>12.2f}{speedup:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
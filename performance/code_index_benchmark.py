@@ -0,0 +1,243 @@
+"""Benchmark the CodeReaderTool code index.
+
+Writes a synthetic tree of Python modules (10k by default) and times indexing,
+incremental updates, the index cache and name searches. "before" is the
+previous behaviour: every update re-parsed every file serially, the cache was
+indented JSON, and searches scanned every name with a substring test.
+
+Usage:
+    python performance/code_index_benchmark.py --files 10000
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from functools import partial
+from typing import Callable, Dict, List
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from tools.code_reader_tool import (  # noqa: E402
+    MATCH_FUZZY,
+    MATCH_PREFIX,
+    CodeElement,
+    CodeIndex,
+    CodeReaderTool,
+    FileAnalysis,
+)
+
+logging.getLogger().setLevel(logging.WARNING)
+
+SYLLABLES = [
+    "ka",
+    "lo",
+    "mi",
+    "ne",
+    "ru",
+    "sa",
+    "ti",
+    "vo",
+    "ze",
+    "pa",
+    "gu",
+    "fe",
+    "ri",
+    "mo",
+]
+VERBS = [
+    "get",
+    "set",
+    "load",
+    "save",
+    "parse",
+    "build",
+    "find",
+    "update",
+    "handle",
+    "render",
+    "sync",
+]
+QUERIES = ["load", "handler", "kalo", "update_mine"]
+
+
+def name(rng: random.Random) -> str:
+    """A synthetic identifier of two to four syllables."""
+    return "".join(rng.choices(SYLLABLES, k=rng.randint(2, 4)))
+
+
+def module_source(rng: random.Random) -> str:
+    """Source of a module with constants, functions and a class with methods."""
+    lines = ["import os", "from typing import List", ""]
+    lines += [f"{name(rng).upper()} = {rng.randint(0, 99)}" for _ in range(3)]
+    for _ in range(4):
+        lines += [
+            "",
+            f"def {rng.choice(VERBS)}_{name(rng)}(value, items):",
+            '    """Synthetic function."""',
+            "    for item in items:",
+            "        if item and value:",
+            "            value += 1",
+            "    return value",
+        ]
+    lines += ["", f"class {name(rng).title()}Handler:", '    """Synthetic class."""']
+    for _ in range(4):
+        lines += [
+            "",
+            f"    def {rng.choice(VERBS)}_{name(rng)}(self, value):",
+            "        return value if value else None",
+        ]
+    return "\n".join(lines) + "\n"
+
+
+def generate(root: str, count: int, seed: int = 42) -> List[str]:
+    """Write ``count`` modules, 100 per package, and return their paths."""
+    rng = random.Random(seed)
+    paths = []
+    for n in range(count):
+        package = os.path.join(root, f"pkg_{n // 100}")
+        os.makedirs(package, exist_ok=True)
+        path = os.path.join(package, f"mod_{n}.py")
+        with open(path, "w") as f:
+            f.write(module_source(rng))
+        paths.append(path)
+    return paths
+
+
+def scan_search(index: CodeIndex, query: str) -> List[CodeElement]:
+    """The original search: a substring test against every indexed name."""
+    query = query.lower()
+    results = []
+    for element_name, elements in index.elements.items():
+        if query in element_name:
+            results.extend(elements)
+    return sorted(results, key=lambda x: x.name.lower().find(query))
+
+
+def save_json_cache(index: CodeIndex, path: str) -> None:
+    """The original cache: every analysis as indented JSON."""
+    cache_data = {
+        "files": {p: asdict(analysis) for p, analysis in index.files.items()},
+        "timestamp": time.time(),
+    }
+    with open(path, "w") as f:
+        json.dump(cache_data, f, indent=2)
+
+
+def load_json_cache(path: str) -> Dict[str, FileAnalysis]:
+    """Load the original JSON cache back into dataclasses."""
+    with open(path) as f:
+        cache_data = json.load(f)
+    files = {}
+    for file_path, file_data in cache_data["files"].items():
+        file_data["elements"] = [CodeElement(**e) for e in file_data["elements"]]
+        files[file_path] = FileAnalysis(**file_data)
+    return files
+
+
+def time_call(func: Callable[[], object], repeat: int = 5) -> float:
+    """Return the best of ``repeat`` runs in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def run(count: int, workers: int) -> Dict[str, Dict[str, float]]:
+    """Run the benchmark and return milliseconds per operation and variant."""
+    root = tempfile.mkdtemp(prefix="code_index_bench_")
+    try:
+        paths = generate(root, count)
+        os.environ["ATLAS_DISABLE_CODE_INDEXING"] = "1"
+        tool = CodeReaderTool(root)
+        results: Dict[str, Dict[str, float]] = {}
+
+        serial = time_call(lambda: tool.rebuild_index(full=True, max_workers=1), 1)
+        parallel = time_call(
+            lambda: tool.rebuild_index(full=True, max_workers=workers), 1
+        )
+        results[f"full index, {workers} processes"] = {
+            "before": serial,
+            "after": parallel,
+        }
+        results["update, nothing changed"] = {
+            "before": serial,
+            "after": time_call(tool.rebuild_index),
+        }
+
+        def edit_ten() -> None:
+            for path in random.sample(paths, 10):
+                with open(path, "a") as f:
+                    f.write("\nEDITED = True\n")
+            tool.rebuild_index()
+
+        results["update, 10 files edited"] = {
+            "before": serial,
+            "after": time_call(edit_ten),
+        }
+
+        json_path = os.path.join(root, "cache.json")
+        results["save cache"] = {
+            "before": time_call(lambda: save_json_cache(tool.index, json_path), 1),
+            "after": time_call(tool.index.save_cache, 1),
+        }
+        results["load cache"] = {
+            "before": time_call(lambda: load_json_cache(json_path), 1),
+            "after": time_call(lambda: CodeIndex(tool.index.cache_file), 1),
+        }
+        json_size = os.path.getsize(json_path)
+        binary_size = os.path.getsize(tool.index.cache_file)
+        print(
+            f"Indexed {len(tool.index.files)} files; cache "
+            f"{json_size / 2**20:.1f} MiB JSON vs {binary_size / 2**20:.1f} MiB binary"
+        )
+
+        index = tool.index
+        for query in QUERIES:
+            results[f"search {query!r}"] = {
+                "before": time_call(partial(scan_search, index, query)),
+                "after": time_call(partial(index.search_elements, query)),
+            }
+        results["prefix search 'load'"] = {
+            "before": time_call(lambda: scan_search(index, "load")),
+            "after": time_call(
+                lambda: index.search_elements("load", match=MATCH_PREFIX)
+            ),
+        }
+        results["fuzzy search 'hanlder'"] = {
+            "before": float("nan"),
+            "after": time_call(
+                lambda: index.search_elements("hanlder", match=MATCH_FUZZY)
+            ),
+        }
+        return results
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    results = run(args.files, args.workers)
+    print(f"{'operation':<32}{'before ms':>12}{'after ms':>12}{'speedup':>10}")
+    for operation, timings in results.items():
+        speedup = timings["before"] / max(timings["after"], 1e-6)
+        print(
+            f"{operation:<32}{timings['before']:>12.2f}{timings['after']:>12.2f}"
+            f"{speedup:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
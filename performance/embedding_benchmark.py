@@ -0,0 +1,82 @@
+"""Benchmark batched and cached embeddings against one request per text.
+
+Uses the offline LocalEmbeddingProvider with a simulated per-request network
+latency, so the numbers show round trips saved rather than model speed.
+
+Usage:
+    python performance/embedding_benchmark.py --texts 2000 --latency-ms 20
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.embeddings import EmbeddingCache, embed_texts  # noqa: E402
+from utils.providers.local_provider import LocalEmbeddingProvider  # noqa: E402
+
+logging.getLogger().setLevel(logging.WARNING)
+
+
+class RemoteLikeProvider(LocalEmbeddingProvider):
+    """Local provider that sleeps once per request like a network call."""
+
+    EMBEDDING_BATCH_SIZE = 100
+
+    def __init__(self, latency: float):
+        super().__init__()
+        self.latency = latency
+        self.requests = 0
+
+    def get_embeddings(self, texts, model=None):
+        self.requests += 1
+        time.sleep(self.latency)
+        return super().get_embeddings(texts, model)
+
+
+def run(count: int, latency_ms: float) -> Dict[str, float]:
+    """Run the benchmark and return the measurements."""
+    texts = [f"def function_{i}(x):\n    return x * {i}" for i in range(count)]
+    provider = RemoteLikeProvider(latency_ms / 1000)
+    results = {}
+
+    sample = texts[: max(count // 20, 10)]
+    started = time.perf_counter()
+    for text in sample:
+        provider.get_embedding(text)
+    results["one per call (s, extrapolated)"] = (
+        (time.perf_counter() - started) * count / len(sample)
+    )
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = EmbeddingCache(cache_dir)
+        provider.requests = 0
+        started = time.perf_counter()
+        embed_texts(provider, texts, cache=cache, max_workers=4)
+        results["batched, cold cache (s)"] = time.perf_counter() - started
+        results["requests, cold cache"] = provider.requests
+
+        started = time.perf_counter()
+        embed_texts(provider, texts, cache=EmbeddingCache(cache_dir))
+        results["reopened, warm cache (s)"] = time.perf_counter() - started
+    return results
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--texts", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    args = parser.parse_args(argv)
+
+    results = run(args.texts, args.latency_ms)
+    for name, value in results.items():
+        print(f"{name:<36}{value:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
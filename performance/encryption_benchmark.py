@@ -0,0 +1,96 @@
+"""Benchmark the per-call cost of workflow.security.EncryptionManager.
+
+Times encrypt/decrypt round trips with the original implementation, which
+ran 100,000 PBKDF2 iterations on every call, against the cached key
+derivation, and reports batch and streaming throughput.
+
+Usage:
+    python performance/encryption_benchmark.py --calls 200
+"""
+
+import argparse
+import base64
+import io
+import logging
+import os
+import sys
+import time
+from typing import Callable, Dict, List
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from workflow.security import EncryptionManager  # noqa: E402
+
+logging.getLogger().setLevel(logging.WARNING)
+
+PAYLOAD = '{"api_key": "sk-0123456789abcdef", "user": "alice"}'
+
+
+def legacy_round_trip(key: bytes, data: str) -> str:
+    """Encrypt and decrypt the way EncryptionManager did before key caching."""
+    from cryptography.fernet import Fernet
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+    def fernet() -> Fernet:
+        kdf = PBKDF2HMAC(
+            algorithm=hashes.SHA256(), length=32, salt=b"static_salt", iterations=100000
+        )
+        return Fernet(base64.urlsafe_b64encode(kdf.derive(key)))
+
+    return fernet().decrypt(fernet().encrypt(data.encode())).decode()
+
+
+def per_call_ms(func: Callable[[], object], calls: int) -> float:
+    """Return the mean time per call in milliseconds."""
+    started = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - started) * 1000 / calls
+
+
+def run(calls: int, stream_mb: int) -> Dict[str, float]:
+    """Run the benchmark and return the measurements."""
+    manager = EncryptionManager()
+    manager.decrypt_data(manager.encrypt_data(PAYLOAD))  # Derive the cached key
+
+    results = {
+        "round trip before (ms)": per_call_ms(
+            lambda: legacy_round_trip(manager.key, PAYLOAD), max(calls // 20, 5)
+        ),
+        "round trip after (ms)": per_call_ms(
+            lambda: manager.decrypt_data(manager.encrypt_data(PAYLOAD)), calls
+        ),
+    }
+
+    batch = [PAYLOAD] * calls
+    started = time.perf_counter()
+    manager.decrypt_batch(manager.encrypt_batch(batch))
+    results["batch round trip per item (ms)"] = (
+        (time.perf_counter() - started) * 1000 / calls
+    )
+
+    payload = os.urandom(stream_mb * 1024 * 1024)
+    started = time.perf_counter()
+    encrypted = b"".join(manager.encrypt_stream(io.BytesIO(payload)))
+    for _ in manager.decrypt_stream(io.BytesIO(encrypted)):
+        pass
+    results["stream round trip (MB/s)"] = stream_mb / (time.perf_counter() - started)
+    return results
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--stream-mb", type=int, default=64)
+    args = parser.parse_args(argv)
+
+    results = run(args.calls, args.stream_mb)
+    for name, value in results.items():
+        print(f"{name:<36}{value:>12.3f}")
+    speedup = results["round trip before (ms)"] / results["round trip after (ms)"]
+    print(f"{'per-call speedup':<36}{speedup:>11.0f}x")
+
+
+if __name__ == "__main__":
+    main()
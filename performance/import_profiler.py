@@ -0,0 +1,242 @@
+"""Import-Time Profiler and Startup Benchmark for Atlas
+
+This module measures what the Atlas bootstrap costs. It runs a statement in a
+fresh interpreter with ``python -X importtime``, turns the report into a tree of
+per-module import cost, and benchmarks cold-start time so that CI can fail when
+startup regresses past a threshold.
+
+The default statement constructs and starts the headless application, which is
+where the lazy startup mode (``ATLAS_LAZY_STARTUP``) defers plugin and tool
+imports, so ``--eager`` shows what that mode saves.
+
+Usage:
+    python performance/import_profiler.py --tree --threshold 1.5
+    python performance/import_profiler.py --eager
+"""
+
+import argparse
+import logging
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+DEFAULT_STATEMENT = (
+    "from core.application import AtlasApplication; AtlasApplication().start()"
+)
+
+_IMPORTTIME_LINE = re.compile(
+    r"^import time:\s+(?P<self>\d+)\s+\|\s+(?P<cumulative>\d+)\s+\|(?P<indent>\s*)(?P<name>\S+)\s*$"
+)
+
+
+@dataclass
+class ImportNode:
+    """Import cost of one module; times are in microseconds."""
+
+    name: str
+    self_us: int = 0
+    cumulative_us: int = 0
+    children: List["ImportNode"] = field(default_factory=list)
+
+    def walk(self):
+        """Yield this node and all of its descendants."""
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+    def find(self, name: str) -> Optional["ImportNode"]:
+        """Return the first node importing ``name``, if any."""
+        return next((node for node in self.walk() if node.name == name), None)
+
+
+def parse_importtime(output: str) -> ImportNode:
+    """Build an import tree from ``python -X importtime`` stderr output.
+
+    The interpreter prints a module after all of its own imports, indenting
+    nested imports by two spaces per level, so children are collected on a
+    stack until their parent line appears.
+
+    Args:
+        output: Text written to stderr by the interpreter.
+
+    Returns:
+        ImportNode: Synthetic ``<root>`` node whose children are the top-level imports.
+    """
+    root = ImportNode("<root>")
+    # pending[depth] holds finished nodes waiting for their parent at depth - 1
+    pending: Dict[int, List[ImportNode]] = {}
+    for line in output.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        depth = (len(match.group("indent")) - 1) // 2
+        node = ImportNode(
+            match.group("name"),
+            int(match.group("self")),
+            int(match.group("cumulative")),
+            pending.pop(depth + 1, []),
+        )
+        pending.setdefault(depth, []).append(node)
+    root.children = pending.get(0, [])
+    root.cumulative_us = sum(child.cumulative_us for child in root.children)
+    return root
+
+
+def _child_env(eager: bool) -> Dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [REPO_ROOT, env.get("PYTHONPATH")])
+    )
+    env["ATLAS_LAZY_STARTUP"] = "false" if eager else "true"
+    return env
+
+
+def profile_imports(
+    statement: str = DEFAULT_STATEMENT, eager: bool = False
+) -> ImportNode:
+    """Run a statement in a fresh interpreter and profile its imports.
+
+    Args:
+        statement: Python statement to run, e.g. ``"import main"``.
+        eager: Disable the lazy startup mode for the run.
+
+    Returns:
+        ImportNode: Root of the import tree.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        cwd=REPO_ROOT,
+        env=_child_env(eager),
+        check=False,
+    )
+    if result.returncode != 0:
+        logger.warning(f"Profiled statement exited with {result.returncode}")
+    return parse_importtime(result.stderr)
+
+
+def format_tree(node: ImportNode, min_ms: float = 1.0, max_depth: int = 6) -> str:
+    """Render an import tree, hiding modules cheaper than ``min_ms``.
+
+    Args:
+        node: Root of the tree to render.
+        min_ms: Minimum cumulative cost in milliseconds of a shown module.
+        max_depth: Maximum nesting depth to render.
+
+    Returns:
+        str: One line per module with cumulative and self time.
+    """
+    lines: List[str] = []
+
+    def render(current: ImportNode, depth: int) -> None:
+        for child in sorted(current.children, key=lambda c: -c.cumulative_us):
+            if child.cumulative_us < min_ms * 1000:
+                continue
+            lines.append(
+                f"{child.cumulative_us / 1000:9.1f} ms {child.self_us / 1000:8.1f} ms  "
+                f"{'  ' * depth}{child.name}"
+            )
+            if depth + 1 < max_depth:
+                render(child, depth + 1)
+
+    lines.append(f"{'total':>12} {'self':>11}  module")
+    render(node, 0)
+    return "\n".join(lines)
+
+
+def top_modules(node: ImportNode, count: int = 15) -> List[ImportNode]:
+    """Return the modules with the highest self import time."""
+    modules = [child for child in node.walk() if child is not node]
+    return sorted(modules, key=lambda m: -m.self_us)[:count]
+
+
+def measure_cold_start(
+    statement: str = DEFAULT_STATEMENT, runs: int = 5, eager: bool = False
+) -> Dict[str, float]:
+    """Measure the wall-clock time of running a statement in fresh interpreters.
+
+    Args:
+        statement: Python statement to run.
+        runs: Number of interpreter launches.
+        eager: Disable the lazy startup mode for the runs.
+
+    Returns:
+        Dict[str, float]: ``min``, ``median`` and ``max`` seconds.
+
+    Raises:
+        RuntimeError: If the statement fails.
+    """
+    env = _child_env(eager)
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-c", statement],
+            capture_output=True,
+            text=True,
+            cwd=REPO_ROOT,
+            env=env,
+            check=False,
+        )
+        timings.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            raise RuntimeError(
+                f"Startup statement failed: {result.stderr.strip().splitlines()[-1:]}"
+            )
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "max": max(timings),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Profile startup imports and check cold-start time against a threshold.
+
+    Returns:
+        int: 0 on success, 1 if the median cold start exceeds the threshold.
+    """
+    parser = argparse.ArgumentParser(description="Atlas startup import profiler")
+    parser.add_argument("--statement", default=DEFAULT_STATEMENT)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=float(os.getenv("ATLAS_STARTUP_THRESHOLD", "0")) or None,
+        help="Fail when the median cold start exceeds this many seconds",
+    )
+    parser.add_argument("--tree", action="store_true", help="Print the import tree")
+    parser.add_argument("--min-ms", type=float, default=1.0)
+    parser.add_argument(
+        "--eager", action="store_true", help="Disable the lazy startup mode"
+    )
+    args = parser.parse_args(argv)
+
+    if args.tree:
+        print(format_tree(profile_imports(args.statement, args.eager), args.min_ms))
+        print()
+
+    timings = measure_cold_start(args.statement, args.runs, args.eager)
+    print(
+        f"Cold start of {args.statement!r}: median {timings['median']:.3f}s "
+        f"(min {timings['min']:.3f}s, max {timings['max']:.3f}s, {args.runs} runs)"
+    )
+    if args.threshold is not None and timings["median"] > args.threshold:
+        print(f"FAIL: cold start exceeds the {args.threshold:.3f}s threshold")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""Benchmark utils.intelligent_mode_detector.IntelligentModeDetector.
+
+The corpus in mode_detector_corpus.json holds chat messages with the mode,
+confidence and reasoning the original per-keyword implementation produced.
+The benchmark fails if any result differs from the corpus, or if throughput
+without the memo falls below the target rate.
+
+Usage:
+    python performance/mode_detector_benchmark.py --min-rate 10000
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from typing import Dict, List
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.intelligent_mode_detector import IntelligentModeDetector  # noqa: E402
+
+logging.getLogger().setLevel(logging.WARNING)
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "mode_detector_corpus.json")
+
+
+def load_corpus(path: str = CORPUS_PATH) -> List[Dict]:
+    """Load the messages and their expected detection results."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def parity_errors(detector: IntelligentModeDetector, corpus: List[Dict]) -> List[str]:
+    """Return the messages whose detection result differs from the corpus."""
+    errors = []
+    for case in corpus:
+        result = detector.detect_chat_mode(case["message"])
+        actual = (
+            result.mode.value,
+            result.confidence,
+            result.should_use_advanced,
+            result.fallback_to_simple,
+            result.reasoning,
+        )
+        expected = (
+            case["mode"],
+            case["confidence"],
+            case["should_use_advanced"],
+            case["fallback_to_simple"],
+            case["reasoning"],
+        )
+        if actual != expected:
+            errors.append(f"{case['message']!r}: expected {expected}, got {actual}")
+    return errors
+
+
+def messages_per_second(
+    detector: IntelligentModeDetector, messages: List[str], repeat: int
+) -> float:
+    """Return the best throughput over ``repeat`` passes over the messages."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for message in messages:
+            detector.detect_chat_mode(message)
+        best = min(best, time.perf_counter() - started)
+    return len(messages) / best
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument(
+        "--min-rate",
+        type=float,
+        default=10000.0,
+        help="Minimum messages per second without the memo",
+    )
+    args = parser.parse_args(argv)
+
+    corpus = load_corpus()
+    messages = [case["message"] for case in corpus]
+
+    errors = parity_errors(IntelligentModeDetector(memo_size=0), corpus)
+    errors += parity_errors(IntelligentModeDetector(), corpus + corpus)
+    print(f"{'corpus messages':<32}{len(corpus):>12}")
+    print(f"{'parity mismatches':<32}{len(errors):>12}")
+
+    cold = messages_per_second(
+        IntelligentModeDetector(memo_size=0), messages, args.repeat
+    )
+    warm = messages_per_second(IntelligentModeDetector(), messages, args.repeat)
+    print(f"{'messages/s, new messages':<32}{cold:>12.0f}")
+    print(f"{'messages/s, repeated messages':<32}{warm:>12.0f}")
+
+    for error in errors[:10]:
+        print(f"MISMATCH {error}")
+    if cold < args.min_rate:
+        print(f"Throughput below target of {args.min_rate:.0f} messages/s")
+    return 1 if errors or cold < args.min_rate else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
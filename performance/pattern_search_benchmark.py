@@ -0,0 +1,185 @@
+"""Benchmark WorkflowPatternLibrary full-text search.
+
+Builds a library of synthetic patterns (100k by default) and times queries
+through the inverted index against the substring scan that search_patterns
+used before, plus the cost of re-indexing a single updated pattern.
+
+Usage:
+    python performance/pattern_search_benchmark.py --patterns 100000
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from functools import partial
+from typing import Any, Callable, Dict, List
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from workflow.workflow_pattern_library import WorkflowPatternLibrary  # noqa: E402
+
+BASE_WORDS = [
+    "data",
+    "pipeline",
+    "extract",
+    "transform",
+    "load",
+    "report",
+    "email",
+    "notify",
+    "schedule",
+    "sync",
+    "backup",
+    "archive",
+    "classify",
+    "train",
+    "model",
+    "deploy",
+    "monitor",
+    "alert",
+    "review",
+    "approve",
+    "invoice",
+    "payment",
+    "customer",
+    "order",
+    "inventory",
+    "shipment",
+    "ticket",
+    "escalate",
+    "audit",
+    "compliance",
+    "cleanup",
+    "migrate",
+    "index",
+    "search",
+    "crawl",
+    "scrape",
+    "translate",
+    "summarize",
+]
+SYLLABLES = [
+    "ka",
+    "lo",
+    "mi",
+    "ne",
+    "ru",
+    "sa",
+    "ti",
+    "vo",
+    "ze",
+    "pa",
+    "gu",
+    "fe",
+    "ri",
+    "mo",
+]
+CATEGORIES = ["Data Processing", "Machine Learning", "Operations", "Finance", "Support"]
+QUERIES = ["report", "invoice payment", "pipe", "escal", "model deploy monitor"]
+
+
+def vocabulary(size: int, rng: random.Random) -> List[str]:
+    """The domain words followed by synthetic ones, most frequent first."""
+    words = list(BASE_WORDS)
+    while len(words) < size:
+        words.append("".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))))
+    return words
+
+
+def generate(count: int, seed: int = 42) -> Dict[str, Dict[str, Any]]:
+    """Generate synthetic patterns by ID, with Zipf-distributed words."""
+    rng = random.Random(seed)
+    words = vocabulary(5000, rng)
+    weights = [1 / (rank + 10) for rank in range(len(words))]
+
+    def pick(k: int) -> List[str]:
+        return rng.choices(words, weights=weights, k=k)
+
+    patterns = {}
+    for n in range(count):
+        patterns[f"pattern_{n}"] = {
+            "name": " ".join(pick(3)).title() + f" {n}",
+            "description": " ".join(pick(20)),
+            "category": rng.choice(CATEGORIES),
+            "tags": list(dict.fromkeys(pick(3))),
+            "structure": {"steps": [], "connections": []},
+            "version": "1.0.0",
+            "usage_count": rng.randint(0, 1000),
+        }
+    return patterns
+
+
+def scan_search(patterns: Dict[str, Dict[str, Any]], query: str) -> List[str]:
+    """The original search: a lower-cased substring scan of every pattern."""
+    query_lower = query.lower()
+    results = [
+        (pattern_id, pattern["usage_count"])
+        for pattern_id, pattern in patterns.items()
+        if query_lower in pattern.get("name", "").lower()
+        or query_lower in pattern.get("description", "").lower()
+        or query_lower in pattern.get("category", "").lower()
+        or any(query_lower in tag.lower() for tag in pattern.get("tags", []))
+    ]
+    return [pid for pid, _ in sorted(results, key=lambda x: x[1], reverse=True)]
+
+
+def time_call(func: Callable[[], object], repeat: int = 5) -> float:
+    """Return the best of ``repeat`` runs in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def run(count: int) -> Dict[str, Dict[str, float]]:
+    """Run the benchmark and return latencies in ms per query and variant."""
+    patterns = generate(count)
+    with tempfile.TemporaryDirectory(prefix="pattern_search_bench_") as workdir:
+        library_path = os.path.join(workdir, "workflow_patterns.json")
+        with open(library_path, "w") as f:
+            json.dump({"patterns": patterns}, f)
+
+        started = time.perf_counter()
+        library = WorkflowPatternLibrary(library_path)
+        print(
+            f"Loaded and indexed {count} patterns in {time.perf_counter() - started:.1f}s"
+        )
+
+        results: Dict[str, Dict[str, float]] = {}
+        for query in QUERIES:
+            results[f"search {query!r}"] = {
+                "before": time_call(partial(scan_search, library.patterns, query)),
+                "after": time_call(partial(library.search_patterns, query, limit=20)),
+            }
+
+        pattern = library.patterns["pattern_0"]
+        results["reindex one pattern"] = {
+            "before": float("nan"),
+            "after": time_call(partial(library._update_indices, "pattern_0", pattern)),
+        }
+        library.close(save=False)
+    return results
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--patterns", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    results = run(args.patterns)
+    print(f"{'operation':<32}{'before ms':>12}{'after ms':>12}{'speedup':>10}")
+    for name, timings in results.items():
+        speedup = timings["before"] / max(timings["after"], 1e-6)
+        print(
+            f"{name:<32}{timings['before']:>12.2f}{timings['after']:>12.2f}{speedup:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
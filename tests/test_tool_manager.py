@@ -4,6 +4,10 @@ Tests for the Atlas Tool Manager.
 """
 
 import asyncio
+import os
+import sys
+import tempfile
+import textwrap
 from unittest import TestCase
 from unittest.mock import AsyncMock, Mock, patch
 
@@ -270,3 +274,67 @@ class TestToolManager(TestCase):
         tool_manager.register_tool_class(tool_class, name="test_tool")
         tool_manager.load_tool("test_tool")
         event_bus.publish.assert_called()
+
+
+class TestLazyToolManager(TestCase):
+    """Test cases for the lazy startup mode of ToolManager."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        package_dir = os.path.join(self.tmp_dir.name, "lazy_tools_pkg")
+        os.makedirs(package_dir)
+        with open(os.path.join(package_dir, "__init__.py"), "w") as f:
+            f.write("")
+        with open(os.path.join(package_dir, "sample_tool.py"), "w") as f:
+            f.write(
+                textwrap.dedent(
+                    """
+                    from tools.base_tool import BaseTool, ToolBase
+
+                    class SampleBase(ToolBase):
+                        pass
+
+                    class SampleTool(BaseTool):
+                        pass
+
+                    class DerivedTool(SampleBase):
+                        pass
+
+                    class Helper:
+                        pass
+                    """
+                )
+            )
+        sys.path.insert(0, self.tmp_dir.name)
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp_dir.name)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        sys.path.remove(self.tmp_dir.name)
+        for name in [n for n in sys.modules if n.startswith("lazy_tools_pkg")]:
+            del sys.modules[name]
+        self.tmp_dir.cleanup()
+
+    def test_discovery_does_not_import_tools(self):
+        """Test that lazy discovery finds tool classes without importing them."""
+        tool_manager = ToolManager(lazy=True)
+        proxies = tool_manager.discover_tools_lazy("lazy_tools_pkg")
+        self.assertEqual(
+            sorted(proxy.attribute_name for proxy in proxies),
+            ["DerivedTool", "SampleBase", "SampleTool"],
+        )
+        self.assertNotIn("lazy_tools_pkg.sample_tool", sys.modules)
+
+    def test_tool_loads_on_first_use(self):
+        """Test that a lazily registered tool is imported when requested."""
+        tool_manager = ToolManager(lazy=True)
+        for proxy in tool_manager.discover_tools_lazy("lazy_tools_pkg"):
+            tool_manager.register_tool_class(proxy)
+        self.assertEqual(tool_manager.list_tools(), [])
+
+        with patch.object(BaseTool, "validate_requirements", return_value=True):
+            tool = tool_manager.get_tool("sample")
+        self.assertIsNotNone(tool)
+        self.assertIn("lazy_tools_pkg.sample_tool", sys.modules)
+        self.assertEqual(tool_manager.list_tools(), ["sample"])
@@ -1,7 +1,60 @@
+import asyncio
+import json
+import threading
+import time
 import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import patch
 
-from core.ai_integration import AIModelManager, automate_ai_task, get_ai_suggestion
+from core.ai_integration import (
+    AIIntegrationError,
+    AIModelManager,
+    InferenceCancelledError,
+    automate_ai_task,
+    get_ai_suggestion,
+    get_performance_report,
+    optimize_model_selection,
+)
+from core.ai_response_cache import ResponseCache
+from core.ai_router import ModelRouter
+from core.metrics import MetricsStore
+
+
+class _StubProviderHandler(BaseHTTPRequestHandler):
+    """Minimal OpenAI-compatible chat completions endpoint."""
+
+    stream_delay = 0.0
+
+    def do_POST(self):  # noqa: N802
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length))
+        prompt = payload["messages"][-1]["content"]
+        if not payload.get("stream"):
+            body = json.dumps(
+                {"choices": [{"message": {"content": f"echo:{prompt}"}}]}
+            ).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        try:
+            for token in ["echo", ":", prompt]:
+                event = {"choices": [{"delta": {"content": token}}]}
+                self.wfile.write(f"data: {json.dumps(event)}\n\n".encode())
+                self.wfile.flush()
+                time.sleep(self.stream_delay)
+            self.wfile.write(b"data: [DONE]\n\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        pass
 
 
 class TestAIModelManager(unittest.TestCase):
@@ -87,6 +140,209 @@ class TestAIModelManager(unittest.TestCase):
             with self.assertRaises(ValueError):
                 automate_ai_task("test_model", "test task", {"key": "value"})
 
+    @patch("core.ai_integration.AIModelManager._infer_local")
+    def test_suggestion_served_from_response_cache(self, mock_infer_local):
+        """Test that a repeated suggestion request skips inference."""
+        mock_infer_local.return_value = "cached suggestion"
+        model_id = "cache-test-model"
+        with (
+            patch.dict(self.manager.models, {model_id: {"provider": "local"}}),
+            patch.object(self.manager, "response_cache", ResponseCache()),
+        ):
+            context = {"user_input": "plan my day"}
+            first = self.manager.get_suggestion(model_id, context)
+            second = self.manager.get_suggestion(model_id, dict(context))
+
+        self.assertEqual(first, second)
+        mock_infer_local.assert_called_once()
+        cache_report = get_performance_report(model_id)[model_id]["cache"]
+        self.assertEqual(cache_report["hits"], 1)
+        self.assertEqual(cache_report["misses"], 1)
+        self.assertEqual(cache_report["hit_rate"], 0.5)
+
+    def test_model_selection_uses_tail_latency(self):
+        """Test that a model with a slow tail loses to a consistently fast one."""
+        store = MetricsStore()
+        for _ in range(90):
+            store.record("spiky-model", 0.1)
+            store.record("steady-model", 0.3)
+        for _ in range(10):
+            store.record("spiky-model", 20.0)
+            store.record("steady-model", 0.3)
+        with (
+            patch("core.ai_integration._latency_metrics", store),
+            patch.dict(
+                "core.ai_integration._performance_metrics",
+                {
+                    "success_rates": {
+                        "spiky-model": {"success": 100, "total": 100},
+                        "steady-model": {"success": 100, "total": 100},
+                    },
+                    "error_counts": {},
+                    "cache": {},
+                },
+            ),
+        ):
+            report = get_performance_report("spiky-model")["spiky-model"]
+            self.assertEqual(report["total_calls"], 100)
+            self.assertAlmostEqual(report["p95_time"], 20.0, delta=0.2)
+            self.assertEqual(report["recent"]["count"], 100)
+            self.assertEqual(
+                optimize_model_selection({"task_type": "general"}), "steady-model"
+            )
+
+    def test_routed_inference_hedges_slow_model(self):
+        """Test that a slow first model is raced by the next best one."""
+
+        def fake_infer(model_name, input_data, context=None):
+            if model_name == "slow-model":
+                time.sleep(0.5)
+            return f"{model_name}:{input_data}"
+
+        models = {
+            "slow-model": {"provider": "local"},
+            "fast-model": {"provider": "local"},
+        }
+        with (
+            patch.dict(self.manager.models, models, clear=True),
+            patch.object(self.manager, "selection_policy", "adaptive"),
+            patch.object(self.manager, "router", ModelRouter()),
+            patch.object(self.manager, "infer", side_effect=fake_infer),
+        ):
+            start = time.monotonic()
+            result = self.manager.infer_routed("hi", hedge_after=0.05)
+            self.assertEqual(result, "fast-model:hi")
+            self.assertLess(time.monotonic() - start, 0.4)
+
+    def test_routed_inference_hedges_before_latency_is_known(self):
+        """Test that a cold router hedges after the configured default delay."""
+
+        def fake_infer(model_name, input_data, context=None):
+            if model_name == "slow-model":
+                time.sleep(0.5)
+            return model_name
+
+        models = {
+            "slow-model": {"provider": "local"},
+            "fast-model": {"provider": "local"},
+        }
+        with (
+            patch.dict(self.manager.models, models, clear=True),
+            patch.object(self.manager, "selection_policy", "adaptive"),
+            patch.object(self.manager, "router", ModelRouter()),
+            patch.object(
+                self.manager, "config", {"ai_router": {"hedge_default_delay": 0.05}}
+            ),
+            patch("core.ai_integration._latency_metrics", MetricsStore()),
+            patch.object(self.manager, "infer", side_effect=fake_infer),
+        ):
+            start = time.monotonic()
+            self.assertEqual(self.manager.infer_routed("hi"), "fast-model")
+            self.assertLess(time.monotonic() - start, 0.4)
+
+    def test_routed_inference_fails_over(self):
+        """Test that a failing first model is retried on another model."""
+
+        def fake_infer(model_name, input_data, context=None):
+            if model_name == "broken-model":
+                raise AIIntegrationError("boom")
+            return model_name
+
+        models = {
+            "broken-model": {"provider": "local"},
+            "backup-model": {"provider": "local"},
+        }
+        with (
+            patch.dict(self.manager.models, models, clear=True),
+            patch.object(self.manager, "selection_policy", "adaptive"),
+            patch.object(self.manager, "router", ModelRouter()),
+            patch.object(self.manager, "infer", side_effect=fake_infer),
+        ):
+            self.assertEqual(self.manager.infer_routed("hi"), "backup-model")
+
+
+class TestAIModelManagerHTTP(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _StubProviderHandler)
+        cls.server_thread = threading.Thread(
+            target=cls.server.serve_forever, daemon=True
+        )
+        cls.server_thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.manager = AIModelManager()
+        self.model_config = {
+            "provider": "openai",
+            "endpoint": f"http://127.0.0.1:{self.server.server_port}/v1/chat",
+        }
+        self.models_patch = patch.dict(
+            self.manager.models, {"stub-model": self.model_config}
+        )
+        self.keys_patch = patch.dict(self.manager.api_keys, {"openai": "test-key"})
+        self.models_patch.start()
+        self.keys_patch.start()
+        _StubProviderHandler.stream_delay = 0.0
+
+    def tearDown(self):
+        self.models_patch.stop()
+        self.keys_patch.stop()
+
+    def test_infer_uses_pooled_session(self):
+        """Test that repeated inferences reuse one HTTP session."""
+        self.assertEqual(self.manager.infer("stub-model", "hi"), "echo:hi")
+        session = self.manager._get_session()
+        self.assertEqual(self.manager.infer("stub-model", "again"), "echo:again")
+        self.assertIs(self.manager._get_session(), session)
+
+    def test_infer_stream_yields_tokens(self):
+        """Test that streamed tokens arrive in order."""
+        tokens = list(self.manager.infer_stream("stub-model", "hello"))
+        self.assertEqual(tokens, ["echo", ":", "hello"])
+
+    def test_infer_stream_is_recorded_by_router(self):
+        """Test that streamed requests feed the router's latency and breakers."""
+        with patch.object(self.manager, "router", ModelRouter()):
+            list(self.manager.infer_stream("stub-model", "hello"))
+            stats = self.manager.router.get_stats()
+        self.assertEqual(stats["models"]["stub-model"]["calls"], 1)
+        self.assertIn("openai", stats["circuits"])
+
+    def test_infer_batch_preserves_order(self):
+        """Test that batch results line up with their inputs."""
+        inputs = [f"prompt-{i}" for i in range(8)]
+        results = self.manager.infer_batch("stub-model", inputs)
+        self.assertEqual(results, [f"echo:{item}" for item in inputs])
+
+    def test_infer_async_with_token_callback(self):
+        """Test async inference reporting tokens through a callback."""
+        received = []
+
+        async def run():
+            return await self.manager.infer_async(
+                "stub-model", "async", on_token=received.append
+            )
+
+        self.assertEqual(asyncio.run(run()), "echo:async")
+        self.assertEqual(received, ["echo", ":", "async"])
+
+    def test_infer_stream_cancellation(self):
+        """Test that setting the cancel event aborts a stream."""
+        _StubProviderHandler.stream_delay = 0.05
+        cancel_event = threading.Event()
+        stream = self.manager.infer_stream(
+            "stub-model", "slow", cancel_event=cancel_event
+        )
+        self.assertEqual(next(stream), "echo")
+        cancel_event.set()
+        with self.assertRaises(InferenceCancelledError):
+            list(stream)
+
 
 class TestAIFunctions(unittest.TestCase):
     def test_get_ai_suggestion(self):
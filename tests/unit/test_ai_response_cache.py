@@ -0,0 +1,145 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from core.ai_response_cache import (
+    CACHE_HIT,
+    CACHE_MISS,
+    CACHE_SEMANTIC_HIT,
+    ResponseCache,
+    make_cache_key,
+)
+
+
+class TestResponseCache(unittest.TestCase):
+    def test_key_normalization(self):
+        """Test that whitespace and context key order do not change the key."""
+        self.assertEqual(
+            make_cache_key("m", "hello   world\n", {"a": 1, "b": 2}),
+            make_cache_key("m", "hello world", {"b": 2, "a": 1}),
+        )
+        self.assertNotEqual(make_cache_key("m1", "x"), make_cache_key("m2", "x"))
+
+    def test_exact_hit_and_miss(self):
+        """Test exact lookups."""
+        cache = ResponseCache()
+        self.assertEqual(cache.get("m", "prompt"), (None, CACHE_MISS))
+        cache.put("m", "prompt", "answer")
+        self.assertEqual(cache.get("m", "prompt"), ("answer", CACHE_HIT))
+        self.assertEqual(cache.get("other", "prompt"), (None, CACHE_MISS))
+
+    def test_ttl_expiry(self):
+        """Test that entries expire after the TTL."""
+        cache = ResponseCache(ttl=10)
+        with patch("core.ai_response_cache.time.time", return_value=1000.0):
+            cache.put("m", "prompt", "answer")
+        with patch("core.ai_response_cache.time.time", return_value=1011.0):
+            self.assertEqual(cache.get("m", "prompt"), (None, CACHE_MISS))
+
+    def test_lru_cap(self):
+        """Test that the least recently used entry is evicted."""
+        cache = ResponseCache(max_entries=2)
+        cache.put("m", "a", 1)
+        cache.put("m", "b", 2)
+        cache.get("m", "a")
+        cache.put("m", "c", 3)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get("m", "b"), (None, CACHE_MISS))
+        self.assertEqual(cache.get("m", "a"), (1, CACHE_HIT))
+
+    def test_byte_budget(self):
+        """Test that least recently used entries are evicted beyond the byte cap."""
+        cache = ResponseCache(max_bytes=100)
+        cache.put("m", "a", "x" * 60)
+        cache.put("m", "b", "y" * 60)
+        cache.put("m", "huge", "z" * 200)
+        self.assertEqual(cache.get("m", "a"), (None, CACHE_MISS))
+        self.assertEqual(cache.get("m", "b"), ("y" * 60, CACHE_HIT))
+        self.assertEqual(cache.get("m", "huge"), (None, CACHE_MISS))
+        stats = cache.stats()
+        self.assertLessEqual(stats["bytes"], 100)
+        self.assertEqual(stats["evictions"], 1)
+
+    def test_stats_and_clear_by_model(self):
+        """Test the counters and that clearing one model keeps the others."""
+        cache = ResponseCache()
+        cache.put("openai/gpt-4", "prompt", "old")
+        cache.put("openai/gpt-4o", "prompt", "new")
+        cache.get("openai/gpt-4", "prompt")
+        cache.get("openai/gpt-4", "other")
+        self.assertEqual(cache.clear("openai/gpt-4"), 1)
+        self.assertEqual(cache.get("openai/gpt-4o", "prompt"), ("new", CACHE_HIT))
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (2, 1))
+        self.assertAlmostEqual(stats["hit_rate"], 2 / 3)
+        self.assertEqual(stats["entries"], 1)
+
+    def test_near_duplicate_lookup(self):
+        """Test that a slightly different prompt reuses the cached response."""
+        cache = ResponseCache(similarity_threshold=0.8)
+        cache.put("m", "Summarize the quarterly sales report for the board", "summary")
+        response, outcome = cache.get(
+            "m", "Summarize the quarterly sales report for the board please"
+        )
+        self.assertEqual((response, outcome), ("summary", CACHE_SEMANTIC_HIT))
+        self.assertEqual(
+            cache.get("m", "Write a poem about autumn leaves"), (None, CACHE_MISS)
+        )
+
+    def test_near_duplicate_requires_same_history(self):
+        """Test that near-duplicates with a different conversation do not match."""
+        cache = ResponseCache(similarity_threshold=0.8)
+        cache.put("m", "What should I do next?", "a", {"history": [{"content": "x"}]})
+        self.assertEqual(
+            cache.get("m", "What should I do next ?", {"history": []}),
+            (None, CACHE_MISS),
+        )
+
+    def test_persistence(self):
+        """Test that entries survive a save/load cycle."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "cache.json")
+            cache = ResponseCache(persist_path=path)
+            cache.put("m", "prompt", {"steps": [1, 2]})
+            cache.save()
+            reloaded = ResponseCache(persist_path=path)
+            self.assertEqual(
+                reloaded.get("m", "prompt"), ({"steps": [1, 2]}, CACHE_HIT)
+            )
+
+    def test_concurrent_saves(self):
+        """Test that saves from several threads do not clash on the temp file."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "cache.json")
+            cache = ResponseCache(persist_path=path)
+            for i in range(50):
+                cache.put("m", f"prompt {i}", {"steps": list(range(20))})
+
+            def save_repeatedly():
+                for _ in range(20):
+                    cache.save()
+
+            threads = [threading.Thread(target=save_repeatedly) for _ in range(8)]
+            with patch("core.ai_response_cache.logger.error") as log_error:
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+            log_error.assert_not_called()
+            self.assertEqual(len(ResponseCache(persist_path=path)), 50)
+
+    def test_near_duplicate_skips_other_embedding_sizes(self):
+        """Test that entries embedded with another dimension are not compared."""
+        cache = ResponseCache(similarity_threshold=0.8)
+        cache.put("m", "Summarize the quarterly sales report", "summary")
+        cache.embedder = lambda text: [1.0, 0.0]
+        self.assertEqual(
+            cache.get("m", "Summarize the quarterly sales report please"),
+            (None, CACHE_MISS),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+
+from core.ai_router import (
+    CIRCUIT_CLOSED,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN,
+    POLICY_BANDIT,
+    ModelRouter,
+    ProviderCircuitBreaker,
+)
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+MODELS = {
+    "fast": {"provider": "openai", "cost_per_1k_tokens": 0.01, "max_tokens": 100},
+    "slow": {"provider": "anthropic", "cost_per_1k_tokens": 0.001, "max_tokens": 100},
+}
+
+
+class TestProviderCircuitBreaker(unittest.TestCase):
+    def test_open_half_open_and_close(self):
+        """Test the circuit lifecycle from failures to a successful probe."""
+        clock = _FakeClock()
+        breaker = ProviderCircuitBreaker(
+            failure_threshold=2, recovery_timeout=30, clock=clock
+        )
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CIRCUIT_CLOSED)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CIRCUIT_OPEN)
+        self.assertFalse(breaker.allow_request())
+
+        clock.now = 31
+        self.assertEqual(breaker.state, CIRCUIT_HALF_OPEN)
+        self.assertTrue(breaker.allow_request())
+        self.assertFalse(breaker.allow_request())
+        breaker.record_success()
+        self.assertEqual(breaker.state, CIRCUIT_CLOSED)
+
+    def test_failed_probe_reopens(self):
+        """Test that a failing half-open probe opens the circuit again."""
+        clock = _FakeClock()
+        breaker = ProviderCircuitBreaker(
+            failure_threshold=1, recovery_timeout=10, clock=clock
+        )
+        breaker.record_failure()
+        clock.now = 11
+        self.assertTrue(breaker.allow_request())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CIRCUIT_OPEN)
+
+
+class TestModelRouter(unittest.TestCase):
+    def test_untried_models_are_measured_first(self):
+        """Test that every model is tried before exploiting the best one."""
+        router = ModelRouter()
+        router.record("fast", "openai", 1.0, True)
+        self.assertEqual(router.select(MODELS), "slow")
+
+    def test_prefers_model_meeting_slo(self):
+        """Test that a model missing the task SLO loses to one meeting it."""
+        router = ModelRouter(slos={"code": 2.0})
+        for _ in range(5):
+            router.record("fast", "openai", 1.0, True)
+            router.record("slow", "anthropic", 8.0, True)
+        self.assertEqual(router.select(MODELS, task_type="code"), "fast")
+
+    def test_failing_provider_is_skipped(self):
+        """Test that an open circuit removes the provider's models."""
+        router = ModelRouter(failure_threshold=3)
+        router.record("slow", "anthropic", 1.0, True)
+        for _ in range(3):
+            router.record("fast", "openai", 0.1, False)
+        self.assertEqual(router.select(MODELS), "slow")
+        self.assertIsNone(router.select(MODELS, exclude=["slow"]))
+        self.assertEqual(router.get_stats()["circuits"]["openai"], CIRCUIT_OPEN)
+
+    def test_cost_budget(self):
+        """Test that models over the task budget are filtered out."""
+        router = ModelRouter(cost_budgets={"general": 0.0005})
+        for _ in range(3):
+            router.record("fast", "openai", 0.5, True)
+            router.record("slow", "anthropic", 5.0, True)
+        self.assertEqual(router.select(MODELS, input_data="x" * 400), "slow")
+
+    def test_bandit_explores_rarely_used_model(self):
+        """Test that the UCB bonus eventually retries a worse model."""
+        router = ModelRouter(policy=POLICY_BANDIT, exploration=1.0)
+        router.record("slow", "anthropic", 20.0, True)
+        for _ in range(30):
+            router.record("fast", "openai", 1.0, True)
+        self.assertEqual(router.select(MODELS), "slow")
+
+    def test_invalid_policy(self):
+        with self.assertRaises(ValueError):
+            ModelRouter(policy="random")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,9 @@
+import math
+import threading
+import time
 import unittest
 
-from core.async_task_manager import AsyncTaskManager
+from core.async_task_manager import AsyncTaskManager, TaskDeadlineExceeded
 
 
 class TestAsyncTaskManager(unittest.TestCase):
@@ -76,5 +79,149 @@ class TestAsyncTaskManager(unittest.TestCase):
             self.task_manager.stop()
 
 
+class TestAsyncTaskManagerPool(unittest.TestCase):
+    def setUp(self):
+        self.task_manager = AsyncTaskManager(num_workers=1)
+        self.release = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+        self.task_manager.stop()
+
+    def _block_worker(self):
+        """Occupy the single worker until ``self.release`` is set."""
+        started = threading.Event()
+
+        def blocker():
+            started.set()
+            self.release.wait(5)
+
+        self.task_manager.submit_task(blocker)
+        self.task_manager.start()
+        self.assertTrue(started.wait(5))
+
+    def test_future_result(self):
+        """Test that submit_task returns a future resolving to the result."""
+        self.task_manager.start()
+        future = self.task_manager.submit_task(lambda: 42)
+        self.assertEqual(future.result(timeout=5), 42)
+
+    def test_interactive_lane_runs_first(self):
+        """Test that interactive tasks overtake queued background tasks."""
+        order = []
+        self._block_worker()
+        background = self.task_manager.submit_task(lambda: order.append("background"))
+        interactive = self.task_manager.submit_task(
+            lambda: order.append("interactive"), priority="interactive"
+        )
+        self.release.set()
+        background.result(timeout=5)
+        interactive.result(timeout=5)
+        self.assertEqual(order, ["interactive", "background"])
+
+    def test_cancel_queued_task(self):
+        """Test that a queued task can be cancelled before it starts."""
+        ran = []
+        self._block_worker()
+        future = self.task_manager.submit_task(
+            lambda: ran.append(True), name="cancel-me"
+        )
+        self.assertTrue(future.cancel())
+        self.release.set()
+        self.task_manager.submit_task(lambda: None).result(timeout=5)
+        self.assertEqual(ran, [])
+        self.assertEqual(self.task_manager.get_metrics()["cancel-me"]["cancelled"], 1)
+
+    def test_deadline_expires_in_queue(self):
+        """Test that a task whose deadline passes while queued never runs."""
+        self._block_worker()
+        future = self.task_manager.submit_task(lambda: "late", deadline=0.01)
+        time.sleep(0.05)
+        self.release.set()
+        with self.assertRaises(TaskDeadlineExceeded):
+            future.result(timeout=5)
+
+    def test_failure_sets_exception(self):
+        """Test that a failing task resolves its future with the exception."""
+        self.task_manager.start()
+
+        def fail():
+            raise RuntimeError("boom")
+
+        future = self.task_manager.submit_task(fail, name="fail")
+        with self.assertRaises(RuntimeError):
+            future.result(timeout=5)
+        self.assertEqual(self.task_manager.get_metrics()["fail"]["failed"], 1)
+
+    def test_per_type_concurrency_limit(self):
+        """Test that tasks of a limited type never run concurrently."""
+        manager = AsyncTaskManager(num_workers=4, concurrency_limits={"ui": 1})
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def ui_task():
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.01)
+            with lock:
+                active -= 1
+
+        manager.start()
+        try:
+            futures = [manager.submit_task(ui_task, task_type="ui") for _ in range(8)]
+            for future in futures:
+                future.result(timeout=5)
+        finally:
+            manager.stop()
+        self.assertEqual(peak, 1)
+
+    def test_metrics(self):
+        """Test that queue latency and run time are recorded per task name."""
+        self.task_manager.start()
+        self.task_manager.submit_task(lambda: time.sleep(0.02), name="sleep").result(
+            timeout=5
+        )
+        metrics = self.task_manager.get_metrics()["sleep"]
+        self.assertEqual(metrics["completed"], 1)
+        self.assertEqual(metrics["run_time"]["count"], 1)
+        self.assertGreaterEqual(metrics["run_time"]["max"], 0.02)
+        self.assertEqual(metrics["queue_latency"]["count"], 1)
+
+    def test_stop_is_prompt_and_cancels_backlog(self):
+        """Test that stop() does not wait for queued tasks or poll timeouts."""
+        self._block_worker()
+        queued = self.task_manager.submit_task(lambda: None)
+        self.release.set()
+        start = time.monotonic()
+        self.task_manager.stop()
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertTrue(queued.cancelled() or queued.done())
+
+    def test_busy_worker_exits_after_stop_without_wait(self):
+        """A worker busy during stop(wait=False) still finds its sentinel."""
+        self._block_worker()
+        worker = self.task_manager.worker_threads[0]
+        queued = self.task_manager.submit_task(lambda: None)
+        self.task_manager.stop(wait=False)
+        self.assertTrue(queued.cancelled())
+
+        self.release.set()
+        worker.join(5)
+        self.assertFalse(worker.is_alive())
+
+    def test_process_executor(self):
+        """Test running a picklable task in the process pool."""
+        self.task_manager.start()
+        future = self.task_manager.submit_task(_factorial_10, executor="process")
+        self.assertEqual(future.result(timeout=30), math.factorial(10))
+
+
+def _factorial_10():
+    return math.factorial(10)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,195 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from tools.code_reader_tool import (
+    MATCH_FUZZY,
+    MATCH_PREFIX,
+    CodeElement,
+    CodeIndex,
+    CodeReaderTool,
+    FileAnalysis,
+)
+
+
+def _analysis(path, *names, element_type="function"):
+    elements = [
+        CodeElement(
+            name=name,
+            type=element_type,
+            file_path=path,
+            line_number=line,
+            end_line=line,
+            signature=f"{name}()",
+            docstring=None,
+        )
+        for line, name in enumerate(names, 1)
+    ]
+    return FileAnalysis(
+        path=path,
+        hash="0",
+        size=0,
+        lines=len(names),
+        last_modified=0.0,
+        elements=elements,
+        imports=[],
+        dependencies=[],
+        complexity=len(names),
+    )
+
+
+class TestCodeIndex(unittest.TestCase):
+    def setUp(self):
+        """Set up an index with a few functions and a class."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.index = CodeIndex(os.path.join(self.temp_dir, "index.bin"))
+        self.index.add_file_analysis(
+            _analysis("a.py", "load_cache", "save_cache", "cache", "load_config")
+        )
+        self.index.add_file_analysis(
+            _analysis("b.py", "CacheManager", element_type="class")
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _names(self, query, **kwargs):
+        return [e.name for e in self.index.search_elements(query, **kwargs)]
+
+    def test_substring_search(self):
+        """Names containing the query are found, earliest and shortest first."""
+        self.assertEqual(
+            self._names("cache"), ["cache", "CacheManager", "load_cache", "save_cache"]
+        )
+        self.assertEqual(self._names("ca", element_type="class"), ["CacheManager"])
+        self.assertEqual(self._names("e_c"), ["save_cache"])
+        self.assertEqual(self._names("missing"), [])
+
+    def test_prefix_search(self):
+        """Prefix search only returns names starting with the query."""
+        self.assertEqual(
+            self._names("load", match=MATCH_PREFIX), ["load_cache", "load_config"]
+        )
+        self.assertEqual(self._names("ache", match=MATCH_PREFIX), [])
+
+    def test_fuzzy_search(self):
+        """Fuzzy search tolerates typos."""
+        self.assertEqual(self._names("lod_cahce", match=MATCH_FUZZY)[0], "load_cache")
+        self.assertEqual(self._names("zzzzzz", match=MATCH_FUZZY), [])
+
+    def test_reindexing_a_file_replaces_its_elements(self):
+        """Re-adding a file drops its old names from every lookup."""
+        self.index.add_file_analysis(_analysis("a.py", "load_settings"))
+        self.assertEqual(self._names("cache"), ["CacheManager"])
+        self.assertEqual(self._names("load", match=MATCH_PREFIX), ["load_settings"])
+        self.assertNotIn("ave", self.index._trigram_names)
+        self.assertTrue(self.index.remove_file("a.py"))
+        self.assertFalse(self.index.remove_file("a.py"))
+        self.assertEqual(self._names("load"), [])
+
+    def test_binary_cache_round_trip(self):
+        """The binary cache restores files and elements."""
+        self.index.save_cache()
+        with open(self.index.cache_file, "rb") as f:
+            self.assertTrue(f.read().startswith(b"ATLASIDX"))
+
+        loaded = CodeIndex(self.index.cache_file)
+        self.assertEqual(loaded.files, self.index.files)
+        self.assertEqual(
+            [e.name for e in loaded.search_elements("cache")], self._names("cache")
+        )
+        self.assertGreater(loaded.timestamp, 0)
+
+    def test_cache_in_other_format_is_ignored(self):
+        """A cache file in an older format loads as an empty index."""
+        with open(self.index.cache_file, "w") as f:
+            f.write('{"files": {}}')
+        self.assertEqual(CodeIndex(self.index.cache_file).files, {})
+
+
+class TestCodeReaderToolIndexing(unittest.TestCase):
+    def setUp(self):
+        """Set up a tool on a temporary tree without background indexing."""
+        self.root = tempfile.mkdtemp()
+        self._write("pkg/module.py", "def first():\n    pass\n")
+        self._write("pkg/other.py", "class Other:\n    def method(self):\n        pass")
+        self._write("venv/ignored.py", "def ignored():\n    pass\n")
+        with patch.dict(os.environ, {"ATLAS_DISABLE_CODE_INDEXING": "1"}):
+            self.tool = CodeReaderTool(self.root)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def _write(self, relative_path, content):
+        path = os.path.join(self.root, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def test_only_changed_files_are_parsed(self):
+        """Unchanged files are skipped; edits, touches and deletions are tracked."""
+        stats = self.tool.rebuild_index()
+        self.assertEqual((stats["parsed"], stats["files"]), (2, 2))
+        self.assertNotIn(os.path.join("venv", "ignored.py"), self.tool.index.files)
+
+        self.assertEqual(self.tool.rebuild_index()["parsed"], 0)
+
+        path = self._write("pkg/module.py", "def second():\n    pass\n")
+        os.utime(path, (1, 1))
+        stats = self.tool.rebuild_index()
+        self.assertEqual((stats["parsed"], stats["unchanged"]), (1, 1))
+        self.assertEqual([e.name for e in self.tool.index.search_elements("first")], [])
+        self.assertEqual(len(self.tool.index.search_elements("second")), 1)
+
+        os.utime(path, (2, 2))
+        self.assertEqual(self.tool.rebuild_index()["parsed"], 0)
+        analysis = self.tool.index.files[os.path.join("pkg", "module.py")]
+        self.assertEqual(analysis.last_modified, 2)
+
+        os.remove(path)
+        stats = self.tool.rebuild_index()
+        self.assertEqual((stats["removed"], stats["files"]), (1, 1))
+
+    def test_unparsable_file_is_not_parsed_again(self):
+        """A file with a syntax error is retried only after it changes."""
+        self._write("broken.py", "def broken(:\n")
+        self.assertEqual(self.tool.rebuild_index()["parsed"], 3)
+        self.assertEqual(self.tool.rebuild_index()["parsed"], 0)
+
+    def test_index_survives_restart(self):
+        """A new tool loads the cache and has nothing left to parse."""
+        self.tool.rebuild_index()
+        with patch.dict(os.environ, {"ATLAS_DISABLE_CODE_INDEXING": "1"}):
+            tool = CodeReaderTool(self.root)
+        self.assertEqual(len(tool.index.files), 2)
+        self.assertEqual(tool.rebuild_index()["parsed"], 0)
+
+    def test_many_files_are_parsed_in_processes(self):
+        """Large batches are parsed by worker processes, without a file cap."""
+        for i in range(250):
+            self._write(f"gen/mod_{i}.py", f"def func_{i}():\n    return {i}\n")
+        # Indexing normally runs on a background thread, so workers are spawned
+        results = []
+        with patch(
+            "tools.code_reader_tool.multiprocessing.get_context",
+            wraps=multiprocessing.get_context,
+        ) as get_context:
+            thread = threading.Thread(
+                target=lambda: results.append(self.tool.rebuild_index(max_workers=2))
+            )
+            thread.start()
+            thread.join()
+        get_context.assert_called_once_with("spawn")
+        stats = results[0]
+        self.assertEqual(stats["files"], 252)
+        elements = self.tool.index.search_elements("func_24", match=MATCH_PREFIX)
+        self.assertEqual(len(elements), 11)
+
+
+if __name__ == "__main__":
+    unittest.main()
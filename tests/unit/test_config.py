@@ -3,6 +3,7 @@ import os
 import sys
 import tempfile
 import unittest
+from unittest.mock import patch
 
 # Third-party imports
 # Local application imports
@@ -28,6 +29,14 @@ class TestConfig(unittest.TestCase):
         self.temp_dir = tempfile.mkdtemp()
         self.config_file = os.path.join(self.temp_dir, "test_config.yaml")
 
+    def test_lazy_startup_is_opt_in(self):
+        """Test that lazy imports are only enabled by ATLAS_LAZY_STARTUP."""
+        with patch.dict(os.environ):
+            os.environ.pop("ATLAS_LAZY_STARTUP", None)
+            self.assertFalse(Config().get("startup.lazy_imports"))
+            os.environ["ATLAS_LAZY_STARTUP"] = "1"
+            self.assertTrue(Config().get("startup.lazy_imports"))
+
     def test_initialization(self):
         """Test that the config initializes correctly."""
         self.assertIsNotNone(self.config._config)
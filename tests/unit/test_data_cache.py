@@ -1,7 +1,9 @@
+import asyncio
 import unittest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, call, patch
 
 from core.data_cache import DataCache
+from utils.cache_manager import CacheManager, LRUCache
 
 
 class TestDataCache(unittest.IsolatedAsyncioTestCase):
@@ -95,5 +97,211 @@ class TestDataCache(unittest.IsolatedAsyncioTestCase):
             )
 
 
+class TestDataCacheMemoryBackend(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        """Use the in-memory backend so no Redis server is needed."""
+        self.data_cache = DataCache(backend="memory")
+
+    async def test_initialize_without_redis(self):
+        """Test that the cache works when Redis is unavailable."""
+        await self.data_cache.initialize()
+        self.assertTrue(self.data_cache.initialized)
+        self.assertTrue(self.data_cache.cache_manager.memory_mode)
+
+    async def test_roundtrip_and_stats(self):
+        """Test set/get through the in-memory backend and hit/miss counters."""
+        await self.data_cache.set_user_data("1", {"name": "Ann"})
+        self.assertEqual(await self.data_cache.get_user_data("1"), {"name": "Ann"})
+        self.assertIsNone(await self.data_cache.get_user_data("2"))
+        stats = self.data_cache.get_stats()
+        self.assertEqual(stats["l1_hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["backend"], "memory")
+
+    async def test_batch_operations(self):
+        """Test batched user data reads and writes."""
+        await self.data_cache.set_users_data({"1": {"n": 1}, "2": {"n": 2}})
+        result = await self.data_cache.get_users_data(["1", "2", "3"])
+        self.assertEqual(result, {"1": {"n": 1}, "2": {"n": 2}, "3": None})
+
+    async def test_get_or_load_single_flight(self):
+        """Test that concurrent misses share a single loader call."""
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"name": "Loaded"}
+
+        results = await asyncio.gather(
+            *(self.data_cache.get_or_load_user_data("1", loader) for _ in range(10))
+        )
+        self.assertEqual(calls, 1)
+        self.assertTrue(all(result == {"name": "Loaded"} for result in results))
+        self.assertEqual(await self.data_cache.get_user_data("1"), {"name": "Loaded"})
+
+    async def test_invalidate_user_cache_removes_task_lists(self):
+        """Test that invalidating a user also removes their task lists."""
+        await self.data_cache.set_user_data("1", {"name": "Ann"})
+        await self.data_cache.set_task_list("1", "inbox", [{"id": 1}])
+        await self.data_cache.set_task_list("1", "work", [{"id": 2}])
+        await self.data_cache.set_task_list("2", "inbox", [{"id": 3}])
+
+        self.assertTrue(await self.data_cache.invalidate_user_cache("1"))
+
+        self.assertIsNone(await self.data_cache.get_user_data("1"))
+        self.assertIsNone(await self.data_cache.get_task_list("1", "inbox"))
+        self.assertIsNone(await self.data_cache.get_task_list("1", "work"))
+        self.assertEqual(await self.data_cache.get_task_list("2", "inbox"), [{"id": 3}])
+
+
+class TestCacheManager(unittest.IsolatedAsyncioTestCase):
+    async def test_ttl_expiry(self):
+        """Test that in-memory entries expire after their TTL."""
+        cache = CacheManager(backend="memory")
+        with patch("utils.cache_manager.time.monotonic", return_value=100.0):
+            await cache.set("key", "value", ttl=5)
+        with patch("utils.cache_manager.time.monotonic", return_value=104.0):
+            self.assertEqual(await cache.get("key"), "value")
+        with patch("utils.cache_manager.time.monotonic", return_value=106.0):
+            self.assertIsNone(await cache.get("key"))
+
+    async def test_redis_set_uses_atomic_expiry(self):
+        """Test that values are written with SET EX instead of SET + EXPIRE."""
+        cache = CacheManager(backend="memory")
+        cache.client = AsyncMock()
+        cache.connected = True
+        await cache.set("key", {"a": 1}, ttl=60)
+        cache.client.set.assert_awaited_once_with("key", '{"a": 1}', ex=60)
+        cache.client.expire.assert_not_called()
+
+    async def test_failed_redis_set_returns_false(self):
+        """Test that a failed Redis write is reported and the value kept in memory."""
+        redis_error = type("RedisError", (Exception,), {})
+        cache = CacheManager(backend="memory")
+        cache.client = AsyncMock()
+        cache.client.set.side_effect = redis_error("connection lost")
+        cache.connected = True
+        with patch("utils.cache_manager.redis") as redis_module:
+            redis_module.RedisError = redis_error
+            self.assertFalse(await cache.set("key", "value"))
+        self.assertFalse(cache.connected)
+        self.assertEqual(await cache.get("key"), "value")
+        self.assertTrue(await cache.set("key", "other"))
+
+    async def test_failed_redis_mset_returns_false(self):
+        """Test that a failed pipelined write is reported like a failed set."""
+        redis_error = type("RedisError", (Exception,), {})
+        cache = CacheManager(backend="memory")
+        cache.client = AsyncMock()
+        pipe = MagicMock()
+        pipe.__aenter__.return_value = pipe
+        pipe.execute = AsyncMock(side_effect=redis_error("connection lost"))
+        cache.client.pipeline = MagicMock(return_value=pipe)
+        cache.connected = True
+        with patch("utils.cache_manager.redis") as redis_module:
+            redis_module.RedisError = redis_error
+            self.assertFalse(await cache.mset({"a": 1, "b": 2}))
+        self.assertFalse(cache.connected)
+        self.assertEqual(await cache.mget(["a", "b"]), {"a": 1, "b": 2})
+
+    async def test_l1_serves_repeated_reads(self):
+        """Test that Redis is only queried on the first read of a key."""
+        cache = CacheManager(backend="memory")
+        cache.client = AsyncMock()
+        cache.client.get.return_value = '{"a": 1}'
+        cache.connected = True
+        self.assertEqual(await cache.get("key"), {"a": 1})
+        self.assertEqual(await cache.get("key"), {"a": 1})
+        cache.client.get.assert_awaited_once_with("key")
+
+    async def test_invalidate_tag(self):
+        """Test removing every key with a tag in one call."""
+        cache = CacheManager(backend="memory")
+        await cache.set("a", 1, tags=["group:1"])
+        await cache.mset({"b": 2, "c": 3}, tags={"b": ["group:1"], "c": ["group:2"]})
+        self.assertEqual(await cache.invalidate_tag("group:1"), 2)
+        self.assertEqual(
+            await cache.mget(["a", "b", "c"]), {"a": None, "b": None, "c": 3}
+        )
+        self.assertEqual(await cache.invalidate_tag("group:1"), 0)
+
+    async def test_retagging_replaces_old_tags(self):
+        """Test that rewriting a key moves it to its new tags."""
+        cache = CacheManager(backend="memory")
+        await cache.set("a", 1, tags=["old"])
+        await cache.set("a", 2, tags=["new"])
+        self.assertEqual(await cache.invalidate_tag("old"), 0)
+        self.assertEqual(await cache.get("a"), 2)
+
+    async def test_evicted_keys_leave_tag_index(self):
+        """Test that LRU eviction also cleans the tag index in memory mode."""
+        cache = CacheManager(backend="memory", l1_max_size=1)
+        await cache.set("a", 1, tags=["t1"])
+        await cache.set("b", 2, tags=["t2"])
+        self.assertEqual(cache.get_stats()["tags"], 1)
+
+    async def test_invalidate_pattern(self):
+        """Test glob invalidation of in-memory keys."""
+        cache = CacheManager(backend="memory")
+        await cache.mset({"user:1:tasks:a": 1, "user:1:tasks:b": 2, "user:1:data": 3})
+        self.assertEqual(await cache.invalidate_pattern("user:1:tasks:*"), 2)
+        self.assertEqual(await cache.get("user:1:data"), 3)
+
+    async def test_redis_invalidate_tag_uses_sscan(self):
+        """Test that Redis tag invalidation reads the tag set instead of KEYS."""
+        cache = CacheManager(backend="memory")
+        cache.client = AsyncMock()
+        cache.connected = True
+
+        tag_sets = {"__tag__:user:1": ["k1"], "__tagttl__:user:1": ["k2"]}
+
+        async def members(tag_key, **kwargs):
+            for key in tag_sets[tag_key]:
+                yield key
+
+        cache.client.sscan_iter = members
+        self.assertEqual(await cache.invalidate_tag("user:1"), 2)
+        cache.client.delete.assert_awaited_once_with(
+            "k1", "k2", "__tag__:user:1", "__tagttl__:user:1"
+        )
+        cache.client.keys.assert_not_called()
+
+    async def test_redis_tag_sets_expire_with_their_keys(self):
+        """Test that tag sets of expiring keys get a TTL that is only extended."""
+        cache = CacheManager(backend="memory")
+        cache.client = AsyncMock()
+        pipe = MagicMock()
+        pipe.__aenter__.return_value = pipe
+        pipe.execute = AsyncMock()
+        cache.client.pipeline = MagicMock(return_value=pipe)
+        cache.connected = True
+
+        await cache.set("k1", 1, ttl=60, tags=["user:1"])
+        pipe.sadd.assert_called_once_with("__tagttl__:user:1", "k1")
+        pipe.expire.assert_has_calls(
+            [
+                call("__tagttl__:user:1", 60, nx=True),
+                call("__tagttl__:user:1", 60, gt=True),
+            ]
+        )
+
+        pipe.reset_mock()
+        await cache.mset({"k2": 2}, tags={"k2": ["user:1"]})
+        pipe.sadd.assert_called_once_with("__tag__:user:1", "k2")
+        pipe.expire.assert_not_called()
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        lru = LRUCache(max_size=2)
+        lru.set("a", 1)
+        lru.set("b", 2)
+        lru.get("a")
+        lru.set("c", 3)
+        self.assertEqual(sorted(lru.keys()), ["a", "c"])
+        self.assertEqual(lru.evictions, 1)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,135 @@
+import os
+import tempfile
+import threading
+import unittest
+
+import numpy as np
+
+from utils.embeddings import EmbeddingCache, embed_texts
+from utils.providers.local_provider import LocalEmbeddingProvider
+
+
+class CountingProvider(LocalEmbeddingProvider):
+    """Local provider that records the batches it is asked to embed."""
+
+    EMBEDDING_BATCH_SIZE = 4
+
+    def __init__(self):
+        super().__init__(dimension=8)
+        self.batches = []
+        self.threads = set()
+
+    def get_embeddings(self, texts, model=None):
+        self.batches.append(list(texts))
+        self.threads.add(threading.get_ident())
+        return super().get_embeddings(texts, model)
+
+
+class TestLocalEmbeddingProvider(unittest.TestCase):
+    def test_deterministic_and_normalized(self):
+        """Equal texts get equal unit vectors; shared words raise similarity."""
+        provider = LocalEmbeddingProvider()
+        a, b, c = np.asarray(
+            provider.get_embeddings(
+                ["send the report", "send the report by email", "water the plants"]
+            )
+        )
+        np.testing.assert_allclose(a, provider.get_embedding("send the report"))
+        self.assertAlmostEqual(float(np.linalg.norm(a)), 1.0, places=5)
+        self.assertGreater(a @ b, a @ c)
+
+
+class TestEmbedTexts(unittest.TestCase):
+    def setUp(self):
+        """Set up a temporary directory for the embedding cache."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = EmbeddingCache(self.temp_dir.name)
+        self.texts = [f"chunk number {i}" for i in range(10)]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_batches_follow_provider_limit(self):
+        """Texts are split into batches no larger than the provider allows."""
+        provider = CountingProvider()
+        vectors = embed_texts(provider, self.texts, batch_size=100, max_workers=1)
+        self.assertEqual(vectors.shape, (10, 8))
+        self.assertEqual(vectors.dtype, np.float32)
+        self.assertEqual([len(batch) for batch in provider.batches], [4, 4, 2])
+
+    def test_duplicates_are_embedded_once(self):
+        """Repeated texts share one request slot and one vector."""
+        provider = CountingProvider()
+        vectors = embed_texts(provider, ["same", "other", "same"])
+        self.assertEqual(provider.batches, [["same", "other"]])
+        np.testing.assert_array_equal(vectors[0], vectors[2])
+
+    def test_cached_texts_are_not_requested_again(self):
+        """Only new texts reach the provider, also from a reopened cache."""
+        provider = CountingProvider()
+        first = embed_texts(provider, self.texts[:6], cache=self.cache)
+
+        provider = CountingProvider()
+        cache = EmbeddingCache(self.temp_dir.name)
+        vectors = embed_texts(provider, self.texts, cache=cache)
+        self.assertEqual(sorted(sum(provider.batches, [])), sorted(self.texts[6:]))
+        np.testing.assert_array_equal(vectors[:6], first)
+
+    def test_batches_run_concurrently(self):
+        """Several batches are dispatched from worker threads."""
+        provider = CountingProvider()
+        embed_texts(provider, self.texts, batch_size=1, max_workers=4)
+        self.assertEqual(len(provider.batches), 10)
+        self.assertNotIn(threading.get_ident(), provider.threads)
+
+    def test_failed_batch_returns_empty_but_caches_the_rest(self):
+        """A failed batch empties the result; successful batches stay cached."""
+        provider = CountingProvider()
+        original = provider.get_embeddings
+        provider.get_embeddings = lambda texts, model=None: (
+            [] if "chunk number 9" in texts else original(texts, model)
+        )
+        vectors = embed_texts(provider, self.texts, cache=self.cache, max_workers=1)
+        self.assertEqual(vectors.size, 0)
+
+        provider = CountingProvider()
+        embed_texts(provider, self.texts, cache=self.cache)
+        self.assertEqual(provider.batches, [["chunk number 8", "chunk number 9"]])
+
+    def test_incomplete_rows_are_dropped_on_load(self):
+        """Vector bytes without a key, left by a crash, are truncated."""
+        provider = CountingProvider()
+        embed_texts(provider, self.texts[:2], cache=self.cache, namespace="ns")
+        vectors_path = os.path.join(self.temp_dir.name, "ns.f32")
+        with open(vectors_path, "ab") as f:
+            f.write(b"\0" * 20)
+
+        cache = EmbeddingCache(self.temp_dir.name)
+        self.assertEqual(len(cache._namespace("ns").rows), 2)
+        embed_texts(provider, self.texts[2:3], cache=cache, namespace="ns")
+        reopened = EmbeddingCache(self.temp_dir.name)
+        keys = list(cache._namespace("ns").rows)
+        self.assertEqual(len(reopened.get_many("ns", keys)), 3)
+        self.assertEqual(os.path.getsize(vectors_path), 3 * 8 * 4)
+
+    def test_caches_sharing_a_directory_keep_each_others_rows(self):
+        """Instances opened before each other's writes never mix up rows."""
+        first = EmbeddingCache(self.temp_dir.name)
+        second = EmbeddingCache(self.temp_dir.name)
+        first.get_many("ns", ["a"])
+        second.get_many("ns", ["b"])
+
+        vector_a = np.full((1, 4), 1.0, dtype=np.float32)
+        vector_b = np.full((1, 4), 2.0, dtype=np.float32)
+        first.put_many("ns", ["a"], vector_a)
+        second.put_many("ns", ["b"], vector_b)
+        first.put_many("ns", ["b"], vector_a)  # Already cached by the other
+
+        for cache in (first, second, EmbeddingCache(self.temp_dir.name)):
+            vectors = cache.get_many("ns", ["a", "b"])
+            np.testing.assert_array_equal(vectors["a"], vector_a[0])
+            np.testing.assert_array_equal(vectors["b"], vector_b[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
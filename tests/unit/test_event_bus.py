@@ -1,12 +1,14 @@
 # Standard library imports
 import sys
+import threading
+import time
 import unittest
 
 # Third-party imports
 from unittest.mock import Mock
 
 # Local application imports
-from core.event_bus import EventBus
+from core.event_bus import EventBus, TopicMatcher
 
 # Path configuration
 if ".." not in sys.path:
@@ -155,6 +157,205 @@ class TestEventBus(unittest.TestCase):
         callback1.assert_not_called()
         callback2.assert_not_called()
 
+    def test_subscribe_priority_order(self):
+        """Test that higher priority listeners are called first."""
+        calls = []
+        self.event_bus.subscribe("test_event", lambda: calls.append("low"))
+        self.event_bus.subscribe(
+            "test_event", lambda: calls.append("high"), priority=10
+        )
+        self.event_bus.subscribe("test_event", lambda: calls.append("low2"))
+        self.event_bus.publish("test_event")
+        self.assertEqual(calls, ["high", "low", "low2"])
+
+    def test_invalid_dispatch_options(self):
+        """Test that unsupported dispatch options are rejected."""
+        with self.assertRaises(ValueError):
+            EventBus(dispatch_mode="threaded")
+        with self.assertRaises(ValueError):
+            EventBus(dispatch_mode="async", backpressure="ignore")
+
+
+class TestTopicRouting(unittest.TestCase):
+    def setUp(self):
+        self.event_bus = EventBus()
+
+    def test_single_segment_wildcard(self):
+        """Test that '*' matches exactly one segment."""
+        callback = Mock()
+        self.event_bus.subscribe("module.*.error", callback)
+        self.event_bus.publish("module.db.error", code=1)
+        self.event_bus.publish("module.db.sub.error", code=2)
+        self.event_bus.publish("module.error", code=3)
+        callback.assert_called_once_with(code=1)
+
+    def test_multi_segment_wildcard(self):
+        """Test that '#' matches zero or more segments."""
+        callback = Mock()
+        self.event_bus.subscribe("workflow.#", callback)
+        self.event_bus.publish("workflow")
+        self.event_bus.publish("workflow.step")
+        self.event_bus.publish("workflow.step.done")
+        self.event_bus.publish("module.step")
+        self.assertEqual(callback.call_count, 3)
+
+    def test_colon_separated_module_events(self):
+        """Test that ':' also separates segments, as in module events."""
+        callback = Mock()
+        self.event_bus.subscribe("test_module:*", callback)
+        self.event_bus.publish("test_module:started")
+        callback.assert_called_once_with()
+
+    def test_exact_and_wildcard_listeners_merge_by_priority(self):
+        """Test call order across exact and wildcard subscriptions."""
+        calls = []
+        self.event_bus.subscribe("module.db.error", lambda: calls.append("exact"))
+        self.event_bus.subscribe("module.#", lambda: calls.append("urgent"), priority=5)
+        self.event_bus.subscribe("module.*.error", lambda: calls.append("pattern"))
+        self.event_bus.publish("module.db.error")
+        self.assertEqual(calls, ["urgent", "exact", "pattern"])
+
+    def test_listener_matched_twice_called_once(self):
+        """Test that a listener reached through two patterns is called once."""
+        callback = Mock()
+        self.event_bus.subscribe("module.#", callback)
+        self.event_bus.subscribe("module.*.error", callback)
+        self.event_bus.publish("module.db.error")
+        callback.assert_called_once_with()
+
+    def test_unsubscribe_wildcard(self):
+        """Test that unsubscribing a pattern invalidates cached routes."""
+        callback = Mock()
+        self.event_bus.subscribe("module.*", callback)
+        self.event_bus.publish("module.loaded")
+        self.event_bus.unsubscribe("module.*", callback)
+        self.event_bus.publish("module.loaded")
+        callback.assert_called_once_with()
+
+    def test_get_matching_listeners(self):
+        """Test resolving the listeners a topic would reach."""
+        exact = Mock()
+        pattern = Mock()
+        self.event_bus.subscribe("module.db.error", exact)
+        self.event_bus.subscribe("module.*.error", pattern)
+        self.assertEqual(
+            self.event_bus.get_matching_listeners("module.db.error"), [exact, pattern]
+        )
+        self.assertEqual(self.event_bus.get_listeners("module.db.error"), [exact])
+
+    def test_matcher_with_many_patterns(self):
+        """Test matching against thousands of patterns."""
+        matcher = TopicMatcher()
+        for i in range(5000):
+            matcher.add(f"module{i}.*.error")
+        matcher.add("#")
+        self.assertEqual(matcher.match("module42.db.error"), {"module42.*.error", "#"})
+        matcher.remove("module42.*.error")
+        self.assertEqual(matcher.match("module42.db.error"), {"#"})
+        self.assertEqual(len(matcher), 5000)
+
+
+class TestAsyncEventBus(unittest.TestCase):
+    def setUp(self):
+        self.event_bus = EventBus(dispatch_mode="async", num_workers=2)
+
+    def tearDown(self):
+        self.event_bus.shutdown(wait=False, timeout=1.0)
+
+    def test_publish_does_not_wait_for_listener(self):
+        """Test that a slow listener does not block the publisher."""
+        release = threading.Event()
+        self.event_bus.subscribe("slow_event", lambda: release.wait(1.0))
+        started = time.monotonic()
+        self.event_bus.publish("slow_event")
+        self.assertLess(time.monotonic() - started, 0.5)
+        release.set()
+        self.assertTrue(self.event_bus.flush(timeout=1.0))
+
+    def test_events_delivered_in_order(self):
+        """Test that events of one topic keep their publish order."""
+        received = []
+        self.event_bus.subscribe("test_event", received.append)
+        for i in range(50):
+            self.event_bus.publish("test_event", i)
+        self.assertTrue(self.event_bus.flush(timeout=1.0))
+        self.assertEqual(received, list(range(50)))
+
+    def test_callback_exception_is_isolated(self):
+        """Test that a failing listener does not prevent delivery to others."""
+        error_callback = Mock(side_effect=ValueError("Test error"))
+        normal_callback = Mock()
+        self.event_bus.subscribe("test_event", error_callback, priority=1)
+        self.event_bus.subscribe("test_event", normal_callback)
+        self.event_bus.publish("test_event", {"data": "test"})
+        self.assertTrue(self.event_bus.flush(timeout=1.0))
+        normal_callback.assert_called_once_with({"data": "test"})
+        stats = self.event_bus.get_stats()["listeners"]
+        self.assertEqual(sum(s["errors"] for s in stats.values()), 1)
+
+    def test_drop_oldest_backpressure(self):
+        """Test that the drop_oldest policy discards the oldest pending events."""
+        bus = EventBus(
+            dispatch_mode="async",
+            num_workers=1,
+            max_queue_size=2,
+            backpressure="drop_oldest",
+        )
+        gate = threading.Event()
+        received = []
+        bus.subscribe("gate", lambda: gate.wait(1.0))
+        bus.subscribe("test_event", received.append)
+        bus.publish("gate")
+        for i in range(5):
+            bus.publish("test_event", i)
+        gate.set()
+        self.assertTrue(bus.flush(timeout=1.0))
+        self.assertEqual(received, [3, 4])
+        self.assertEqual(bus.get_stats()["topics"]["test_event"]["dropped"], 3)
+        bus.shutdown()
+
+    def test_coalesce_backpressure(self):
+        """Test that the coalesce policy keeps only the newest event."""
+        bus = EventBus(
+            dispatch_mode="async",
+            num_workers=1,
+            max_queue_size=2,
+            backpressure="coalesce",
+        )
+        gate = threading.Event()
+        received = []
+        bus.subscribe("gate", lambda: gate.wait(1.0))
+        bus.subscribe("test_event", received.append)
+        bus.publish("gate")
+        for i in range(3):
+            bus.publish("test_event", i)
+        gate.set()
+        self.assertTrue(bus.flush(timeout=1.0))
+        self.assertEqual(received, [2])
+        self.assertEqual(bus.get_stats()["topics"]["test_event"]["coalesced"], 2)
+        bus.shutdown()
+
+    def test_stats_track_listener_latency(self):
+        """Test that per-listener latency counters are recorded."""
+
+        def listener():
+            time.sleep(0.01)
+
+        self.event_bus.subscribe("test_event", listener)
+        self.event_bus.publish("test_event")
+        self.assertTrue(self.event_bus.flush(timeout=1.0))
+        stats = self.event_bus.get_stats()
+        (listener_stats,) = stats["listeners"].values()
+        self.assertEqual(listener_stats["calls"], 1)
+        self.assertGreater(listener_stats["max_latency"], 0.0)
+        self.assertEqual(stats["topics"]["test_event"]["queue_depth"], 0)
+
+    def test_publish_after_shutdown(self):
+        """Test that publishing on a stopped async bus raises an error."""
+        self.event_bus.shutdown()
+        with self.assertRaises(RuntimeError):
+            self.event_bus.publish("test_event")
+
 
 if __name__ == "__main__":
     unittest.main()
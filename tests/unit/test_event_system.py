@@ -212,6 +212,23 @@ class TestEventSystem(unittest.TestCase):
         with self.assertRaises(TypeError):
             register_module_events("module1", {"event1": "value1"})
 
+    def test_callback_exception_does_not_stop_delivery(self):
+        """Test that a failing listener is logged and the rest still run."""
+        failing = MagicMock(side_effect=ValueError("boom"))
+        listener = MagicMock()
+        self.event_bus.subscribe("test_event", failing)
+        self.event_bus.subscribe("test_event", listener)
+        self.event_bus.publish("test_event", 1)
+        listener.assert_called_once_with(1)
+
+    def test_wildcard_module_events(self):
+        """Test subscribing to every event of a module with a wildcard."""
+        listener = MagicMock()
+        EVENT_BUS.subscribe("wildcard_module:*", listener)
+        publish_module_event("wildcard_module", "loaded", data="x")
+        listener.assert_called_once_with(data="x")
+        EVENT_BUS.unsubscribe("wildcard_module:*", listener)
+
 
 if __name__ == "__main__":
     unittest.main()
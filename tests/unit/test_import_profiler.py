@@ -0,0 +1,76 @@
+import os
+import unittest
+
+from performance.import_profiler import (
+    format_tree,
+    measure_cold_start,
+    parse_importtime,
+    profile_imports,
+    top_modules,
+)
+
+SAMPLE_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:        50 |         50 |     errno
+import time:       300 |        350 |   posixpath
+import time:       200 |        550 | os
+import time:        80 |         80 | json
+"""
+
+
+class TestParseImporttime(unittest.TestCase):
+    def test_builds_tree(self):
+        """Test that nested imports become children of the module importing them."""
+        root = parse_importtime(SAMPLE_OUTPUT)
+        self.assertEqual([child.name for child in root.children], ["os", "json"])
+        self.assertEqual(root.cumulative_us, 630)
+
+        os_node = root.find("os")
+        self.assertEqual(
+            [child.name for child in os_node.children], ["_io", "posixpath"]
+        )
+        self.assertEqual(os_node.find("errno").self_us, 50)
+        self.assertIsNone(root.find("missing"))
+
+    def test_top_modules_and_format(self):
+        """Test ranking by self time and hiding cheap modules from the tree."""
+        root = parse_importtime(SAMPLE_OUTPUT)
+        self.assertEqual(
+            [node.name for node in top_modules(root, 2)], ["posixpath", "os"]
+        )
+        tree = format_tree(root, min_ms=0.1)
+        self.assertIn("os", tree)
+        self.assertNotIn("errno", tree)
+
+
+class TestStartupBudget(unittest.TestCase):
+    """Cold-start regression checks; override the budget with ATLAS_STARTUP_THRESHOLD."""
+
+    STATEMENT = "import tools.tool_manager"
+
+    def test_tool_manager_does_not_import_tools(self):
+        """Test that importing the tool manager does not import the tool modules."""
+        root = profile_imports(self.STATEMENT)
+        self.assertIsNotNone(root.find("tools.tool_manager"))
+        self.assertIsNone(root.find("tools.ocr_tool"))
+
+    def test_entry_points_defer_heavy_imports(self):
+        """Test that importing the entry modules leaves Qt and the subsystems unloaded."""
+        root = profile_imports("import main")
+        self.assertIsNone(root.find("core.application"))
+        self.assertIsNone(root.find("PySide6.QtWidgets"))
+
+        root = profile_imports("import core.atlas_application")
+        self.assertIsNone(root.find("core.ai_integration"))
+        self.assertIsNone(root.find("core.workflow_manager"))
+
+    def test_cold_start_within_threshold(self):
+        """Test that the cold start of the tool manager stays within budget."""
+        threshold = float(os.getenv("ATLAS_STARTUP_THRESHOLD", "3.0"))
+        timings = measure_cold_start(self.STATEMENT, runs=3)
+        self.assertLessEqual(timings["median"], threshold)
+
+
+if __name__ == "__main__":
+    unittest.main()
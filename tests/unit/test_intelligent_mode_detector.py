@@ -0,0 +1,64 @@
+import unittest
+from unittest.mock import patch
+
+from utils.intelligent_mode_detector import ChatMode, IntelligentModeDetector
+
+
+class TestIntelligentModeDetector(unittest.TestCase):
+    def setUp(self):
+        """Set up a detector with a small memo."""
+        self.detector = IntelligentModeDetector(memo_size=2)
+
+    def test_simple_and_advanced_messages(self):
+        """Commands are simple; analytical questions need advanced thinking."""
+        result = self.detector.detect_chat_mode("read file main.py")
+        self.assertEqual(result.mode, ChatMode.SIMPLE_COMMAND)
+        self.assertEqual(result.confidence, 0.95)
+
+        result = self.detector.detect_chat_mode("Що не так з модулем думання?")
+        self.assertEqual(result.mode, ChatMode.ADVANCED_THINKING)
+        self.assertIn("pattern: problem_question (+0.5)", result.reasoning)
+
+    def test_matches_are_reported_in_listed_order(self):
+        """Keywords appear in the reasoning in the order of their list."""
+        result = self.detector.detect_chat_mode("why is the system design a problem")
+        reasoning = result.reasoning
+        self.assertLess(reasoning.index("problem"), reasoning.index("system"))
+        self.assertLess(reasoning.index("system"), reasoning.index("design"))
+        self.assertLess(reasoning.index("design"), reasoning.index("why"))
+
+    def test_command_regexes_match_in_one_call(self):
+        """The compiled command pattern reports every matching regex."""
+        message = "list folder agents"
+        score, reasoning = self.detector._check_simple_commands(message, message)
+        self.assertAlmostEqual(score, 0.6)
+        self.assertIn("pattern: ^list", reasoning)
+        self.assertIn("short_command", reasoning)
+
+    def test_regex_skipped_without_its_literal(self):
+        """Complex regexes only run when the keyword scan found their literal."""
+        message = "list directory agents"
+        self.assertFalse(self.detector._find_keywords(message) & {"як", "що", "чому"})
+        score, reasoning = self.detector._check_advanced_thinking(message, message)
+        self.assertNotIn("pattern:", reasoning)
+
+    def test_repeated_messages_come_from_memo(self):
+        """Repeated messages are memoized, counted and evicted least recently used."""
+        first = self.detector.detect_chat_mode("how does memory manager work?")
+        with patch.object(self.detector, "_find_keywords") as find:
+            second = self.detector.detect_chat_mode("  how does memory manager work?")
+        find.assert_not_called()
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+
+        stats = self.detector.get_detection_stats()
+        self.assertEqual(stats["memo_hits"], 1)
+        self.assertEqual(stats["total_detections"], 2)
+
+        self.detector.detect_chat_mode("show tree")
+        self.detector.detect_chat_mode("metrics")
+        self.assertNotIn("how does memory manager work?", self.detector._memo)
+
+
+if __name__ == "__main__":
+    unittest.main()
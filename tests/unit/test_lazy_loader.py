@@ -1,7 +1,9 @@
+import sys
+import types
 import unittest
 from unittest.mock import Mock, patch
 
-from core.lazy_loader import LazyLoader
+from core.lazy_loader import LazyLoader, get_lazy_load_stats, lazy_exports
 
 
 # Test suite for LazyLoader class
@@ -175,6 +177,45 @@ class TestLazyLoader(unittest.TestCase):
                 self.loader_module.get()
             mock_import.assert_called_once_with("dummy_module")
 
+    def test_call_instantiates_attribute(self):
+        """Test that calling a class proxy imports the module and instantiates the class."""
+        mock_module = Mock()
+        with patch("importlib.import_module", return_value=mock_module):
+            instance = self.loader_attribute(1, key="value")
+        mock_module.dummy_attribute.assert_called_once_with(1, key="value")
+        self.assertIs(instance, mock_module.dummy_attribute.return_value)
+        self.assertTrue(self.loader_attribute.loaded)
+
+
+class TestLazyExports(unittest.TestCase):
+    def setUp(self):
+        self.package = types.ModuleType("lazy_exports_pkg")
+        sys.modules["lazy_exports_pkg"] = self.package
+        self.package.__getattr__, self.package.__dir__ = lazy_exports(
+            "lazy_exports_pkg", {"dumps": "json", "OrderedDict": "collections"}
+        )
+
+    def tearDown(self):
+        del sys.modules["lazy_exports_pkg"]
+
+    def test_export_imported_on_first_access(self):
+        """Test that an exported name is imported, cached and timed on first access."""
+        import json
+
+        self.assertNotIn("dumps", vars(self.package))
+        self.assertIs(self.package.dumps, json.dumps)
+        self.assertIs(vars(self.package)["dumps"], json.dumps)
+        self.assertIn("json", get_lazy_load_stats())
+
+    def test_unknown_name_raises_attribute_error(self):
+        """Test that names missing from the exports raise AttributeError."""
+        with self.assertRaises(AttributeError):
+            _ = self.package.missing
+
+    def test_dir_lists_exports(self):
+        """Test that dir() includes names that have not been imported yet."""
+        self.assertIn("OrderedDict", dir(self.package))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,99 @@
+import random
+import threading
+import unittest
+
+from core.metrics import LatencyHistogram, MetricsStore, RollingHistogram
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_percentiles_within_precision(self):
+        """Test that percentiles match the exact values within 1%."""
+        rng = random.Random(7)
+        samples = [rng.lognormvariate(-2, 1) for _ in range(10000)]
+        histogram = LatencyHistogram()
+        for sample in samples:
+            histogram.record(sample)
+
+        ordered = sorted(samples)
+        for percentile in (50, 95, 99):
+            exact = ordered[int(percentile / 100 * len(ordered)) - 1]
+            self.assertAlmostEqual(
+                histogram.percentile(percentile), exact, delta=exact * 0.02
+            )
+        self.assertEqual(histogram.count, 10000)
+        self.assertEqual(histogram.min, min(samples))
+        self.assertEqual(histogram.max, max(samples))
+
+    def test_memory_is_bounded(self):
+        """Test that the bucket count does not grow with the sample count."""
+        histogram = LatencyHistogram()
+        for i in range(100000):
+            histogram.record(0.5 + (i % 100) / 1000)
+        self.assertLess(len(histogram._buckets), 20)
+
+    def test_empty(self):
+        """Test that an empty histogram reports zeros."""
+        histogram = LatencyHistogram()
+        self.assertEqual(histogram.percentile(99), 0.0)
+        self.assertEqual(histogram.mean, 0.0)
+
+
+class TestRollingHistogram(unittest.TestCase):
+    def test_old_slots_expire(self):
+        """Test that samples leave the window once their slot is too old."""
+        clock = _FakeClock()
+        rolling = RollingHistogram(slot_seconds=10, num_slots=3, clock=clock)
+        rolling.record(1.0)
+        clock.now += 10
+        rolling.record(2.0)
+        self.assertEqual(rolling.snapshot().count, 2)
+
+        clock.now += 20
+        self.assertEqual(rolling.snapshot().count, 1)
+        self.assertEqual(rolling.snapshot().max, 2.0)
+
+        clock.now += 10
+        self.assertEqual(rolling.snapshot().count, 0)
+
+
+class TestMetricsStore(unittest.TestCase):
+    def test_summary_all_time_and_recent(self):
+        """Test that the recent summary only covers the rolling window."""
+        clock = _FakeClock()
+        store = MetricsStore(window_seconds=60, num_slots=6, clock=clock)
+        store.record("model", 5.0)
+        clock.now += 120
+        store.record("model", 1.0)
+
+        self.assertEqual(store.summary("model")["count"], 2)
+        recent = store.summary("model", recent=True)
+        self.assertEqual(recent["count"], 1)
+        self.assertAlmostEqual(recent["p99"], 1.0)
+        self.assertIsNone(store.summary("unknown"))
+
+    def test_concurrent_records(self):
+        """Test that concurrent writers do not lose samples."""
+        store = MetricsStore()
+
+        def worker():
+            for _ in range(1000):
+                store.record("model", 0.01)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(store.summary("model")["count"], 8000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -101,3 +101,70 @@ def test_planning_operation(benchmark):
         time.sleep(0.1)  # Simulate a planning operation
 
     benchmark(planning_op)
+
+
+@pytest.mark.benchmark(group="workflow_resume")
+def test_workflow_resume(benchmark, tmp_path):
+    """Benchmark resuming a workflow with thousands of journaled steps."""
+    from workflow.engine import WorkflowEngine
+
+    engine = WorkflowEngine(str(tmp_path / "workflow_state.db"))
+    engine.start_workflow("wf_resume", {})
+    plan = [{"tool_name": "tool", "params": {"n": i}} for i in range(5000)]
+    for idx, step in enumerate(plan):
+        result = {"success": True, "output": f"result {idx}" * 10}
+        engine.store.record_step("wf_resume", engine.step_key(idx, step), result)
+
+    def resume():
+        engine.recover_workflow("wf_resume")
+        return engine.store.load_steps("wf_resume")
+
+    journal = benchmark(resume)
+    engine.store.close()
+    assert len(journal) == 5000
+
+
+@pytest.mark.benchmark(group="workflow_triggers")
+def test_trigger_scheduler_10k(benchmark):
+    """Benchmark 10k triggers on one scheduler; threads, CPU and memory stay flat."""
+    import threading
+    import tracemalloc
+    from datetime import datetime, timedelta
+
+    from workflow.scheduler import TriggerScheduler
+    from workflow.trigger import ConditionBasedTrigger, TimeBasedTrigger, TriggerManager
+
+    scheduler = TriggerScheduler(max_workers=4)
+    scheduler.start()
+    threads_before = threading.active_count()
+    tracemalloc.start()
+
+    def start_triggers():
+        manager = TriggerManager(scheduler)
+        start = datetime.now() + timedelta(seconds=0.5)
+        for i in range(5000):
+            manager.add_trigger(
+                TimeBasedTrigger(
+                    f"time_{i}", lambda: None, start, interval=timedelta(seconds=0.5)
+                )
+            )
+            manager.add_trigger(
+                ConditionBasedTrigger(f"cond_{i}", lambda: None, lambda: False, 0.5)
+            )
+        manager.start_all()
+        return manager
+
+    manager = benchmark.pedantic(start_triggers, rounds=1, iterations=1)
+    memory_started, _ = tracemalloc.get_traced_memory()
+    cpu_before = time.process_time()
+    time.sleep(2)  # Four firing rounds of all 10k triggers
+    cpu_used = time.process_time() - cpu_before
+    memory_after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    threads_after = threading.active_count()
+    manager.stop_all()
+    scheduler.shutdown()
+
+    assert threads_after <= threads_before + scheduler.max_workers
+    assert memory_after - memory_started < 5 * 1024 * 1024
+    assert cpu_used < 2.0
@@ -0,0 +1,134 @@
+import threading
+import time
+import unittest
+
+from core.ai_router import CIRCUIT_OPEN
+from utils.provider_health import ProviderHealthMonitor
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class _CountingProbe:
+    def __init__(self, result=True):
+        self.result = result
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.result
+
+
+class TestProviderHealthMonitor(unittest.TestCase):
+    def setUp(self):
+        """Set up a monitor with two healthy providers."""
+        self.probes = {"primary": _CountingProbe(), "backup": _CountingProbe()}
+        self.monitor = ProviderHealthMonitor(self.probes, min_hedge_samples=3)
+
+    def tearDown(self):
+        self.monitor.stop()
+
+    def test_probe_results_are_cached(self):
+        """Availability is probed once per TTL, not once per request."""
+        clock = _FakeClock()
+        probe = _CountingProbe()
+        monitor = ProviderHealthMonitor({"p": probe}, probe_ttl=10, clock=clock)
+        for _ in range(5):
+            self.assertTrue(monitor.is_available("p"))
+        self.assertEqual(probe.calls, 1)
+        clock.now = 11
+        monitor.is_available("p")
+        self.assertEqual(probe.calls, 2)
+        self.assertFalse(monitor.is_available("unknown"))
+        monitor.stop()
+
+    def test_background_refresh_updates_availability(self):
+        """The refresher thread picks up a provider going down."""
+        monitor = ProviderHealthMonitor(self.probes, refresh_interval=0.01)
+        self.assertTrue(monitor.is_available("backup"))
+        self.probes["backup"].result = False
+        monitor.start()
+        deadline = time.monotonic() + 2
+        while monitor.is_available("backup") and time.monotonic() < deadline:
+            time.sleep(0.01)
+        monitor.stop()
+        self.assertFalse(monitor.is_available("backup"))
+
+    def test_rank_prefers_healthy_fast_providers(self):
+        """A slow, failing preferred provider loses to a fast, healthy one."""
+        self.assertEqual(
+            self.monitor.rank(["backup", "primary"], preferred="primary"),
+            ["primary", "backup"],
+        )
+        self.monitor.record("primary", 8.0, True)
+        self.monitor.record("primary", 8.0, False)
+        self.monitor.record("backup", 0.5, True)
+        self.assertEqual(
+            self.monitor.rank(["primary", "backup"], preferred="primary"),
+            ["backup", "primary"],
+        )
+
+    def test_open_circuit_is_skipped(self):
+        """Providers whose circuit opened are left out of the ranking."""
+        for _ in range(self.monitor.failure_threshold):
+            self.monitor.record("primary", 0.1, False)
+        self.assertEqual(self.monitor.get_stats()["primary"]["circuit"], CIRCUIT_OPEN)
+        self.assertEqual(self.monitor.rank(["primary", "backup"]), ["backup"])
+
+    def test_call_fails_over(self):
+        """Errors and unusable results move on to the next provider."""
+
+        def send(name):
+            if name == "primary":
+                raise ConnectionError("down")
+            return {"content": "ok"}
+
+        self.assertEqual(
+            self.monitor.call(send, ["primary", "backup"]),
+            ("backup", {"content": "ok"}),
+        )
+        self.assertEqual(
+            self.monitor.call(
+                lambda name: {"content": ""},
+                ["primary", "backup"],
+                is_success=lambda data: bool(data["content"]),
+            ),
+            (None, None),
+        )
+        with self.assertRaises(ConnectionError):
+            self.monitor.call(send, ["primary"])
+
+    def test_slow_request_is_hedged(self):
+        """A request slower than the p95 is raced against the next provider."""
+        for _ in range(5):
+            self.monitor.record("primary", 0.01, True)
+        release = threading.Event()
+
+        def send(name):
+            if name == "primary":
+                release.wait(5)
+                return "slow"
+            return "fast"
+
+        started = time.monotonic()
+        result = self.monitor.call(send, ["primary", "backup"], hedge=True)
+        release.set()
+        self.assertEqual(result, ("backup", "fast"))
+        self.assertLess(time.monotonic() - started, 1)
+
+    def test_no_hedge_without_latency_history(self):
+        """Providers are not hedged until their p95 is known."""
+        self.assertIsNone(self.monitor.hedge_delay("primary"))
+        result = self.monitor.call(
+            lambda name: time.sleep(0.05) or name, ["primary", "backup"], hedge=True
+        )
+        self.assertEqual(result, ("primary", "primary"))
+
+
+if __name__ == "__main__":
+    unittest.main()
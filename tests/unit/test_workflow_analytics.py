@@ -0,0 +1,120 @@
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from workflow.analytics import WorkflowAnalytics
+
+
+class TestWorkflowAnalyticsIngestion(unittest.TestCase):
+    def setUp(self):
+        """Set up analytics on a temporary database with a small batch size."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, "analytics.db")
+        self.analytics = WorkflowAnalytics(
+            self.db_path, batch_size=3, flush_interval=60
+        )
+
+    def tearDown(self):
+        self.analytics.close()
+        self.temp_dir.cleanup()
+
+    def _stored_actions(self):
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM action_executions").fetchone()[0]
+
+    def _record(self, execution_id, status="success", start=None):
+        start = start or datetime(2024, 5, 1, 13, 15)
+        self.analytics.record_action(
+            execution_id, "fetch", start, start + timedelta(seconds=2), status, None
+        )
+
+    def test_actions_are_buffered_until_batch_size(self):
+        """Actions are written in batches rather than one commit each."""
+        self.analytics.start_execution("e1", "wf")
+        self._record("e1")
+        self._record("e1")
+        self.assertEqual(self._stored_actions(), 0)
+        self._record("e1")
+        self.assertEqual(self._stored_actions(), 3)
+
+    def test_failed_flush_keeps_actions_buffered(self):
+        """Actions of a failed write are written by the next flush."""
+        self.analytics.start_execution("e1", "wf")
+        self._record("e1")
+        with (
+            patch.object(
+                self.analytics,
+                "_workflow_of",
+                side_effect=sqlite3.OperationalError("database is locked"),
+            ),
+            self.assertRaises(sqlite3.OperationalError),
+        ):
+            self.analytics.flush()
+        self.assertEqual(self._stored_actions(), 0)
+        self.analytics.flush()
+        self.assertEqual(self._stored_actions(), 1)
+
+    def test_timer_flushes_without_new_actions(self):
+        """The flush interval applies even when no further action is recorded."""
+        self.analytics.flush_interval = 0.05
+        self.analytics.start_execution("e1", "wf")
+        self._record("e1")
+        deadline = time.monotonic() + 5
+        while self._stored_actions() == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self._stored_actions(), 1)
+
+    def test_close_writes_buffered_actions(self):
+        """Closing writes the buffer and the connection."""
+        self.analytics.start_execution("e1", "wf")
+        self._record("e1")
+        self.analytics.close()
+        self.assertIsNone(self.analytics.conn)
+        self.assertEqual(self._stored_actions(), 1)
+
+    def test_reads_see_buffered_actions(self):
+        """Queries flush the buffer first, including execution counters."""
+        self.analytics.start_execution("e1", "wf")
+        self._record("e1")
+        self._record("e1", status="failed")
+        self.assertEqual(len(self.analytics.get_action_performance("e1")), 2)
+        execution = self.analytics.get_workflow_performance("wf")[0]
+        self.assertEqual(execution["actions_count"], 2)
+        self.assertEqual(execution["failed_actions_count"], 1)
+
+    def test_hourly_rollup_is_maintained_incrementally(self):
+        """Rollups aggregate actions and executions per workflow per hour."""
+        self.analytics.start_execution("e1", "wf")
+        self._record("e1", start=datetime(2024, 5, 1, 13, 5))
+        self._record("e1", status="failed", start=datetime(2024, 5, 1, 13, 55))
+        self._record("e1", start=datetime(2024, 5, 1, 14, 10))
+        self.analytics.end_execution("e1", "failed")
+
+        rollup = {r["hour"]: r for r in self.analytics.get_hourly_rollup("wf")}
+        self.assertEqual(rollup["2024-05-01 13:00"]["actions_count"], 2)
+        self.assertEqual(rollup["2024-05-01 13:00"]["failed_actions_count"], 1)
+        self.assertAlmostEqual(
+            rollup["2024-05-01 13:00"]["total_action_duration_seconds"], 4.0
+        )
+        self.assertEqual(rollup["2024-05-01 14:00"]["actions_count"], 1)
+        totals = sum(r["executions_count"] for r in rollup.values())
+        failed = sum(r["failed_count"] for r in rollup.values())
+        self.assertEqual((totals, failed), (1, 1))
+
+    def test_database_uses_wal_and_indexes(self):
+        """The analytics database runs in WAL mode and indexes lookup columns."""
+        conn = self.analytics.conn
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM action_executions WHERE execution_id = ?",
+            ("e1",),
+        ).fetchall()
+        self.assertIn("idx_action_executions_execution", str(plan))
+
+
+if __name__ == "__main__":
+    unittest.main()
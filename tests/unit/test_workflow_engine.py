@@ -0,0 +1,227 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import types
+import unittest
+from unittest.mock import Mock, patch
+
+from workflow.engine import WorkflowEngine
+
+
+class TestWorkflowEngineState(unittest.TestCase):
+    def setUp(self):
+        """Set up an engine on a temporary database."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, "workflow_state.db")
+        self.engine = WorkflowEngine(self.db_path, commit_every=3, commit_interval=60)
+
+    def tearDown(self):
+        self.engine.store.close()
+        self.temp_dir.cleanup()
+
+    def _delta_rows(self):
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM workflow_state_delta").fetchone()[
+                0
+            ]
+
+    def test_database_uses_wal(self):
+        """The state database is opened in WAL journaling mode."""
+        mode = self.engine.conn.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode.lower(), "wal")
+
+    def test_updates_are_group_committed(self):
+        """Updates stay pending until commit_every of them accumulate."""
+        state = {"a": 1}
+        self.engine.start_workflow("wf", state)
+        for i in range(2):
+            state[f"step_{i}"] = i
+            self.engine.update_state(state)
+        self.assertEqual(self._delta_rows(), 0)
+
+        state["step_2"] = 2
+        self.engine.update_state(state)
+        self.assertEqual(self._delta_rows(), 3)
+
+    def test_unchanged_state_writes_nothing(self):
+        """Updating with an identical state records no delta."""
+        self.engine.start_workflow("wf", {"a": 1})
+        self.engine.update_state({"a": 1})
+        self.engine.flush_state()
+        self.assertEqual(self._delta_rows(), 0)
+
+    def test_commit_interval_flushes_pending_updates(self):
+        """Pending updates are committed once the time window elapses."""
+        self.engine.store.commit_interval = 0.05
+        self.engine.start_workflow("wf", {})
+        self.engine.update_state({"a": 1})
+        time.sleep(0.3)
+        self.assertEqual(self._delta_rows(), 1)
+
+    def test_recover_rebuilds_state_from_deltas(self):
+        """A new engine recovers the state from the initial state and deltas."""
+        self.engine.start_workflow("wf", {"a": 1, "b": 2})
+        self.engine.update_state({"a": 1, "b": 2, "step_1": "x"})
+        self.engine.update_state({"a": 5, "step_1": "x"})
+        self.engine.update_state({"a": 5, "step_1": "x", "step_2": {"ok": True}})
+        self.engine.update_state(
+            {"a": 5, "step_1": "y", "step_2": {"ok": True}}, changed_keys=["step_1"]
+        )
+        self.engine.flush_state()
+
+        other = WorkflowEngine(self.db_path)
+        try:
+            state = other.recover_workflow("wf")
+        finally:
+            other.store.close()
+        self.assertEqual(state, {"a": 5, "step_1": "y", "step_2": {"ok": True}})
+
+    def test_update_from_worker_threads(self):
+        """State can be updated from threads other than the creating one."""
+        self.engine.start_workflow("wf", {})
+        errors = []
+
+        def worker(n):
+            try:
+                for i in range(10):
+                    self.engine.store.update("wf", {f"t{n}_{i}": i}, [f"t{n}_{i}"])
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(len(self.engine.recover_workflow("wf")), 40)
+
+    def test_complete_workflow_removes_state(self):
+        """Completing a workflow removes its state and pending deltas."""
+        self.engine.start_workflow("wf", {})
+        self.engine.update_state({"a": 1})
+        self.engine.complete_workflow()
+        self.assertIsNone(self.engine.recover_workflow("wf"))
+        self.assertEqual(self._delta_rows(), 0)
+
+
+class Crash(BaseException):
+    """Simulates the process dying in the middle of a step."""
+
+
+class TestWorkflowResume(unittest.TestCase):
+    def setUp(self):
+        """Set up a temporary database and a fake tool executor."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, "workflow_state.db")
+        self.manager = Mock()
+        module = types.SimpleNamespace(self_regeneration_manager=self.manager)
+        self.patcher = patch.dict(
+            sys.modules, {"agents.self_regeneration_manager": module}
+        )
+        self.patcher.start()
+        self.plan = [{"tool_name": "tool", "params": {"n": i}} for i in range(5)]
+
+    def tearDown(self):
+        self.patcher.stop()
+        self.temp_dir.cleanup()
+
+    def test_resume_skips_completed_steps(self):
+        """A resumed plan replays journaled outputs instead of re-running steps."""
+
+        def crash_on_third(tool_name, params):
+            if params["n"] == 2:
+                raise Crash()
+            return {"success": True, "value": params["n"] * 10}
+
+        self.manager.execute_tool.side_effect = crash_on_third
+        engine = WorkflowEngine(self.db_path)
+        with self.assertRaises(Crash):
+            engine.execute_workflow_plan(self.plan, {"goal": "g"}, workflow_id="wf")
+        engine.store.close()
+
+        self.manager.execute_tool.reset_mock()
+        self.manager.execute_tool.side_effect = lambda tool_name, params: {
+            "success": True,
+            "value": params["n"] * 10,
+        }
+        engine = WorkflowEngine(self.db_path)
+        try:
+            outcome = engine.execute_workflow_plan(self.plan, {}, workflow_id="wf")
+        finally:
+            engine.store.close()
+
+        executed = [c.args[1]["n"] for c in self.manager.execute_tool.call_args_list]
+        self.assertEqual(executed, [2, 3, 4])
+        self.assertEqual(
+            [r["result"]["value"] for r in outcome["results"]], [0, 10, 20, 30, 40]
+        )
+        self.assertEqual(outcome["final_state"]["goal"], "g")
+
+    def test_failed_step_keeps_journal_for_retry(self):
+        """A plan stopped by a failed step resumes from that step."""
+        self.manager.execute_tool.side_effect = lambda tool_name, params: {
+            "success": params["n"] != 3,
+            "value": params["n"] * 10,
+        }
+        engine = WorkflowEngine(self.db_path)
+        try:
+            outcome = engine.execute_workflow_plan(self.plan, {}, workflow_id="wf")
+            self.assertEqual([e["step"] for e in outcome["errors"]], [4])
+
+            self.manager.execute_tool.reset_mock()
+            self.manager.execute_tool.side_effect = lambda tool_name, params: {
+                "success": True,
+                "value": params["n"] * 10,
+            }
+            outcome = engine.execute_workflow_plan(self.plan, {}, workflow_id="wf")
+        finally:
+            engine.store.close()
+
+        executed = [c.args[1]["n"] for c in self.manager.execute_tool.call_args_list]
+        self.assertEqual(executed, [3, 4])
+        self.assertEqual(outcome["errors"], [])
+
+    def test_completed_workflow_does_not_resume(self):
+        """Finished workflows drop their journal, so the same ID runs afresh."""
+        self.manager.execute_tool.return_value = {"success": True}
+        engine = WorkflowEngine(self.db_path)
+        try:
+            engine.execute_workflow_plan(self.plan, {}, workflow_id="wf")
+            engine.execute_workflow_plan(self.plan, {}, workflow_id="wf")
+        finally:
+            engine.store.close()
+        self.assertEqual(self.manager.execute_tool.call_count, 10)
+
+    def test_step_outputs_round_trip(self):
+        """Journaled outputs decode to the recorded values."""
+        engine = WorkflowEngine(self.db_path)
+        output = {"success": True, "items": list(range(100)), "text": "x" * 1000}
+        try:
+            engine.start_workflow("wf", {})
+            engine.store.record_step("wf", "key", output)
+            self.assertEqual(engine.store.load_steps("wf"), {"key": output})
+        finally:
+            engine.store.close()
+
+    def test_step_is_committed_without_pending_updates(self):
+        """A journaled step is visible to other connections right away."""
+        engine = WorkflowEngine(self.db_path)
+        try:
+            engine.start_workflow("wf", {})
+            engine.store.record_step("wf", "key", {"success": True})
+            with sqlite3.connect(self.db_path) as conn:
+                rows = conn.execute(
+                    "SELECT step_key FROM workflow_step_journal WHERE workflow_id = ?",
+                    ("wf",),
+                ).fetchall()
+        finally:
+            engine.store.close()
+        self.assertEqual(rows, [("key",)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from workflow.error_handling import AlwaysContinue, WorkflowError
+from workflow.execution import AdvancedWorkflowEngine, get_shared_executor
+
+
+class TestAdvancedWorkflowEngine(unittest.TestCase):
+    def setUp(self):
+        """Set up an engine with an active workflow on a temporary database."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.engine = AdvancedWorkflowEngine(
+            db_path=os.path.join(self.temp_dir.name, "workflow_state.db"),
+            max_workers=4,
+        )
+        self.engine.error_handler.set_strategy(AlwaysContinue())
+        self.engine.start_workflow("wf-test", {})
+
+    def tearDown(self):
+        self.engine.store.close()
+        self.temp_dir.cleanup()
+
+    def test_engines_share_executor(self):
+        """Engines with the same pool size reuse one long-lived executor."""
+        other = AdvancedWorkflowEngine(
+            db_path=os.path.join(self.temp_dir.name, "other.db"), max_workers=4
+        )
+        try:
+            self.assertIs(self.engine.executor, other.executor)
+            self.assertIs(self.engine.executor, get_shared_executor(4))
+        finally:
+            other.store.close()
+
+    def test_execute_parallel_preserves_order(self):
+        """Results line up with the submitted actions, not completion order."""
+        actions = [
+            lambda: (time.sleep(0.05), "slow")[1],
+            lambda: "fast",
+            lambda: 1 / 0,
+        ]
+        self.assertEqual(self.engine.execute_parallel(actions), ["slow", "fast", None])
+
+    def test_execute_dag_passes_dependency_results(self):
+        """Each step receives its dependencies' results and its parameters."""
+        workflow_def = {
+            "steps": [
+                {"id": "a", "action": lambda inputs: 2},
+                {"id": "b", "action": lambda inputs: 3},
+                {
+                    "id": "sum",
+                    "action": lambda inputs, scale: (inputs["a"] + inputs["b"]) * scale,
+                    "parameters": {"scale": 10},
+                    "dependencies": ["a", "b"],
+                },
+            ]
+        }
+        results = self.engine.execute_dag(workflow_def)
+        self.assertEqual(results, {"a": 2, "b": 3, "sum": 50})
+
+    def test_ready_steps_run_concurrently(self):
+        """Independent steps start without waiting for each other."""
+        barrier = threading.Barrier(3, timeout=2)
+        workflow_def = {
+            "steps": [
+                {"id": str(i), "action": lambda inputs: barrier.wait()}
+                for i in range(3)
+            ]
+        }
+        results = self.engine.execute_dag(workflow_def)
+        self.assertEqual(len(results), 3)
+
+    def test_stream_dag_yields_in_completion_order(self):
+        """Events are streamed as steps finish."""
+        workflow_def = {
+            "steps": [
+                {"id": "slow", "action": lambda inputs: time.sleep(0.1)},
+                {"id": "fast", "action": lambda inputs: None},
+            ]
+        }
+        events = list(self.engine.stream_dag(workflow_def))
+        self.assertEqual([e["step_id"] for e in events], ["fast", "slow"])
+        self.assertTrue(all(e["status"] == "completed" for e in events))
+
+    def test_step_timeout_skips_dependents(self):
+        """A step over its timeout is reported and its dependents are skipped."""
+        seen = []
+        workflow_def = {
+            "steps": [
+                {
+                    "id": "hang",
+                    "action": lambda inputs: time.sleep(0.3),
+                    "timeout": 0.05,
+                },
+                {"id": "ok", "action": lambda inputs: "done"},
+                {
+                    "id": "after",
+                    "action": lambda inputs: "x",
+                    "dependencies": ["hang", "ok"],
+                },
+            ]
+        }
+        results = self.engine.execute_dag(workflow_def, on_step_complete=seen.append)
+        statuses = {e["step_id"]: e["status"] for e in seen}
+        self.assertEqual(
+            statuses, {"hang": "timeout", "ok": "completed", "after": "skipped"}
+        )
+        self.assertEqual(results, {"hang": None, "ok": "done", "after": None})
+
+    def test_critical_path_scheduled_first(self):
+        """With one worker, the step heading the longest path runs first."""
+        engine = AdvancedWorkflowEngine(
+            db_path=os.path.join(self.temp_dir.name, "serial.db"), max_workers=1
+        )
+        engine.start_workflow("wf-serial", {})
+        order = []
+        workflow_def = {
+            "steps": [
+                {"id": "short", "action": lambda inputs: order.append("short")},
+                {
+                    "id": "long_head",
+                    "action": lambda inputs: order.append("long_head"),
+                },
+                {
+                    "id": "long_tail",
+                    "action": lambda inputs: order.append("long_tail"),
+                    "dependencies": ["long_head"],
+                    "estimated_duration": 5.0,
+                },
+            ]
+        }
+        try:
+            engine.execute_dag(workflow_def)
+        finally:
+            engine.store.close()
+        self.assertEqual(order[0], "long_head")
+
+    def test_invalid_dependencies_rejected(self):
+        """Unknown dependencies and cycles are rejected before anything runs."""
+        unknown = {
+            "steps": [{"id": "a", "action": lambda inputs: 1, "dependencies": ["x"]}]
+        }
+        cyclic = {
+            "steps": [
+                {"id": "a", "action": lambda inputs: 1, "dependencies": ["b"]},
+                {"id": "b", "action": lambda inputs: 1, "dependencies": ["a"]},
+            ]
+        }
+        with self.assertRaises(ValueError):
+            self.engine.execute_dag(unknown)
+        with self.assertRaises(ValueError):
+            self.engine.execute_dag(cyclic)
+
+    def test_failure_stops_when_handler_says_so(self):
+        """A failing step raises when the error handler stops the workflow."""
+
+        class StopAlways(AlwaysContinue):
+            def should_continue(self, error):
+                return False
+
+        self.engine.error_handler.set_strategy(StopAlways())
+        workflow_def = {"steps": [{"id": "boom", "action": lambda inputs: 1 / 0}]}
+        with self.assertRaises(WorkflowError):
+            self.engine.execute_dag(workflow_def)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import importlib.util
+import os
+import subprocess
+import sys
+import unittest
+from datetime import datetime, timedelta
+
+from workflow.workflow_analytics import WorkflowAnalytics
+
+PANDAS_AVAILABLE = importlib.util.find_spec("pandas") is not None
+SKLEARN_AVAILABLE = importlib.util.find_spec("sklearn") is not None
+
+
+class TestIncrementalWorkflowAnalytics(unittest.TestCase):
+    def setUp(self):
+        """Set up analytics with a few executions of two workflows."""
+        self.analytics = WorkflowAnalytics(retrain_every=5)
+        self.now = datetime.now()
+        for i, duration in enumerate([10, 20, 30, 40]):
+            self._record("wf_a", f"a{i}", duration, success=i != 3, error="Timeout")
+        self._record("wf_b", "b0", 5, success=True)
+        # Outside a 30-day window
+        self._record("wf_a", "old", 1000, success=False, error="Old", days_ago=60)
+
+    def _record(
+        self, workflow_id, execution_id, duration, success, error="", days_ago=0
+    ):
+        start = self.now - timedelta(days=days_ago, seconds=duration)
+        self.analytics.record_execution(
+            workflow_id,
+            execution_id,
+            start,
+            start + timedelta(seconds=duration),
+            success,
+            "" if success else error,
+            steps=[
+                {
+                    "step_id": "s1",
+                    "step_name": "fetch",
+                    "start_time": start,
+                    "end_time": start + timedelta(seconds=duration / 2),
+                    "success": True,
+                }
+            ],
+        )
+
+    def test_heavy_dependencies_are_not_imported(self):
+        """Importing and recording does not load pandas, plotting or sklearn."""
+        script = (
+            "import sys\n"
+            "from datetime import datetime\n"
+            "from workflow.workflow_analytics import WorkflowAnalytics\n"
+            "a = WorkflowAnalytics()\n"
+            "a.record_execution('wf', 'e', datetime.now(), datetime.now(), True)\n"
+            "a.get_performance_metrics('wf')\n"
+            "heavy = ('pandas', 'matplotlib', 'seaborn', 'sklearn')\n"
+            "print(sorted(m for m in heavy if m in sys.modules))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            text=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+        )
+        self.assertEqual(result.stdout.strip(), "[]", result.stderr)
+
+    def test_performance_metrics_use_sliding_window(self):
+        """Metrics cover only the requested window and match the raw data."""
+        metrics = self.analytics.get_performance_metrics("wf_a", days=30)
+        self.assertEqual(metrics["total_executions"], 4)
+        self.assertEqual(metrics["success_rate"], 75.0)
+        self.assertEqual(metrics["average_duration"], 25.0)
+        self.assertEqual((metrics["min_duration"], metrics["max_duration"]), (10, 40))
+        self.assertAlmostEqual(metrics["median_duration"], 20, delta=0.5)
+        self.assertEqual(metrics["common_errors"], [("Timeout", 1)])
+
+        all_time = self.analytics.get_performance_metrics("wf_a", days=90)
+        self.assertEqual(all_time["total_executions"], 5)
+        self.assertEqual(
+            self.analytics.get_performance_metrics()["total_executions"], 5
+        )
+
+    def test_unknown_workflow_has_empty_metrics(self):
+        self.assertEqual(
+            self.analytics.get_performance_metrics("missing")["total_executions"], 0
+        )
+
+    def test_step_metrics(self):
+        """Step statistics are kept per workflow and step name."""
+        steps = self.analytics.get_step_metrics("wf_a")
+        self.assertEqual(list(steps), ["fetch"])
+        self.assertEqual(steps["fetch"]["average_duration"], 12.5)
+
+    def test_daily_buckets_are_bounded(self):
+        """Only retention_days daily buckets are kept per workflow."""
+        analytics = WorkflowAnalytics(retention_days=3)
+        start = datetime(2024, 1, 1)
+        for day in range(10):
+            when = start + timedelta(days=day)
+            analytics.record_execution("wf", str(day), when, when, True)
+        self.assertEqual(len(analytics._workflow_stats["wf"].daily), 3)
+
+    @unittest.skipUnless(PANDAS_AVAILABLE, "pandas not installed")
+    def test_frames_are_built_lazily(self):
+        """DataFrames are built on access and reused until the next record."""
+        frame = self.analytics.execution_data
+        self.assertEqual(len(frame), 6)
+        self.assertIs(self.analytics.execution_data, frame)
+        self._record("wf_b", "b1", 5, success=True)
+        self.assertEqual(len(self.analytics.execution_data), 7)
+        self.assertEqual(len(self.analytics.step_data), 7)
+
+    @unittest.skipUnless(PANDAS_AVAILABLE, "pandas not installed")
+    def test_comparative_analytics(self):
+        comparison = self.analytics.comparative_analytics()
+        self.assertEqual(list(comparison["workflow_id"]), ["wf_a", "wf_b"])
+        self.assertEqual(list(comparison["total_executions"]), [4, 1])
+
+    @unittest.skipUnless(SKLEARN_AVAILABLE, "scikit-learn not installed")
+    def test_model_retrains_only_when_stale(self):
+        """Predictions reuse the model until retrain_every new executions arrive."""
+        for i in range(10):
+            self._record("wf_b", f"x{i}", 5 + i, success=True)
+        self.assertTrue(self.analytics.train_predictive_model())
+        model = self.analytics.predictive_model
+        self.analytics.predict_workflow_failure("wf_b", 7.0, self.now)
+        self.assertIs(self.analytics.predictive_model, model)
+
+        for i in range(5):
+            self._record("wf_b", f"y{i}", 5, success=True)
+        result = self.analytics.predict_workflow_failure("wf_b", 7.0, self.now)
+        self.assertIsNot(self.analytics.predictive_model, model)
+        self.assertIn("failure_probability", result)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,255 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from workflow.pattern_search import PatternSearchIndex
+from workflow.workflow_pattern_library import WorkflowPatternLibrary
+
+
+class TestPatternSearch(unittest.TestCase):
+    def setUp(self):
+        """Set up a library with a few patterns in a temporary directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.library_path = os.path.join(self.temp_dir.name, "patterns.json")
+        self.library = WorkflowPatternLibrary(self.library_path)
+        self.library.add_pattern(
+            "report",
+            "Report Generation",
+            "Build a weekly sales report.",
+            "Reporting",
+            ["report", "sales"],
+            {},
+        )
+        self.library.add_pattern(
+            "mailer", "Mailer", "Send the report by email.", "Messaging", ["email"], {}
+        )
+
+    def tearDown(self):
+        self.library.close()
+        self.temp_dir.cleanup()
+
+    def _ids(self, query, **kwargs):
+        return [p["id"] for p in self.library.search_patterns(query, **kwargs)]
+
+    def test_name_match_ranks_above_description_match(self):
+        """A match in the name outweighs one in the description."""
+        self.assertEqual(self._ids("report"), ["report", "mailer"])
+
+    def test_every_query_word_must_match(self):
+        """Results contain all words of the query."""
+        self.assertEqual(self._ids("report email"), ["mailer"])
+        self.assertEqual(self._ids("report nonexistent"), [])
+
+    def test_prefix_and_infix_matches(self):
+        """Words match as prefixes and inside longer words."""
+        self.assertIn("etl_basic", self._ids("pipe"))
+        self.assertIn("etl_basic", self._ids("line"))
+        self.assertEqual(self._ids("gener"), ["report"])
+
+    def test_usage_count_lifts_equally_relevant_patterns(self):
+        """Among equally relevant patterns, the more used one comes first."""
+        for pattern_id in ("a", "b"):
+            self.library.add_pattern(pattern_id, "Twin", "Same text.", "Twins", [], {})
+        self.library.instantiate_pattern("b")
+        self.assertEqual(self._ids("twin"), ["b", "a"])
+
+    def test_limit(self):
+        """Only the best results are returned when a limit is given."""
+        self.assertEqual(self._ids("report", limit=1), ["report"])
+
+    def test_non_ascii_search(self):
+        """Words outside ASCII are indexed and matched case-insensitively."""
+        self.library.add_pattern(
+            "analysis", "Аналіз даних", "Звіт про продажі.", "Аналітика", [], {}
+        )
+        self.assertEqual(self._ids("аналіз"), ["analysis"])
+        self.assertEqual(self._ids("ЗВІТ"), ["analysis"])
+
+    def test_query_without_words_matches_nothing(self):
+        """A query made only of punctuation does not match every pattern."""
+        self.assertEqual(self._ids("?!"), [])
+        self.assertEqual(len(self._ids("")), len(self.library.patterns))
+
+    def test_update_reindexes_pattern(self):
+        """Updated fields are searchable and old ones are forgotten."""
+        self.library.update_pattern(
+            "mailer", name="Notifier", description="Post a chat message.", tags=["chat"]
+        )
+        self.assertEqual(self._ids("report"), ["report"])
+        self.assertEqual(self._ids("chat"), ["mailer"])
+        self.assertNotIn("email", self.library.tags)
+
+    def test_delete_removes_pattern_from_indices(self):
+        """Deleted patterns leave no search, category or tag entries."""
+        self.library.delete_pattern("report")
+        self.assertEqual(self._ids("sales"), [])
+        self.assertNotIn("Reporting", self.library.categories)
+        self.assertNotIn("sales", self.library.tags)
+
+    def test_customize_does_not_duplicate_index_entries(self):
+        """Customizing in place keeps each pattern listed once."""
+        self.library.customize_pattern("report", {"steps": []})
+        self.library.customize_pattern("report", {"steps": []})
+        self.assertEqual(self.library.categories["Reporting"], ["report"])
+        self.assertEqual(self.library.tags["customized"], ["report"])
+
+    def test_import_rebuilds_indices(self):
+        """Duplicate index entries in an imported JSON library are dropped."""
+        self.library.export_library()
+        with open(self.library_path) as f:
+            data = json.load(f)
+        data["categories"]["Reporting"] = ["report", "report", "missing"]
+        with open(self.library_path, "w") as f:
+            json.dump(data, f)
+
+        self.library.import_library(self.library_path)
+        self.assertEqual(self.library.categories["Reporting"], ["report"])
+        self.assertEqual(self._ids("weekly"), ["report"])
+
+    def test_contributed_pattern_search(self):
+        """Contributed patterns are searchable by author and stay consistent."""
+        self.library.contribute_pattern(
+            "c1", "Search ETL", "ETL workflow", "Data", ["ETL"], {}, "Author"
+        )
+        self.library.contribute_pattern(
+            "c2", "Search Data", "Data workflow", "Data", ["data"], {}, "Searcher"
+        )
+        search = self.library.search_contributed_patterns
+        self.assertEqual([p["id"] for p in search("searcher")], ["c2"])
+        self.assertEqual({p["id"] for p in search("data")}, {"c1", "c2"})
+
+        self.library.update_contributed_pattern(
+            "c1", tags=["batch"], description="Load"
+        )
+        self.library.delete_contributed_pattern("c2")
+        self.assertEqual([p["id"] for p in search("etl batch")], ["c1"])
+        self.assertEqual(search("searcher"), [])
+
+
+class TestPatternStorage(unittest.TestCase):
+    def setUp(self):
+        """Set up a library with one contributed pattern in a temporary directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.library_path = os.path.join(self.temp_dir.name, "patterns.json")
+        self.library = WorkflowPatternLibrary(self.library_path)
+        self.library.contribute_pattern(
+            "c1", "Shared", "A shared pattern", "Data", ["etl"], {"steps": []}, "Ann"
+        )
+
+    def tearDown(self):
+        self.library.close()
+        self.temp_dir.cleanup()
+
+    def _reopen(self):
+        self.library.close()
+        self.library = WorkflowPatternLibrary(self.library_path)
+        return self.library
+
+    def test_changes_write_only_the_changed_pattern(self):
+        """Rating and commenting write one pattern and survive a restart."""
+        with patch.object(
+            self.library.store, "write", wraps=self.library.store.write
+        ) as write:
+            self.library.rate_contributed_pattern("c1", 4.0)
+            self.library.comment_on_contributed_pattern("c1", "Nice", "Bob")
+        for call in write.call_args_list:
+            self.assertEqual([pid for pid, _ in call.args[1]], ["c1"])
+
+        pattern = self._reopen().get_contributed_pattern("c1")
+        self.assertEqual(pattern["rating"], 4.0)
+        self.assertEqual(pattern["comments"][0]["text"], "Nice")
+
+    def test_pattern_bodies_load_lazily(self):
+        """Listing and searching read summaries; full patterns load on access."""
+        library = self._reopen()
+        with patch.object(library.store, "load", wraps=library.store.load) as load:
+            self.assertTrue(library.list_patterns())
+            self.assertTrue(library.search_patterns("etl"))
+            self.assertEqual(load.call_count, 0)
+            self.assertIn("steps", library.get_pattern("etl_basic")["structure"])
+            self.assertEqual(load.call_count, 1)
+
+    def test_close_writes_only_changed_patterns(self):
+        """Patterns that were only read are not written back on close."""
+        library = self._reopen()
+        library.get_pattern("etl_basic")
+        library.get_contributed_pattern("c1")
+        library.get_pattern("ml_training")["tags"].append("edited")
+        with patch.object(library.store, "write", wraps=library.store.write) as write:
+            library.close()
+        written = [pid for call in write.call_args_list for pid, _ in call.args[1]]
+        self.assertEqual(written, ["ml_training"])
+
+        library = self._reopen()
+        self.assertIn("edited", library.get_pattern("ml_training")["tags"])
+        with patch.object(library.store, "write") as write:
+            library.get_pattern("ml_training")["tags"].append("unsaved")
+            library.close(save=False)
+        write.assert_not_called()
+
+    def test_deletions_persist(self):
+        """A library emptied of patterns stays empty after a restart."""
+        for pattern_id in list(self.library.patterns):
+            self.library.delete_pattern(pattern_id)
+        self.library.delete_contributed_pattern("c1")
+        library = self._reopen()
+        self.assertEqual(len(library.patterns), 0)
+        self.assertEqual(len(library.marketplace_patterns), 0)
+
+    def test_json_library_is_imported_and_exported(self):
+        """A JSON library is imported on first use and can be exported again."""
+        self.library.instantiate_pattern("etl_basic")
+        export_path = os.path.join(self.temp_dir.name, "export.json")
+        self.library.export_library(export_path)
+        marketplace_path = os.path.join(self.temp_dir.name, "marketplace.json")
+        self.library.export_marketplace(marketplace_path)
+
+        other = WorkflowPatternLibrary(
+            export_path, store_path=os.path.join(self.temp_dir.name, "other.db")
+        )
+        try:
+            other.import_marketplace(marketplace_path)
+            self.assertEqual(other.get_pattern("etl_basic")["usage_count"], 1)
+            self.assertEqual(set(other.patterns), set(self.library.patterns))
+            self.assertEqual(
+                [p["id"] for p in other.search_contributed_patterns("ann")], ["c1"]
+            )
+        finally:
+            other.close()
+
+    def test_edited_json_library_is_reimported(self):
+        """Changes to the JSON library after it was synced replace the store."""
+        self.library.export_library()
+        self.library.instantiate_pattern("etl_basic")
+        self.assertEqual(self._reopen().get_pattern("etl_basic")["usage_count"], 1)
+
+        with open(self.library_path) as f:
+            data = json.load(f)
+        data["patterns"]["etl_basic"]["name"] = "Edited ETL"
+        with open(self.library_path, "w") as f:
+            json.dump(data, f)
+        mtime = os.path.getmtime(self.library_path) + 10
+        os.utime(self.library_path, (mtime, mtime))
+
+        pattern = self._reopen().get_pattern("etl_basic")
+        self.assertEqual(pattern["name"], "Edited ETL")
+        self.assertEqual(pattern["usage_count"], 0)
+
+
+class TestPatternSearchIndex(unittest.TestCase):
+    def test_removing_last_document_forgets_its_terms(self):
+        """Terms no document uses are dropped from the prefix and trigram lookups."""
+        index = PatternSearchIndex({"name": 1.0})
+        index.add("a", {"name": "unique words"})
+        index.add("a", {"name": "other"})
+        self.assertEqual(index.search("uniq"), [])
+        self.assertEqual([doc_id for doc_id, _ in index.search("the")], ["a"])
+        index.remove("a")
+        self.assertEqual(len(index), 0)
+        self.assertEqual(index.search("other"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
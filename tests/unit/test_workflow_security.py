@@ -0,0 +1,98 @@
+import importlib.util
+import io
+import unittest
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from workflow import security
+from workflow.security import EncryptionManager
+
+CRYPTOGRAPHY_AVAILABLE = importlib.util.find_spec("cryptography") is not None
+
+
+@unittest.skipUnless(CRYPTOGRAPHY_AVAILABLE, "cryptography not installed")
+class TestEncryptionManager(unittest.TestCase):
+    def setUp(self):
+        """Set up an encryption manager with a fixed key."""
+        self.key = b"k" * 32
+        self.manager = EncryptionManager(self.key)
+
+    def test_round_trip(self):
+        """Encrypted data decrypts to the original."""
+        token = self.manager.encrypt_data("secret value")
+        self.assertTrue(token.startswith(b"v1."))
+        self.assertEqual(self.manager.decrypt_data(token), "secret value")
+
+    def test_key_is_derived_once(self):
+        """PBKDF2 runs once per key salt, not once per call."""
+        crypto = security._crypto()
+        kdf = Mock(wraps=crypto.PBKDF2HMAC)
+        counting = SimpleNamespace(**dict(vars(crypto), PBKDF2HMAC=kdf))
+        with patch.object(security, "_crypto", return_value=counting):
+            tokens = [self.manager.encrypt_data(str(i)) for i in range(20)]
+            items = self.manager.decrypt_batch(tokens)
+        self.assertEqual(items, [str(i) for i in range(20)])
+        self.assertEqual(kdf.call_count, 1)
+
+    def test_each_message_has_its_own_salt(self):
+        """Encrypting the same data twice gives different salts and tokens."""
+        first = self.manager.encrypt_data("same")
+        second = self.manager.encrypt_data("same")
+        self.assertNotEqual(first.split(b".")[1], second.split(b".")[1])
+
+    def test_other_manager_with_same_key_decrypts(self):
+        """The salts in the header are enough to decrypt with the same key."""
+        token = self.manager.encrypt_data("shared")
+        self.assertEqual(EncryptionManager(self.key).decrypt_data(token), "shared")
+
+    def test_legacy_token_decrypts(self):
+        """Tokens from the static-salt format remain readable."""
+        import base64
+
+        from cryptography.fernet import Fernet
+
+        key = self.manager._derive_key(EncryptionManager.LEGACY_SALT)
+        token = Fernet(base64.urlsafe_b64encode(key)).encrypt(b"old")
+        self.assertEqual(self.manager.decrypt_data(token), "old")
+
+    def test_batch_round_trip(self):
+        """Batches keep their order."""
+        items = ["a", "b", "c"]
+        self.assertEqual(
+            self.manager.decrypt_batch(self.manager.encrypt_batch(items)), items
+        )
+
+    def test_stream_round_trip(self):
+        """Large payloads are encrypted and decrypted chunk by chunk."""
+        payload = bytes(range(256)) * 1000
+        encrypted = b"".join(
+            self.manager.encrypt_stream(io.BytesIO(payload), chunk_size=10_000)
+        )
+        chunks = list(self.manager.decrypt_stream(io.BytesIO(encrypted)))
+        self.assertEqual(len(chunks), 26)
+        self.assertEqual(b"".join(chunks), payload)
+
+    def test_empty_stream_round_trip(self):
+        """An empty payload is a valid stream."""
+        encrypted = b"".join(self.manager.encrypt_stream(io.BytesIO(b"")))
+        self.assertEqual(
+            b"".join(self.manager.decrypt_stream(io.BytesIO(encrypted))), b""
+        )
+
+    def test_truncated_or_tampered_stream_is_rejected(self):
+        """Dropping the final chunk or flipping a byte fails decryption."""
+        records = list(
+            self.manager.encrypt_stream(io.BytesIO(b"x" * 100), chunk_size=40)
+        )
+        truncated = b"".join(records[:-1])
+        with self.assertRaises(ValueError):
+            b"".join(self.manager.decrypt_stream(io.BytesIO(truncated)))
+
+        tampered = bytearray(b"".join(records))
+        tampered[-1] ^= 1
+        with self.assertRaises(ValueError):
+            b"".join(self.manager.decrypt_stream(io.BytesIO(bytes(tampered))))
+
+
+if __name__ == "__main__":
+    unittest.main()
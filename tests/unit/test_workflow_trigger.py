@@ -0,0 +1,230 @@
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+
+from core.event_bus import EventBus
+from workflow.scheduler import (
+    MISFIRE_FIRE_ALL,
+    MISFIRE_FIRE_ONCE,
+    MISFIRE_SKIP,
+    TriggerScheduler,
+)
+from workflow.trigger import (
+    ConditionBasedTrigger,
+    EventBasedTrigger,
+    TimeBasedTrigger,
+    TriggerManager,
+    compile_event_filter,
+)
+
+
+class TestTriggerScheduler(unittest.TestCase):
+    def setUp(self):
+        """Set up a dedicated scheduler for each test."""
+        self.scheduler = TriggerScheduler(max_workers=2, misfire_grace=0.05)
+
+    def tearDown(self):
+        self.scheduler.shutdown()
+
+    def test_timers_fire_in_due_order(self):
+        """One-shot timers fire once, earliest first."""
+        fired = []
+        done = threading.Event()
+        self.scheduler.schedule(lambda: (fired.append("b"), done.set()), delay=0.1)
+        self.scheduler.schedule(lambda: fired.append("a"), delay=0.02)
+        self.assertTrue(done.wait(1))
+        self.assertEqual(fired, ["a", "b"])
+
+    def test_repeating_timer_and_cancel(self):
+        """Repeating timers fire until cancelled."""
+        count = []
+        timer = self.scheduler.schedule(lambda: count.append(1), interval=0.02)
+        time.sleep(0.15)
+        self.scheduler.cancel(timer)
+        fired = len(count)
+        time.sleep(0.1)
+        self.assertGreaterEqual(fired, 3)
+        self.assertEqual(len(count), fired)
+        self.assertEqual(self.scheduler.pending_count(), 0)
+
+    def test_many_triggers_use_one_thread(self):
+        """Thousands of timers do not add threads beyond the pool."""
+        before = threading.active_count()
+        timers = [
+            self.scheduler.schedule(lambda: None, delay=60, interval=60)
+            for _ in range(2000)
+        ]
+        self.assertLessEqual(threading.active_count(), before + 1 + 2)
+        for timer in timers:
+            self.scheduler.cancel(timer)
+        self.assertEqual(self.scheduler.pending_count(), 0)
+
+    def _run_late(self, policy, interval):
+        """Run a repeating timer that missed several occurrences."""
+        runs = []
+        timer = self.scheduler.schedule(
+            lambda: runs.append(time.time()),
+            delay=1,
+            interval=interval,
+            misfire_policy=policy,
+        )
+        # Pretend the process was suspended through five occurrences
+        with self.scheduler._condition:
+            self.scheduler._heap.clear()
+            timer.in_heap = False
+            timer.due -= 1 + 5 * interval
+        self.scheduler._push(timer)
+        time.sleep(0.1)
+        self.scheduler.cancel(timer)
+        return timer, runs
+
+    def test_misfire_skip(self):
+        """Skipped misfires wait for the next occurrence instead of running."""
+        timer, runs = self._run_late(MISFIRE_SKIP, interval=1.0)
+        self.assertEqual(timer.misfire_count, 1)
+        self.assertEqual(runs, [])
+        self.assertGreater(timer.due, time.time())
+
+    def test_misfire_fire_once(self):
+        """Missed occurrences are coalesced into a single run."""
+        timer, runs = self._run_late(MISFIRE_FIRE_ONCE, interval=1.0)
+        self.assertEqual(len(runs), 1)
+
+    def test_misfire_fire_all_catches_up(self):
+        """Catch-up timers run once for every missed occurrence."""
+        timer, runs = self._run_late(MISFIRE_FIRE_ALL, interval=1.0)
+        self.assertGreaterEqual(len(runs), 6)
+
+    def test_condition_triggers_share_a_timer(self):
+        """Condition triggers with the same interval are checked by one timer."""
+        fired = []
+        flags = {"go": False}
+        triggers = [
+            ConditionBasedTrigger(
+                f"c{i}", lambda i=i: fired.append(i), lambda: flags["go"], 0.02
+            )
+            for i in range(10)
+        ]
+        for trigger in triggers:
+            trigger.scheduler = self.scheduler
+            trigger.start()
+        self.assertEqual(self.scheduler.pending_count(), 1)
+
+        flags["go"] = True
+        time.sleep(0.15)
+        self.assertEqual(sorted(fired), list(range(10)))
+        # Activated condition triggers stop and release the shared timer
+        self.assertEqual(self.scheduler.pending_count(), 0)
+
+
+class TestTriggerManager(unittest.TestCase):
+    def test_manager_runs_time_triggers_on_its_scheduler(self):
+        """Managed time-based triggers repeat on the manager's scheduler."""
+        scheduler = TriggerScheduler(max_workers=1)
+        manager = TriggerManager(scheduler)
+        fired = []
+        manager.add_trigger(
+            TimeBasedTrigger(
+                "t1",
+                lambda: fired.append(1),
+                datetime.now() + timedelta(milliseconds=10),
+                interval=timedelta(milliseconds=20),
+            )
+        )
+        try:
+            manager.start_all()
+            time.sleep(0.1)
+            manager.stop_all()
+            self.assertGreaterEqual(len(fired), 2)
+            self.assertEqual(scheduler.pending_count(), 0)
+        finally:
+            scheduler.shutdown()
+
+
+class TestEventTriggers(unittest.TestCase):
+    def setUp(self):
+        """Set up a manager on a private scheduler."""
+        self.scheduler = TriggerScheduler(max_workers=1)
+        self.fired = []
+
+    def tearDown(self):
+        self.scheduler.shutdown()
+
+    def _trigger(self, trigger_id, event_type, **kwargs):
+        trigger = EventBasedTrigger(
+            trigger_id, lambda: self.fired.append(trigger_id), event_type, **kwargs
+        )
+        trigger.start()
+        return trigger
+
+    def test_dispatch_only_reaches_indexed_triggers(self):
+        """Events reach the triggers of their type and matching patterns only."""
+        manager = TriggerManager(self.scheduler)
+        manager.add_trigger(self._trigger("saved", "file.saved"))
+        manager.add_trigger(self._trigger("any_file", "file.*"))
+        for i in range(100):
+            manager.add_trigger(self._trigger(f"other_{i}", f"other.{i}"))
+
+        self.assertEqual(manager.dispatch_event("file.saved", {}), 2)
+        self.assertEqual(sorted(self.fired), ["any_file", "saved"])
+
+        manager.remove_trigger("saved")
+        manager.remove_trigger("any_file")
+        self.assertEqual(manager.dispatch_event("file.saved", {}), 0)
+
+    def test_filters_run_before_condition(self):
+        """Declarative filters reject events before the condition is called."""
+        condition_calls = []
+        manager = TriggerManager(self.scheduler)
+        manager.add_trigger(
+            self._trigger(
+                "failed",
+                "task.done",
+                condition=lambda data: condition_calls.append(data) or True,
+                filters={"status": "failed", "meta.retries": {"gte": 3}},
+            )
+        )
+        manager.simulate_event("task.done", {"status": "ok", "meta": {"retries": 5}})
+        manager.simulate_event(
+            "task.done", {"status": "failed", "meta": {"retries": 5}}
+        )
+        self.assertEqual(self.fired, ["failed"])
+        self.assertEqual(len(condition_calls), 1)
+
+    def test_compile_event_filter_operators(self):
+        """Filter operators cover comparisons, membership, presence and regex."""
+        matches = compile_event_filter(
+            {
+                "name": {"regex": "^report_"},
+                "size": {"gt": 10, "lte": 100},
+                "kind": {"in": ["pdf", "csv"]},
+                "tags": {"contains": "urgent"},
+                "owner": {"exists": False},
+            }
+        )
+        event = {"name": "report_q3", "size": 50, "kind": "pdf", "tags": ["urgent"]}
+        self.assertTrue(matches(event))
+        self.assertFalse(matches({**event, "size": "big"}))
+        self.assertFalse(matches({**event, "owner": "bob"}))
+        with self.assertRaises(ValueError):
+            compile_event_filter({"x": {"near": 1}})
+
+    def test_event_bus_publications_fire_triggers(self):
+        """Triggers fire from EventBus publications and unsubscribe on removal."""
+        bus = EventBus()
+        manager = TriggerManager(self.scheduler, event_bus=bus)
+        manager.add_trigger(self._trigger("a", "workflow.#"))
+        manager.add_trigger(self._trigger("b", "workflow.#", filters={"id": 7}))
+
+        bus.publish("workflow.started", {"id": 7})
+        bus.publish("workflow.started", id=8)
+        self.assertEqual(self.fired, ["a", "b", "a"])
+
+        manager.remove_trigger("a")
+        manager.remove_trigger("b")
+        self.assertEqual(bus.get_listeners("workflow.#"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,6 +10,8 @@ Creative, proactive, and playful tool modules are included for superhuman and en
 import logging
 from typing import Any, Dict, List, Optional, Tuple
 
+from core.lazy_loader import lazy_exports
+
 __all__ = [
     "BrowserTool",
     "wait_for_clipboard_change",
@@ -29,53 +31,56 @@ __all__ = [
     "EmailAnalytics",
 ]
 
-from .accessibility_tool import accessibility_action
-from .add_meme_caption_tool import add_meme_caption
-from .applescript_tool import run_applescript
-from .automator_shortcuts_tool import run_automator_or_shortcut
-from .base_tool import BaseTool
-from .browser import BrowserTool
-from .clipboard_tool import (
-    ClipboardResult,
-    clear_clipboard,
-    get_clipboard_image,
-    get_clipboard_text,
-    set_clipboard_image,
-    set_clipboard_text,
-    wait_for_clipboard_change,
-)
-from .creative_tool import CreativeTool
-from .delay_tool import DelayTool
-from .email.analytics import EmailAnalytics
-from .email.automation import EmailAutomation
-from .email.filtering import EmailFilter
-from .email.signature import EmailSignatureManager
-from .email.templates import EmailTemplateManager
-from .image_recognition_tool import find_object_in_image, find_template_in_image
-from .macro_suggestion_tool import macro_suggestion
-from .mouse_keyboard_tool import (
-    MouseButton,
-    MouseKeyboardResult,
-    click_at,
-    move_mouse,
-    press_key,
-    type_text,
-)
-from .ocr_tool import ocr_file, ocr_image
-from .pdf_extraction_tool import extract_pdf_text
-from .playful_tool import PlayfulTool
-from .proactive_tool import ProactiveTool
-from .save_image_tool import save_image
-from .screenshot_tool import capture_screen
-from .summarize_text_tool import summarize_text
-from .system_events_tool import system_event
-from .terminal_tool import (
-    TerminalResult,
-    change_directory,
-    execute_command,
-    execute_script,
-    get_environment,
-    kill_process,
+# Tools are imported on first access so that importing one tool, or the
+# tool manager, does not load every tool and its dependencies
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "accessibility_action": ".accessibility_tool",
+        "add_meme_caption": ".add_meme_caption_tool",
+        "run_applescript": ".applescript_tool",
+        "run_automator_or_shortcut": ".automator_shortcuts_tool",
+        "BaseTool": ".base_tool",
+        "BrowserTool": ".browser",
+        "ClipboardResult": ".clipboard_tool",
+        "clear_clipboard": ".clipboard_tool",
+        "get_clipboard_image": ".clipboard_tool",
+        "get_clipboard_text": ".clipboard_tool",
+        "set_clipboard_image": ".clipboard_tool",
+        "set_clipboard_text": ".clipboard_tool",
+        "wait_for_clipboard_change": ".clipboard_tool",
+        "CreativeTool": ".creative_tool",
+        "DelayTool": ".delay_tool",
+        "EmailAnalytics": ".email.analytics",
+        "EmailAutomation": ".email.automation",
+        "EmailFilter": ".email.filtering",
+        "EmailSignatureManager": ".email.signature",
+        "EmailTemplateManager": ".email.templates",
+        "find_object_in_image": ".image_recognition_tool",
+        "find_template_in_image": ".image_recognition_tool",
+        "macro_suggestion": ".macro_suggestion_tool",
+        "MouseButton": ".mouse_keyboard_tool",
+        "MouseKeyboardResult": ".mouse_keyboard_tool",
+        "click_at": ".mouse_keyboard_tool",
+        "move_mouse": ".mouse_keyboard_tool",
+        "press_key": ".mouse_keyboard_tool",
+        "type_text": ".mouse_keyboard_tool",
+        "ocr_file": ".ocr_tool",
+        "ocr_image": ".ocr_tool",
+        "extract_pdf_text": ".pdf_extraction_tool",
+        "PlayfulTool": ".playful_tool",
+        "ProactiveTool": ".proactive_tool",
+        "save_image": ".save_image_tool",
+        "capture_screen": ".screenshot_tool",
+        "summarize_text": ".summarize_text_tool",
+        "system_event": ".system_events_tool",
+        "TerminalResult": ".terminal_tool",
+        "change_directory": ".terminal_tool",
+        "execute_command": ".terminal_tool",
+        "execute_script": ".terminal_tool",
+        "get_environment": ".terminal_tool",
+        "kill_process": ".terminal_tool",
+    },
 )
 
 
@@ -90,6 +95,13 @@ class EmailTool:
 
         with suppress(ImportError):  # Not needed unless using Gmail features
             from googleapiclient.discovery import build
+
+        from .email.analytics import EmailAnalytics
+        from .email.automation import EmailAutomation
+        from .email.filtering import EmailFilter
+        from .email.signature import EmailSignatureManager
+        from .email.templates import EmailTemplateManager
+
         self.service = service
         self.logger = logging.getLogger(__name__)
         self.analytics = EmailAnalytics(service)
@@ -1,17 +1,53 @@
 """
 Advanced code reader tool for Atlas Help mode - provides comprehensive code analysis.
+
+The code index is updated incrementally: files whose modification time, size
+or content hash did not change since the last run are not parsed again, and
+changed files are parsed in parallel worker processes. The index is cached in
+a compact zlib-compressed binary file, and element names are indexed for
+prefix (sorted names), substring (trigrams) and fuzzy lookups.
 """
 
 import ast
+import bisect
+import difflib
+import gc
 import hashlib
 import json
 import logging
+import multiprocessing
 import os
+import sys
+import threading
 import time
-from collections import defaultdict
-from dataclasses import asdict, dataclass
+import zlib
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    import msgpack
+
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+# Формат бінарного кешу індексу: magic, версія формату, кодек
+CACHE_MAGIC = b"ATLASIDX"
+CACHE_VERSION = 1
+_CODEC_MSGPACK = 1
+_CODEC_JSON = 2
+
+# Мінімальна кількість змінених файлів для паралельного розбору в процесах
+PARALLEL_MIN_FILES = 32
+
+# Name lookup modes of CodeIndex.search_elements
+MATCH_PREFIX = "prefix"
+MATCH_SUBSTRING = "substring"
+MATCH_FUZZY = "fuzzy"
 
 
 @dataclass
@@ -50,37 +86,118 @@ class FileAnalysis:
     encoding: str = "utf-8"
 
 
+_ELEMENT_FIELDS = [f.name for f in fields(CodeElement)]
+_FILE_FIELDS = [f.name for f in fields(FileAnalysis)]
+
+
+def _trigrams(name: str) -> Set[str]:
+    """Get the distinct three-character substrings of a name."""
+    return {name[i : i + 3] for i in range(len(name) - 2)}
+
+
 class CodeIndex:
     """Maintains an index of all code elements for fast searching"""
 
     def __init__(self, cache_file: str = None):
-        self.elements: Dict[str, List[CodeElement]] = defaultdict(list)
+        self.elements: Dict[str, List[CodeElement]] = {}
         self.files: Dict[str, FileAnalysis] = {}
-        self.cache_file = cache_file or ".atlas_code_cache.json"
+        self.cache_file = cache_file or ".atlas_code_cache.bin"
+        self.timestamp = 0.0  # Час останнього збереження кешу
+        # Триграми будуються при першому пошуку, щоб завантаження було швидким
+        self._trigram_names: Optional[Dict[str, Set[str]]] = None
+        self._sorted_names: Optional[List[str]] = None  # Для пошуку за префіксом
         self.load_cache()
 
     def add_file_analysis(self, analysis: FileAnalysis):
-        """Add file analysis to index"""
+        """Add file analysis to index, replacing an earlier analysis of the file"""
+        self.remove_file(analysis.path)
         self.files[analysis.path] = analysis
 
         # Index all elements
         for element in analysis.elements:
-            self.elements[element.name.lower()].append(element)
+            name = element.name.lower()
+            entries = self.elements.get(name)
+            if entries is None:
+                entries = self.elements[name] = []
+                self._sorted_names = None
+                if self._trigram_names is not None:
+                    for trigram in _trigrams(name):
+                        self._trigram_names.setdefault(trigram, set()).add(name)
+            entries.append(element)
+
+    def remove_file(self, path: str) -> bool:
+        """Remove a file and its elements from the index.
+
+        Args:
+            path (str): Path of the file relative to the indexed root.
+
+        Returns:
+            bool: True if the file was indexed, False otherwise.
+        """
+        analysis = self.files.pop(path, None)
+        if analysis is None:
+            return False
+        for element in analysis.elements:
+            name = element.name.lower()
+            entries = self.elements.get(name)
+            if entries is None:
+                continue
+            entries[:] = [e for e in entries if e is not element]
+            if not entries:
+                del self.elements[name]
+                self._sorted_names = None
+                if self._trigram_names is not None:
+                    for trigram in _trigrams(name):
+                        names = self._trigram_names[trigram]
+                        names.discard(name)
+                        if not names:
+                            del self._trigram_names[trigram]
+        return True
+
+    def clear(self):
+        """Remove all files and elements from the index"""
+        self.elements.clear()
+        self.files.clear()
+        self._trigram_names = None
+        self._sorted_names = None
 
     def search_elements(
-        self, query: str, element_type: str = None
+        self,
+        query: str,
+        element_type: str = None,
+        match: str = MATCH_SUBSTRING,
+        cutoff: float = 0.6,
     ) -> List[CodeElement]:
-        """Search for code elements by name"""
+        """Search for code elements by name.
+
+        Args:
+            query (str): Name or part of a name, case-insensitive.
+            element_type (str): Only return elements of this type.
+            match (str): MATCH_SUBSTRING for names containing the query,
+                MATCH_PREFIX for names starting with it, or MATCH_FUZZY for
+                names similar to it.
+            cutoff (float): Minimum similarity ratio of fuzzy matches.
+
+        Returns:
+            List[CodeElement]: Matching elements, best match first.
+        """
         query = query.lower()
-        results = []
-
-        for name, elements in self.elements.items():
-            if query in name:
-                for element in elements:
-                    if element_type is None or element.type == element_type:
-                        results.append(element)
+        if match == MATCH_PREFIX:
+            names = sorted(self._prefix_names(query), key=lambda n: (len(n), n))
+        elif match == MATCH_FUZZY:
+            names = self._fuzzy_names(query, cutoff)
+        else:
+            names = sorted(
+                self._substring_names(query),
+                key=lambda n: (n.find(query), len(n), n),
+            )
 
-        return sorted(results, key=lambda x: x.name.lower().find(query))
+        results = []
+        for name in names:
+            for element in self.elements[name]:
+                if element_type is None or element.type == element_type:
+                    results.append(element)
+        return results
 
     def get_file_elements(
         self, file_path: str, element_type: str = None
@@ -95,33 +212,125 @@ class CodeIndex:
 
         return elements
 
+    def _trigram_index(self) -> Dict[str, Set[str]]:
+        """Get the names by trigram, building the lookup on first use"""
+        if self._trigram_names is None:
+            self._trigram_names = {}
+            for name in self.elements:
+                for trigram in _trigrams(name):
+                    self._trigram_names.setdefault(trigram, set()).add(name)
+        return self._trigram_names
+
+    def _prefix_names(self, query: str) -> List[str]:
+        """Get the names starting with the query from the sorted names"""
+        if self._sorted_names is None:
+            self._sorted_names = sorted(self.elements)
+        names = self._sorted_names
+        start = bisect.bisect_left(names, query)
+        end = start
+        while end < len(names) and names[end].startswith(query):
+            end += 1
+        return names[start:end]
+
+    def _substring_names(self, query: str) -> Iterable[str]:
+        """Get the names containing the query, narrowed down by trigrams"""
+        if len(query) < 3:
+            return [name for name in self.elements if query in name]
+        trigram_names = self._trigram_index()
+        candidates = sorted(
+            (trigram_names.get(t, set()) for t in _trigrams(query)), key=len
+        )
+        names = set(candidates[0]).intersection(*candidates[1:])
+        return [name for name in names if query in name]
+
+    def _fuzzy_names(self, query: str, cutoff: float) -> List[str]:
+        """Get the names similar to the query, most similar first"""
+        if len(query) < 3:
+            candidates: Iterable[str] = self.elements
+        else:
+            # Кандидати - імена з найбільшою кількістю спільних триграм
+            trigram_names = self._trigram_index()
+            shared = Counter()
+            for trigram in _trigrams(query):
+                shared.update(trigram_names.get(trigram, ()))
+            candidates = [name for name, _ in shared.most_common(200)]
+        matcher = difflib.SequenceMatcher(b=query)
+        scored = []
+        for name in candidates:
+            matcher.set_seq1(name)
+            if matcher.real_quick_ratio() >= cutoff and matcher.quick_ratio() >= cutoff:
+                ratio = matcher.ratio()
+                if ratio >= cutoff:
+                    scored.append((-ratio, name))
+        return [name for _, name in sorted(scored)]
+
     def save_cache(self):
         """Save index to cache file"""
         try:
-            cache_data = {
-                "files": {
-                    path: asdict(analysis) for path, analysis in self.files.items()
-                },
-                "timestamp": time.time(),
-            }
-            with open(self.cache_file, "w") as f:
-                json.dump(cache_data, f, indent=2)
+            # Файли та елементи зберігаються як рядки значень полів
+            files = []
+            for analysis in self.files.values():
+                row = [getattr(analysis, field) for field in _FILE_FIELDS]
+                row[_FILE_FIELDS.index("elements")] = [
+                    [getattr(e, field) for field in _ELEMENT_FIELDS]
+                    for e in analysis.elements
+                ]
+                files.append(row)
+            self.timestamp = time.time()
+            cache_data = {"files": files, "timestamp": self.timestamp}
+            if MSGPACK_AVAILABLE:
+                codec = _CODEC_MSGPACK
+                payload = msgpack.packb(cache_data, use_bin_type=True)
+            else:
+                codec = _CODEC_JSON
+                payload = json.dumps(cache_data, separators=(",", ":")).encode()
+
+            # Атомарний запис, щоб перерваний запис не пошкодив кеш
+            tmp_file = f"{self.cache_file}.tmp"
+            with open(tmp_file, "wb") as f:
+                f.write(CACHE_MAGIC + bytes([CACHE_VERSION, codec]))
+                f.write(zlib.compress(payload, 1))
+            os.replace(tmp_file, self.cache_file)
         except Exception as e:
             logging.exception(f"Failed to save cache: {e}")
 
     def load_cache(self):
         """Load index from cache file"""
         try:
-            if os.path.exists(self.cache_file):
-                with open(self.cache_file) as f:
-                    cache_data = json.load(f)
-
-                for _path, file_data in cache_data.get("files", {}).items():
-                    # Convert dict back to dataclass
-                    elements = [CodeElement(**elem) for elem in file_data["elements"]]
-                    file_data["elements"] = elements
-                    analysis = FileAnalysis(**file_data)
-                    self.add_file_analysis(analysis)
+            if not os.path.exists(self.cache_file):
+                return
+            with open(self.cache_file, "rb") as f:
+                data = f.read()
+
+            header = CACHE_MAGIC + bytes([CACHE_VERSION])
+            if not data.startswith(header) or len(data) <= len(header):
+                logging.info(f"Ignoring code index cache {self.cache_file}: old format")
+                return
+            codec = data[len(header)]
+            payload = zlib.decompress(data[len(header) + 1 :])
+            if codec == _CODEC_MSGPACK:
+                if not MSGPACK_AVAILABLE:
+                    logging.info("msgpack is required to read the code index cache")
+                    return
+                cache_data = msgpack.unpackb(payload, raw=False)
+            else:
+                cache_data = json.loads(payload)
+
+            # Збирач сміття лише сповільнює створення великої кількості об'єктів
+            gc_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                for row in cache_data.get("files", []):
+                    file_data = dict(zip(_FILE_FIELDS, row, strict=True))
+                    # Convert rows back to dataclasses
+                    file_data["elements"] = [
+                        CodeElement(*elem) for elem in file_data["elements"]
+                    ]
+                    self.add_file_analysis(FileAnalysis(**file_data))
+            finally:
+                if gc_enabled:
+                    gc.enable()
+            self.timestamp = cache_data.get("timestamp", 0.0)
         except Exception as e:
             logging.exception(f"Failed to load cache: {e}")
 
@@ -166,11 +375,12 @@ class CodeReaderTool:
         }
 
         # Initialize code index for advanced analysis
-        self.index = CodeIndex(
-            cache_file=str(self.root_path / ".atlas_code_cache.json")
-        )
-        self._last_index_update = 0
+        self.index = CodeIndex(cache_file=str(self.root_path / ".atlas_code_cache.bin"))
+        self._last_index_update = self.index.timestamp
         self._index_update_interval = 300  # 5 minutes
+        self._index_lock = threading.Lock()
+        # Файли, які не вдалося розібрати: шлях -> (mtime, розмір)
+        self._skipped_files: Dict[str, Tuple[float, int]] = {}
 
         # Запускаємо індексацію в фоні, щоб не блокувати запуск
         # Можна відключити через змінну середовища
@@ -179,8 +389,6 @@ class CodeReaderTool:
             "1",
             "yes",
         ):
-            import threading
-
             self._indexing_thread = threading.Thread(
                 target=self._ensure_index_updated, daemon=True
             )
@@ -454,143 +662,169 @@ class CodeReaderTool:
     def _ensure_index_updated(self):
         """Ensure code index is up to date"""
         try:
-            # Спочатку спробуємо завантажити існуючий cache
-            cache_file = self.root_path / ".atlas_code_cache.json"
-            if cache_file.exists():
-                cache_age = time.time() - cache_file.stat().st_mtime
-                if cache_age < self._index_update_interval:
-                    self.logger.info("Using existing code index cache")
-                    return
-
             current_time = time.time()
             if current_time - self._last_index_update > self._index_update_interval:
                 self.rebuild_index()
         except Exception as e:
             self.logger.error(f"Error updating index: {e}")
 
-    def rebuild_index(self):
-        """Rebuild the entire code index from scratch"""
-        self.logger.info("Rebuilding code index...")
-        start_time = time.time()
-        max_indexing_time = 30  # Максимум 30 секунд на індексацію
-
-        # Clear existing index
-        self.index = CodeIndex(
-            cache_file=str(self.root_path / ".atlas_code_cache.json")
-        )
-
-        # Index only Atlas Python files (not venv)
-        python_files = []
-        for pattern in [
-            "*.py",
-            "agents/*.py",
-            "tools/*.py",
-            "ui/*.py",
-            "utils/*.py",
-            "tests/*.py",
-        ]:
-            python_files.extend(self.root_path.glob(pattern))
-
-        # Обмежуємо кількість файлів
-        python_files = python_files[:200]  # Максимум 200 файлів
-
-        files_processed = 0
-        for file_path in python_files:
-            # Verification таймауту
-            if time.time() - start_time > max_indexing_time:
-                self.logger.info(
-                    f"Indexing timeout reached, processed {files_processed} files"
-                )
-                break
-
-            if any(excluded in file_path.parts for excluded in self.excluded_dirs):
-                continue
+    def rebuild_index(
+        self, full: bool = False, max_workers: int = None
+    ) -> Dict[str, int]:
+        """Bring the code index up to date with the Python files on disk.
+
+        Files whose modification time and size match the index are skipped,
+        files whose content hash still matches are only re-stamped, and the
+        rest are parsed, in worker processes when there are many of them.
+
+        Args:
+            full (bool): Discard the index and parse every file again.
+            max_workers (int): Worker processes for parsing, defaults to the
+                number of CPUs.
+
+        Returns:
+            Dict[str, int]: Number of files parsed, unchanged and removed, and
+                the files and elements in the index.
+        """
+        with self._index_lock:
+            self.logger.info("Updating code index...")
+            start_time = time.time()
+            if full:
+                self.index.clear()
+                self._skipped_files.clear()
+
+            current = dict(self._iter_python_files())
+
+            self._skipped_files = {
+                path: signature
+                for path, signature in self._skipped_files.items()
+                if path in current
+            }
+            removed = [path for path in self.index.files if path not in current]
+            for path in removed:
+                self.index.remove_file(path)
+
+            stale = []
+            unchanged = restamped = 0
+            for relative_path, file_path in current.items():
+                cached = self.index.files.get(relative_path)
+                if cached is None:
+                    skipped = self._skipped_files.get(relative_path)
+                    if skipped and skipped == self._file_signature(file_path):
+                        unchanged += 1
+                    else:
+                        stale.append(relative_path)
+                    continue
+                last_modified = cached.last_modified
+                if self._is_unchanged(file_path, cached):
+                    unchanged += 1
+                    restamped += cached.last_modified != last_modified
+                else:
+                    stale.append(relative_path)
 
-            try:
-                analysis = self._analyze_python_file(file_path)
+            stale_paths = [current[relative_path] for relative_path in stale]
+            analyses = self._analyze_python_files(stale_paths, max_workers)
+            for relative_path, analysis in zip(stale, analyses, strict=True):
                 if analysis:
                     self.index.add_file_analysis(analysis)
-                    files_processed += 1
-            except Exception as e:
-                self.logger.error(f"Error analyzing file {file_path}: {e}")
-                continue
+                else:
+                    self._skipped_files[relative_path] = self._file_signature(
+                        current[relative_path]
+                    )
 
-        self.index.save_cache()
-        self._last_index_update = time.time()
+            if stale or removed or restamped or full:
+                self.index.save_cache()
+            self._last_index_update = time.time()
 
-        elapsed = time.time() - start_time
-        file_count = len(self.index.files)
-        element_count = sum(len(elements) for elements in self.index.elements.values())
+            stats = {
+                "parsed": len(stale),
+                "unchanged": unchanged,
+                "removed": len(removed),
+                "files": len(self.index.files),
+                "elements": sum(len(e) for e in self.index.elements.values()),
+            }
 
+        elapsed = time.time() - start_time
         self.logger.info(
-            f"Index rebuilt: {file_count} files, {element_count} elements in {elapsed:.2f}s"
+            f"Index updated: {stats['files']} files, {stats['elements']} elements, "
+            f"{stats['parsed']} parsed in {elapsed:.2f}s"
         )
+        return stats
+
+    def _iter_python_files(self) -> Iterable[Tuple[str, str]]:
+        """Walk the root for Python files, skipping excluded directories.
+
+        Yields:
+            Tuple[str, str]: Path relative to the root and full path of a file.
+        """
+        for dirpath, dirnames, filenames in os.walk(self.root_path):
+            dirnames[:] = [d for d in dirnames if d not in self.excluded_dirs]
+            relative_dir = os.path.relpath(dirpath, self.root_path)
+            for filename in filenames:
+                if filename.endswith(".py"):
+                    relative_path = (
+                        filename
+                        if relative_dir == os.curdir
+                        else os.path.join(relative_dir, filename)
+                    )
+                    yield relative_path, os.path.join(dirpath, filename)
 
-    def _analyze_python_file(self, file_path: Path) -> Optional[FileAnalysis]:
-        """Analyze a Python file using AST and extract code elements"""
+    @staticmethod
+    def _file_signature(file_path: str) -> Optional[Tuple[float, int]]:
+        """Get the modification time and size of a file"""
         try:
-            # Verification на виключені директорії
-            if any(excluded in file_path.parts for excluded in self.excluded_dirs):
-                return None
-
-            # Verification розміру файлу (максимум 1MB)
-            stat = file_path.stat()
-            max_size = 1024 * 1024  # 1MB
-            if stat.st_size > max_size:
-                self.logger.warning(
-                    f"Skipping large file {file_path} ({stat.st_size} bytes)"
-                )
-                return None
-
-            with open(file_path, encoding="utf-8") as f:
-                content = f.read()
-
-            # Verification кількості рядків (максимум 10000)
-            lines = content.count("\n") + 1
-            if lines > 10000:
-                self.logger.warning(f"Skipping large file {file_path} ({lines} lines)")
-                return None
-
-            # Basic file info
-            file_hash = hashlib.md5(content.encode()).hexdigest()
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return stat.st_mtime, stat.st_size
 
-            # Parse AST з обмеженням глибини рекурсії
+    def _is_unchanged(self, file_path: str, cached: FileAnalysis) -> bool:
+        """Check a file against its indexed analysis by mtime, size and hash"""
+        try:
+            stat = os.stat(file_path)
+            if stat.st_mtime == cached.last_modified and stat.st_size == cached.size:
+                return True
+            # Змінився лише час модифікації (git checkout, touch)
+            if stat.st_size == cached.size:
+                with open(file_path, "rb") as f:
+                    if hashlib.md5(f.read()).hexdigest() == cached.hash:
+                        cached.last_modified = stat.st_mtime
+                        return True
+        except OSError:
+            pass
+        return False
+
+    def _analyze_python_files(
+        self, paths: List[str], max_workers: int = None
+    ) -> List[Optional[FileAnalysis]]:
+        """Analyze Python files, in worker processes when there are many
+
+        Workers are spawned rather than forked: indexing usually runs on a
+        background thread, and forking a threaded process can copy locks held
+        by other threads into the children.
+        """
+        analyze = partial(analyze_python_file, root_path=str(self.root_path))
+        workers = max_workers or os.cpu_count() or 1
+        results = None
+        if len(paths) >= PARALLEL_MIN_FILES and workers > 1:
             try:
-                import sys
-
-                old_limit = sys.getrecursionlimit()
-                sys.setrecursionlimit(500)  # Обмежуємо рекурсію
-                tree = ast.parse(content, filename=str(file_path))
-                sys.setrecursionlimit(old_limit)
-            except (SyntaxError, RecursionError) as e:
-                self.logger.warning(f"Cannot parse {file_path}: {e}")
-                return None
-
-            # Extract elements
-            analyzer = ASTAnalyzer(str(file_path))
-            analyzer.visit(tree)
-
-            # Calculate dependencies
-            dependencies = self._extract_dependencies(content)
-
-            # Calculate file complexity
-            complexity = self._calculate_file_complexity(analyzer.elements)
-
-            return FileAnalysis(
-                path=str(file_path.relative_to(self.root_path)),
-                hash=file_hash,
-                size=stat.st_size,
-                lines=lines,
-                last_modified=stat.st_mtime,
-                elements=analyzer.elements,
-                imports=analyzer.imports,
-                dependencies=dependencies,
-                complexity=complexity,
-            )
+                with ProcessPoolExecutor(
+                    max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+                ) as executor:
+                    chunksize = max(1, len(paths) // (workers * 4))
+                    results = list(executor.map(analyze, paths, chunksize=chunksize))
+            except Exception as e:
+                self.logger.warning(f"Parallel indexing failed, indexing serially: {e}")
+        if results is None:
+            results = [analyze(path) for path in paths]
+        return results
 
-        except Exception as e:
-            self.logger.error(f"Error analyzing file {file_path}: {e}")
+    def _analyze_python_file(self, file_path: Path) -> Optional[FileAnalysis]:
+        """Analyze a Python file using AST and extract code elements"""
+        # Verification на виключені директорії
+        if any(excluded in file_path.parts for excluded in self.excluded_dirs):
             return None
+        return analyze_python_file(str(file_path), str(self.root_path))
 
     def search_functions(self, query: str = "", class_name: str = None) -> str:
         """Search for functions and methods in the codebase"""
@@ -956,8 +1190,13 @@ class CodeReaderTool:
         if search_type in ["all", "definitions"]:
             # Search for symbol definitions
             elements = self.index.search_elements(query)
+            title = "Symbol Definitions"
+            if not elements:
+                # Можливо, в назві помилка - шукаємо схожі імена
+                elements = self.index.search_elements(query, match=MATCH_FUZZY)
+                title = "Similar Symbols"
             if elements:
-                results.append(f"🎯 **Symbol Definitions for '{query}':**\n")
+                results.append(f"🎯 **{title} for '{query}':**\n")
 
                 # Group by type
                 by_type = defaultdict(list)
@@ -1016,7 +1255,8 @@ class CodeReaderTool:
 
         return "\n".join(results)
 
-    def _extract_dependencies(self, content: str) -> List[str]:
+    @staticmethod
+    def _extract_dependencies(content: str) -> List[str]:
         """Extract dependencies from import statements"""
         dependencies = set()
 
@@ -1035,7 +1275,8 @@ class CodeReaderTool:
 
         return sorted(dependencies)
 
-    def _calculate_file_complexity(self, elements: List[CodeElement]) -> int:
+    @staticmethod
+    def _calculate_file_complexity(elements: List[CodeElement]) -> int:
         """Calculate file complexity based on elements"""
         complexity = 0
         for element in elements:
@@ -1091,6 +1332,73 @@ class CodeReaderTool:
         return lang_map.get(suffix, "text")
 
 
+def analyze_python_file(file_path: str, root_path: str) -> Optional[FileAnalysis]:
+    """Analyze a Python file using AST and extract code elements.
+
+    This is a module-level function so it can run in worker processes.
+
+    Args:
+        file_path (str): Path of the file.
+        root_path (str): Indexed root the analysis path is made relative to.
+
+    Returns:
+        Optional[FileAnalysis]: The analysis, or None if the file is too
+            large or cannot be parsed.
+    """
+    logger = logging.getLogger(CodeReaderTool.__name__)
+    try:
+        # Verification розміру файлу (максимум 1MB)
+        stat = os.stat(file_path)
+        max_size = 1024 * 1024  # 1MB
+        if stat.st_size > max_size:
+            logger.warning(f"Skipping large file {file_path} ({stat.st_size} bytes)")
+            return None
+
+        with open(file_path, "rb") as f:
+            raw = f.read()
+        content = raw.decode("utf-8")
+
+        # Verification кількості рядків (максимум 10000)
+        lines = content.count("\n") + 1
+        if lines > 10000:
+            logger.warning(f"Skipping large file {file_path} ({lines} lines)")
+            return None
+
+        # Basic file info
+        file_hash = hashlib.md5(raw).hexdigest()
+
+        # Parse AST з обмеженням глибини рекурсії
+        old_limit = sys.getrecursionlimit()
+        try:
+            sys.setrecursionlimit(500)  # Обмежуємо рекурсію
+            tree = ast.parse(content, filename=file_path)
+        except (SyntaxError, RecursionError) as e:
+            logger.warning(f"Cannot parse {file_path}: {e}")
+            return None
+        finally:
+            sys.setrecursionlimit(old_limit)
+
+        # Extract elements
+        analyzer = ASTAnalyzer(file_path)
+        analyzer.visit(tree)
+
+        return FileAnalysis(
+            path=os.path.relpath(file_path, root_path),
+            hash=file_hash,
+            size=stat.st_size,
+            lines=lines,
+            last_modified=stat.st_mtime,
+            elements=analyzer.elements,
+            imports=analyzer.imports,
+            dependencies=CodeReaderTool._extract_dependencies(content),
+            complexity=CodeReaderTool._calculate_file_complexity(analyzer.elements),
+        )
+
+    except Exception as e:
+        logger.error(f"Error analyzing file {file_path}: {e}")
+        return None
+
+
 class ASTAnalyzer(ast.NodeVisitor):
     """AST visitor for analyzing Python code structure"""
 
@@ -5,13 +5,15 @@ This module provides comprehensive tool management including discovery,
 loading, registration, and lifecycle management of Atlas tools.
 """
 
+import ast
 import importlib
 import inspect
 import logging
 import os
 import pkgutil
-from typing import Any, Dict, List, Optional, Type
+from typing import Any, Dict, List, Optional, Type, Union
 
+from core.lazy_loader import LazyLoader
 from tools.base_tool import ToolBase
 
 logger = logging.getLogger(__name__)
@@ -27,13 +29,20 @@ class ToolManager:
     - Tool execution and chaining
     - Performance monitoring and statistics
     - Event system integration
+
+    In lazy mode, which is opt-in, tool modules are not imported during
+    discovery; their classes are registered as lazy proxies and a tool is
+    imported and instantiated the first time it is requested. Until then it
+    is only listed by ``list_tool_classes``: categories and metadata come
+    from tool instances.
     """
 
-    def __init__(self, event_bus=None):
+    def __init__(self, event_bus=None, lazy: bool = False):
         """Initialize the tool manager."""
         self.event_bus = event_bus
+        self.lazy = lazy
         self.tools: Dict[str, ToolBase] = {}
-        self.tool_classes: Dict[str, Type[ToolBase]] = {}
+        self.tool_classes: Dict[str, Union[Type[ToolBase], LazyLoader]] = {}
         self.categories: Dict[str, List[str]] = {}
         self._setup_event_handlers()
 
@@ -96,17 +105,91 @@ class ToolManager:
         logger.info(f"Discovered {len(discovered_tools)} tools")
         return discovered_tools
 
+    def discover_tools_lazy(self, package_path: str = "tools") -> List[LazyLoader]:
+        """
+        Discover tool classes by parsing the tool sources without importing them.
+
+        A class counts as a tool if it derives, by name, from ``ToolBase``, an
+        imported subclass of it such as ``BaseTool``, or another tool class
+        found in the package.
+
+        Args:
+            package_path: Dotted name of the package containing tools
+
+        Returns:
+            List of lazy proxies for the discovered tool classes
+        """
+        tools_dir = (
+            os.path.dirname(__file__)
+            if package_path == "tools"
+            else os.path.abspath(os.path.join(*package_path.split(".")))
+        )
+        if not os.path.exists(tools_dir):
+            logger.warning(f"Tools directory not found: {tools_dir}")
+            return []
+
+        # Collect (module, class, base names) for every top-level class
+        classes = []
+        for _, modname, _ in pkgutil.iter_modules([tools_dir]):
+            if modname.startswith("__"):
+                continue
+            path = os.path.join(tools_dir, f"{modname}.py")
+            try:
+                with open(path, encoding="utf-8") as f:
+                    tree = ast.parse(f.read(), filename=path)
+            except (OSError, SyntaxError, ValueError) as e:
+                logger.error(f"Error parsing tool module {modname}: {e}")
+                continue
+            for node in tree.body:
+                if isinstance(node, ast.ClassDef):
+                    bases = {
+                        base.attr if isinstance(base, ast.Attribute) else base.id
+                        for base in node.bases
+                        if isinstance(base, (ast.Name, ast.Attribute))
+                    }
+                    classes.append((modname, node.name, bases))
+
+        # Seed with the already imported tool base classes, e.g. BaseTool
+        tool_bases = {ToolBase.__name__}
+        stack = list(ToolBase.__subclasses__())
+        while stack:
+            subclass = stack.pop()
+            tool_bases.add(subclass.__name__)
+            stack.extend(subclass.__subclasses__())
+        changed = True
+        while changed:
+            changed = False
+            for _, class_name, bases in classes:
+                if class_name not in tool_bases and bases & tool_bases:
+                    tool_bases.add(class_name)
+                    changed = True
+
+        discovered_tools = [
+            LazyLoader(f"{package_path}.{modname}", class_name)
+            for modname, class_name, bases in classes
+            if bases & tool_bases and modname != "base_tool"
+        ]
+        logger.info(f"Discovered {len(discovered_tools)} tools without importing them")
+        return discovered_tools
+
     def register_tool_class(
-        self, tool_class: Type[ToolBase], name: Optional[str] = None
+        self,
+        tool_class: Union[Type[ToolBase], LazyLoader],
+        name: Optional[str] = None,
     ):
         """
         Register a tool class for later instantiation.
 
         Args:
-            tool_class: The tool class to register
+            tool_class: The tool class to register, or a lazy proxy of it
             name: Optional name for the tool (defaults to class-derived name)
         """
-        tool_name = name or tool_class.__name__.replace("Tool", "").lower()
+        class_name = (
+            tool_class.attribute_name
+            if isinstance(tool_class, LazyLoader)
+            else tool_class.__name__
+        )
+        tool_name = name or class_name.replace("Tool", "").lower()
         self.tool_classes[tool_name] = tool_class
 
         logger.info(f"Registered tool class: {tool_name}")
@@ -135,6 +218,9 @@ class ToolManager:
 
         try:
             tool_class = self.tool_classes[tool_name]
+            if isinstance(tool_class, LazyLoader):
+                tool_class = tool_class.get()
+                self.tool_classes[tool_name] = tool_class
             tool_instance = tool_class(**kwargs)
 
             # Setup tool registry for chaining
@@ -239,7 +325,15 @@ class ToolManager:
         Returns:
             Tool instance or None if not found
         """
-        return self.tools.get(tool_name)
+        tool = self.tools.get(tool_name)
+        # Lazily registered tools are loaded on first use
+        if (
+            tool is None
+            and isinstance(self.tool_classes.get(tool_name), LazyLoader)
+            and self.load_tool(tool_name)
+        ):
+            tool = self.tools.get(tool_name)
+        return tool
 
     async def execute_tool(self, tool_name: str, *args, **kwargs) -> Dict[str, Any]:
         """
@@ -310,12 +404,24 @@ class ToolManager:
         logger.info("Initializing all tools...")
 
         # Discover tools first
-        discovered_tools = self.discover_tools()
+        discovered_tools = (
+            self.discover_tools_lazy() if self.lazy else self.discover_tools()
+        )
 
         # Register discovered tools
         for tool_class in discovered_tools:
             self.register_tool_class(tool_class)
 
+        if self.lazy:
+            logger.info(
+                f"Registered {len(self.tool_classes)} tools for loading on first use"
+            )
+            if self.event_bus:
+                self.event_bus.publish(
+                    "tools_initialized", total=len(self.tool_classes), successful=0
+                )
+            return
+
         # Load all registered tools
         success_count = 0
         for tool_name in self.tool_classes:
@@ -46,7 +46,8 @@ class PluginsModule(QWidget):
         self.setObjectName("PluginsModule")
         self.plugin_manager: Optional[PluginManager] = None
         self.tool_widgets: List[QWidget] = []
-        self.async_manager = AsyncTaskManager()
+        # Widget updates must not run concurrently with each other
+        self.async_manager = AsyncTaskManager(concurrency_limits={"ui": 1})
         self.async_manager.start()
         layout = QVBoxLayout(self)
         layout.setContentsMargins(20, 20, 20, 20)
@@ -147,7 +148,9 @@ class PluginsModule(QWidget):
                 pass
                 # self.logger.error(f"Error updating plugins: {e}")
 
-        self.async_manager.submit_task(update_plugins_async)
+        self.async_manager.submit_task(
+            update_plugins_async, priority="interactive", task_type="ui"
+        )
 
     def update_tools(self) -> None:
         """Update plugin tools in the UI asynchronously.
@@ -182,7 +185,9 @@ class PluginsModule(QWidget):
                 pass
                 # self.logger.error(f"Error updating tools: {e}")
 
-        self.async_manager.submit_task(update_tools_async)
+        self.async_manager.submit_task(
+            update_tools_async, priority="interactive", task_type="ui"
+        )
 
     def activate_plugin(self) -> None:
         """Activate the selected plugin.
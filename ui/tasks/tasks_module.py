@@ -66,7 +66,8 @@ class TasksModule(QWidget):
         self.task_planner_agent = task_planner_agent
         self.user_id = user_id
         self.tool_widgets: List[QWidget] = []
-        self.async_manager = AsyncTaskManager()
+        # Widget updates must not run concurrently with each other
+        self.async_manager = AsyncTaskManager(concurrency_limits={"ui": 1})
         self.async_manager.start()
         layout = QVBoxLayout(self)
         layout.setContentsMargins(20, 20, 20, 20)
@@ -189,7 +190,9 @@ class TasksModule(QWidget):
             except Exception as e:
                 print(f"Error updating task list: {e}")
 
-        self.async_manager.submit_task(update_task_list_async)
+        self.async_manager.submit_task(
+            update_task_list_async, priority="interactive", task_type="ui"
+        )
 
     def update_plan_list(self) -> None:
         """Update the plan list from the task planner agent asynchronously."""
@@ -205,7 +208,9 @@ class TasksModule(QWidget):
             except Exception as e:
                 print(f"Error updating plan list: {e}")
 
-        self.async_manager.submit_task(update_plan_list_async)
+        self.async_manager.submit_task(
+            update_plan_list_async, priority="interactive", task_type="ui"
+        )
 
     def on_plan_selected(self, current, previous) -> None:
         """Handle plan selection change to display plan details.
@@ -314,7 +319,9 @@ class TasksModule(QWidget):
                         f"{str(_('Failed to create plan:')) or 'Failed to create plan:'} {str(e)}",
                     )
 
-            self.async_manager.submit_task(create_plan_async)
+            self.async_manager.submit_task(
+                create_plan_async, priority="interactive", task_type="ui"
+            )
 
     def cancel_plan(self) -> None:
         """Cancel the selected plan."""
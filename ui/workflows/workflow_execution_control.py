@@ -20,7 +20,9 @@ from PySide6.QtWidgets import (
 
 from ui.components.loading_spinner import LoadingSpinner
 from ui.module_communication import EVENT_BUS
+from utils.config_manager import ConfigManager
 from workflow.engine import WorkflowEngine
+from workflow.workflow_pattern_library import WorkflowPatternLibrary
 
 
 class WorkflowExecutionControl(QWidget):
@@ -137,34 +139,41 @@ class WorkflowExecutionControl(QWidget):
         if self.current_workflow_id and not self.is_executing:
             self.execute_button.setEnabled(False)
             self.spinner.start()
-            # Завантажити план workflow (наприклад, з JSON-файлу)
+            # Завантажити план workflow з бібліотеки шаблонів
             workflow_id = self.current_workflow_id
             patterns_path = (
                 pathlib.Path(os.path.dirname(__file__)).parent.parent
                 / "workflow"
                 / "workflow_patterns.json"
             )
-            with open(patterns_path, "r") as f:
-                patterns = json.load(f)
+            # The pattern database lives in the app data dir, not the source tree
+            store_dir = ConfigManager().get_app_data_path("workflow")
+            library = WorkflowPatternLibrary(
+                str(patterns_path), store_path=str(store_dir / "workflow_patterns.db")
+            )
             plan = None
             initial_state = {}
-            for key, wf in patterns.get("patterns", {}).items():
+            # Шукаємо за зведеннями, щоб не завантажувати всі шаблони з бази
+            pattern_id = None
+            for key, summary in library.patterns.summaries():
                 if (
                     key == workflow_id
-                    or wf.get("name") == workflow_id
-                    or wf.get("id") == workflow_id
+                    or summary.get("name") == workflow_id
+                    or summary.get("id") == workflow_id
                 ):
-                    # Конвертуємо структуру у список кроків для WorkflowEngine
-                    steps = wf.get("structure", {}).get("steps", [])
-                    # Кожен крок повинен мати tool_name та params
-                    plan = []
-                    for step in steps:
-                        tool_name = (
-                            step.get("name") or step.get("type") or "unknown_tool"
-                        )
-                        params = step.get("config", {})
-                        plan.append({"tool_name": tool_name, "params": params})
+                    pattern_id = key
                     break
+            wf = library.get_pattern(pattern_id) if pattern_id else None
+            if wf:
+                # Конвертуємо структуру у список кроків для WorkflowEngine
+                steps = wf.get("structure", {}).get("steps", [])
+                # Кожен крок повинен мати tool_name та params
+                plan = []
+                for step in steps:
+                    tool_name = step.get("name") or step.get("type") or "unknown_tool"
+                    params = step.get("config", {})
+                    plan.append({"tool_name": tool_name, "params": params})
+            library.close(save=False)
             if not plan:
                 QMessageBox.critical(
                     self,
@@ -1,20 +1,153 @@
 """
 Cache Manager for Atlas using Redis.
 This module provides a simple interface for caching frequently accessed data to improve performance.
+
+Reads go through a small in-process LRU/TTL cache (L1) before reaching Redis (L2).
+When Redis is not installed or not reachable the manager keeps working as a pure
+in-memory cache and periodically retries the Redis connection.
+
+Keys can be tagged when they are set. Every tag has a secondary index (Redis sets
+plus an in-process key set), so ``invalidate_tag`` removes all tagged keys at a cost
+proportional to the number of tagged keys rather than the size of the keyspace.
+The Redis set holding keys stored with a TTL expires with its longest-lived key.
 """
 
+import asyncio
+import fnmatch
+import inspect
 import json
-from typing import Any, Optional
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+try:
+    import redis.asyncio as redis
+except ImportError:  # Redis is optional; fall back to the in-memory backend
+    redis = None
+
+BACKEND_AUTO = "auto"
+BACKEND_REDIS = "redis"
+BACKEND_MEMORY = "memory"
+
+TAG_KEY_PREFIX = "__tag__:"
+EXPIRING_TAG_KEY_PREFIX = "__tagttl__:"
+INVALIDATION_BATCH_SIZE = 500
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    Size-bounded in-process cache with per-entry expiry.
+
+    Entries are evicted in least-recently-used order once ``max_size`` is
+    reached; expired entries are dropped lazily when they are read.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        default_ttl: Optional[float] = None,
+        on_evict: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        """
+        Initialize the LRU cache.
+
+        Args:
+            max_size (int): Maximum number of entries kept.
+            default_ttl (float, optional): Expiry in seconds for entries stored
+                without an explicit TTL. None keeps them until evicted.
+            on_evict (Callable, optional): Called with the key of every entry
+                dropped because of size pressure or expiry.
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self.on_evict = on_evict
+        self._entries: "OrderedDict[str, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
 
-import redis.asyncio as redis
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the cached value for a key, or ``default`` if absent or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            if self.on_evict is not None:
+                self.on_evict(key)
+            return default
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entries if needed."""
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            evicted, _ = self._entries.popitem(last=False)
+            self.evictions += 1
+            if self.on_evict is not None:
+                self.on_evict(evicted)
+
+    def delete(self, key: str) -> bool:
+        """Remove a key. Returns True if it was present."""
+        return self._entries.pop(key, None) is not None
+
+    def keys(self) -> List[str]:
+        """Return the currently stored keys (including not yet purged expired ones)."""
+        return list(self._entries.keys())
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over a snapshot of ``keys()``, so entries may be removed meanwhile."""
+        return iter(self.keys())
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
 
 
 class CacheManager:
     """
     A class to manage caching operations using Redis for Atlas application.
+
+    Values are kept in an in-process LRU cache in front of Redis, so repeated
+    reads of hot keys do not pay a network round-trip or JSON decoding. In
+    memory mode (Redis missing or unreachable) the LRU cache is the store.
     """
 
-    def __init__(self, host: str = "localhost", port: int = 6379, db: int = 0) -> None:
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        db: int = 0,
+        backend: str = BACKEND_AUTO,
+        l1_max_size: int = 1024,
+        l1_ttl: Optional[float] = 30.0,
+        reconnect_interval: float = 30.0,
+    ) -> None:
         """
         Initialize the CacheManager with Redis connection parameters.
 
@@ -22,20 +155,67 @@ class CacheManager:
             host (str): Redis server host.
             port (int): Redis server port.
             db (int): Redis database number.
+            backend (str): ``"auto"`` uses Redis when reachable and memory
+                otherwise, ``"redis"`` and ``"memory"`` force one backend.
+            l1_max_size (int): Maximum number of entries in the in-process cache.
+            l1_ttl (float, optional): Maximum age of an in-process copy of a
+                Redis value, bounding staleness across processes.
+            reconnect_interval (float): Minimum seconds between Redis
+                connection attempts while running on the memory backend.
         """
-        self.client = redis.Redis(host=host, port=port, db=db, decode_responses=True)
+        if backend not in (BACKEND_AUTO, BACKEND_REDIS, BACKEND_MEMORY):
+            raise ValueError(f"Unsupported cache backend: {backend}")
+        if backend == BACKEND_REDIS and redis is None:
+            raise ImportError("The redis package is required for the redis backend")
+
+        self.backend = backend
+        self.l1_ttl = l1_ttl
+        self.reconnect_interval = reconnect_interval
+        self.l1 = LRUCache(max_size=l1_max_size, on_evict=self._on_l1_evict)
+        # Secondary indexes for keys tagged by this process
+        self._tag_index: Dict[str, Set[str]] = {}
+        self._key_tags: Dict[str, Set[str]] = {}
+        self.client = None
+        if backend != BACKEND_MEMORY and redis is not None:
+            self.client = redis.Redis(
+                host=host, port=port, db=db, decode_responses=True
+            )
         self.connected = False
+        self._last_connect_attempt: Optional[float] = None
+        self._inflight: Dict[str, "asyncio.Future[Any]"] = {}
+        self._stats: Dict[str, Union[int, float]] = {
+            "l1_hits": 0,
+            "l2_hits": 0,
+            "misses": 0,
+            "sets": 0,
+            "deletes": 0,
+            "invalidations": 0,
+            "errors": 0,
+            "loads": 0,
+            "coalesced_loads": 0,
+            "redis_calls": 0,
+            "redis_time": 0.0,
+        }
+
+    @property
+    def memory_mode(self) -> bool:
+        """True when values are only held in process memory."""
+        return not self.connected
 
     async def connect(self) -> None:
         """
         Establish connection to Redis server.
         """
+        if self.client is None:
+            self.connected = False
+            return
+        self._last_connect_attempt = time.monotonic()
         try:
             await self.client.ping()
             self.connected = True
             print("Connected to Redis successfully.")
-        except redis.ConnectionError as e:
-            print(f"Failed to connect to Redis: {e}")
+        except (redis.ConnectionError, OSError) as e:
+            print(f"Failed to connect to Redis, using in-memory cache: {e}")
             self.connected = False
 
     async def close(self) -> None:
@@ -47,7 +227,115 @@ class CacheManager:
             self.connected = False
             print("Redis connection closed.")
 
-    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+    async def _ensure_connection(self) -> bool:
+        """Reconnect to Redis if possible, rate-limited by ``reconnect_interval``."""
+        if self.connected:
+            return True
+        if self.client is None:
+            return False
+        if (
+            self._last_connect_attempt is None
+            or time.monotonic() - self._last_connect_attempt >= self.reconnect_interval
+        ):
+            await self.connect()
+        return self.connected
+
+    def _redis_failed(self, action: str, error: Exception) -> None:
+        """Record a Redis failure and degrade to the in-memory backend."""
+        self._stats["errors"] += 1
+        print(f"Error {action} cache value, falling back to memory: {error}")
+        self.connected = False
+        self._last_connect_attempt = time.monotonic()
+
+    def _l1_ttl_for(self, ttl: Optional[int]) -> Optional[float]:
+        """TTL of the in-process copy: the item TTL capped by ``l1_ttl`` in Redis mode."""
+        if not self.connected:
+            return ttl
+        if ttl is None:
+            return self.l1_ttl
+        if self.l1_ttl is None:
+            return ttl
+        return min(ttl, self.l1_ttl)
+
+    def _record_redis_call(self, started: float) -> None:
+        self._stats["redis_calls"] += 1
+        self._stats["redis_time"] += time.perf_counter() - started
+
+    @staticmethod
+    def _tag_key(tag: str) -> str:
+        return f"{TAG_KEY_PREFIX}{tag}"
+
+    @staticmethod
+    def _expiring_tag_key(tag: str) -> str:
+        return f"{EXPIRING_TAG_KEY_PREFIX}{tag}"
+
+    def _queue_tags(
+        self, pipe: Any, key: str, tags: Iterable[str], ttl: Optional[int]
+    ) -> None:
+        """Queue adding a key to the Redis sets of its tags.
+
+        Keys stored with a TTL go to a separate tag set whose expiry is only
+        ever extended to cover its longest-lived member (EXPIRE NX, then GT;
+        Redis 7+), so the tag sets of expired keys do not pile up. Keys
+        without a TTL go to a tag set that never expires.
+        """
+        for tag in tags:
+            if ttl is None:
+                pipe.sadd(self._tag_key(tag), key)
+                continue
+            tag_key = self._expiring_tag_key(tag)
+            pipe.sadd(tag_key, key)
+            pipe.expire(tag_key, ttl, nx=True)
+            pipe.expire(tag_key, ttl, gt=True)
+
+    def _index_tags(self, key: str, tags: Optional[Iterable[str]]) -> None:
+        """Point the in-process tag index of a key at its current tags."""
+        new_tags = set(tags or ())
+        old_tags = self._key_tags.pop(key, set())
+        for tag in old_tags - new_tags:
+            self._unindex_tag(tag, key)
+        for tag in new_tags:
+            self._tag_index.setdefault(tag, set()).add(key)
+        if new_tags:
+            self._key_tags[key] = new_tags
+
+    def _unindex_tag(self, tag: str, key: str) -> None:
+        keys = self._tag_index.get(tag)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._tag_index[tag]
+
+    def _forget_key(self, key: str) -> None:
+        """Drop a key from the in-process cache and tag index."""
+        self.l1.delete(key)
+        for tag in self._key_tags.pop(key, ()):
+            self._unindex_tag(tag, key)
+
+    def _on_l1_evict(self, key: str) -> None:
+        # In memory mode an evicted entry is gone for good, so its tags go too
+        if not self.connected:
+            for tag in self._key_tags.pop(key, ()):
+                self._unindex_tag(tag, key)
+
+    @staticmethod
+    def _encode(value: Any) -> str:
+        return value if isinstance(value, str) else json.dumps(value)
+
+    @staticmethod
+    def _decode(value: str) -> Any:
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            return value
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        tags: Optional[Iterable[str]] = None,
+    ) -> bool:
         """
         Set a value in cache with an optional time-to-live (TTL).
 
@@ -55,25 +343,35 @@ class CacheManager:
             key (str): Cache key.
             value (Any): Value to cache. If not a string, will be JSON serialized.
             ttl (int, optional): Time to live in seconds. If None, persists indefinitely.
+            tags (Iterable[str], optional): Tags for group invalidation via ``invalidate_tag``.
 
         Returns:
-            bool: True if successful, False otherwise.
+            bool: True if the active backend stored the value; False if the
+                Redis write failed, in which case it is only kept in memory.
         """
-        if not self.connected:
-            await self.connect()
-        if not self.connected:
-            return False
-
-        try:
-            if not isinstance(value, str):
-                value = json.dumps(value)
-            await self.client.set(key, value)
-            if ttl is not None:
-                await self.client.expire(key, ttl)
-            return True
-        except redis.RedisError as e:
-            print(f"Error setting cache value: {e}")
-            return False
+        tags = list(tags or ())
+        await self._ensure_connection()
+        self._stats["sets"] += 1
+        stored = True
+        if self.connected:
+            started = time.perf_counter()
+            try:
+                if tags:
+                    async with self.client.pipeline(transaction=False) as pipe:
+                        pipe.set(key, self._encode(value), ex=ttl)
+                        self._queue_tags(pipe, key, tags, ttl)
+                        await pipe.execute()
+                else:
+                    # SET ... EX is atomic, unlike SET followed by EXPIRE
+                    await self.client.set(key, self._encode(value), ex=ttl)
+            except redis.RedisError as e:
+                self._redis_failed("setting", e)
+                stored = False
+            finally:
+                self._record_redis_call(started)
+        self.l1.set(key, value, self._l1_ttl_for(ttl))
+        self._index_tags(key, tags)
+        return stored
 
     async def get(self, key: str) -> Optional[Any]:
         """
@@ -85,22 +383,32 @@ class CacheManager:
         Returns:
             Any: Cached value if found, None otherwise. Attempts JSON deserialization if applicable.
         """
-        if not self.connected:
-            await self.connect()
-        if not self.connected:
+        value = self.l1.get(key, _MISSING)
+        if value is not _MISSING:
+            self._stats["l1_hits"] += 1
+            return value
+
+        if not await self._ensure_connection():
+            self._stats["misses"] += 1
             return None
 
+        started = time.perf_counter()
         try:
-            value = await self.client.get(key)
-            if value is None:
-                return None
-            try:
-                return json.loads(value)
-            except json.JSONDecodeError:
-                return value
+            raw = await self.client.get(key)
         except redis.RedisError as e:
-            print(f"Error getting cache value: {e}")
+            self._redis_failed("getting", e)
+            self._stats["misses"] += 1
+            return None
+        finally:
+            self._record_redis_call(started)
+
+        if raw is None:
+            self._stats["misses"] += 1
             return None
+        self._stats["l2_hits"] += 1
+        value = self._decode(raw)
+        self.l1.set(key, value, self.l1_ttl)
+        return value
 
     async def delete(self, key: str) -> bool:
         """
@@ -112,22 +420,264 @@ class CacheManager:
         Returns:
             bool: True if key was deleted or didn't exist, False on error.
         """
-        if not self.connected:
-            await self.connect()
-        if not self.connected:
-            return False
+        self._forget_key(key)
+        self._stats["deletes"] += 1
+        if not await self._ensure_connection():
+            return True
 
+        started = time.perf_counter()
         try:
             await self.client.delete(key)
             return True
         except redis.RedisError as e:
-            print(f"Error deleting cache key: {e}")
+            self._redis_failed("deleting", e)
             return False
+        finally:
+            self._record_redis_call(started)
+
+    async def mget(self, keys: Iterable[str]) -> Dict[str, Optional[Any]]:
+        """
+        Retrieve several values with a single Redis round-trip.
+
+        Args:
+            keys (Iterable[str]): Cache keys to look up.
+
+        Returns:
+            Dict[str, Any]: Value per key, None for keys that are not cached.
+        """
+        keys = list(keys)
+        results: Dict[str, Optional[Any]] = {}
+        missing: List[str] = []
+        for key in keys:
+            value = self.l1.get(key, _MISSING)
+            if value is _MISSING:
+                missing.append(key)
+            else:
+                self._stats["l1_hits"] += 1
+                results[key] = value
+
+        if missing and await self._ensure_connection():
+            started = time.perf_counter()
+            try:
+                raw_values = await self.client.mget(missing)
+            except redis.RedisError as e:
+                self._redis_failed("getting", e)
+                raw_values = [None] * len(missing)
+            finally:
+                self._record_redis_call(started)
+            for key, raw in zip(missing, raw_values, strict=True):
+                if raw is None:
+                    continue
+                self._stats["l2_hits"] += 1
+                value = self._decode(raw)
+                self.l1.set(key, value, self.l1_ttl)
+                results[key] = value
+
+        for key in keys:
+            if key not in results:
+                self._stats["misses"] += 1
+                results[key] = None
+        return results
+
+    async def mset(
+        self,
+        mapping: Dict[str, Any],
+        ttl: Optional[int] = None,
+        tags: Optional[Dict[str, Iterable[str]]] = None,
+    ) -> bool:
+        """
+        Store several values with a single pipelined Redis round-trip.
+
+        Args:
+            mapping (Dict[str, Any]): Values to cache by key.
+            ttl (int, optional): Time to live in seconds for every key.
+            tags (Dict[str, Iterable[str]], optional): Tags per key.
+
+        Returns:
+            bool: True if the active backend stored the values; False if the
+                Redis write failed, in which case they are only kept in memory.
+        """
+        tags = {key: list(key_tags) for key, key_tags in (tags or {}).items()}
+        await self._ensure_connection()
+        self._stats["sets"] += len(mapping)
+        stored = True
+        if self.connected and mapping:
+            started = time.perf_counter()
+            try:
+                async with self.client.pipeline(transaction=False) as pipe:
+                    for key, value in mapping.items():
+                        pipe.set(key, self._encode(value), ex=ttl)
+                    for key, key_tags in tags.items():
+                        self._queue_tags(pipe, key, key_tags, ttl)
+                    await pipe.execute()
+            except redis.RedisError as e:
+                self._redis_failed("setting", e)
+                stored = False
+            finally:
+                self._record_redis_call(started)
+        l1_ttl = self._l1_ttl_for(ttl)
+        for key, value in mapping.items():
+            self.l1.set(key, value, l1_ttl)
+            self._index_tags(key, tags.get(key))
+        return stored
+
+    async def invalidate_tag(self, tag: str) -> int:
+        """
+        Delete every key stored with the given tag.
+
+        Tagged keys are read from the tag index with SSCAN and deleted in
+        pipelined batches, so the cost depends on the number of tagged keys
+        and Redis is never blocked by a KEYS scan.
+
+        Args:
+            tag (str): Tag passed to ``set``/``mset``.
+
+        Returns:
+            int: Number of distinct keys invalidated.
+        """
+        keys = set(self._tag_index.pop(tag, ()))
+        for key in keys:
+            self._forget_key(key)
+
+        if await self._ensure_connection():
+            tag_keys = (self._tag_key(tag), self._expiring_tag_key(tag))
+            started = time.perf_counter()
+            try:
+                batch: List[str] = []
+                for tag_key in tag_keys:
+                    async for key in self.client.sscan_iter(
+                        tag_key, count=INVALIDATION_BATCH_SIZE
+                    ):
+                        self._forget_key(key)
+                        keys.add(key)
+                        batch.append(key)
+                        if len(batch) >= INVALIDATION_BATCH_SIZE:
+                            await self.client.delete(*batch)
+                            batch = []
+                await self.client.delete(*batch, *tag_keys)
+            except redis.RedisError as e:
+                self._redis_failed("invalidating", e)
+            finally:
+                self._record_redis_call(started)
+
+        self._stats["invalidations"] += len(keys)
+        return len(keys)
+
+    async def invalidate_pattern(self, pattern: str) -> int:
+        """
+        Delete every key matching a glob-style pattern.
+
+        Uses incremental SCAN rather than KEYS, so Redis stays responsive,
+        but the cost still grows with the keyspace; prefer tags for hot paths.
+
+        Args:
+            pattern (str): Glob pattern such as ``user:123:tasks:*``.
+
+        Returns:
+            int: Number of distinct keys invalidated.
+        """
+        keys = {key for key in self.l1 if fnmatch.fnmatchcase(key, pattern)}
+        for key in keys:
+            self._forget_key(key)
+
+        if await self._ensure_connection():
+            started = time.perf_counter()
+            try:
+                batch: List[str] = []
+                async for key in self.client.scan_iter(
+                    match=pattern, count=INVALIDATION_BATCH_SIZE
+                ):
+                    self._forget_key(key)
+                    keys.add(key)
+                    batch.append(key)
+                    if len(batch) >= INVALIDATION_BATCH_SIZE:
+                        await self.client.delete(*batch)
+                        batch = []
+                if batch:
+                    await self.client.delete(*batch)
+            except redis.RedisError as e:
+                self._redis_failed("invalidating", e)
+            finally:
+                self._record_redis_call(started)
+
+        self._stats["invalidations"] += len(keys)
+        return len(keys)
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Union[Any, Awaitable[Any]]],
+        ttl: Optional[int] = None,
+        tags: Optional[Iterable[str]] = None,
+    ) -> Any:
+        """
+        Return the cached value for a key, loading and caching it on a miss.
+
+        Concurrent callers missing the same key share one ``loader`` call
+        (single-flight), so an expired hot key does not stampede the source.
+
+        Args:
+            key (str): Cache key.
+            loader (Callable): Sync or async function producing the value.
+            ttl (int, optional): Time to live in seconds for the loaded value.
+            tags (Iterable[str], optional): Tags for the loaded value.
+
+        Returns:
+            Any: The cached or freshly loaded value.
+        """
+        value = await self.get(key)
+        if value is not None:
+            return value
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self._stats["coalesced_loads"] += 1
+            return await asyncio.shield(pending)
+
+        future: "asyncio.Future[Any]" = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            self._stats["loads"] += 1
+            value = loader()
+            if inspect.isawaitable(value):
+                value = await value
+            if value is not None:
+                await self.set(key, value, ttl, tags=tags)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache hit/miss and latency statistics.
+
+        Returns:
+            Dict[str, Any]: Counters plus hit rate, average Redis latency in
+                seconds, the active backend and the in-process cache size.
+        """
+        stats: Dict[str, Any] = dict(self._stats)
+        lookups = stats["l1_hits"] + stats["l2_hits"] + stats["misses"]
+        stats["hit_rate"] = (
+            (stats["l1_hits"] + stats["l2_hits"]) / lookups if lookups else 0.0
+        )
+        stats["avg_redis_latency"] = (
+            stats["redis_time"] / stats["redis_calls"] if stats["redis_calls"] else 0.0
+        )
+        stats["backend"] = BACKEND_REDIS if self.connected else BACKEND_MEMORY
+        stats["l1_size"] = len(self.l1)
+        stats["l1_evictions"] = self.l1.evictions
+        stats["tags"] = len(self._tag_index)
+        return stats
 
 
 # Example usage
 if __name__ == "__main__":
-    import asyncio
 
     async def main():
         cache = CacheManager()
@@ -144,6 +694,7 @@ if __name__ == "__main__":
         user_info = await cache.get("user:1:data")
         print(f"Last Seen: {last_seen}")
         print(f"User Info: {user_info}")
+        print(f"Stats: {cache.get_stats()}")
 
         # Clean up
         await cache.close()
@@ -0,0 +1,300 @@
+"""Batched, cached embeddings for Atlas.
+
+``embed_texts`` embeds many texts with any provider exposing
+``get_embeddings(texts, model)``. It skips texts already in the cache and
+embeds each distinct text once. The remaining texts are split into batches no
+larger than the provider's ``EMBEDDING_BATCH_SIZE``, and the batches are sent
+concurrently.
+
+``EmbeddingCache`` keeps vectors on disk, keyed by a SHA-256 hash of the text.
+Each provider/model pair has its own namespace, made of two append-only files:
+a float32 NumPy vector file, which is memory-mapped for reads, and a key file
+with one hash per row. Writers lock the namespace, so processes can share a
+cache directory.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: only threads of one process are serialized
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Batch size for providers that do not declare EMBEDDING_BATCH_SIZE
+DEFAULT_BATCH_SIZE = 64
+
+
+def text_key(text: str) -> str:
+    """Get the content hash identifying a text in the cache.
+
+    Args:
+        text (str): Text to embed.
+
+    Returns:
+        str: Hex SHA-256 digest of the text.
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class _Namespace:
+    """Vectors of one provider/model pair.
+
+    Several processes may share a cache directory, so appends hold an
+    exclusive lock on a ``.lock`` file and first read the rows other writers
+    appended. Row numbers always follow the key file on disk.
+    """
+
+    def __init__(self, base_path: str):
+        self.keys_path = base_path + ".keys"
+        self.vectors_path = base_path + ".f32"
+        self.lock_path = base_path + ".lock"
+        self.rows: Dict[str, int] = {}
+        self.count = 0  # Key lines read, which is the number of rows
+        self.dimension = 0
+        self._keys_read = 0  # Bytes of the key file read so far
+        self._malformed = False
+        self._vectors: Optional[np.memmap] = None
+        self._refresh()
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Hold an exclusive lock shared with other processes."""
+        with open(self.lock_path, "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _refresh(self) -> None:
+        """Read the complete key lines appended since the last read."""
+        try:
+            size = os.path.getsize(self.keys_path)
+        except OSError:
+            return
+        if size < self._keys_read:
+            # The key file was recreated; read it from the start
+            self.rows, self.count, self.dimension, self._keys_read = {}, 0, 0, 0
+            self._vectors = None
+        if size == self._keys_read or self._malformed:
+            return
+        with open(self.keys_path, "rb") as f:
+            f.seek(self._keys_read)
+            data = f.read()
+        # A line without a newline is still being written, or was cut by a crash
+        end = data.rfind(b"\n") + 1
+        lines = data[:end].decode("ascii").split()
+        self._keys_read += end
+        if not self.dimension and lines:
+            header = lines.pop(0)
+            if not header.startswith("dim="):
+                logger.warning(f"Ignoring malformed embedding cache {self.keys_path}")
+                self._malformed = True
+                return
+            self.dimension = int(header[4:])
+        for key in lines:
+            self.rows.setdefault(key, self.count)
+            self.count += 1
+
+    def get(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Get the cached vectors of the given keys."""
+        if any(key not in self.rows for key in keys):
+            self._refresh()
+        found = [(key, self.rows[key]) for key in keys if key in self.rows]
+        if not found:
+            return {}
+        if self._vectors is None or len(self._vectors) < self.count:
+            self._vectors = np.memmap(
+                self.vectors_path,
+                dtype=np.float32,
+                mode="r",
+                shape=(self.count, self.dimension),
+            )
+        vectors = np.array(self._vectors[[row for _, row in found]])
+        return {key: vectors[i] for i, (key, _) in enumerate(found)}
+
+    def put(self, keys: Sequence[str], vectors: np.ndarray) -> None:
+        """Append vectors for keys not cached yet."""
+        with self._file_lock():
+            self._refresh()
+            if self._malformed:
+                return
+            if not self.dimension:
+                # No complete header on disk, so the key file holds no rows
+                self.dimension = vectors.shape[1]
+                header = f"dim={self.dimension}\n".encode("ascii")
+                with open(self.keys_path, "wb") as f:
+                    f.write(header)
+                self._keys_read = len(header)
+            elif vectors.shape[1] != self.dimension:
+                logger.warning(
+                    f"Not caching {vectors.shape[1]}-dimensional embeddings in "
+                    f"{self.dimension}-dimensional cache {self.keys_path}"
+                )
+                return
+            new: Dict[str, int] = {}
+            for i, key in enumerate(keys):
+                if key not in self.rows:
+                    new.setdefault(key, i)
+            if not new:
+                return
+            # Drop partial rows and key lines a crashed writer left behind
+            _truncate(self.vectors_path, self.count * self.dimension * 4)
+            _truncate(self.keys_path, self._keys_read)
+            # Vectors first: a crash leaves extra rows, which the next put drops
+            with open(self.vectors_path, "ab") as f:
+                rows = vectors[list(new.values())]
+                f.write(np.ascontiguousarray(rows, dtype=np.float32).tobytes())
+            lines = "".join(f"{key}\n" for key in new).encode("ascii")
+            with open(self.keys_path, "ab") as f:
+                f.write(lines)
+            self._keys_read += len(lines)
+            for key in new:
+                self.rows[key] = self.count
+                self.count += 1
+        self._vectors = None
+
+
+def _truncate(path: str, size: int) -> None:
+    """Cut a file down to ``size`` bytes if it is longer."""
+    if os.path.exists(path) and os.path.getsize(path) > size:
+        with open(path, "r+b") as f:
+            f.truncate(size)
+
+
+class EmbeddingCache:
+    """Content-hash keyed on-disk cache of float32 embedding vectors."""
+
+    def __init__(self, cache_dir: str):
+        """Initialize the cache.
+
+        Args:
+            cache_dir (str): Directory holding the vector and key files.
+        """
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._namespaces: Dict[str, _Namespace] = {}
+
+    def _namespace(self, namespace: str) -> _Namespace:
+        """Get the open namespace, loading it on first use."""
+        entry = self._namespaces.get(namespace)
+        if entry is None:
+            name = re.sub(r"[^A-Za-z0-9_.-]", "_", namespace)
+            entry = _Namespace(os.path.join(self.cache_dir, name))
+            self._namespaces[namespace] = entry
+        return entry
+
+    def get_many(self, namespace: str, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Get cached vectors.
+
+        Args:
+            namespace (str): Provider/model the vectors belong to.
+            keys (Sequence[str]): Content hashes from ``text_key``.
+
+        Returns:
+            Dict[str, np.ndarray]: Vector by key, for the keys that are cached.
+        """
+        with self._lock:
+            return self._namespace(namespace).get(keys)
+
+    def put_many(
+        self, namespace: str, keys: Sequence[str], vectors: np.ndarray
+    ) -> None:
+        """Cache vectors.
+
+        Args:
+            namespace (str): Provider/model the vectors belong to.
+            keys (Sequence[str]): Content hashes from ``text_key``.
+            vectors (np.ndarray): One row per key.
+        """
+        with self._lock:
+            self._namespace(namespace).put(keys, vectors)
+
+
+def embed_texts(
+    provider: Any,
+    texts: Sequence[str],
+    model: Optional[str] = None,
+    cache: Optional[EmbeddingCache] = None,
+    namespace: Optional[str] = None,
+    batch_size: Optional[int] = None,
+    max_workers: int = 4,
+) -> np.ndarray:
+    """Embed texts in concurrent batches, reusing cached vectors.
+
+    Args:
+        provider (Any): Provider with a ``get_embeddings(texts, model)`` method.
+        texts (Sequence[str]): Texts to embed.
+        model (Optional[str]): Embedding model; defaults to the provider's
+            ``embedding_model``.
+        cache (Optional[EmbeddingCache]): Cache to read and fill.
+        namespace (Optional[str]): Cache namespace; defaults to the provider
+            class and model.
+        batch_size (Optional[int]): Texts per request; capped at the provider's
+            ``EMBEDDING_BATCH_SIZE``.
+        max_workers (int): Maximum number of batches in flight.
+
+    Returns:
+        np.ndarray: float32 array with one row per text, or an empty array if
+            any batch failed. Vectors of the batches that succeeded are cached.
+    """
+    model = model or getattr(provider, "embedding_model", None)
+    namespace = namespace or f"{type(provider).__name__}-{model}"
+    keys = [text_key(text) for text in texts]
+    vectors = cache.get_many(namespace, keys) if cache else {}
+
+    # Each distinct missing text is embedded once
+    missing: Dict[str, str] = {}
+    for key, text in zip(keys, texts, strict=True):
+        if key not in vectors:
+            missing.setdefault(key, text)
+    if missing:
+        limit = getattr(provider, "EMBEDDING_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+        size = max(1, min(batch_size or limit, limit))
+        pending = list(missing.items())
+        batches = [pending[i : i + size] for i in range(0, len(pending), size)]
+
+        def run(batch: List[tuple]) -> List[List[float]]:
+            return provider.get_embeddings([text for _, text in batch], model)
+
+        workers = max(1, min(max_workers, len(batches)))
+        if workers == 1:
+            results = [run(batch) for batch in batches]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(run, batches))
+
+        failed = False
+        for batch, result in zip(batches, results, strict=True):
+            if not result or len(result) != len(batch):
+                logger.error(
+                    f"Embedding batch of {len(batch)} texts returned "
+                    f"{len(result or [])} vectors"
+                )
+                failed = True
+                continue
+            batch_keys = [key for key, _ in batch]
+            batch_vectors = np.asarray(result, dtype=np.float32)
+            if cache:
+                cache.put_many(namespace, batch_keys, batch_vectors)
+            vectors.update(zip(batch_keys, batch_vectors, strict=True))
+        if failed:
+            return np.empty((0, 0), dtype=np.float32)
+
+    if not texts:
+        return np.empty((0, 0), dtype=np.float32)
+    return np.stack([vectors[key] for key in keys])
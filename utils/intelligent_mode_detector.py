@@ -1,13 +1,21 @@
 """
 Інтелектуальний детектор режимів чату Atlas
 Розумна system визначення, коли використовувати advanced thinking vs звичайний help mode
+
+All keywords are deduplicated into one table and the message is checked
+against it once; every score is then computed from the matched keywords. The
+anchored command regexes are compiled into a single pattern that is matched
+once at the start of the message, and the other regexes are precompiled and
+only run when the keyword scan found the literal they start with. Results of
+repeated messages are served from an LRU memo.
 """
 
 import logging
 import re
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import dataclass, replace
 from enum import Enum
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
 
 
 class ChatMode(Enum):
@@ -34,15 +42,21 @@ class IntelligentModeDetector:
     Інтелектуальний детектор режимів з контекстним аналізом
     """
 
-    def __init__(self):
+    def __init__(self, memo_size: int = 1024):
         self.logger = logging.getLogger(self.__class__.__name__)
 
         # Вдосконалені паттерни детекції
         self.patterns = self._initialize_detection_patterns()
+        self._compile_patterns()
+
+        # LRU memo of detection results by message
+        self.memo_size = memo_size
+        self._memo: "OrderedDict[str, DetectionResult]" = OrderedDict()
 
         # Статистика для навчання
         self.detection_stats: Dict[str, Any] = {
             "total_detections": 0,
+            "memo_hits": 0,
             "mode_counts": {},
             "accuracy_feedback": [],
         }
@@ -80,6 +94,19 @@ class IntelligentModeDetector:
                     "показати файл",
                     "список директорій",
                 ],
+                # Команди, що роблять коротке повідомлення (до 4 слів) простим
+                "short_commands": ["read", "show", "list", "tree"],
+                # Точні збіги на початку повідомлення мають найвищий пріоритет
+                "exact_matches": [
+                    "read file",
+                    "show file",
+                    "list directory",
+                    "show tree",
+                    "search for",
+                    "info about",
+                    "metrics",
+                    "stats",
+                ],
             },
             # Складні аналітичні запити
             "advanced_thinking": {
@@ -117,6 +144,132 @@ class IntelligentModeDetector:
                     "оптимізація",
                     "проблема",
                 ],
+                # Конкретні українські та англійські ключові слова з високою вагою
+                "weighted_keywords": {
+                    # Аналітичні слова
+                    "проаналізуй": 0.4,
+                    "analyze": 0.4,
+                    "аналіз": 0.3,
+                    "analysis": 0.3,
+                    "розгляну": 0.3,
+                    "examine": 0.3,
+                    "досліди": 0.3,
+                    "investigate": 0.3,
+                    # Проблемні слова
+                    "що не так": 0.5,
+                    "what's wrong": 0.5,
+                    "what is wrong": 0.5,
+                    "проблем": 0.4,
+                    "problem": 0.4,
+                    "issue": 0.4,
+                    "помилк": 0.4,
+                    "error": 0.4,
+                    "не працює": 0.4,
+                    "doesn't work": 0.4,
+                    "not working": 0.4,
+                    # Покращення
+                    "покращи": 0.4,
+                    "improve": 0.4,
+                    "покращення": 0.3,
+                    "improvement": 0.3,
+                    "як можна": 0.4,
+                    "how can": 0.4,
+                    "удосконал": 0.3,
+                    "enhance": 0.3,
+                    "оптиміз": 0.3,
+                    "optimize": 0.3,
+                    # Порівняння
+                    "порівня": 0.4,
+                    "compare": 0.4,
+                    "різниц": 0.3,
+                    "difference": 0.3,
+                    "який кращ": 0.4,
+                    "which is better": 0.4,
+                    "що вибрати": 0.4,
+                    # Архітектурні
+                    "архітектур": 0.4,
+                    "architecture": 0.4,
+                    "структур": 0.3,
+                    "structure": 0.3,
+                    "систем": 0.3,
+                    "system": 0.3,
+                    "дизайн": 0.3,
+                    "design": 0.3,
+                    # Концептуальні
+                    "як працює": 0.5,
+                    "how does": 0.4,
+                    "how it works": 0.5,
+                    "чому": 0.3,
+                    "why": 0.3,
+                    "навіщо": 0.3,
+                    "what is the purpose": 0.4,
+                    "принцип": 0.3,
+                    "principle": 0.3,
+                    "підхід": 0.3,
+                    "approach": 0.3,
+                },
+                # Регулярні вирази для складних паттернів
+                # Кожен паттерн має літерали, з яких він починається
+                "complex_patterns": [
+                    (
+                        r"як\s+(можна\s+)?(покращи|удосконал)",
+                        0.4,
+                        "improvement_question",
+                        ("як",),
+                    ),
+                    (r"що\s+не\s+так\s+з", 0.5, "problem_question", ("що",)),
+                    (r"чому\s+.+\s+(не\s+)?працює", 0.4, "why_not_working", ("чому",)),
+                    (r"як\s+.+\s+працює", 0.4, "how_it_works", ("як",)),
+                    (r"порівня.+\s+(з|та|and|with)", 0.4, "comparison", ("порівня",)),
+                    (r"проаналізуй\s+.+", 0.5, "analysis_request", ("проаналізуй",)),
+                    (
+                        r"(how|як)\s+(can|to|могти)\s+.+",
+                        0.3,
+                        "how_to_question",
+                        ("how", "як"),
+                    ),
+                    (
+                        r"(what|що)\s+(should|треба|потрібно)",
+                        0.3,
+                        "what_should",
+                        ("what", "що"),
+                    ),
+                ],
+                # Питальні слова з складністю
+                "question_starters": [
+                    "як можна",
+                    "чому саме",
+                    "що робити",
+                    "як краще",
+                    "how can",
+                    "why does",
+                    "what should",
+                    "how to",
+                ],
+                # Наявність технічних термінів Atlas
+                "atlas_terms": [
+                    "atlas",
+                    "пам'ять",
+                    "memory",
+                    "агент",
+                    "agent",
+                    "модуль",
+                    "module",
+                    "менеджер",
+                    "manager",
+                    "думання",
+                    "thinking",
+                    "аналіз",
+                    "analysis",
+                ],
+                # Терміни, що схиляють неоднозначне повідомлення до advanced
+                "fallback_terms": [
+                    "проаналізуй",
+                    "архітектур",
+                    "що не так",
+                    "покращ",
+                    "порівня",
+                ],
             },
             # Контекстні модифікатори
             "context_modifiers": {
@@ -169,6 +322,77 @@ class IntelligentModeDetector:
             },
         }
 
+    def _compile_patterns(self) -> None:
+        """Compile the keyword table and regexes once per detector"""
+        simple = self.patterns["simple_commands"]
+        advanced = self.patterns["advanced_thinking"]
+        modifiers = self.patterns["context_modifiers"]
+
+        # Position of each keyword in its list, so matches keep the listed order
+        self._simple_keyword_order = {
+            keyword: index for index, keyword in enumerate(simple["keywords"])
+        }
+        self._weighted_keyword_order = {
+            keyword: index
+            for index, keyword in enumerate(advanced["weighted_keywords"])
+        }
+        self._short_commands = frozenset(simple["short_commands"])
+        self._atlas_terms = frozenset(advanced["atlas_terms"])
+        self._fallback_terms = frozenset(advanced["fallback_terms"])
+        self._complexity_indicators = frozenset(modifiers["complexity_indicators"])
+        self._simplicity_indicators = frozenset(modifiers["simplicity_indicators"])
+        self._technical_terms = frozenset(modifiers["technical_terms"])
+
+        # Every keyword of every list, each checked once per message
+        self._keywords: Tuple[str, ...] = tuple(
+            dict.fromkeys(
+                [
+                    *simple["keywords"],
+                    *simple["short_commands"],
+                    *simple["exact_matches"],
+                    *advanced["weighted_keywords"],
+                    *advanced["question_starters"],
+                    *advanced["atlas_terms"],
+                    *advanced["fallback_terms"],
+                    *modifiers["complexity_indicators"],
+                    *modifiers["simplicity_indicators"],
+                    *modifiers["technical_terms"],
+                    *(
+                        literal
+                        for *_, literals in advanced["complex_patterns"]
+                        for literal in literals
+                    ),
+                ]
+            )
+        )
+
+        # All command regexes in one pattern: each optional lookahead records
+        # whether its regex matches, so a single match call checks them all
+        self._simple_groups: List[Tuple[str, str]] = []
+        alternatives = []
+        for index, pattern in enumerate(simple["patterns"]):
+            group = f"p{index}"
+            self._simple_groups.append((group, pattern))
+            if pattern.startswith("^"):
+                alternatives.append(f"(?=(?P<{group}>{pattern[1:]}))?")
+            else:
+                alternatives.append(f"(?=(?s:.*?)(?P<{group}>{pattern}))?")
+        self._simple_matcher = re.compile("".join(alternatives))
+
+        self._complex_patterns = [
+            (re.compile(pattern), weight, name, frozenset(literals))
+            for pattern, weight, name, literals in advanced["complex_patterns"]
+        ]
+
+    def _find_keywords(self, message_lower: str) -> FrozenSet[str]:
+        """Знаходження всіх ключових слів повідомлення за один прохід"""
+        return frozenset(filter(message_lower.__contains__, self._keywords))
+
+    @staticmethod
+    def _in_order(found: Iterable[str], order: Dict[str, int]) -> List[str]:
+        """Matched keywords of one list, in the order of that list"""
+        return sorted((keyword for keyword in found if keyword in order), key=order.get)
+
     def detect_chat_mode(
         self, message: str, context: Optional[Dict] = None
     ) -> DetectionResult:
@@ -186,18 +410,31 @@ class IntelligentModeDetector:
                 should_use_advanced=False,
             )
 
+        # Повторні повідомлення (context не впливає на результат)
+        cached = self._memo.get(message)
+        if cached is not None:
+            self._memo.move_to_end(message)
+            self.detection_stats["memo_hits"] += 1
+            self._log_detection(message, cached)
+            return replace(cached)
+
+        # Один прохід по таблиці ключових слів для всіх фаз
+        found = self._find_keywords(message_lower)
+
         # Фаза 1: Verification простих команд (високий пріоритет)
         simple_score, simple_reasoning = self._check_simple_commands(
-            message, message_lower
+            message, message_lower, found
         )
 
         # Фаза 2: Verification складних запитів
         advanced_score, advanced_reasoning = self._check_advanced_thinking(
-            message, message_lower
+            message, message_lower, found
         )
 
         # Фаза 3: Контекстні модифікатори
-        context_modifier = self._analyze_context_modifiers(message, message_lower)
+        context_modifier = self._analyze_context_modifiers(
+            message, message_lower, found
+        )
 
         # Фаза 4: Вирішення конфліктів та фінальне рішення
         final_result = self._resolve_mode_conflict(
@@ -207,53 +444,53 @@ class IntelligentModeDetector:
             simple_reasoning,
             advanced_reasoning,
             message,
+            found,
         )
 
+        if self.memo_size > 0:
+            self._memo[message] = replace(final_result)
+            if len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+
         # Логування для навчання
         self._log_detection(message, final_result)
 
         return final_result
 
     def _check_simple_commands(
-        self, message: str, message_lower: str
+        self,
+        message: str,
+        message_lower: str,
+        found: Optional[FrozenSet[str]] = None,
     ) -> Tuple[float, str]:
         """Verification простих команд"""
+        if found is None:
+            found = self._find_keywords(message_lower)
+        simple = self.patterns["simple_commands"]
         score = 0.0
         matched_patterns = []
 
         # Verification регулярних виразів
-        for pattern in self.patterns["simple_commands"]["patterns"]:
-            if re.search(pattern, message_lower):
-                score += 0.3
-                matched_patterns.append(f"pattern: {pattern[:30]}...")
+        match = self._simple_matcher.match(message_lower)
+        if match.lastindex is not None:  # At least one regex matched
+            for group, pattern in self._simple_groups:
+                if match.group(group) is not None:
+                    score += 0.3
+                    matched_patterns.append(f"pattern: {pattern[:30]}...")
 
         # Verification ключових слів
-        for keyword in self.patterns["simple_commands"]["keywords"]:
-            if keyword in message_lower:
-                score += 0.2
-                matched_patterns.append(f"keyword: {keyword}")
+        for keyword in self._in_order(found, self._simple_keyword_order):
+            score += 0.2
+            matched_patterns.append(f"keyword: {keyword}")
 
         # Додаткові правила для простих команд
-        if len(message.split()) <= 4 and any(
-            cmd in message_lower for cmd in ["read", "show", "list", "tree"]
-        ):
+        if len(message.split()) <= 4 and not found.isdisjoint(self._short_commands):
             score += 0.3
             matched_patterns.append("short_command")
 
         # Точні збіги мають найвищий пріоритет
-        exact_matches = [
-            "read file",
-            "show file",
-            "list directory",
-            "show tree",
-            "search for",
-            "info about",
-            "metrics",
-            "stats",
-        ]
-
-        for exact in exact_matches:
-            if message_lower.startswith(exact):
+        for exact in simple["exact_matches"]:
+            if exact in found and message_lower.startswith(exact):
                 score = 0.95  # Майже гарантована проста команда
                 matched_patterns = [f"exact_match: {exact}"]
                 break
@@ -266,115 +503,36 @@ class IntelligentModeDetector:
         return min(score, 1.0), reasoning
 
     def _check_advanced_thinking(
-        self, message: str, message_lower: str
+        self,
+        message: str,
+        message_lower: str,
+        found: Optional[FrozenSet[str]] = None,
     ) -> Tuple[float, str]:
         """Verification потреби в складному мисленні"""
+        if found is None:
+            found = self._find_keywords(message_lower)
+        advanced = self.patterns["advanced_thinking"]
         score = 0.0
         matched_patterns = []
 
-        # Конкретні українські та англійські ключові слова з високою вагою
-        high_priority_keywords = {
-            # Аналітичні слова
-            "проаналізуй": 0.4,
-            "analyze": 0.4,
-            "аналіз": 0.3,
-            "analysis": 0.3,
-            "розгляну": 0.3,
-            "examine": 0.3,
-            "досліди": 0.3,
-            "investigate": 0.3,
-            # Проблемні слова
-            "що не так": 0.5,
-            "what's wrong": 0.5,
-            "what is wrong": 0.5,
-            "проблем": 0.4,
-            "problem": 0.4,
-            "issue": 0.4,
-            "помилк": 0.4,
-            "error": 0.4,
-            "не працює": 0.4,
-            "doesn't work": 0.4,
-            "not working": 0.4,
-            # Покращення
-            "покращи": 0.4,
-            "improve": 0.4,
-            "покращення": 0.3,
-            "improvement": 0.3,
-            "як можна": 0.4,
-            "how can": 0.4,
-            "удосконал": 0.3,
-            "enhance": 0.3,
-            "оптиміз": 0.3,
-            "optimize": 0.3,
-            # Порівняння
-            "порівня": 0.4,
-            "compare": 0.4,
-            "різниц": 0.3,
-            "difference": 0.3,
-            "який кращ": 0.4,
-            "which is better": 0.4,
-            "що вибрати": 0.4,
-            # Архітектурні
-            "архітектур": 0.4,
-            "architecture": 0.4,
-            "структур": 0.3,
-            "structure": 0.3,
-            "систем": 0.3,
-            "system": 0.3,
-            "дизайн": 0.3,
-            "design": 0.3,
-            # Концептуальні
-            "як працює": 0.5,
-            "how does": 0.4,
-            "how it works": 0.5,
-            "чому": 0.3,
-            "why": 0.3,
-            "навіщо": 0.3,
-            "what is the purpose": 0.4,
-            "принцип": 0.3,
-            "principle": 0.3,
-            "підхід": 0.3,
-            "approach": 0.3,
-        }
-
         # Verification ключових слів з вагами
-        for keyword, weight in high_priority_keywords.items():
-            if keyword in message_lower:
-                score += weight
-                matched_patterns.append(f"keyword: {keyword} (+{weight})")
-
-        # Регулярні вирази для складних паттернів
-        complex_patterns = [
-            (r"як\s+(можна\s+)?(покращи|удосконал)", 0.4, "improvement_question"),
-            (r"що\s+не\s+так\s+з", 0.5, "problem_question"),
-            (r"чому\s+.+\s+(не\s+)?працює", 0.4, "why_not_working"),
-            (r"як\s+.+\s+працює", 0.4, "how_it_works"),
-            (r"порівня.+\s+(з|та|and|with)", 0.4, "comparison"),
-            (r"проаналізуй\s+.+", 0.5, "analysis_request"),
-            (r"(how|як)\s+(can|to|могти)\s+.+", 0.3, "how_to_question"),
-            (r"(what|що)\s+(should|треба|потрібно)", 0.3, "what_should"),
-        ]
-
-        for pattern, weight, name in complex_patterns:
-            if re.search(pattern, message_lower):
+        weighted_keywords = advanced["weighted_keywords"]
+        for keyword in self._in_order(found, self._weighted_keyword_order):
+            weight = weighted_keywords[keyword]
+            score += weight
+            matched_patterns.append(f"keyword: {keyword} (+{weight})")
+
+        # Регулярні вирази запускаються, лише якщо знайдено їхній літерал
+        for regex, weight, name, literals in self._complex_patterns:
+            if not found.isdisjoint(literals) and regex.search(message_lower):
                 score += weight
                 matched_patterns.append(f"pattern: {name} (+{weight})")
 
         # Додаткові правила
 
         # Питальні слова з складністю
-        complex_question_starters = [
-            "як можна",
-            "чому саме",
-            "що робити",
-            "як краще",
-            "how can",
-            "why does",
-            "what should",
-            "how to",
-        ]
-        for starter in complex_question_starters:
-            if message_lower.startswith(starter):
+        for starter in advanced["question_starters"]:
+            if starter in found and message_lower.startswith(starter):
                 score += 0.3
                 matched_patterns.append(f"complex_start: {starter}")
 
@@ -392,22 +550,7 @@ class IntelligentModeDetector:
             matched_patterns.append(f"multiple_questions: {question_count}")
 
         # Наявність технічних термінів Atlas
-        atlas_terms = [
-            "atlas",
-            "пам'ять",
-            "memory",
-            "агент",
-            "agent",
-            "модуль",
-            "module",
-            "менеджер",
-            "manager",
-            "думання",
-            "thinking",
-            "аналіз",
-            "analysis",
-        ]
-        atlas_count = sum(1 for term in atlas_terms if term in message_lower)
+        atlas_count = len(found & self._atlas_terms)
         if atlas_count > 1:
             score += atlas_count * 0.05
             matched_patterns.append(f"atlas_terms: {atlas_count}")
@@ -419,32 +562,25 @@ class IntelligentModeDetector:
         )
         return min(score, 1.0), reasoning
 
-    def _analyze_context_modifiers(self, message: str, message_lower: str) -> float:
+    def _analyze_context_modifiers(
+        self,
+        message: str,
+        message_lower: str,
+        found: Optional[FrozenSet[str]] = None,
+    ) -> float:
         """Аналіз контекстних модифікаторів"""
+        if found is None:
+            found = self._find_keywords(message_lower)
         modifier = 0.0
 
         # Індикатори складності
-        complexity_indicators = self.patterns["context_modifiers"][
-            "complexity_indicators"
-        ]
-        complexity_count = sum(
-            1 for indicator in complexity_indicators if indicator in message_lower
-        )
-        modifier += complexity_count * 0.1
+        modifier += len(found & self._complexity_indicators) * 0.1
 
         # Індикатори простоти
-        simplicity_indicators = self.patterns["context_modifiers"][
-            "simplicity_indicators"
-        ]
-        simplicity_count = sum(
-            1 for indicator in simplicity_indicators if indicator in message_lower
-        )
-        modifier -= simplicity_count * 0.1
+        modifier -= len(found & self._simplicity_indicators) * 0.1
 
         # Технічні терміни
-        technical_terms = self.patterns["context_modifiers"]["technical_terms"]
-        technical_count = sum(1 for term in technical_terms if term in message_lower)
-        if technical_count > 2:
+        if len(found & self._technical_terms) > 2:
             modifier += 0.15  # Багато технічних термінів = складність
 
         return max(-0.3, min(0.3, modifier))  # Обмежуємо модифікатор
@@ -457,6 +593,7 @@ class IntelligentModeDetector:
         simple_reasoning: str,
         advanced_reasoning: str,
         original_message: str,
+        found: Optional[FrozenSet[str]] = None,
     ) -> DetectionResult:
         """Вирішення конфліктів та фінальне рішення"""
 
@@ -499,16 +636,9 @@ class IntelligentModeDetector:
 
         else:
             # Вибір за найвищою оцінкою або за замовчуванням advanced для складних термінів
-            has_complex_terms = any(
-                term in original_message.lower()
-                for term in [
-                    "проаналізуй",
-                    "архітектур",
-                    "що не так",
-                    "покращ",
-                    "порівня",
-                ]
-            )
+            if found is None:
+                found = self._find_keywords(original_message.lower())
+            has_complex_terms = not found.isdisjoint(self._fallback_terms)
 
             if adjusted_advanced_score > simple_score or has_complex_terms:
                 mode = ChatMode.ADVANCED_THINKING
@@ -538,9 +668,10 @@ class IntelligentModeDetector:
             self.detection_stats["mode_counts"][mode_key] = 0
         self.detection_stats["mode_counts"][mode_key] += 1
 
-        self.logger.debug(
-            f"Mode detection: '{message[:50]}...' -> {result.mode.value} (confidence: {result.confidence:.2f})"
-        )
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(
+                f"Mode detection: '{message[:50]}...' -> {result.mode.value} (confidence: {result.confidence:.2f})"
+            )
 
     def get_detection_stats(self) -> Dict:
         """Getting статистики детекції"""
@@ -3,21 +3,32 @@
 This module provides a centralized manager for interacting with Large Language Models (LLMs).
 It handles API key management, client initialization, and provides a unified interface
 for making chat-based and other types of LLM calls. It also integrates with the
-TokenTracker to monitor and log token usage for all API calls.
+TokenTracker to monitor and log token usage for all API calls. Responses to
+single-message requests are served from an LRU/TTL ResponseCache, which can
+be persisted across sessions with the ``llm_cache_persistent`` setting.
+Embeddings are requested in concurrent batches from any provider that supports
+them and cached on disk by content hash. Chat requests are routed by a
+ProviderHealthMonitor, which ranks providers by health and latency, skips
+providers with an open circuit breaker, and can hedge slow requests.
 """
 
-import json
 import logging
 import socket
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Protocol, Union
+from typing import Any, Callable, Dict, List, Optional, Protocol, Tuple, Union
+
+import numpy as np
 
 # Imports for LLM providers are deferred to improve startup performance.
 from modules.agents.token_tracker import TokenTracker, TokenUsage
 
+from core.ai_response_cache import CACHE_MISS, ResponseCache
 from utils.config_manager import config_manager as utils_config_manager
+from utils.embeddings import EmbeddingCache, embed_texts
+from utils.provider_health import ProviderHealthMonitor
 from utils.providers.gemini_provider import GeminiProvider
 from utils.providers.groq_provider import GroqProvider
+from utils.providers.local_provider import LocalEmbeddingProvider
 from utils.providers.ollama_provider import OllamaProvider
 
 # Import provider-specific modules
@@ -34,9 +45,14 @@ class LLMProvider(Protocol):
         model: Optional[str] = None,
         max_tokens: Optional[int] = None,
     ) -> Dict[str, Any]: ...
-    def get_embedding(
-        self, text: str, model: str = "models/embedding-001"
-    ) -> List[float]: ...
+    def get_embedding(self, text: str, model: Optional[str] = None) -> List[float]: ...
+    def get_embeddings(
+        self, texts: List[str], model: Optional[str] = None
+    ) -> List[List[float]]: ...
+
+
+# Providers tried, in order, when no embedding provider is configured
+EMBEDDING_PROVIDERS = ("gemini", "openai", "ollama")
 
 
 # ---------------------------------------------------------------------------
@@ -61,12 +77,20 @@ class LLMResponse:  # noqa: D101
 class LLMManager:
     """Manages interactions with multiple Language Model providers."""
 
-    def __init__(self, token_tracker: TokenTracker, config_manager=None):
+    def __init__(
+        self,
+        token_tracker: TokenTracker,
+        config_manager=None,
+        response_cache: Optional[ResponseCache] = None,
+    ):
         self.logger = logging.getLogger(self.__class__.__name__)
         self.token_tracker = token_tracker
-        self.cache: Dict[str, TokenUsage] = {}
 
         self.config_manager = config_manager or utils_config_manager
+        self.cache = response_cache or self._create_response_cache()
+        self._tokens_saved = 0
+        self._embedding_cache: Optional[EmbeddingCache] = None
+        self._local_embeddings: Optional[LocalEmbeddingProvider] = None
 
         self.default_provider = "gemini"
 
@@ -90,6 +114,15 @@ class LLMManager:
             "ollama": OllamaProvider(self.config_manager),
         }
 
+        # Availability probes are cached and refreshed in the background once
+        # the first request is sent
+        self.health = ProviderHealthMonitor(
+            self._provider_probes(),
+            probe_ttl=float(self._get_setting("llm_probe_ttl", 60)),
+            refresh_interval=float(self._get_setting("llm_probe_interval", 30)),
+        )
+        self.hedge_requests = bool(self._get_setting("llm_hedge_requests", False))
+
     def chat(
         self,
         messages: List[Dict[str, Any]],
@@ -121,29 +154,21 @@ class LLMManager:
         try:
             # Check cache first for non-conversational queries
             if len(messages) == 1 and messages[0].get("role") == "user":
-                cache_key = json.dumps(messages[0])
-                if cache_key in self.cache:
-                    self.logger.info(f"Cache hit for request: {cache_key[:50]}...")
-                    return self.cache[cache_key]
-
-            # Route the request to the appropriate provider
-            if provider not in self.providers:
-                self.logger.error(f"Unsupported provider: {provider}")
-                return self._fallback_to_available_provider(
-                    messages, tools, model_to_use, max_tokens
-                )
-
-            if not self.providers[provider].is_available():
-                self.logger.error(
-                    f"Provider {provider} is not available. Attempting fallback."
-                )
-                return self._fallback_to_available_provider(
-                    messages, tools, model_to_use, max_tokens
+                cache_key = {"tools": tools, "max_tokens": max_tokens}
+                cached, outcome = self.cache.get(
+                    f"{provider}/{model_to_use}", messages, cache_key
                 )
+                if outcome != CACHE_MISS:
+                    self.logger.debug(f"Cache hit for {provider}/{model_to_use}")
+                    self._tokens_saved += cached.get("total_tokens", 0) or 0
+                    return TokenUsage(**cached)
 
-            response_data = self.providers[provider].chat(
-                messages, tools, model_to_use, max_tokens
+            served_by, response_data = self._dispatch(
+                provider, messages, tools, model_to_use, max_tokens
             )
+            if served_by is None:
+                self.logger.error("No providers available after fallback attempts.")
+                return TokenUsage()
             token_usage = TokenUsage(
                 response_text=response_data.get("content", ""),
                 tool_calls=response_data.get("tool_calls"),
@@ -153,9 +178,30 @@ class LLMManager:
             )
             self.token_tracker.add_usage(token_usage)
 
-            if cache_key:
-                self.cache[cache_key] = token_usage
-                self.logger.info(f"Cached response for request: {cache_key[:50]}...")
+            if served_by != provider:
+                # Fallback providers answer with their default model
+                provider = served_by
+                model_to_use = self.providers[served_by].model
+
+            # Tool calls are provider SDK objects that do not survive JSON, and
+            # replaying them would repeat their side effects, so they are not cached
+            if (
+                cache_key
+                and not token_usage.tool_calls
+                and not (token_usage.response_text or "").startswith("[ERROR")
+            ):
+                self.cache.put(
+                    f"{provider}/{model_to_use}",
+                    messages,
+                    {
+                        "response_text": token_usage.response_text,
+                        "prompt_tokens": token_usage.prompt_tokens,
+                        "completion_tokens": token_usage.completion_tokens,
+                        "total_tokens": token_usage.total_tokens,
+                    },
+                    cache_key,
+                )
+                self.logger.debug(f"Cached response of {provider}/{model_to_use}")
 
             return token_usage
         except socket.timeout as e:
@@ -184,72 +230,122 @@ class LLMManager:
                     tool_calls=None,
                 )
             self.logger.error(f"LLM API error with {provider}: {e}", exc_info=True)
-            return self._fallback_to_available_provider(
-                messages, tools, model_to_use, max_tokens
-            )
+            return TokenUsage()
 
-    def _fallback_to_available_provider(
+    def _dispatch(
         self,
+        provider: str,
         messages: List[Dict[str, Any]],
         tools: Optional[List[Dict[str, Any]]] = None,
         model: Optional[str] = None,
         max_tokens: Optional[int] = None,
-    ) -> TokenUsage:
-        """Attempt to fallback to another available provider if the current one fails."""
-        self.logger.info("Attempting to fallback to another available provider.")
-        fallback_providers = [p for p in self.providers if p != self.current_provider]
-        for provider in fallback_providers:
-            if provider in self.providers and self.providers[provider].is_available():
-                self.logger.info(f"Falling back to provider: {provider}")
-                try:
-                    response_data = self.providers[provider].chat(
-                        messages, tools, model, max_tokens
-                    )
-                    token_usage = TokenUsage(
-                        response_text=response_data.get("content", ""),
-                        tool_calls=response_data.get("tool_calls"),
-                        prompt_tokens=response_data.get("prompt_tokens", 0),
-                        completion_tokens=response_data.get("completion_tokens", 0),
-                        total_tokens=response_data.get("total_tokens", 0),
-                    )
-                    self.token_tracker.add_usage(token_usage)
-                    # Update current provider to the one that worked
-                    self.current_provider = provider
-                    self.logger.info(f"Successfully fell back to provider: {provider}")
-                    return token_usage
-                except Exception as e:
-                    self.logger.error(
-                        f"Fallback to {provider} failed: {e}", exc_info=True
-                    )
-                    continue
-        self.logger.error("No providers available after fallback attempts.")
-        return TokenUsage()
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """Send a chat request to the healthiest providers, failing over on errors.
+
+        The preferred provider gets the model asked for; fallback providers use
+        their default model. Errors raised by every provider are re-raised.
+
+        Returns:
+            The provider that answered and its response, or (None, None)
+        """
+        if provider not in self.providers:
+            self.logger.error(f"Unsupported provider: {provider}")
+        self.health.start()
+        ranked = self.health.rank(self.providers, preferred=provider)
+        if not ranked:
+            return None, None
+        if ranked[0] != provider:
+            self.logger.info(f"Routing request to {ranked[0]} instead of {provider}")
+
+        def send(name: str) -> Dict[str, Any]:
+            return self.providers[name].chat(
+                messages, tools, model if name == provider else None, max_tokens
+            )
+
+        return self.health.call(
+            send,
+            ranked,
+            hedge=self.hedge_requests,
+            is_success=lambda data: bool(
+                data and (data.get("content") or data.get("tool_calls"))
+            ),
+        )
 
     def get_embedding(
-        self, text: str, model: str = "models/embedding-001"
+        self, text: str, model: Optional[str] = None, provider: Optional[str] = None
     ) -> List[float]:
         """Generates an embedding for the given text."""
-        provider = "gemini"  # Default to Gemini for embeddings
-        if provider not in self.providers:
-            self.logger.error(
-                f"Provider {provider} not found for embedding generation."
-            )
-            return []
+        vectors = self.get_embeddings([text], model=model, provider=provider)
+        return vectors[0].tolist() if len(vectors) else []
 
-        provider_instance = self.providers[provider]
-        if not hasattr(provider_instance, "get_embedding"):
-            self.logger.error(
-                f"Provider {provider} does not support embedding generation."
-            )
-            return []
+    def get_embeddings(
+        self,
+        texts: List[str],
+        model: Optional[str] = None,
+        provider: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        max_workers: int = 4,
+    ) -> np.ndarray:
+        """
+        Generate embeddings for many texts with batched, cached requests.
 
-        if not provider_instance.is_available():
-            self.logger.error(
-                f"Cannot generate embedding, {provider} client not available."
-            )
-            return []
+        Args:
+            texts: Texts to embed
+            model: Optional embedding model (defaults to the provider's)
+            provider: Optional provider name, e.g. "openai", "ollama" or the
+                offline "local" provider (defaults to the ``embedding_provider``
+                setting, then the first available provider)
+            batch_size: Optional texts per request, capped at the provider limit
+            max_workers: Maximum number of batch requests in flight
 
-        return provider_instance.get_embedding(text, model)
+        Returns:
+            float32 array with one row per text, or an empty array on failure
+        """
+        name = provider or self._get_setting("embedding_provider", "")
+        if name == "local":
+            if self._local_embeddings is None:
+                self._local_embeddings = LocalEmbeddingProvider(self.config_manager)
+            provider_instance = self._local_embeddings
+        else:
+            candidates = [name] if name else EMBEDDING_PROVIDERS
+            provider_instance = None
+            for candidate in candidates:
+                instance = self.providers.get(candidate)
+                if (
+                    instance is not None
+                    and hasattr(instance, "get_embeddings")
+                    and self.health.is_available(candidate)
+                ):
+                    name, provider_instance = candidate, instance
+                    break
+            if provider_instance is None:
+                self.logger.error(
+                    f"No available provider for embedding generation: {candidates}"
+                )
+                return np.empty((0, 0), dtype=np.float32)
+
+        model = model or provider_instance.embedding_model
+        return embed_texts(
+            provider_instance,
+            texts,
+            model=model,
+            cache=self._get_embedding_cache(),
+            namespace=f"{name}-{model}",
+            batch_size=batch_size,
+            max_workers=max_workers,
+        )
+
+    def _get_embedding_cache(self) -> Optional[EmbeddingCache]:
+        """Open the on-disk embedding cache on first use."""
+        if self._embedding_cache is None and self._get_setting(
+            "embedding_cache_enabled", True
+        ):
+            try:
+                cache_dir = self.config_manager.get_app_data_path("embeddings")
+                self._embedding_cache = EmbeddingCache(str(cache_dir))
+            except Exception as e:
+                self.logger.warning(f"Embedding cache unavailable: {e}")
+        return self._embedding_cache
 
     def update_settings(self):
         """Update LLM manager settings from config."""
@@ -260,6 +356,7 @@ class LLMManager:
 
             # Check if settings actually changed
             settings_changed = False
+            old_provider, old_model = self.current_provider, self.current_model
 
             if new_model != self.current_model:
                 self.current_model = new_model
@@ -273,12 +370,17 @@ class LLMManager:
 
             # Re-initialize providers if settings changed
             if settings_changed:
+                dropped = self.cache.clear(f"{old_provider}/{old_model}")
+                self.logger.info(
+                    f"Dropped {dropped} cached responses of {old_provider}/{old_model}"
+                )
                 self.providers = {
                     "openai": OpenAIProvider(self.config_manager),
                     "gemini": GeminiProvider(self.config_manager),
                     "groq": GroqProvider(self.config_manager),
                     "ollama": OllamaProvider(self.config_manager),
                 }
+                self.health.set_probes(self._provider_probes())
                 self.logger.info("Re-initialized LLM providers with new settings")
 
             self.logger.debug("LLM settings updated successfully")
@@ -287,8 +389,40 @@ class LLMManager:
             self.logger.error(f"Failed to update LLM settings: {e}", exc_info=True)
             return False
 
+    def get_provider_health(self) -> Dict[str, Dict[str, Any]]:
+        """Get circuit state, availability and latency statistics per provider."""
+        return self.health.get_stats()
+
+    def _provider_probes(self) -> Dict[str, Callable[[], bool]]:
+        """Get the availability check of every provider."""
+        return {name: client.is_available for name, client in self.providers.items()}
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get response cache hit/miss counters and the tokens saved by hits."""
+        return dict(self.cache.stats(), tokens_saved=self._tokens_saved)
+
+    def _get_setting(self, key: str, default: Any) -> Any:
+        """Get a setting, falling back to the default if it is missing."""
+        get_setting = getattr(self.config_manager, "get_setting", None)
+        value = get_setting(key, default) if get_setting else default
+        return default if value is None else value
+
+    def _create_response_cache(self) -> ResponseCache:
+        """Create the response cache from the ``llm_cache_*`` settings."""
+        setting = self._get_setting
+        persist_path = None
+        if setting("llm_cache_persistent", False):
+            persist_path = setting("llm_cache_path", "")
+            if not persist_path:
+                cache_dir = self.config_manager.get_app_data_path("llm_cache")
+                persist_path = str(cache_dir / "responses.json")
+        return ResponseCache(
+            ttl=float(setting("llm_cache_ttl", 3600)),
+            max_entries=int(setting("llm_cache_max_entries", 1024)),
+            max_bytes=int(setting("llm_cache_max_mb", 16)) * 1024 * 1024,
+            persist_path=persist_path,
+        )
+
     def is_provider_available(self, provider: str) -> bool:
-        """Check if a specific LLM provider is available."""
-        if provider in self.providers:
-            return self.providers[provider].is_available()
-        return False
+        """Check if a specific LLM provider is available, using cached probes."""
+        return self.health.is_available(provider)
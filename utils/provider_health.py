@@ -0,0 +1,350 @@
+"""Provider health tracking and failover for the Atlas LLM Manager.
+
+``ProviderHealthMonitor`` keeps, per provider:
+- a circuit breaker;
+- exponentially weighted averages of latency and success;
+- a window of recent latencies for the p95;
+- a cached ``is_available()`` result, which a background thread refreshes so
+  requests never wait on an availability probe.
+
+``call`` tries the healthiest providers first and fails over on errors. A
+request that is still running after its provider's p95 latency can optionally
+be hedged with a second request to the next provider; the first success wins.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from core.ai_router import ProviderCircuitBreaker
+
+logger = logging.getLogger(__name__)
+
+
+class _ProviderState:
+    """Health data of one provider."""
+
+    def __init__(self, breaker: ProviderCircuitBreaker, window: int):
+        self.breaker = breaker
+        self.calls = 0
+        self.latency = 0.0
+        self.success = 1.0
+        self.recent: Deque[float] = deque(maxlen=window)
+        self.available: Optional[bool] = None
+        self.checked_at = 0.0
+
+
+class ProviderHealthMonitor:
+    """Health- and latency-weighted provider routing with hedged requests."""
+
+    def __init__(
+        self,
+        probes: Dict[str, Callable[[], bool]],
+        probe_ttl: float = 60.0,
+        refresh_interval: float = 30.0,
+        alpha: float = 0.2,
+        failure_threshold: int = 3,
+        recovery_timeout: float = 30.0,
+        preference: float = 2.0,
+        latency_window: int = 100,
+        min_hedge_samples: int = 10,
+        max_workers: int = 8,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the monitor.
+
+        Args:
+            probes (Dict[str, Callable[[], bool]]): Availability check by
+                provider name.
+            probe_ttl (float): Seconds a probe result is trusted before a
+                request probes again itself.
+            refresh_interval (float): Seconds between background probe rounds.
+            alpha (float): EWMA smoothing factor in (0, 1].
+            failure_threshold (int): Consecutive failures that open a circuit.
+            recovery_timeout (float): Seconds before an open circuit is probed.
+            preference (float): Score multiplier of the preferred provider.
+            latency_window (int): Recent latencies kept for the p95.
+            min_hedge_samples (int): Latencies needed before hedging a provider.
+            max_workers (int): Threads available for requests in flight.
+            clock (Callable[[], float]): Monotonic time source.
+        """
+        self.probe_ttl = probe_ttl
+        self.refresh_interval = refresh_interval
+        self.alpha = alpha
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.preference = preference
+        self.latency_window = latency_window
+        self.min_hedge_samples = min_hedge_samples
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._probes: Dict[str, Callable[[], bool]] = {}
+        self._states: Dict[str, _ProviderState] = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="llm-dispatch"
+        )
+        self._stop = threading.Event()
+        self._refresher: Optional[threading.Thread] = None
+        self.set_probes(probes)
+
+    def set_probes(self, probes: Dict[str, Callable[[], bool]]) -> None:
+        """Replace the availability checks and forget cached probe results.
+
+        Args:
+            probes (Dict[str, Callable[[], bool]]): Availability check by
+                provider name.
+        """
+        with self._lock:
+            self._probes = dict(probes)
+            for name in self._probes:
+                self._state(name).available = None
+
+    def start(self) -> None:
+        """Start refreshing availability in a background thread."""
+        with self._lock:
+            if self._refresher is not None and self._refresher.is_alive():
+                return
+            self._stop.clear()
+            self._refresher = threading.Thread(
+                target=self._refresh_loop, name="llm-health", daemon=True
+            )
+            self._refresher.start()
+
+    def stop(self) -> None:
+        """Stop the background refresh and the request threads."""
+        self._stop.set()
+        self._executor.shutdown(wait=False)
+
+    def refresh(self) -> None:
+        """Probe every provider now."""
+        for name in list(self._probes):
+            self._probe(name)
+
+    def is_available(self, name: str) -> bool:
+        """Get the cached availability of a provider, probing if it is stale.
+
+        Args:
+            name (str): Provider name.
+
+        Returns:
+            bool: True if the provider passed its last probe.
+        """
+        with self._lock:
+            if name not in self._probes:
+                return False
+            state = self._state(name)
+            fresh = (
+                state.available is not None
+                and self._clock() - state.checked_at < self.probe_ttl
+            )
+            if fresh:
+                return state.available
+        return self._probe(name)
+
+    def record(self, name: str, latency: float, success: bool) -> None:
+        """Record the outcome of a request.
+
+        Args:
+            name (str): Provider name.
+            latency (float): Request duration in seconds.
+            success (bool): Whether the request succeeded.
+        """
+        with self._lock:
+            state = self._state(name)
+            if state.calls == 0:
+                state.latency = latency
+                state.success = 1.0 if success else 0.0
+            else:
+                state.latency += self.alpha * (latency - state.latency)
+                state.success += self.alpha * (float(success) - state.success)
+            state.calls += 1
+            if success:
+                state.recent.append(latency)
+        if success:
+            state.breaker.record_success()
+        else:
+            state.breaker.record_failure()
+
+    def rank(
+        self, candidates: Iterable[str], preferred: Optional[str] = None
+    ) -> List[str]:
+        """Order usable providers from the best to the worst score.
+
+        The score is the success rate divided by ``1 + latency``, multiplied by
+        ``preference`` for the preferred provider. Providers that failed their
+        last probe or whose circuit is open are left out.
+
+        Args:
+            candidates (Iterable[str]): Provider names.
+            preferred (Optional[str]): Provider configured by the user.
+
+        Returns:
+            List[str]: Usable provider names, best first.
+        """
+        scored = []
+        for index, name in enumerate(candidates):
+            if not self.is_available(name):
+                continue
+            with self._lock:
+                state = self._state(name)
+                score = state.success / (1.0 + state.latency)
+            if not state.breaker.available():
+                continue
+            if name == preferred:
+                score *= self.preference
+            scored.append((-score, index, name))
+        return [name for _, _, name in sorted(scored)]
+
+    def hedge_delay(self, name: str) -> Optional[float]:
+        """Get the p95 latency of a provider, after which a request is hedged.
+
+        Args:
+            name (str): Provider name.
+
+        Returns:
+            Optional[float]: Seconds, or None while too few latencies are known.
+        """
+        with self._lock:
+            recent = sorted(self._state(name).recent)
+        if len(recent) < self.min_hedge_samples:
+            return None
+        return recent[min(len(recent) - 1, int(0.95 * len(recent)))]
+
+    def call(
+        self,
+        func: Callable[[str], Any],
+        providers: List[str],
+        hedge: bool = False,
+        is_success: Callable[[Any], bool] = lambda result: True,
+    ) -> Tuple[Optional[str], Any]:
+        """Call providers in order until one succeeds.
+
+        Args:
+            func (Callable[[str], Any]): Sends the request to the named provider.
+            providers (List[str]): Provider names, best first, e.g. from ``rank``.
+            hedge (bool): Send one extra request to the next provider when the
+                first is still running after its p95 latency.
+            is_success (Callable[[Any], bool]): Tells whether a result counts as
+                a success; failed results move on to the next provider.
+
+        Returns:
+            Tuple[Optional[str], Any]: The provider that succeeded and its
+                result, or (None, None) if every provider returned a failure.
+
+        Raises:
+            Exception: The last error raised, if every provider failed and at
+                least one raised.
+        """
+        queue = list(providers)
+        pending: Dict[Future, str] = {}
+        hedged = False
+        last_error: Optional[BaseException] = None
+
+        def launch() -> bool:
+            while queue:
+                name = queue.pop(0)
+                with self._lock:
+                    breaker = self._state(name).breaker
+                if breaker.allow_request():
+                    future = self._executor.submit(self._run, func, name, is_success)
+                    pending[future] = name
+                    return True
+            return False
+
+        launch()
+        while pending:
+            timeout = None
+            if hedge and not hedged and queue and len(pending) == 1:
+                timeout = self.hedge_delay(next(iter(pending.values())))
+            done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                hedged = True
+                slow = next(iter(pending.values()))
+                if launch():
+                    logger.info(f"Hedging slow request to {slow}")
+                continue
+            for future in done:
+                name = pending.pop(future)
+                try:
+                    success, result = future.result()
+                except Exception as e:
+                    last_error = e
+                    logger.warning(f"Provider {name} failed: {e}")
+                    continue
+                if success:
+                    return name, result
+                logger.warning(f"Provider {name} returned an unusable response")
+            if not pending:
+                launch()
+        if last_error is not None:
+            raise last_error
+        return None, None
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get the health data of every provider.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Circuit state, cached availability, call
+                count, average latency and success, and p95 latency by provider.
+        """
+        with self._lock:
+            names = list(self._states)
+        stats = {}
+        for name in names:
+            state = self._states[name]
+            stats[name] = {
+                "circuit": state.breaker.state,
+                "available": state.available,
+                "calls": state.calls,
+                "ewma_latency": state.latency,
+                "ewma_success": state.success,
+                "p95_latency": self.hedge_delay(name),
+            }
+        return stats
+
+    def _state(self, name: str) -> _ProviderState:
+        """Get the state of a provider, creating it on first use."""
+        state = self._states.get(name)
+        if state is None:
+            breaker = ProviderCircuitBreaker(
+                self.failure_threshold, self.recovery_timeout, self._clock
+            )
+            state = self._states[name] = _ProviderState(breaker, self.latency_window)
+        return state
+
+    def _probe(self, name: str) -> bool:
+        """Run the availability check of a provider and cache its result."""
+        probe = self._probes.get(name)
+        try:
+            available = bool(probe()) if probe else False
+        except Exception as e:
+            logger.warning(f"Availability probe of {name} failed: {e}")
+            available = False
+        with self._lock:
+            state = self._state(name)
+            state.available = available
+            state.checked_at = self._clock()
+        return available
+
+    def _refresh_loop(self) -> None:
+        """Refresh availability until stopped."""
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.refresh_interval)
+
+    def _run(
+        self, func: Callable[[str], Any], name: str, is_success: Callable[[Any], bool]
+    ) -> Tuple[bool, Any]:
+        """Send one request and record its outcome, also when it loses a hedge."""
+        started = self._clock()
+        try:
+            result = func(name)
+        except Exception:
+            self.record(name, self._clock() - started, False)
+            raise
+        success = bool(is_success(result))
+        self.record(name, self._clock() - started, success)
+        return success, result
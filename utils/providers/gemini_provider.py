@@ -18,11 +18,15 @@ except ImportError:
 class GeminiProvider:
     """Manages interactions with Gemini API."""
 
+    # Maximum number of inputs accepted by one batchEmbedContents request
+    EMBEDDING_BATCH_SIZE = 100
+
     def __init__(self, config_manager):
         self.logger = logging.getLogger(self.__class__.__name__)
         self.config_manager = config_manager
         self.client = None
         self.model = "gemini-1.5-flash"
+        self.embedding_model = "models/embedding-001"
         self._initialize_client()
 
     def _initialize_client(self):
@@ -129,3 +133,23 @@ class GeminiProvider:
         except Exception as e:
             self.logger.error(f"Failed to generate embedding: {e}", exc_info=True)
             return []
+
+    def get_embeddings(
+        self, texts: List[str], model: Optional[str] = None
+    ) -> List[List[float]]:
+        """Generates embeddings for a batch of texts in one API request."""
+        if not self.is_available():
+            self.logger.error(
+                "Cannot generate embeddings, Gemini client not available."
+            )
+            return []
+
+        try:
+            # A list of contents is sent as a single batchEmbedContents call
+            result = genai.embed_content(
+                model=model or self.embedding_model, content=list(texts)
+            )
+            return result["embedding"]
+        except Exception as e:
+            self.logger.error(f"Failed to generate embeddings: {e}", exc_info=True)
+            return []
@@ -0,0 +1,56 @@
+"""Local Embedding Provider for Atlas LLM Manager.
+
+This module provides an offline embedding provider that needs no API key,
+network or model download. Texts are embedded with signed feature hashing of
+their words and word bigrams, so equal texts always get equal vectors and
+texts sharing words get similar ones. It is meant for tests and offline
+development, not for semantic search quality.
+"""
+
+import hashlib
+import logging
+import re
+from typing import List, Optional
+
+import numpy as np
+
+_WORD_RE = re.compile(r"\w+")
+
+
+class LocalEmbeddingProvider:
+    """Deterministic, offline embeddings based on feature hashing."""
+
+    EMBEDDING_BATCH_SIZE = 1024
+
+    def __init__(self, config_manager=None, dimension: int = 256):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.config_manager = config_manager
+        self.dimension = dimension
+        self.embedding_model = f"hashing-{dimension}"
+
+    def is_available(self) -> bool:
+        """The local provider is always available."""
+        return True
+
+    def get_embedding(self, text: str, model: Optional[str] = None) -> List[float]:
+        """Generates an embedding for the given text."""
+        return self.get_embeddings([text], model)[0]
+
+    def get_embeddings(
+        self, texts: List[str], model: Optional[str] = None
+    ) -> List[List[float]]:
+        """Generates L2-normalized embeddings for a batch of texts."""
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            words = _WORD_RE.findall(text.lower())
+            features = words + [
+                f"{a} {b}" for a, b in zip(words, words[1:], strict=False)
+            ]
+            for feature in features:
+                digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8)
+                value = int.from_bytes(digest.digest(), "little")
+                sign = 1.0 if value & 1 else -1.0
+                vectors[row, (value >> 1) % self.dimension] += sign
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors.tolist()
@@ -1,7 +1,7 @@
 """Ollama Provider for Atlas LLM Manager.
 
 This module provides the implementation for interacting with Ollama's local API.
-It handles client initialization and chat functionality.
+It handles client initialization, chat and embedding functionality.
 """
 
 import logging
@@ -13,10 +13,14 @@ import requests
 class OllamaProvider:
     """Manages interactions with Ollama local API."""
 
+    # Inputs per /api/embed request; Ollama has no hard limit
+    EMBEDDING_BATCH_SIZE = 64
+
     def __init__(self, config_manager):
         self.logger = logging.getLogger(self.__class__.__name__)
         self.config_manager = config_manager
         self.model = "llama3"
+        self.embedding_model = "nomic-embed-text"
 
     def is_available(self):
         """Check if Ollama provider is available."""
@@ -71,9 +75,24 @@ class OllamaProvider:
                 "total_tokens": 0,
             }
 
-    def get_embedding(
-        self, text: str, model: str = "models/embedding-001"
-    ) -> List[float]:
-        """Embedding generation is not supported by Ollama API by default."""
-        self.logger.warning("Embedding generation is not supported by Ollama API")
-        return []
+    def get_embedding(self, text: str, model: Optional[str] = None) -> List[float]:
+        """Generates an embedding for the given text via the local HTTP API."""
+        embeddings = self.get_embeddings([text], model)
+        return embeddings[0] if embeddings else []
+
+    def get_embeddings(
+        self, texts: List[str], model: Optional[str] = None
+    ) -> List[List[float]]:
+        """Generates embeddings for a batch of texts in one /api/embed request."""
+        url = "http://localhost:11434/api/embed"
+        payload = {"model": model or self.embedding_model, "input": list(texts)}
+        try:
+            response = requests.post(url, json=payload, timeout=60)
+            if response.status_code != 200:
+                raise ValueError(
+                    f"Ollama API error: {response.status_code} {response.text}"
+                )
+            return response.json().get("embeddings", [])
+        except Exception as e:
+            self.logger.error(f"Failed to generate embeddings: {e}", exc_info=True)
+            return []
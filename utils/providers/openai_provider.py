@@ -18,11 +18,15 @@ except ImportError:
 class OpenAIProvider:
     """Manages interactions with OpenAI API."""
 
+    # Maximum number of inputs accepted by one embeddings request
+    EMBEDDING_BATCH_SIZE = 2048
+
     def __init__(self, config_manager):
         self.logger = logging.getLogger(self.__class__.__name__)
         self.config_manager = config_manager
         self.client = None
         self.model = "gpt-4-turbo"
+        self.embedding_model = "text-embedding-3-small"
         self._initialize_client()
 
     def _initialize_client(self):
@@ -106,3 +110,23 @@ class OpenAIProvider:
         except Exception as e:
             self.logger.error(f"Failed to generate embedding: {e}", exc_info=True)
             return []
+
+    def get_embeddings(
+        self, texts: List[str], model: Optional[str] = None
+    ) -> List[List[float]]:
+        """Generates embeddings for a batch of texts in one API request."""
+        if not self.is_available():
+            self.logger.error(
+                "Cannot generate embeddings, OpenAI client not available."
+            )
+            return []
+
+        try:
+            response = self.client.embeddings.create(
+                input=texts, model=model or self.embedding_model
+            )
+            data = sorted(response.data, key=lambda item: item.index)
+            return [item.embedding for item in data]
+        except Exception as e:
+            self.logger.error(f"Failed to generate embeddings: {e}", exc_info=True)
+            return []
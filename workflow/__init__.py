@@ -13,11 +13,13 @@ from .error_handling import (
     ErrorHandler,
     RetryAction,
     StatePersistenceError,
+    StepTimeoutError,
     StopOnCritical,
     WorkflowError,
 )
 from .execution import AdvancedWorkflowEngine
 from .integration import IntegrationAdapter, RESTApiAdapter, WorkflowIntegrator
+from .scheduler import TriggerScheduler
 from .security import AccessControl, AuditLogger, EncryptionManager, WorkflowSecurity
 from .trigger import (
     ConditionBasedTrigger,
@@ -37,11 +39,13 @@ __all__ = [
     "WorkflowError",
     "ActionExecutionError",
     "StatePersistenceError",
+    "StepTimeoutError",
     "Trigger",
     "TimeBasedTrigger",
     "EventBasedTrigger",
     "ConditionBasedTrigger",
     "TriggerManager",
+    "TriggerScheduler",
     "WorkflowAnalytics",
     "IntegrationAdapter",
     "RESTApiAdapter",
@@ -3,12 +3,20 @@ Workflow Monitoring and Analytics Module
 
 This module provides functionality for real-time monitoring, performance metrics,
 and optimization suggestions for workflows.
+
+Recorded actions are buffered in memory and written in batches, and per-hour
+rollups of every workflow are maintained as the batches are written, so
+dashboards do not have to aggregate the raw action table.
 """
 
+import contextlib
 import logging
 import sqlite3
+import threading
+import time
+from collections import defaultdict
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 # Configure logging
 logging.basicConfig(
@@ -20,21 +28,39 @@ logger = logging.getLogger(__name__)
 class WorkflowAnalytics:
     """Handles monitoring and analytics for workflow execution."""
 
-    def __init__(self, db_path: str = "workflow_analytics.db"):
+    def __init__(
+        self,
+        db_path: str = "workflow_analytics.db",
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+    ):
         """Initialize the Workflow Analytics system.
 
         Args:
             db_path (str): Path to the SQLite database for storing analytics data.
+            batch_size (int): Number of buffered actions that triggers a write.
+            flush_interval (float): Maximum age in seconds of the oldest buffered
+                action; a timer writes the buffer once it is reached.
         """
         self.db_path = db_path
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
         self.conn = None
+        self._lock = threading.RLock()
+        self._action_buffer: List[Tuple] = []
+        self._buffer_started = 0.0
+        self._flush_timer: Optional[threading.Timer] = None
+        # execution_id -> workflow_id, for rolling up buffered actions
+        self._execution_workflows: Dict[str, str] = {}
         self.initialize_db()
 
     def initialize_db(self) -> None:
         """Initialize the SQLite database for analytics data."""
         try:
-            self.conn = sqlite3.connect(self.db_path)
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
             cursor = self.conn.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS workflow_executions (
                     execution_id TEXT PRIMARY KEY,
@@ -60,6 +86,32 @@ class WorkflowAnalytics:
                     error_message TEXT
                 )
             """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS workflow_hourly_rollup (
+                    workflow_id TEXT NOT NULL,
+                    hour TEXT NOT NULL,
+                    executions_count INTEGER NOT NULL DEFAULT 0,
+                    completed_count INTEGER NOT NULL DEFAULT 0,
+                    failed_count INTEGER NOT NULL DEFAULT 0,
+                    total_duration_seconds REAL NOT NULL DEFAULT 0,
+                    actions_count INTEGER NOT NULL DEFAULT 0,
+                    failed_actions_count INTEGER NOT NULL DEFAULT 0,
+                    total_action_duration_seconds REAL NOT NULL DEFAULT 0,
+                    PRIMARY KEY (workflow_id, hour)
+                )
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_workflow_executions_workflow
+                ON workflow_executions (workflow_id, start_time)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_action_executions_execution
+                ON action_executions (execution_id, start_time)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_action_executions_status
+                ON action_executions (status, execution_id)
+            """)
             self.conn.commit()
             logger.info("Database initialized for workflow analytics.")
         except sqlite3.Error as e:
@@ -73,19 +125,25 @@ class WorkflowAnalytics:
             execution_id (str): Unique identifier for this execution.
             workflow_id (str): Identifier of the workflow being executed.
         """
+        started = datetime.now()
         try:
-            cursor = self.conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO workflow_executions (
-                    execution_id, workflow_id, start_time, status,
-                    actions_count, failed_actions_count
+            with self._lock:
+                cursor = self.conn.cursor()
+                cursor.execute(
+                    """
+                    INSERT INTO workflow_executions (
+                        execution_id, workflow_id, start_time, status,
+                        actions_count, failed_actions_count
+                    )
+                    VALUES (?, ?, ?, 'running', 0, 0)
+                """,
+                    (execution_id, workflow_id, started),
                 )
-                VALUES (?, ?, ?, 'running', 0, 0)
-            """,
-                (execution_id, workflow_id, datetime.now()),
-            )
-            self.conn.commit()
+                self._add_to_rollup(
+                    cursor, workflow_id, started, {"executions_count": 1}
+                )
+                self.conn.commit()
+                self._execution_workflows[execution_id] = workflow_id
             logger.info(
                 f"Started monitoring execution {execution_id} for workflow {workflow_id}"
             )
@@ -104,19 +162,41 @@ class WorkflowAnalytics:
             details (Optional[str]): Additional details or error messages if applicable.
         """
         try:
-            cursor = self.conn.cursor()
-            cursor.execute(
-                """
-                UPDATE workflow_executions
-                SET end_time = ?,
-                    duration_seconds = (strftime('%s', 'now') - strftime('%s', start_time)),
-                    status = ?,
-                    details = ?
-                WHERE execution_id = ?
-            """,
-                (datetime.now(), status, details or "", execution_id),
-            )
-            self.conn.commit()
+            with self._lock:
+                self.flush()
+                cursor = self.conn.cursor()
+                cursor.execute(
+                    """
+                    UPDATE workflow_executions
+                    SET end_time = ?,
+                        duration_seconds = (strftime('%s', 'now') - strftime('%s', start_time)),
+                        status = ?,
+                        details = ?
+                    WHERE execution_id = ?
+                """,
+                    (datetime.now(), status, details or "", execution_id),
+                )
+                cursor.execute(
+                    """
+                    SELECT workflow_id, start_time, duration_seconds
+                    FROM workflow_executions WHERE execution_id = ?
+                """,
+                    (execution_id,),
+                )
+                row = cursor.fetchone()
+                if row:
+                    self._add_to_rollup(
+                        cursor,
+                        row[0],
+                        row[1],
+                        {
+                            "completed_count": int(status == "completed"),
+                            "failed_count": int(status == "failed"),
+                            "total_duration_seconds": row[2] or 0.0,
+                        },
+                    )
+                self.conn.commit()
+                self._execution_workflows.pop(execution_id, None)
             logger.info(
                 f"Ended monitoring execution {execution_id} with status {status}"
             )
@@ -143,17 +223,12 @@ class WorkflowAnalytics:
             status (str): Status of the action ('success', 'failed').
             error_message (Optional[str]): Error message if the action failed.
         """
-        try:
-            cursor = self.conn.cursor()
-            duration = (end_time - start_time).total_seconds()
-            cursor.execute(
-                """
-                INSERT INTO action_executions (
-                    execution_id, action_name, start_time, end_time,
-                    duration_seconds, status, error_message
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
+        duration = (end_time - start_time).total_seconds()
+        with self._lock:
+            if not self._action_buffer:
+                self._buffer_started = time.monotonic()
+                self._schedule_flush()
+            self._action_buffer.append(
                 (
                     execution_id,
                     action_name,
@@ -162,39 +237,197 @@ class WorkflowAnalytics:
                     duration,
                     status,
                     error_message or "",
-                ),
+                )
             )
-
-            # Update counts in workflow_executions
-            if status == "failed":
-                cursor.execute(
+            if (
+                len(self._action_buffer) >= self.batch_size
+                or time.monotonic() - self._buffer_started >= self.flush_interval
+            ):
+                self.flush()
+        logger.debug(
+            f"Recorded action {action_name} for execution {execution_id} with status {status}"
+        )
+
+    def flush(self) -> None:
+        """Write all buffered actions, their execution counters and rollups."""
+        with self._lock:
+            if not self._action_buffer:
+                return
+            rows, self._action_buffer = self._action_buffer, []
+            self._cancel_flush_timer()
+            try:
+                cursor = self.conn.cursor()
+                cursor.executemany(
                     """
-                    UPDATE workflow_executions
-                    SET actions_count = actions_count + 1,
-                        failed_actions_count = failed_actions_count + 1
-                    WHERE execution_id = ?
+                    INSERT INTO action_executions (
+                        execution_id, action_name, start_time, end_time,
+                        duration_seconds, status, error_message
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
                 """,
-                    (execution_id,),
+                    rows,
                 )
-            else:
-                cursor.execute(
+
+                # One counter update per execution instead of one per action
+                counts: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+                rollups: Dict[Tuple[str, str], Dict[str, float]] = defaultdict(
+                    lambda: defaultdict(float)
+                )
+                for execution_id, _, start_time, _, duration, status, _ in rows:
+                    failed = int(status == "failed")
+                    counts[execution_id][0] += 1
+                    counts[execution_id][1] += failed
+                    workflow_id = self._workflow_of(cursor, execution_id)
+                    if workflow_id is None:
+                        continue
+                    totals = rollups[(workflow_id, self._hour(start_time))]
+                    totals["actions_count"] += 1
+                    totals["failed_actions_count"] += failed
+                    totals["total_action_duration_seconds"] += duration
+                cursor.executemany(
                     """
                     UPDATE workflow_executions
-                    SET actions_count = actions_count + 1
+                    SET actions_count = actions_count + ?,
+                        failed_actions_count = failed_actions_count + ?
                     WHERE execution_id = ?
                 """,
-                    (execution_id,),
+                    [(total, failed, eid) for eid, (total, failed) in counts.items()],
                 )
+                for (workflow_id, hour), totals in rollups.items():
+                    self._add_to_rollup(cursor, workflow_id, hour, totals)
+                self.conn.commit()
+                logger.debug(f"Flushed {len(rows)} recorded actions")
+            except sqlite3.Error as e:
+                logger.error(f"Failed to flush {len(rows)} recorded actions: {e}")
+                self.conn.rollback()
+                # Put the rows back so the next flush writes them
+                self._action_buffer[:0] = rows
+                self._schedule_flush()
+                raise
+
+    def close(self) -> None:
+        """Write buffered actions and close the database connection."""
+        with self._lock:
+            self._cancel_flush_timer()
+            if self.conn is None:
+                return
+            try:
+                self.flush()
+            finally:
+                self._cancel_flush_timer()
+                self.conn.close()
+                self.conn = None
+                logger.info("Closed database connection for WorkflowAnalytics.")
+
+    def _schedule_flush(self) -> None:
+        """Start the timer that writes the buffer after ``flush_interval``."""
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(
+                self.flush_interval, self._flush_on_timer
+            )
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _cancel_flush_timer(self) -> None:
+        """Stop the pending flush timer, if any."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+    def _flush_on_timer(self) -> None:
+        """Write the buffer from the flush timer thread."""
+        with self._lock:
+            self._flush_timer = None
+            if self.conn is None:
+                return
+            # Logged by flush; the rows stay buffered for a retry
+            with contextlib.suppress(sqlite3.Error):
+                self.flush()
+
+    def get_hourly_rollup(
+        self,
+        workflow_id: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """Retrieve per-hour aggregates for a workflow.
 
-            self.conn.commit()
-            logger.info(
-                f"Recorded action {action_name} for execution {execution_id} with status {status}"
+        Args:
+            workflow_id (str): Identifier of the workflow.
+            since (Optional[datetime]): First hour to include.
+            until (Optional[datetime]): Last hour to include.
+
+        Returns:
+            List[Dict[str, Any]]: One entry per hour, oldest first.
+        """
+        self.flush()
+        columns = [
+            "hour",
+            "executions_count",
+            "completed_count",
+            "failed_count",
+            "total_duration_seconds",
+            "actions_count",
+            "failed_actions_count",
+            "total_action_duration_seconds",
+        ]
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                f"""
+                SELECT {", ".join(columns)}
+                FROM workflow_hourly_rollup
+                WHERE workflow_id = ? AND hour >= ? AND hour <= ?
+                ORDER BY hour
+            """,
+                (
+                    workflow_id,
+                    self._hour(since) if since else "",
+                    self._hour(until) if until else "9999",
+                ),
             )
-        except sqlite3.Error as e:
-            logger.error(
-                f"Failed to record action {action_name} for execution {execution_id}: {e}"
+            return [dict(zip(columns, row, strict=False)) for row in cursor.fetchall()]
+
+    def _workflow_of(self, cursor: sqlite3.Cursor, execution_id: str) -> Optional[str]:
+        """Get the workflow of an execution, from memory or the database."""
+        workflow_id = self._execution_workflows.get(execution_id)
+        if workflow_id is None:
+            cursor.execute(
+                "SELECT workflow_id FROM workflow_executions WHERE execution_id = ?",
+                (execution_id,),
             )
-            raise
+            row = cursor.fetchone()
+            if row:
+                workflow_id = self._execution_workflows[execution_id] = row[0]
+        return workflow_id
+
+    @staticmethod
+    def _hour(timestamp: Any) -> str:
+        """Get the rollup bucket of a timestamp, e.g. '2024-05-01 13:00'."""
+        if isinstance(timestamp, str):
+            if len(timestamp) == 16 and timestamp.endswith(":00"):
+                return timestamp  # Already a bucket
+            timestamp = datetime.fromisoformat(timestamp)
+        return timestamp.strftime("%Y-%m-%d %H:00")
+
+    def _add_to_rollup(
+        self,
+        cursor: sqlite3.Cursor,
+        workflow_id: str,
+        hour: Any,
+        totals: Dict[str, float],
+    ) -> None:
+        """Add counters to a workflow's rollup row for an hour."""
+        columns = list(totals)
+        cursor.execute(
+            f"""
+            INSERT INTO workflow_hourly_rollup (workflow_id, hour, {", ".join(columns)})
+            VALUES (?, ?, {", ".join("?" for _ in columns)})
+            ON CONFLICT (workflow_id, hour) DO UPDATE SET
+                {", ".join(f"{c} = {c} + excluded.{c}" for c in columns)}
+        """,
+            (workflow_id, self._hour(hour), *totals.values()),
+        )
 
     def get_workflow_performance(
         self, workflow_id: str, limit: int = 100
@@ -208,6 +441,7 @@ class WorkflowAnalytics:
         Returns:
             List[Dict[str, Any]]: List of execution performance data.
         """
+        self.flush()
         try:
             cursor = self.conn.cursor()
             cursor.execute(
@@ -254,6 +488,7 @@ class WorkflowAnalytics:
         Returns:
             List[Dict[str, Any]]: List of action performance data.
         """
+        self.flush()
         try:
             cursor = self.conn.cursor()
             cursor.execute(
@@ -297,6 +532,7 @@ class WorkflowAnalytics:
         Returns:
             Dict[str, Any]: Analysis of failures including common failing actions and error messages.
         """
+        self.flush()
         try:
             cursor = self.conn.cursor()
             # Get failed executions
@@ -379,6 +615,7 @@ class WorkflowAnalytics:
         Returns:
             Dict[str, Any]: Optimization suggestions including bottlenecks and parallelization opportunities.
         """
+        self.flush()
         try:
             cursor = self.conn.cursor()
             # Get average duration of actions to identify bottlenecks
@@ -445,5 +682,4 @@ class WorkflowAnalytics:
     def __del__(self):
         """Cleanup database connection on object destruction."""
         if self.conn:
-            self.conn.close()
-            logger.info("Closed database connection for WorkflowAnalytics.")
+            self.close()
@@ -5,11 +5,14 @@ This module provides the core functionality for executing workflows in Atlas.
 It implements transactional execution, error handling, logging, and state persistence.
 """
 
+import hashlib
 import json
 import logging
 import sqlite3
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Optional
+
+from workflow.state_store import WorkflowStateStore
 
 # Configure logging
 logging.basicConfig(
@@ -19,13 +22,24 @@ logger = logging.getLogger(__name__)
 
 
 class WorkflowEngine:
-    def __init__(self, db_path: str = "workflow_state.db"):
+    def __init__(
+        self,
+        db_path: str = "workflow_state.db",
+        commit_every: int = 20,
+        commit_interval: float = 1.0,
+    ):
         """Initialize the Workflow Engine with a database for state persistence.
 
         Args:
             db_path (str): Path to the SQLite database for storing workflow state.
+            commit_every (int): Number of state updates committed together.
+            commit_interval (float): Maximum time in seconds a state update
+                waits before it is committed.
         """
         self.db_path = db_path
+        self.commit_every = commit_every
+        self.commit_interval = commit_interval
+        self.store = None
         self.conn = None
         self.current_workflow_id = None
         self.initialize_db()
@@ -33,16 +47,10 @@ class WorkflowEngine:
     def initialize_db(self) -> None:
         """Initialize the SQLite database for workflow state persistence."""
         try:
-            self.conn = sqlite3.connect(self.db_path)
-            cursor = self.conn.cursor()
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS workflow_state (
-                    workflow_id TEXT PRIMARY KEY,
-                    state TEXT NOT NULL,
-                    last_updated TIMESTAMP
-                )
-            """)
-            self.conn.commit()
+            self.store = WorkflowStateStore(
+                self.db_path, self.commit_every, self.commit_interval
+            )
+            self.conn = self.store.conn
             logger.info("Database initialized for workflow state persistence.")
         except sqlite3.Error as e:
             logger.error(f"Failed to initialize database: {e}")
@@ -57,20 +65,10 @@ class WorkflowEngine:
         """
         self.current_workflow_id = workflow_id
         try:
-            cursor = self.conn.cursor()
-            state_json = json.dumps(initial_state)
-            cursor.execute(
-                """
-                INSERT OR REPLACE INTO workflow_state (workflow_id, state, last_updated)
-                VALUES (?, ?, ?)
-            """,
-                (workflow_id, state_json, datetime.now()),
-            )
-            self.conn.commit()
+            self.store.start(workflow_id, initial_state)
             logger.info(f"Started workflow {workflow_id} with initial state.")
         except sqlite3.Error as e:
             logger.error(f"Failed to start workflow {workflow_id}: {e}")
-            self.conn.rollback()
             raise
 
     def execute_action(self, action: callable, *args, **kwargs) -> Any:
@@ -98,38 +96,38 @@ class WorkflowEngine:
             return result
         except Exception as e:
             logger.error(f"Action failed in workflow {self.current_workflow_id}: {e}")
-            self.conn.rollback()
+            self.store.rollback()
             raise
 
-    def update_state(self, new_state: Dict[str, Any]) -> None:
+    def update_state(
+        self, new_state: Dict[str, Any], changed_keys: Optional[Iterable[str]] = None
+    ) -> None:
         """Update the state of the current workflow.
 
+        Only the top-level keys that changed are saved, and updates are
+        committed in batches; see ``WorkflowStateStore``.
+
         Args:
             new_state (Dict[str, Any]): New state to save for the workflow.
+            changed_keys (Optional[Iterable[str]]): Keys known to have changed,
+                to skip comparing the whole state.
         """
         if not self.current_workflow_id:
             raise ValueError("No active workflow. Call start_workflow() first.")
 
         try:
-            cursor = self.conn.cursor()
-            state_json = json.dumps(new_state)
-            cursor.execute(
-                """
-                UPDATE workflow_state
-                SET state = ?, last_updated = ?
-                WHERE workflow_id = ?
-            """,
-                (state_json, datetime.now(), self.current_workflow_id),
-            )
-            self.conn.commit()
-            logger.info(f"Updated state for workflow {self.current_workflow_id}")
+            self.store.update(self.current_workflow_id, new_state, changed_keys)
+            logger.debug(f"Updated state for workflow {self.current_workflow_id}")
         except sqlite3.Error as e:
             logger.error(
                 f"Failed to update state for workflow {self.current_workflow_id}: {e}"
             )
-            self.conn.rollback()
             raise
 
+    def flush_state(self) -> None:
+        """Commit all pending state updates to the database."""
+        self.store.flush()
+
     def recover_workflow(self, workflow_id: str) -> Optional[Dict[str, Any]]:
         """Recover the state of a previously started workflow.
 
@@ -140,13 +138,8 @@ class WorkflowEngine:
             Optional[Dict[str, Any]]: The recovered state if found, None otherwise.
         """
         try:
-            cursor = self.conn.cursor()
-            cursor.execute(
-                "SELECT state FROM workflow_state WHERE workflow_id = ?", (workflow_id,)
-            )
-            result = cursor.fetchone()
-            if result:
-                state = json.loads(result[0])
+            state = self.store.load(workflow_id)
+            if state is not None:
                 self.current_workflow_id = workflow_id
                 logger.info(f"Recovered workflow {workflow_id} with state.")
                 return state
@@ -162,41 +155,65 @@ class WorkflowEngine:
             raise ValueError("No active workflow. Call start_workflow() first.")
 
         try:
-            cursor = self.conn.cursor()
-            cursor.execute(
-                "DELETE FROM workflow_state WHERE workflow_id = ?",
-                (self.current_workflow_id,),
-            )
-            self.conn.commit()
+            self.store.delete(self.current_workflow_id)
             logger.info(f"Completed and cleaned up workflow {self.current_workflow_id}")
             self.current_workflow_id = None
         except sqlite3.Error as e:
             logger.error(f"Failed to complete workflow {self.current_workflow_id}: {e}")
-            self.conn.rollback()
             raise
 
     def execute_workflow_plan(
-        self, plan: list, initial_state: dict, continue_on_error: bool = False
+        self,
+        plan: list,
+        initial_state: dict,
+        continue_on_error: bool = False,
+        workflow_id: Optional[str] = None,
     ) -> dict:
         """
         Execute a workflow plan (list of steps), each step is a dict: {'tool_name': str, 'params': dict}.
+
+        Every successful step is journaled under its idempotency key (the step's
+        'idempotency_key', or one derived from its position, tool and params).
+        Passing the ID of an interrupted workflow resumes it: journaled steps are
+        not executed again and their recorded outputs are replayed instead. A
+        workflow that ended with errors keeps its state and journal for that;
+        only a workflow without errors is completed and cleaned up.
         Args:
             plan: List of workflow steps.
             initial_state: Initial workflow state.
             continue_on_error: If True, workflow continues after error; else stops.
+            workflow_id: ID of the workflow; resumes it if it was interrupted.
         Returns:
             dict: Final state with results and errors.
         """
         from agents.self_regeneration_manager import self_regeneration_manager
 
-        state = initial_state.copy()
+        recovered = self.recover_workflow(workflow_id) if workflow_id else None
+        workflow_id = workflow_id or f"wf_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        if recovered is not None:
+            state = recovered
+            journal = self.store.load_steps(workflow_id)
+            logger.info(
+                f"[Workflow] Resuming {workflow_id} with {len(journal)} completed steps"
+            )
+        else:
+            state = initial_state.copy()
+            journal = {}
+            self.start_workflow(workflow_id, state)
         results = []
         errors = []
-        workflow_id = f"wf_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        self.start_workflow(workflow_id, state)
         for idx, step in enumerate(plan):
             tool_name = step.get("tool_name")
             params = step.get("params", {})
+            step_key = step.get("idempotency_key") or self.step_key(idx, step)
+            if step_key in journal:
+                result = journal[step_key]
+                results.append({"step": idx + 1, "tool": tool_name, "result": result})
+                state[f"step_{idx + 1}"] = result
+                logger.info(
+                    f"[Workflow] Step {idx + 1}/{len(plan)}: replayed {tool_name}"
+                )
+                continue
             logger.info(f"[Workflow] Step {idx + 1}/{len(plan)}: {tool_name}({params})")
             try:
                 result = self.execute_action(
@@ -204,23 +221,55 @@ class WorkflowEngine:
                 )
                 results.append({"step": idx + 1, "tool": tool_name, "result": result})
                 state[f"step_{idx + 1}"] = result
-                self.update_state(state)
+                self.update_state(state, changed_keys=[f"step_{idx + 1}"])
                 if not result.get("success", True) and not continue_on_error:
                     logger.error(
                         f"[Workflow] Step {idx + 1} failed, stopping workflow."
                     )
                     errors.append({"step": idx + 1, "tool": tool_name, "error": result})
                     break
+                if result.get("success", True):
+                    self.store.record_step(workflow_id, step_key, result)
             except Exception as e:
                 logger.error(f"[Workflow] Exception in step {idx + 1}: {e}")
                 errors.append({"step": idx + 1, "tool": tool_name, "error": str(e)})
                 if not continue_on_error:
                     break
-        self.complete_workflow()
-        return {"results": results, "errors": errors, "final_state": state}
+        if errors:
+            # Keep the journal so a rerun skips the completed steps
+            self.flush_state()
+            logger.info(
+                f"[Workflow] {workflow_id} stopped with errors; it can be resumed"
+            )
+        else:
+            self.complete_workflow()
+        return {
+            "workflow_id": workflow_id,
+            "results": results,
+            "errors": errors,
+            "final_state": state,
+        }
+
+    @staticmethod
+    def step_key(index: int, step: Dict[str, Any]) -> str:
+        """Derive the idempotency key of a plan step.
+
+        Args:
+            index (int): Position of the step in the plan.
+            step (Dict[str, Any]): Step definition.
+
+        Returns:
+            str: Key that is stable across runs of the same plan.
+        """
+        payload = json.dumps(
+            [index, step.get("tool_name"), step.get("params", {})],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
     def __del__(self):
         """Cleanup database connection on object destruction."""
-        if self.conn:
-            self.conn.close()
+        if self.store:
+            self.store.close()
             logger.info("Closed database connection for WorkflowEngine.")
@@ -30,6 +30,12 @@ class ActionExecutionError(WorkflowError):
     pass
 
 
+class StepTimeoutError(ActionExecutionError):
+    """Raised when a workflow step does not finish within its timeout."""
+
+    pass
+
+
 class StatePersistenceError(WorkflowError):
     """Raised when there's an error in saving or recovering workflow state."""
 
@@ -5,13 +5,21 @@ This module extends the WorkflowEngine to support advanced features like
 parallel execution, conditional branching, and workflow templates.
 """
 
+import heapq
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import math
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 from workflow.engine import WorkflowEngine
-from workflow.error_handling import ActionExecutionError, ErrorHandler
+from workflow.error_handling import (
+    ActionExecutionError,
+    ErrorHandler,
+    StepTimeoutError,
+)
 
 # Configure logging
 logging.basicConfig(
@@ -19,19 +27,50 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Worker pools shared by all engines, keyed by size, so that executions do not
+# create and tear down threads on every call
+_shared_executors: Dict[int, ThreadPoolExecutor] = {}
+_shared_executors_lock = threading.Lock()
+
+
+def get_shared_executor(max_workers: int) -> ThreadPoolExecutor:
+    """Get the long-lived worker pool of the given size, creating it on first use.
+
+    Args:
+        max_workers (int): Number of worker threads in the pool.
+
+    Returns:
+        ThreadPoolExecutor: Pool shared by every engine with this size.
+    """
+    with _shared_executors_lock:
+        executor = _shared_executors.get(max_workers)
+        if executor is None:
+            executor = _shared_executors[max_workers] = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="WorkflowWorker"
+            )
+        return executor
+
 
 class AdvancedWorkflowEngine(WorkflowEngine):
     """Extends WorkflowEngine to support advanced execution features."""
 
-    def __init__(self, db_path: str = "workflow_state.db", max_workers: int = 4):
+    def __init__(
+        self,
+        db_path: str = "workflow_state.db",
+        max_workers: int = 4,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ):
         """Initialize the Advanced Workflow Engine.
 
         Args:
             db_path (str): Path to the SQLite database for storing workflow state.
             max_workers (int): Maximum number of parallel workers for action execution.
+            executor (Optional[ThreadPoolExecutor]): Worker pool to run actions on;
+                defaults to the shared pool of ``max_workers`` threads.
         """
         super().__init__(db_path)
         self.max_workers = max_workers
+        self.executor = executor or get_shared_executor(max_workers)
         self.error_handler = ErrorHandler()
         self.templates: Dict[str, Dict[str, Any]] = {}
         self.versions: Dict[str, int] = {}
@@ -43,7 +82,8 @@ class AdvancedWorkflowEngine(WorkflowEngine):
             actions (List[Callable[[], Any]]): List of actions to execute in parallel.
 
         Returns:
-            List[Any]: Results of the executed actions.
+            List[Any]: Results of the executed actions, in the order of ``actions``;
+                None for actions that failed.
 
         Raises:
             WorkflowError: If any action fails and the error handler decides to stop execution.
@@ -51,36 +91,295 @@ class AdvancedWorkflowEngine(WorkflowEngine):
         if not self.current_workflow_id:
             raise ValueError("No active workflow. Call start_workflow() first.")
 
-        results = []
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_action = {
-                executor.submit(action): i for i, action in enumerate(actions)
-            }
-            for future in as_completed(future_to_action):
-                action_index = future_to_action[future]
-                try:
-                    result = future.result()
-                    results.append(result)
+        futures = [self.executor.submit(action) for action in actions]
+        results: List[Any] = [None] * len(actions)
+        for action_index, future in enumerate(futures):
+            try:
+                results[action_index] = future.result()
+                logger.info(
+                    f"Parallel action {action_index} completed in workflow {self.current_workflow_id}"
+                )
+            except Exception as e:
+                error = ActionExecutionError(
+                    f"Parallel action {action_index} failed: {str(e)}",
+                    action=f"parallel_action_{action_index}",
+                    workflow_id=self.current_workflow_id,
+                )
+                if not self.error_handler.handle_error(error, self.conn.rollback):
+                    logger.error(
+                        f"Stopping workflow {self.current_workflow_id} due to parallel action failure"
+                    )
+                    for pending in futures[action_index + 1 :]:
+                        pending.cancel()
+                    raise
+                logger.warning(
+                    f"Continuing workflow {self.current_workflow_id} despite parallel action failure"
+                )
+
+        return results
+
+    def execute_dag(
+        self,
+        workflow_def: Dict[str, Any],
+        step_timeout: Optional[float] = None,
+        on_step_complete: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Dict[str, Any]:
+        """Execute the steps of a workflow definition as a dependency graph.
+
+        See ``stream_dag`` for the step format and scheduling.
+
+        Args:
+            workflow_def (Dict[str, Any]): Workflow definition with a ``steps`` list.
+            step_timeout (Optional[float]): Default timeout in seconds per step.
+            on_step_complete (Optional[Callable[[Dict[str, Any]], None]]): Called
+                with the event of every finished, failed or skipped step.
+
+        Returns:
+            Dict[str, Any]: Result of each step by step ID; None for steps that
+                failed, timed out or were skipped.
+
+        Raises:
+            WorkflowError: If a step fails and the error handler decides to stop execution.
+        """
+        results: Dict[str, Any] = {}
+        for event in self.stream_dag(workflow_def, step_timeout):
+            results[event["step_id"]] = event["result"]
+            if on_step_complete:
+                on_step_complete(event)
+        return results
+
+    def stream_dag(
+        self, workflow_def: Dict[str, Any], step_timeout: Optional[float] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Execute a workflow as a dependency graph, yielding an event per step.
+
+        Each step is a dict with an ``id``, an ``action``, optional ``parameters``
+        and the IDs of the steps it depends on in ``dependencies``, as checked by
+        ``WorkflowValidator``. A callable action is called as
+        ``action(inputs, **parameters)`` where ``inputs`` maps each dependency ID
+        to its result. A step may set its own ``timeout`` and an
+        ``estimated_duration`` used for scheduling.
+
+        A step is submitted to the shared worker pool as soon as all of its
+        dependencies have finished. When more steps are ready than there are
+        workers, the step with the longest estimated path to the end of the
+        workflow (the critical path) goes first. Steps depending on a failed
+        step are skipped.
+
+        Timed-out steps are reported immediately, but their threads cannot be
+        interrupted and run to completion in the background.
+
+        Args:
+            workflow_def (Dict[str, Any]): Workflow definition with a ``steps`` list.
+            step_timeout (Optional[float]): Default timeout in seconds per step.
+
+        Yields:
+            Dict[str, Any]: ``step_id``, ``status`` (``"completed"``, ``"failed"``,
+                ``"timeout"`` or ``"skipped"``), ``result``, ``error`` and
+                ``duration`` of a step, in completion order.
+
+        Raises:
+            ValueError: If there is no active workflow or the dependencies are invalid.
+            WorkflowError: If a step fails and the error handler decides to stop execution.
+        """
+        if not self.current_workflow_id:
+            raise ValueError("No active workflow. Call start_workflow() first.")
+
+        steps, dependents, priority = self._plan_dag(workflow_def.get("steps", []))
+        waiting = {
+            step_id: len(set(step.get("dependencies", [])))
+            for step_id, step in steps.items()
+        }
+        order = {step_id: index for index, step_id in enumerate(steps)}
+        ready = [
+            (-priority[step_id], order[step_id], step_id)
+            for step_id, count in waiting.items()
+            if count == 0
+        ]
+        heapq.heapify(ready)
+        results: Dict[str, Any] = {}
+        # future -> (step ID, deadline, start time)
+        running: Dict[Future, Tuple[str, float, float]] = {}
+
+        while ready or running:
+            while ready and len(running) < self.max_workers:
+                _, _, step_id = heapq.heappop(ready)
+                step = steps[step_id]
+                inputs = {dep: results[dep] for dep in step.get("dependencies", [])}
+                timeout = step.get("timeout", step_timeout)
+                started = time.monotonic()
+                future = self.executor.submit(
+                    self._resolve_step_action(step),
+                    inputs,
+                    **step.get("parameters", {}),
+                )
+                running[future] = (
+                    step_id,
+                    started + timeout if timeout is not None else math.inf,
+                    started,
+                )
+
+            nearest = min(deadline for _, deadline, _ in running.values())
+            done, _ = wait(
+                running,
+                timeout=None
+                if nearest == math.inf
+                else max(nearest - time.monotonic(), 0),
+                return_when=FIRST_COMPLETED,
+            )
+            now = time.monotonic()
+            for future, (step_id, deadline, started) in list(running.items()):
+                if future in done:
+                    error = future.exception()
+                elif now >= deadline:
+                    future.cancel()
+                    error = StepTimeoutError(
+                        f"Step {step_id} timed out after {deadline - started:.3f}s",
+                        action=step_id,
+                        workflow_id=self.current_workflow_id,
+                    )
+                else:
+                    continue
+                del running[future]
+                event = {
+                    "workflow_id": self.current_workflow_id,
+                    "step_id": step_id,
+                    "status": "completed",
+                    "result": None,
+                    "error": None,
+                    "duration": now - started,
+                }
+
+                if error is None:
+                    results[step_id] = event["result"] = future.result()
                     logger.info(
-                        f"Parallel action {action_index} completed in workflow {self.current_workflow_id}"
+                        f"Step {step_id} completed in workflow {self.current_workflow_id}"
                     )
-                except Exception as e:
+                    yield event
+                    for dependent in dependents[step_id]:
+                        if dependent not in waiting:
+                            continue  # Skipped because another dependency failed
+                        waiting[dependent] -= 1
+                        if waiting[dependent] == 0:
+                            heapq.heappush(
+                                ready,
+                                (-priority[dependent], order[dependent], dependent),
+                            )
+                    continue
+
+                if not isinstance(error, StepTimeoutError):
                     error = ActionExecutionError(
-                        f"Parallel action {action_index} failed: {str(e)}",
-                        action=f"parallel_action_{action_index}",
+                        f"Step {step_id} failed: {str(error)}",
+                        action=step_id,
                         workflow_id=self.current_workflow_id,
                     )
-                    if not self.error_handler.handle_error(error, self.conn.rollback):
-                        logger.error(
-                            f"Stopping workflow {self.current_workflow_id} due to parallel action failure"
-                        )
-                        raise
-                    results.append(None)  # Append None for failed action
-                    logger.warning(
-                        f"Continuing workflow {self.current_workflow_id} despite parallel action failure"
+                if not self.error_handler.handle_error(error, self.conn.rollback):
+                    logger.error(
+                        f"Stopping workflow {self.current_workflow_id} due to failure of step {step_id}"
                     )
+                    for pending in running:
+                        pending.cancel()
+                    raise error
+                event["status"] = (
+                    "timeout" if isinstance(error, StepTimeoutError) else "failed"
+                )
+                event["error"] = str(error)
+                yield event
+                yield from self._skip_dependents(step_id, steps, dependents, waiting)
 
-        return results
+    def _skip_dependents(
+        self,
+        step_id: str,
+        steps: Dict[str, Dict[str, Any]],
+        dependents: Dict[str, List[str]],
+        waiting: Dict[str, int],
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield skip events for every step that transitively depends on a failed step."""
+        stack = list(dependents[step_id])
+        while stack:
+            dependent = stack.pop()
+            if waiting.pop(dependent, None) is None:
+                continue  # Already skipped through another failed dependency
+            logger.warning(
+                f"Skipping step {dependent} in workflow {self.current_workflow_id}: dependency {step_id} failed"
+            )
+            yield {
+                "workflow_id": self.current_workflow_id,
+                "step_id": dependent,
+                "status": "skipped",
+                "result": None,
+                "error": f"Dependency {step_id} failed",
+                "duration": 0.0,
+            }
+            stack.extend(dependents[dependent])
+
+    def _plan_dag(
+        self, step_list: List[Dict[str, Any]]
+    ) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, List[str]], Dict[str, float]]:
+        """Index the steps of a DAG and rank them by critical path length.
+
+        Args:
+            step_list (List[Dict[str, Any]]): Steps of the workflow.
+
+        Returns:
+            Tuple: Steps by ID, dependent step IDs by step ID, and the estimated
+                duration of the longest path from each step to the end of the workflow.
+
+        Raises:
+            ValueError: If step IDs are duplicated, a dependency is unknown or
+                the dependencies contain a cycle.
+        """
+        steps: Dict[str, Dict[str, Any]] = {}
+        for step in step_list:
+            if step["id"] in steps:
+                raise ValueError(f"Duplicate step ID: {step['id']}")
+            steps[step["id"]] = step
+
+        dependents: Dict[str, List[str]] = {step_id: [] for step_id in steps}
+        in_degree: Dict[str, int] = {}
+        for step_id, step in steps.items():
+            dependencies = set(step.get("dependencies", []))
+            for dep_id in dependencies:
+                if dep_id not in steps:
+                    raise ValueError(
+                        f"Invalid dependency ID '{dep_id}' in step {step_id}"
+                    )
+                dependents[dep_id].append(step_id)
+            in_degree[step_id] = len(dependencies)
+
+        # Kahn's algorithm; leftover steps are part of a cycle
+        topological = [step_id for step_id, degree in in_degree.items() if degree == 0]
+        for step_id in topological:
+            for dependent in dependents[step_id]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    topological.append(dependent)
+        if len(topological) < len(steps):
+            cyclic = sorted(step_id for step_id, degree in in_degree.items() if degree)
+            raise ValueError(f"Circular dependency detected involving steps {cyclic}")
+
+        priority: Dict[str, float] = {}
+        for step_id in reversed(topological):
+            priority[step_id] = steps[step_id].get("estimated_duration", 1.0) + max(
+                (priority[dependent] for dependent in dependents[step_id]), default=0.0
+            )
+        return steps, dependents, priority
+
+    def _resolve_step_action(self, step: Dict[str, Any]) -> Callable[..., Any]:
+        """Get the function to run for a DAG step.
+
+        Args:
+            step (Dict[str, Any]): Step definition.
+
+        Returns:
+            Callable[..., Any]: Function called with the dependency results and
+                the step parameters.
+        """
+        action = step.get("action")
+        if callable(action):
+            return action
+        action_func = self._create_action_func(step)
+        return lambda inputs, **parameters: action_func()
 
     def execute_conditional(
         self,
@@ -179,6 +478,8 @@ class AdvancedWorkflowEngine(WorkflowEngine):
                         for a in action_def.get("actions", [])
                     ]
                     self.execute_parallel(action_funcs)
+                elif action_type == "dag":
+                    self.execute_dag(action_def, action_def.get("step_timeout"))
                 elif action_type == "conditional":
                     condition_func = self._create_condition_func(
                         action_def.get("condition")
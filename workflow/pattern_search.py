@@ -0,0 +1,299 @@
+"""
+Workflow Pattern Search
+
+This module provides the full-text index used by the WorkflowPatternLibrary.
+Pattern fields are tokenized into an inverted index that is updated
+incrementally as patterns are added, changed or removed. Queries are matched
+per token against exact terms, term prefixes and (through a trigram index)
+terms containing the token, and results are ranked with BM25 scaled by how
+often each pattern has been used.
+"""
+
+import bisect
+import heapq
+import math
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# Unicode letters and digits; underscores separate words like other punctuation
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+# Score multipliers for a query token matching a term exactly, as a prefix of
+# the term, or elsewhere inside the term
+EXACT_MATCH_WEIGHT = 1.0
+PREFIX_MATCH_WEIGHT = 0.7
+INFIX_MATCH_WEIGHT = 0.4
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into case-folded alphanumeric tokens, in any script.
+
+    Args:
+        text (str): Text to tokenize.
+
+    Returns:
+        List[str]: Tokens in order of appearance.
+    """
+    return _TOKEN_RE.findall(text.casefold())
+
+
+def _trigrams(term: str) -> Set[str]:
+    """Get the distinct three-character substrings of a term."""
+    return {term[i : i + 3] for i in range(len(term) - 2)}
+
+
+class PatternSearchIndex:
+    """Incrementally maintained inverted index with BM25 ranking.
+
+    Each document is a pattern dict; the configured fields are tokenized and
+    their term frequencies scaled by the field weight, so a match in a
+    pattern's name counts for more than one in its description. List-valued
+    fields such as tags are indexed as one text. Text relevance is multiplied
+    by ``1 + usage_weight * log1p(usage)`` so frequently used patterns win
+    among similarly relevant ones.
+    """
+
+    def __init__(
+        self,
+        fields: Dict[str, float],
+        usage_field: str = "usage_count",
+        usage_weight: float = 0.1,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ):
+        """Initialize an empty index.
+
+        Args:
+            fields (Dict[str, float]): Weight of each indexed pattern field.
+            usage_field (str): Pattern field holding its usage count.
+            usage_weight (float): How strongly usage lifts relevance.
+            k1 (float): BM25 term frequency saturation.
+            b (float): BM25 document length normalization.
+        """
+        self.fields = fields
+        self.usage_field = usage_field
+        self.usage_weight = usage_weight
+        self.k1 = k1
+        self.b = b
+        # term -> {doc_id: weighted term frequency}
+        self._postings: Dict[str, Dict[str, float]] = {}
+        # doc_id -> {term: weighted term frequency}, used to remove documents
+        self._doc_terms: Dict[str, Dict[str, float]] = {}
+        self._doc_lengths: Dict[str, float] = {}
+        self._boosts: Dict[str, float] = {}
+        self._total_length = 0.0
+        self._vocabulary: List[str] = []  # Sorted, for prefix lookups
+        self._trigram_terms: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._doc_terms
+
+    def add(self, doc_id: str, document: Dict[str, Any]) -> None:
+        """Index a document, replacing any earlier version of it.
+
+        Args:
+            doc_id (str): Unique identifier of the document.
+            document (Dict[str, Any]): Pattern data holding the indexed fields.
+        """
+        self.remove(doc_id)
+        terms: Dict[str, float] = {}
+        for field, weight in self.fields.items():
+            value = document.get(field)
+            if not value:
+                continue
+            if not isinstance(value, str):
+                value = " ".join(str(item) for item in value)
+            for token in tokenize(value):
+                terms[token] = terms.get(token, 0.0) + weight
+
+        length = sum(terms.values())
+        self._doc_terms[doc_id] = terms
+        self._doc_lengths[doc_id] = length
+        self._total_length += length
+        self.set_usage(doc_id, document.get(self.usage_field, 0))
+        for term, frequency in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                self._add_term(term)
+            postings[doc_id] = frequency
+
+    def remove(self, doc_id: str) -> bool:
+        """Remove a document from the index.
+
+        Args:
+            doc_id (str): Unique identifier of the document.
+
+        Returns:
+            bool: True if the document was indexed, False otherwise.
+        """
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return False
+        self._total_length -= self._doc_lengths.pop(doc_id)
+        del self._boosts[doc_id]
+        for term in terms:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+                self._remove_term(term)
+        return True
+
+    def set_usage(self, doc_id: str, usage: int) -> None:
+        """Update the usage count a document's ranking is lifted by.
+
+        Args:
+            doc_id (str): Unique identifier of an indexed document.
+            usage (int): Number of times the pattern has been used.
+        """
+        self._boosts[doc_id] = 1 + self.usage_weight * math.log1p(max(usage or 0, 0))
+
+    def clear(self) -> None:
+        """Remove all documents."""
+        self._postings.clear()
+        self._doc_terms.clear()
+        self._doc_lengths.clear()
+        self._boosts.clear()
+        self._total_length = 0.0
+        self._vocabulary = []
+        self._trigram_terms.clear()
+
+    def rebuild(self, documents: Dict[str, Dict[str, Any]]) -> None:
+        """Replace the index contents with the given documents.
+
+        Args:
+            documents (Dict[str, Dict[str, Any]]): Documents by ID.
+        """
+        self.clear()
+        for doc_id, document in documents.items():
+            self.add(doc_id, document)
+
+    def search(
+        self, query: str, limit: Optional[int] = None
+    ) -> List[Tuple[str, float]]:
+        """Rank the documents matching every token of a query.
+
+        A blank query matches every document, ranked by usage; a query made
+        only of punctuation matches nothing.
+
+        Args:
+            query (str): Free-text query.
+            limit (Optional[int]): Maximum number of results to return.
+
+        Returns:
+            List[Tuple[str, float]]: Document IDs and scores, best first.
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if tokens:
+            scores = self._match(tokens)
+        elif query.strip():
+            return []
+        else:
+            scores = dict.fromkeys(self._boosts, 1.0)
+        boosts = self._boosts
+        ranked = [(score * boosts[doc_id], doc_id) for doc_id, score in scores.items()]
+        if limit is None:
+            ranked.sort(reverse=True)
+        else:
+            ranked = heapq.nlargest(limit, ranked)
+        return [(doc_id, score) for score, doc_id in ranked]
+
+    def _match(self, tokens: List[str]) -> Dict[str, float]:
+        """Get the BM25 score of the documents matching all tokens."""
+        if not self._doc_terms:
+            return {}
+        # Score the most selective token first so the others only touch its hits
+        per_token = sorted(
+            (self._expand(token) for token in tokens),
+            key=lambda expansions: sum(len(self._postings[t]) for t, _ in expansions),
+        )
+        lengths = self._doc_lengths
+        average_length = self._total_length / len(self._doc_terms) or 1.0
+        k1_plus_1 = self.k1 + 1
+        norm_base = self.k1 * (1 - self.b)
+        norm_per_length = self.k1 * self.b / average_length
+
+        scores: Optional[Dict[str, float]] = None
+        for expansions in per_token:
+            token_scores: Dict[str, float] = {}
+            for term, weight in expansions:
+                postings = self._postings[term]
+                factor = weight * self._idf(len(postings)) * k1_plus_1
+                if scores is None:
+                    candidates: Iterable[Tuple[str, float]] = postings.items()
+                else:
+                    candidates = [
+                        (doc_id, postings[doc_id])
+                        for doc_id in scores
+                        if doc_id in postings
+                    ]
+                for doc_id, frequency in candidates:
+                    score = (
+                        factor
+                        * frequency
+                        / (frequency + norm_base + norm_per_length * lengths[doc_id])
+                    )
+                    # A token counts once per document, through its best match
+                    if score > token_scores.get(doc_id, 0.0):
+                        token_scores[doc_id] = score
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {
+                    doc_id: scores[doc_id] + score
+                    for doc_id, score in token_scores.items()
+                }
+            if not scores:
+                break
+        return scores
+
+    def _expand(self, token: str) -> List[Tuple[str, float]]:
+        """Get the indexed terms a query token matches, with their weights."""
+        matches: Dict[str, float] = {}
+        start = bisect.bisect_left(self._vocabulary, token)
+        for term in self._vocabulary[start:]:
+            if not term.startswith(token):
+                break
+            matches[term] = EXACT_MATCH_WEIGHT if term == token else PREFIX_MATCH_WEIGHT
+        if len(token) >= 3:
+            candidates: Optional[Set[str]] = None
+            for trigram in sorted(_trigrams(token), key=self._trigram_count):
+                terms = self._trigram_terms.get(trigram)
+                if not terms:
+                    candidates = None
+                    break
+                candidates = terms.copy() if candidates is None else candidates & terms
+            for term in candidates or ():
+                if term not in matches and token in term:
+                    matches[term] = INFIX_MATCH_WEIGHT
+        return list(matches.items())
+
+    def _trigram_count(self, trigram: str) -> int:
+        return len(self._trigram_terms.get(trigram, ()))
+
+    def _idf(self, document_frequency: int) -> float:
+        """BM25 inverse document frequency, kept positive for common terms."""
+        n = len(self._doc_terms)
+        return math.log(1 + (n - document_frequency + 0.5) / (document_frequency + 0.5))
+
+    def _add_term(self, term: str) -> None:
+        """Register a new term in the prefix and trigram lookups."""
+        bisect.insort(self._vocabulary, term)
+        for trigram in _trigrams(term):
+            self._trigram_terms.setdefault(trigram, set()).add(term)
+
+    def _remove_term(self, term: str) -> None:
+        """Drop a term no document contains any more from the lookups."""
+        position = bisect.bisect_left(self._vocabulary, term)
+        if position < len(self._vocabulary) and self._vocabulary[position] == term:
+            del self._vocabulary[position]
+        for trigram in _trigrams(term):
+            terms = self._trigram_terms.get(trigram)
+            if terms is not None:
+                terms.discard(term)
+                if not terms:
+                    del self._trigram_terms[trigram]
@@ -0,0 +1,356 @@
+"""
+Workflow Pattern Store
+
+This module persists the WorkflowPatternLibrary and its marketplace in a
+WAL-mode SQLite database with one row per pattern, so adding, rating or
+commenting on a pattern writes only that pattern instead of the whole library.
+Each row keeps a small summary (name, tags, counters, ...) next to the full
+pattern; the summaries are loaded at startup to build the search and category
+indices, while full patterns are read on first access.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from collections.abc import MutableMapping
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# Pattern fields left out of summaries; loaded only with the full pattern
+HEAVY_FIELDS = ("structure", "versions", "comments")
+
+
+def summarize(pattern: Dict[str, Any]) -> Dict[str, Any]:
+    """Get the summary fields of a pattern.
+
+    Args:
+        pattern (Dict[str, Any]): Full pattern data.
+
+    Returns:
+        Dict[str, Any]: The pattern without its heavy fields.
+    """
+    return {key: value for key, value in pattern.items() if key not in HEAVY_FIELDS}
+
+
+def _fingerprint(pattern: Dict[str, Any]) -> str:
+    """Serialize a pattern canonically, to tell whether it changed."""
+    return json.dumps(pattern, sort_keys=True, default=str)
+
+
+class PatternStore:
+    """Thread-safe SQLite storage for patterns, partitioned by scope."""
+
+    def __init__(self, db_path: str = "workflow_patterns.db"):
+        """Open the pattern database.
+
+        Args:
+            db_path (str): Path to the SQLite database for storing patterns.
+        """
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        cursor = self.conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS workflow_patterns (
+                scope TEXT NOT NULL,
+                pattern_id TEXT NOT NULL,
+                summary TEXT NOT NULL,
+                body TEXT NOT NULL,
+                updated_at TIMESTAMP,
+                PRIMARY KEY (scope, pattern_id)
+            )
+        """)
+        # Scopes that have been written at least once, so an emptied library
+        # is not mistaken for a new one
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS workflow_pattern_scopes (
+                scope TEXT PRIMARY KEY,
+                created_at TIMESTAMP
+            )
+        """)
+        # Modification time of the JSON file each scope was last imported from
+        # or exported to, so edits made to the file later are noticed
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS workflow_pattern_sources (
+                scope TEXT PRIMARY KEY,
+                mtime REAL NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    def has_scope(self, scope: str) -> bool:
+        """Check whether a scope has ever been written.
+
+        Args:
+            scope (str): Name of the pattern collection.
+
+        Returns:
+            bool: True if the scope exists, False otherwise.
+        """
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT 1 FROM workflow_pattern_scopes WHERE scope = ?", (scope,)
+            ).fetchone()
+        return row is not None
+
+    def source_mtime(self, scope: str) -> Optional[float]:
+        """Get the modification time of the JSON file a scope was synced with.
+
+        Args:
+            scope (str): Name of the pattern collection.
+
+        Returns:
+            Optional[float]: The file's mtime, or None if never synced.
+        """
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT mtime FROM workflow_pattern_sources WHERE scope = ?", (scope,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_source_mtime(self, scope: str, mtime: float) -> None:
+        """Record the modification time of the JSON file a scope was synced with.
+
+        Args:
+            scope (str): Name of the pattern collection.
+            mtime (float): The file's mtime.
+        """
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO workflow_pattern_sources VALUES (?, ?)",
+                (scope, mtime),
+            )
+            self.conn.commit()
+
+    def load_summaries(self, scope: str) -> Dict[str, Dict[str, Any]]:
+        """Get the summaries of all patterns of a scope.
+
+        Args:
+            scope (str): Name of the pattern collection.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Summary by pattern ID.
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT pattern_id, summary FROM workflow_patterns WHERE scope = ?",
+                (scope,),
+            ).fetchall()
+        return {pattern_id: json.loads(summary) for pattern_id, summary in rows}
+
+    def load(self, scope: str, pattern_id: str) -> Optional[Dict[str, Any]]:
+        """Get a full pattern.
+
+        Args:
+            scope (str): Name of the pattern collection.
+            pattern_id (str): Unique identifier of the pattern.
+
+        Returns:
+            Optional[Dict[str, Any]]: The pattern if stored, None otherwise.
+        """
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT body FROM workflow_patterns WHERE scope = ? AND pattern_id = ?",
+                (scope, pattern_id),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def write(
+        self,
+        scope: str,
+        patterns: Iterable[Tuple[str, Dict[str, Any]]] = (),
+        deleted: Iterable[str] = (),
+        replace: bool = False,
+    ) -> None:
+        """Store and delete patterns in one transaction.
+
+        Args:
+            scope (str): Name of the pattern collection.
+            patterns (Iterable[Tuple[str, Dict[str, Any]]]): Pattern IDs and
+                full patterns to store.
+            deleted (Iterable[str]): IDs of patterns to delete.
+            replace (bool): Delete all other patterns of the scope first.
+        """
+        now = datetime.now()
+        rows = [
+            (
+                scope,
+                pattern_id,
+                json.dumps(summarize(pattern)),
+                json.dumps(pattern),
+                now,
+            )
+            for pattern_id, pattern in patterns
+        ]
+        with self._lock:
+            try:
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO workflow_pattern_scopes VALUES (?, ?)",
+                    (scope, now),
+                )
+                if replace:
+                    self.conn.execute(
+                        "DELETE FROM workflow_patterns WHERE scope = ?", (scope,)
+                    )
+                self.conn.executemany(
+                    "DELETE FROM workflow_patterns WHERE scope = ? AND pattern_id = ?",
+                    [(scope, pattern_id) for pattern_id in deleted],
+                )
+                self.conn.executemany(
+                    """
+                    INSERT OR REPLACE INTO workflow_patterns
+                        (scope, pattern_id, summary, body, updated_at)
+                    VALUES (?, ?, ?, ?, ?)
+                """,
+                    rows,
+                )
+                self.conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Failed to write {scope} patterns: {e}")
+                self.conn.rollback()
+                raise
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+
+class PatternCollection(MutableMapping):
+    """Dict-like view of the patterns of one scope in a PatternStore.
+
+    Full patterns are read from the store on first access and cached.
+    Changes, including in-place edits of a pattern returned by the
+    collection, stay in memory until ``save`` or ``save_all`` is called.
+    ``save_all`` only writes patterns that differ from what was last read
+    or written, so reading patterns never causes writes.
+    """
+
+    def __init__(self, store: PatternStore, scope: str):
+        """Load the pattern summaries of a scope.
+
+        Args:
+            store (PatternStore): Store holding the patterns.
+            scope (str): Name of the pattern collection.
+        """
+        self.store = store
+        self.scope = scope
+        self._summaries = store.load_summaries(scope)
+        self._patterns: Dict[str, Dict[str, Any]] = {}
+        self._deleted: Set[str] = set()
+        # Fingerprint of each loaded pattern as stored; missing means changed
+        self._stored: Dict[str, str] = {}
+
+    def __getitem__(self, pattern_id: str) -> Dict[str, Any]:
+        pattern = self._patterns.get(pattern_id)
+        if pattern is None:
+            if pattern_id not in self._summaries:
+                raise KeyError(pattern_id)
+            pattern = self.store.load(self.scope, pattern_id)
+            if pattern is None:
+                raise KeyError(pattern_id)
+            self._patterns[pattern_id] = pattern
+            self._stored[pattern_id] = _fingerprint(pattern)
+        return pattern
+
+    def __setitem__(self, pattern_id: str, pattern: Dict[str, Any]) -> None:
+        self._patterns[pattern_id] = pattern
+        self._summaries[pattern_id] = summarize(pattern)
+        self._deleted.discard(pattern_id)
+        self._stored.pop(pattern_id, None)
+
+    def __delitem__(self, pattern_id: str) -> None:
+        del self._summaries[pattern_id]
+        self._patterns.pop(pattern_id, None)
+        self._stored.pop(pattern_id, None)
+        self._deleted.add(pattern_id)
+
+    def __contains__(self, pattern_id: object) -> bool:
+        return pattern_id in self._summaries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._summaries))
+
+    def __len__(self) -> int:
+        return len(self._summaries)
+
+    def summary(self, pattern_id: str) -> Dict[str, Any]:
+        """Get the summary fields of a pattern without loading it.
+
+        Args:
+            pattern_id (str): Unique identifier of the pattern.
+
+        Returns:
+            Dict[str, Any]: The pattern if already loaded, its summary otherwise.
+        """
+        pattern = self._patterns.get(pattern_id)
+        return pattern if pattern is not None else self._summaries[pattern_id]
+
+    def summaries(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Get the summary fields of all patterns without loading them.
+
+        Returns:
+            List[Tuple[str, Dict[str, Any]]]: Pattern IDs and summaries.
+        """
+        return [(pattern_id, self.summary(pattern_id)) for pattern_id in self]
+
+    def save(self, pattern_id: str) -> None:
+        """Write one pattern, or its deletion, to the store.
+
+        Args:
+            pattern_id (str): Unique identifier of the pattern.
+        """
+        if pattern_id in self._deleted:
+            self.store.write(self.scope, deleted=[pattern_id])
+            self._deleted.discard(pattern_id)
+            return
+        pattern = self._patterns.get(pattern_id)
+        if pattern is None:
+            return  # Never loaded, so unchanged
+        self.store.write(self.scope, [(pattern_id, pattern)])
+        self._summaries[pattern_id] = summarize(pattern)
+        self._stored[pattern_id] = _fingerprint(pattern)
+
+    def save_all(self) -> None:
+        """Write every changed pattern and all deletions to the store."""
+        changed = []
+        for pattern_id, pattern in self._patterns.items():
+            fingerprint = _fingerprint(pattern)
+            if self._stored.get(pattern_id) != fingerprint:
+                changed.append((pattern_id, pattern, fingerprint))
+        if not changed and not self._deleted:
+            return
+        self.store.write(
+            self.scope,
+            [(pattern_id, pattern) for pattern_id, pattern, _ in changed],
+            self._deleted,
+        )
+        self._deleted.clear()
+        for pattern_id, pattern, fingerprint in changed:
+            self._summaries[pattern_id] = summarize(pattern)
+            self._stored[pattern_id] = fingerprint
+
+    def replace(self, patterns: Dict[str, Dict[str, Any]]) -> None:
+        """Replace all patterns of the scope, in memory and in the store.
+
+        Args:
+            patterns (Dict[str, Dict[str, Any]]): New patterns by ID.
+        """
+        self.store.write(self.scope, patterns.items(), replace=True)
+        self._summaries = {
+            pattern_id: summarize(pattern) for pattern_id, pattern in patterns.items()
+        }
+        self._patterns = {}
+        self._deleted = set()
+        self._stored = {}
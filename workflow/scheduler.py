@@ -0,0 +1,345 @@
+"""
+Workflow Trigger Scheduler
+
+This module provides a single-threaded timer scheduler for workflow triggers.
+All timers live in one heap serviced by one thread, and callbacks run on a
+bounded worker pool, so the number of threads does not grow with the number
+of triggers. Condition checks that share an interval are coalesced into one
+timer.
+"""
+
+import heapq
+import itertools
+import logging
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# Missed-fire policies, applied when a timer fires later than the grace time
+MISFIRE_FIRE_ONCE = "fire_once"  # Run once for all missed occurrences
+MISFIRE_FIRE_ALL = "fire_all"  # Run once per missed occurrence
+MISFIRE_SKIP = "skip"  # Do not run; wait for the next occurrence
+MISFIRE_POLICIES = (MISFIRE_FIRE_ONCE, MISFIRE_FIRE_ALL, MISFIRE_SKIP)
+
+
+class ScheduledTimer:
+    """Handle of a timer registered with a TriggerScheduler."""
+
+    def __init__(
+        self,
+        callback: Callable[[], None],
+        due: float,
+        interval: Optional[float],
+        jitter: float,
+        misfire_policy: str,
+        name: str,
+    ):
+        self.callback = callback
+        self.due = due
+        self.interval = interval
+        self.jitter = jitter
+        self.misfire_policy = misfire_policy
+        self.name = name
+        self.cancelled = False
+        self.in_heap = False
+        self.running = False
+        self.fire_count = 0
+        self.misfire_count = 0
+
+    def cancel(self) -> None:
+        """Cancel the timer; a run already in progress is not interrupted."""
+        self.cancelled = True
+
+
+class _ConditionGroup:
+    """Condition triggers that share a check interval."""
+
+    def __init__(self):
+        self.triggers: Dict[str, object] = {}
+        self.timer: Optional[ScheduledTimer] = None
+
+
+class TriggerScheduler:
+    """Runs trigger timers from one heap on a single scheduler thread."""
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        misfire_grace: float = 1.0,
+        jitter: float = 0.0,
+        condition_batch_size: int = 256,
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            max_workers (int): Number of threads running trigger callbacks.
+            misfire_grace (float): Seconds a timer may fire late before its
+                missed-fire policy applies.
+            jitter (float): Default maximum random delay in seconds added to
+                each firing, to spread out timers due at the same moment.
+            condition_batch_size (int): Number of coalesced condition checks
+                run per worker task.
+        """
+        self.max_workers = max_workers
+        self.misfire_grace = misfire_grace
+        self.jitter = jitter
+        self.condition_batch_size = condition_batch_size
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.thread: Optional[threading.Thread] = None
+        self.running = False
+        self._heap: List[tuple] = []
+        self._counter = itertools.count()
+        self._cancelled = 0
+        self._condition = threading.Condition()
+        self._condition_groups: Dict[float, _ConditionGroup] = {}
+
+    def start(self) -> None:
+        """Start the scheduler thread and worker pool if not already running."""
+        with self._condition:
+            if self.running:
+                return
+            self.running = True
+            self.executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="TriggerWorker"
+            )
+            self.thread = threading.Thread(
+                target=self._run, name="TriggerScheduler", daemon=True
+            )
+            self.thread.start()
+        logger.info(f"Started trigger scheduler with {self.max_workers} workers")
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the scheduler thread and worker pool.
+
+        Args:
+            wait (bool): Wait for running callbacks to finish.
+        """
+        with self._condition:
+            if not self.running:
+                return
+            self.running = False
+            self._condition.notify()
+        self.thread.join()
+        self.executor.shutdown(wait=wait)
+        self.thread = None
+        self.executor = None
+        logger.info("Stopped trigger scheduler")
+
+    def schedule(
+        self,
+        callback: Callable[[], None],
+        delay: float = 0.0,
+        interval: Optional[float] = None,
+        jitter: Optional[float] = None,
+        misfire_policy: str = MISFIRE_FIRE_ONCE,
+        name: str = "",
+    ) -> ScheduledTimer:
+        """Register a one-shot or repeating timer.
+
+        Args:
+            callback (Callable[[], None]): Function to run on the worker pool.
+            delay (float): Seconds until the first firing.
+            interval (Optional[float]): If provided, repeat every this many seconds.
+            jitter (Optional[float]): Maximum random delay in seconds added to each
+                firing; defaults to the scheduler's jitter.
+            misfire_policy (str): One of ``MISFIRE_POLICIES``.
+            name (str): Name used in log messages.
+
+        Returns:
+            ScheduledTimer: Handle to cancel the timer with.
+        """
+        if interval is not None and interval <= 0:
+            raise ValueError("Timer interval must be positive")
+        if misfire_policy not in MISFIRE_POLICIES:
+            raise ValueError(f"Unknown missed-fire policy: {misfire_policy}")
+
+        timer = ScheduledTimer(
+            callback,
+            time.time() + max(delay, 0.0),
+            interval,
+            self.jitter if jitter is None else jitter,
+            misfire_policy,
+            name,
+        )
+        self.start()
+        self._push(timer)
+        return timer
+
+    def cancel(self, timer: ScheduledTimer) -> None:
+        """Cancel a timer.
+
+        Cancelled timers are dropped lazily when they reach the top of the heap;
+        the heap is rebuilt once they make up most of it.
+
+        Args:
+            timer (ScheduledTimer): Handle returned by ``schedule``.
+        """
+        with self._condition:
+            if timer.cancelled:
+                return
+            timer.cancel()
+            if not timer.in_heap:
+                return  # Firing or already fired; it will not be pushed again
+            self._cancelled += 1
+            if self._cancelled > 64 and self._cancelled * 2 > len(self._heap):
+                self._heap = [item for item in self._heap if not item[2].cancelled]
+                heapq.heapify(self._heap)
+                self._cancelled = 0
+
+    def add_condition(self, trigger) -> None:
+        """Check a condition trigger together with others of the same interval.
+
+        Args:
+            trigger (ConditionBasedTrigger): Trigger whose condition to check.
+        """
+        with self._condition:
+            interval = trigger.check_interval
+            group = self._condition_groups.get(interval)
+            if group is None:
+                group = self._condition_groups[interval] = _ConditionGroup()
+            group.triggers[trigger.trigger_id] = trigger
+            if group.timer is None:
+                group.timer = self.schedule(
+                    lambda: self._check_conditions(interval),
+                    delay=0.0,
+                    interval=interval,
+                    misfire_policy=MISFIRE_FIRE_ONCE,
+                    name=f"conditions@{interval}s",
+                )
+
+    def remove_condition(self, trigger) -> None:
+        """Stop checking a condition trigger.
+
+        Args:
+            trigger (ConditionBasedTrigger): Trigger to remove.
+        """
+        with self._condition:
+            group = self._condition_groups.get(trigger.check_interval)
+            if group is None:
+                return
+            group.triggers.pop(trigger.trigger_id, None)
+            if not group.triggers:
+                self.cancel(group.timer)
+                del self._condition_groups[trigger.check_interval]
+
+    def pending_count(self) -> int:
+        """Get the number of active timers.
+
+        Returns:
+            int: Timers that are scheduled and not cancelled.
+        """
+        with self._condition:
+            return len(self._heap) - self._cancelled
+
+    def _push(self, timer: ScheduledTimer) -> None:
+        """Add a timer to the heap at its due time plus jitter."""
+        fire_at = timer.due + (random.uniform(0, timer.jitter) if timer.jitter else 0)
+        with self._condition:
+            if timer.cancelled:
+                return
+            timer.in_heap = True
+            heapq.heappush(self._heap, (fire_at, next(self._counter), timer))
+            if self._heap[0][2] is timer:
+                self._condition.notify()
+
+    def _run(self) -> None:
+        """Scheduler thread: fire due timers until shut down."""
+        while True:
+            with self._condition:
+                if not self.running:
+                    return
+                if not self._heap:
+                    self._condition.wait()
+                    continue
+                fire_at, _, timer = self._heap[0]
+                now = time.time()
+                if fire_at > now:
+                    self._condition.wait(fire_at - now)
+                    continue
+                heapq.heappop(self._heap)
+                timer.in_heap = False
+                if timer.cancelled:
+                    self._cancelled -= 1
+                    continue
+            self._fire(timer, now)
+
+    def _fire(self, timer: ScheduledTimer, now: float) -> None:
+        """Run a due timer according to its missed-fire policy and reschedule it."""
+        late = now - timer.due > self.misfire_grace
+        if late:
+            timer.misfire_count += 1
+        # Only catch-up timers may queue a run behind one still in progress
+        overlapping = timer.running and timer.misfire_policy != MISFIRE_FIRE_ALL
+        skip = (late and timer.misfire_policy == MISFIRE_SKIP) or overlapping
+        if overlapping:
+            logger.warning(f"Timer {timer.name} still running; skipping this firing")
+        if not skip:
+            timer.running = True
+            timer.fire_count += 1
+            self.executor.submit(self._run_callback, timer)
+
+        if timer.interval is None:
+            return
+        if late and timer.misfire_policy != MISFIRE_FIRE_ALL:
+            # Move to the first occurrence after now, dropping the missed ones
+            missed = math.floor((now - timer.due) / timer.interval) + 1
+            timer.due += missed * timer.interval
+        else:
+            timer.due += timer.interval
+        self._push(timer)
+
+    def _run_callback(self, timer: ScheduledTimer) -> None:
+        """Run a timer callback on a worker thread."""
+        try:
+            timer.callback()
+        except Exception as e:
+            logger.error(f"Error in scheduled callback {timer.name}: {e}")
+        finally:
+            timer.running = False
+
+    def _check_conditions(self, interval: float) -> None:
+        """Check the conditions of one interval group, in batches on the pool."""
+        with self._condition:
+            group = self._condition_groups.get(interval)
+            triggers = list(group.triggers.values()) if group else []
+        batches = [
+            triggers[i : i + self.condition_batch_size]
+            for i in range(0, len(triggers), self.condition_batch_size)
+        ]
+        # This call already holds one worker; run the first batch here
+        for batch in batches[1:]:
+            self.executor.submit(self._check_batch, batch)
+        if batches:
+            self._check_batch(batches[0])
+
+    @staticmethod
+    def _check_batch(triggers: list) -> None:
+        """Check a batch of condition triggers."""
+        for trigger in triggers:
+            trigger.check()
+
+
+_default_scheduler: Optional[TriggerScheduler] = None
+_default_scheduler_lock = threading.Lock()
+
+
+def get_default_scheduler() -> TriggerScheduler:
+    """Get the scheduler shared by triggers that were not given one.
+
+    Returns:
+        TriggerScheduler: The process-wide scheduler, created on first use.
+    """
+    global _default_scheduler
+    with _default_scheduler_lock:
+        if _default_scheduler is None:
+            _default_scheduler = TriggerScheduler()
+        return _default_scheduler
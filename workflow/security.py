@@ -5,14 +5,20 @@ This module implements security features for workflow automation,
 including access control, encryption, and audit logging.
 """
 
+import base64
+import functools
 import hashlib
 import hmac
 import json
 import logging
 import os
 import secrets
+import struct
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from types import SimpleNamespace
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional
 
 # Configure logging
 logging.basicConfig(
@@ -113,16 +119,64 @@ class AccessControl:
         logger.info(f"Updated permissions for role {role_name} to {permissions}")
 
 
-class EncryptionManager:
-    """Manages encryption and decryption of sensitive workflow data."""
+@functools.lru_cache(maxsize=None)
+def _crypto() -> SimpleNamespace:
+    """Import the cryptography primitives once.
+
+    Raises:
+        ImportError: If the cryptography library is not installed.
+    """
+    from cryptography.exceptions import InvalidTag
+    from cryptography.fernet import Fernet, InvalidToken
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+    from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+    from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+    return SimpleNamespace(
+        AESGCM=AESGCM,
+        Fernet=Fernet,
+        HKDF=HKDF,
+        InvalidTag=InvalidTag,
+        InvalidToken=InvalidToken,
+        PBKDF2HMAC=PBKDF2HMAC,
+        hashes=hashes,
+    )
+
 
-    def __init__(self, key: Optional[bytes] = None):
+class EncryptionManager:
+    """Manages encryption and decryption of sensitive workflow data.
+
+    The expensive PBKDF2 derivation runs once per key salt and its result is
+    cached. Every message (or stream) also gets a random salt, which HKDF
+    combines with the cached key into a per-message key. Both salts travel in
+    a versioned header, so any manager holding the same key can decrypt.
+
+    Token format: ``v1.<base64 key salt + message salt>.<Fernet token>``.
+    Tokens without a header, written by earlier versions with a static salt,
+    are still decrypted.
+    """
+
+    KDF_ITERATIONS = 100000
+    SALT_SIZE = 16
+    LEGACY_SALT = b"static_salt"
+    TOKEN_VERSION = b"v1"
+    STREAM_MAGIC = b"AWES\x01"
+    STREAM_CHUNK_SIZE = 64 * 1024
+    _RECORD_HEADER = struct.Struct(">BI")  # Final flag, ciphertext length
+
+    def __init__(self, key: Optional[bytes] = None, max_cached_keys: int = 32):
         """Initialize encryption manager with a key.
 
         Args:
             key (Optional[bytes]): Encryption key, if None, a new key is generated.
+            max_cached_keys (int): Number of derived keys kept, one per key salt.
         """
         self.key = key or secrets.token_bytes(32)  # 256-bit key for AES
+        self.max_cached_keys = max_cached_keys
+        self.key_salt = secrets.token_bytes(self.SALT_SIZE)
+        self._derived_keys: "OrderedDict[bytes, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
         logger.info("Encryption manager initialized")
 
     def encrypt_data(self, data: str) -> bytes:
@@ -132,26 +186,12 @@ class EncryptionManager:
             data (str): Data to encrypt.
 
         Returns:
-            bytes: Encrypted data with nonce.
+            bytes: Versioned token holding the salts and the encrypted data.
         """
         try:
-            import base64
-
-            from cryptography.fernet import Fernet
-            from cryptography.hazmat.primitives import hashes
-            from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-
-            # Derive a Fernet key from the provided key
-            salt = b"static_salt"  # In production, use a random salt per encryption
-            kdf = PBKDF2HMAC(
-                algorithm=hashes.SHA256(), length=32, salt=salt, iterations=100000
-            )
-            key = base64.urlsafe_b64encode(kdf.derive(self.key))
-            f = Fernet(key)
-
-            encrypted = f.encrypt(data.encode())
-            logger.info("Data encrypted successfully")
-            return encrypted
+            token = self._encrypt(data.encode())
+            logger.debug("Data encrypted successfully")
+            return token
         except ImportError:
             logger.warning(
                 "Cryptography library not available, using placeholder encryption"
@@ -168,28 +208,208 @@ class EncryptionManager:
             str: Decrypted data.
         """
         try:
-            import base64
+            decrypted = self._decrypt(encrypted_data).decode()
+            logger.debug("Data decrypted successfully")
+            return decrypted
+        except ImportError:
+            logger.warning(
+                "Cryptography library not available, using placeholder decryption"
+            )
+            return encrypted_data.decode().replace("encrypted_", "")
+
+    def encrypt_batch(self, items: Iterable[str]) -> List[bytes]:
+        """Encrypt several values, each with its own message salt.
 
-            from cryptography.fernet import Fernet
-            from cryptography.hazmat.primitives import hashes
-            from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+        Args:
+            items (Iterable[str]): Data to encrypt.
 
-            # Derive a Fernet key from the provided key
-            salt = b"static_salt"  # Must match the salt used in encrypt_data
-            kdf = PBKDF2HMAC(
-                algorithm=hashes.SHA256(), length=32, salt=salt, iterations=100000
+        Returns:
+            List[bytes]: Tokens in the order of the items.
+        """
+        items = list(items)
+        try:
+            tokens = [self._encrypt(item.encode()) for item in items]
+        except ImportError:
+            logger.warning(
+                "Cryptography library not available, using placeholder encryption"
             )
-            key = base64.urlsafe_b64encode(kdf.derive(self.key))
-            f = Fernet(key)
+            return [f"encrypted_{item}".encode() for item in items]
+        logger.debug(f"Encrypted {len(tokens)} items")
+        return tokens
 
-            decrypted = f.decrypt(encrypted_data).decode()
-            logger.info("Data decrypted successfully")
-            return decrypted
+    def decrypt_batch(self, tokens: Iterable[bytes]) -> List[str]:
+        """Decrypt several tokens.
+
+        Args:
+            tokens (Iterable[bytes]): Tokens returned by ``encrypt_data`` or
+                ``encrypt_batch``.
+
+        Returns:
+            List[str]: Decrypted data in the order of the tokens.
+        """
+        tokens = list(tokens)
+        try:
+            items = [self._decrypt(token).decode() for token in tokens]
         except ImportError:
             logger.warning(
                 "Cryptography library not available, using placeholder decryption"
             )
-            return encrypted_data.decode().replace("encrypted_", "")
+            return [token.decode().replace("encrypted_", "") for token in tokens]
+        logger.debug(f"Decrypted {len(items)} items")
+        return items
+
+    def encrypt_stream(
+        self, source: BinaryIO, chunk_size: Optional[int] = None
+    ) -> Iterator[bytes]:
+        """Encrypt a large payload chunk by chunk.
+
+        Each chunk is sealed with AES-GCM under a per-stream key. The chunk
+        index and a final-chunk flag are authenticated, so reordered, dropped
+        or truncated chunks fail to decrypt.
+
+        Args:
+            source (BinaryIO): Readable binary file-like object.
+            chunk_size (Optional[int]): Plaintext bytes per chunk.
+
+        Yields:
+            bytes: The stream header, then one encrypted record per chunk.
+
+        Raises:
+            RuntimeError: If the cryptography library is not installed.
+        """
+        crypto = self._require_crypto()
+        chunk_size = chunk_size or self.STREAM_CHUNK_SIZE
+        message_salt = secrets.token_bytes(self.SALT_SIZE)
+        aead = crypto.AESGCM(self._message_key(self.key_salt, message_salt, b"stream"))
+        yield self.STREAM_MAGIC + self.key_salt + message_salt
+
+        index = 0
+        chunk = source.read(chunk_size)
+        while True:
+            following = source.read(chunk_size)
+            final = not following
+            ciphertext = aead.encrypt(
+                self._nonce(index), chunk, self._RECORD_HEADER.pack(final, index)
+            )
+            yield self._RECORD_HEADER.pack(final, len(ciphertext)) + ciphertext
+            if final:
+                return
+            chunk = following
+            index += 1
+
+    def decrypt_stream(self, source: BinaryIO) -> Iterator[bytes]:
+        """Decrypt a payload written by ``encrypt_stream``, chunk by chunk.
+
+        Args:
+            source (BinaryIO): Readable binary file-like object.
+
+        Yields:
+            bytes: Decrypted chunks.
+
+        Raises:
+            ValueError: If the stream is malformed, truncated or tampered with.
+            RuntimeError: If the cryptography library is not installed.
+        """
+        crypto = self._require_crypto()
+        header_size = len(self.STREAM_MAGIC) + 2 * self.SALT_SIZE
+        header = source.read(header_size)
+        if len(header) < header_size or not header.startswith(self.STREAM_MAGIC):
+            raise ValueError("Not an encrypted workflow stream")
+        key_salt = header[len(self.STREAM_MAGIC) : -self.SALT_SIZE]
+        message_salt = header[-self.SALT_SIZE :]
+        aead = crypto.AESGCM(self._message_key(key_salt, message_salt, b"stream"))
+
+        index = 0
+        while True:
+            record = source.read(self._RECORD_HEADER.size)
+            if len(record) < self._RECORD_HEADER.size:
+                raise ValueError("Encrypted stream is truncated")
+            final, length = self._RECORD_HEADER.unpack(record)
+            ciphertext = source.read(length)
+            if len(ciphertext) < length:
+                raise ValueError("Encrypted stream is truncated")
+            try:
+                yield aead.decrypt(
+                    self._nonce(index),
+                    ciphertext,
+                    self._RECORD_HEADER.pack(final, index),
+                )
+            except crypto.InvalidTag as e:
+                raise ValueError(f"Encrypted stream chunk {index} is invalid") from e
+            if final:
+                return
+            index += 1
+
+    def _encrypt(self, plaintext: bytes) -> bytes:
+        """Encrypt bytes into a versioned token."""
+        crypto = _crypto()
+        message_salt = secrets.token_bytes(self.SALT_SIZE)
+        key = self._message_key(self.key_salt, message_salt, b"token")
+        salts = base64.urlsafe_b64encode(self.key_salt + message_salt)
+        token = crypto.Fernet(base64.urlsafe_b64encode(key)).encrypt(plaintext)
+        return b".".join((self.TOKEN_VERSION, salts, token))
+
+    def _decrypt(self, token: bytes) -> bytes:
+        """Decrypt a versioned or legacy token."""
+        crypto = _crypto()
+        version, _, rest = token.partition(b".")
+        if version == self.TOKEN_VERSION:
+            salts, _, token = rest.partition(b".")
+            salts = base64.urlsafe_b64decode(salts)
+            key = self._message_key(
+                salts[: self.SALT_SIZE], salts[self.SALT_SIZE :], b"token"
+            )
+        else:
+            # Headerless token from before salts were stored
+            key = self._derive_key(self.LEGACY_SALT)
+        return crypto.Fernet(base64.urlsafe_b64encode(key)).decrypt(token)
+
+    def _derive_key(self, key_salt: bytes) -> bytes:
+        """Get the PBKDF2 key for a salt, deriving it only once."""
+        with self._lock:
+            key = self._derived_keys.get(key_salt)
+            if key is not None:
+                self._derived_keys.move_to_end(key_salt)
+                return key
+        crypto = _crypto()
+        key = crypto.PBKDF2HMAC(
+            algorithm=crypto.hashes.SHA256(),
+            length=32,
+            salt=key_salt,
+            iterations=self.KDF_ITERATIONS,
+        ).derive(self.key)
+        with self._lock:
+            self._derived_keys[key_salt] = key
+            while len(self._derived_keys) > self.max_cached_keys:
+                self._derived_keys.popitem(last=False)
+        return key
+
+    def _message_key(
+        self, key_salt: bytes, message_salt: bytes, purpose: bytes
+    ) -> bytes:
+        """Derive the key of one message from the cached key with HKDF."""
+        crypto = _crypto()
+        return crypto.HKDF(
+            algorithm=crypto.hashes.SHA256(),
+            length=32,
+            salt=message_salt,
+            info=b"workflow-encryption-" + purpose,
+        ).derive(self._derive_key(key_salt))
+
+    @staticmethod
+    def _nonce(index: int) -> bytes:
+        """AES-GCM nonce of a stream chunk; each stream has its own key."""
+        return index.to_bytes(12, "big")
+
+    @staticmethod
+    def _require_crypto() -> SimpleNamespace:
+        """Get the cryptography primitives, which streaming cannot do without."""
+        try:
+            return _crypto()
+        except ImportError as e:
+            raise RuntimeError(
+                "cryptography is required for streaming encryption"
+            ) from e
 
     def hash_sensitive_data(self, data: str) -> str:
         """Create a secure hash of sensitive data.
@@ -0,0 +1,374 @@
+"""
+Workflow State Store
+
+This module persists workflow state for the WorkflowEngine. State changes are
+stored as per-step delta rows in a WAL-mode SQLite database and written in
+batches (group commit), so long workflows do not pay for an fsync and a full
+state rewrite on every step. Completed steps are journaled with their outputs
+so an interrupted workflow can resume without re-running them.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import zlib
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import msgpack
+
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+class WorkflowStateStore:
+    """Thread-safe, batched store for workflow state.
+
+    The full state of a workflow is written once when it starts. Every later
+    update only records the top-level keys that changed since the previous
+    update. Updates are buffered and committed together once ``commit_every``
+    of them are pending or ``commit_interval`` seconds have passed since the
+    oldest one, whichever comes first. Up to that many updates can be lost on a
+    crash; call ``flush()`` to make them durable immediately.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "workflow_state.db",
+        commit_every: int = 20,
+        commit_interval: float = 1.0,
+    ):
+        """Open the state database.
+
+        Args:
+            db_path (str): Path to the SQLite database for storing workflow state.
+            commit_every (int): Number of pending updates that triggers a commit;
+                1 commits every update.
+            commit_interval (float): Maximum time in seconds an update stays
+                pending before it is committed.
+        """
+        self.db_path = db_path
+        self.commit_every = max(1, commit_every)
+        self.commit_interval = commit_interval
+        self._lock = threading.RLock()
+        # (workflow_id, state delta, removed keys)
+        self._pending: List[Tuple[str, Dict[str, Any], List[str]]] = []
+        self._timer: Optional[threading.Timer] = None
+        # Last state seen per workflow, used to compute deltas
+        self._snapshots: Dict[str, Dict[str, Any]] = {}
+
+        # The parallel executor updates state from its worker threads
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        cursor = self.conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS workflow_state (
+                workflow_id TEXT PRIMARY KEY,
+                state TEXT NOT NULL,
+                last_updated TIMESTAMP
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS workflow_state_delta (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                workflow_id TEXT NOT NULL,
+                delta TEXT NOT NULL,
+                removed TEXT NOT NULL,
+                created_at TIMESTAMP
+            )
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_workflow_state_delta_workflow
+            ON workflow_state_delta (workflow_id, seq)
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS workflow_step_journal (
+                workflow_id TEXT NOT NULL,
+                step_key TEXT NOT NULL,
+                codec TEXT NOT NULL,
+                output BLOB NOT NULL,
+                created_at TIMESTAMP,
+                PRIMARY KEY (workflow_id, step_key)
+            )
+        """)
+        self.conn.commit()
+
+    def start(self, workflow_id: str, state: Dict[str, Any]) -> None:
+        """Write the full initial state of a workflow, replacing any earlier run.
+
+        Args:
+            workflow_id (str): Unique identifier for the workflow.
+            state (Dict[str, Any]): Initial state of the workflow.
+        """
+        with self._lock:
+            self._drop_pending(workflow_id)
+            self.conn.execute(
+                "DELETE FROM workflow_step_journal WHERE workflow_id = ?",
+                (workflow_id,),
+            )
+            self._write_base(workflow_id, state)
+            self._snapshots[workflow_id] = dict(state)
+
+    def update(
+        self,
+        workflow_id: str,
+        state: Dict[str, Any],
+        changed_keys: Optional[Iterable[str]] = None,
+    ) -> None:
+        """Record the changes of a workflow's state since the previous update.
+
+        Values are compared at the top level only; pass ``changed_keys`` when a
+        nested value was modified in place.
+
+        Args:
+            workflow_id (str): Unique identifier for the workflow.
+            state (Dict[str, Any]): Current state of the workflow.
+            changed_keys (Optional[Iterable[str]]): Keys known to have changed;
+                other keys are not compared.
+        """
+        with self._lock:
+            snapshot = self._snapshots.setdefault(workflow_id, {})
+            if changed_keys is not None:
+                keys = [key for key in changed_keys if key in state]
+                removed = [
+                    key for key in changed_keys if key not in state and key in snapshot
+                ]
+            else:
+                keys = [
+                    key
+                    for key, value in state.items()
+                    if key not in snapshot or snapshot[key] != value
+                ]
+                removed = [key for key in snapshot if key not in state]
+            if not keys and not removed:
+                return
+
+            delta = {key: state[key] for key in keys}
+            snapshot.update(delta)
+            for key in removed:
+                del snapshot[key]
+            self._pending.append((workflow_id, delta, removed))
+
+            if len(self._pending) >= self.commit_every:
+                self.flush()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.commit_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        """Commit all pending updates."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, []
+            now = datetime.now()
+            try:
+                self.conn.executemany(
+                    """
+                    INSERT INTO workflow_state_delta (workflow_id, delta, removed, created_at)
+                    VALUES (?, ?, ?, ?)
+                """,
+                    [
+                        (workflow_id, json.dumps(delta), json.dumps(removed), now)
+                        for workflow_id, delta, removed in pending
+                    ],
+                )
+                self.conn.executemany(
+                    "UPDATE workflow_state SET last_updated = ? WHERE workflow_id = ?",
+                    [(now, workflow_id) for workflow_id in {p[0] for p in pending}],
+                )
+                self.conn.commit()
+                logger.debug(f"Committed {len(pending)} workflow state updates")
+            except sqlite3.Error as e:
+                logger.error(f"Failed to commit workflow state updates: {e}")
+                self.conn.rollback()
+                raise
+
+    def rollback(self) -> None:
+        """Roll back the open transaction, never in the middle of a flush."""
+        with self._lock:
+            if self.conn is not None:
+                self.conn.rollback()
+
+    def load(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        """Rebuild a workflow's state from its initial state and deltas.
+
+        The rebuilt state is written back as the new initial state so the
+        deltas do not have to be replayed again.
+
+        Args:
+            workflow_id (str): Unique identifier of the workflow.
+
+        Returns:
+            Optional[Dict[str, Any]]: The state if the workflow exists, None otherwise.
+        """
+        with self._lock:
+            self.flush()
+            cursor = self.conn.cursor()
+            cursor.execute(
+                "SELECT state FROM workflow_state WHERE workflow_id = ?", (workflow_id,)
+            )
+            row = cursor.fetchone()
+            if not row:
+                return None
+            state = json.loads(row[0])
+
+            cursor.execute(
+                """
+                SELECT delta, removed FROM workflow_state_delta
+                WHERE workflow_id = ? ORDER BY seq
+            """,
+                (workflow_id,),
+            )
+            deltas = cursor.fetchall()
+            for delta, removed in deltas:
+                state.update(json.loads(delta))
+                for key in json.loads(removed):
+                    state.pop(key, None)
+            if deltas:
+                self._write_base(workflow_id, state)
+            self._snapshots[workflow_id] = dict(state)
+            return state
+
+    def delete(self, workflow_id: str) -> None:
+        """Remove all stored state of a workflow.
+
+        Args:
+            workflow_id (str): Unique identifier of the workflow.
+        """
+        with self._lock:
+            self._drop_pending(workflow_id)
+            self._snapshots.pop(workflow_id, None)
+            try:
+                self.conn.execute(
+                    "DELETE FROM workflow_state_delta WHERE workflow_id = ?",
+                    (workflow_id,),
+                )
+                self.conn.execute(
+                    "DELETE FROM workflow_step_journal WHERE workflow_id = ?",
+                    (workflow_id,),
+                )
+                self.conn.execute(
+                    "DELETE FROM workflow_state WHERE workflow_id = ?", (workflow_id,)
+                )
+                self.conn.commit()
+            except sqlite3.Error:
+                self.conn.rollback()
+                raise
+
+    def record_step(self, workflow_id: str, step_key: str, output: Any) -> None:
+        """Durably record the output of a completed step.
+
+        The record is committed right away, together with any pending state
+        updates, so a resumed workflow never runs the step again.
+
+        Args:
+            workflow_id (str): Unique identifier of the workflow.
+            step_key (str): Idempotency key of the step.
+            output (Any): Output of the step.
+        """
+        codec, blob = self._encode(output)
+        with self._lock:
+            try:
+                self.conn.execute(
+                    """
+                    INSERT OR REPLACE INTO workflow_step_journal
+                        (workflow_id, step_key, codec, output, created_at)
+                    VALUES (?, ?, ?, ?, ?)
+                """,
+                    (workflow_id, step_key, codec, blob, datetime.now()),
+                )
+                self.flush()
+                self.conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Failed to journal step {step_key} of {workflow_id}: {e}")
+                self.conn.rollback()
+                raise
+
+    def load_steps(self, workflow_id: str) -> Dict[str, Any]:
+        """Get the recorded outputs of a workflow's completed steps.
+
+        Args:
+            workflow_id (str): Unique identifier of the workflow.
+
+        Returns:
+            Dict[str, Any]: Step output by idempotency key.
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT step_key, codec, output FROM workflow_step_journal WHERE workflow_id = ?",
+                (workflow_id,),
+            ).fetchall()
+        return {step_key: self._decode(codec, blob) for step_key, codec, blob in rows}
+
+    @staticmethod
+    def _encode(value: Any) -> Tuple[str, bytes]:
+        """Serialize and compress a step output.
+
+        Returns:
+            Tuple[str, bytes]: Codec name and encoded bytes.
+        """
+        if MSGPACK_AVAILABLE:
+            return "msgpack+zlib", zlib.compress(
+                msgpack.packb(value, use_bin_type=True, default=str)
+            )
+        return "json+zlib", zlib.compress(
+            json.dumps(value, default=str).encode("utf-8")
+        )
+
+    @staticmethod
+    def _decode(codec: str, blob: bytes) -> Any:
+        """Decode a step output written by ``_encode``."""
+        data = zlib.decompress(blob)
+        if codec == "msgpack+zlib":
+            if not MSGPACK_AVAILABLE:
+                raise RuntimeError("msgpack is required to read this workflow journal")
+            return msgpack.unpackb(data, raw=False, strict_map_key=False)
+        return json.loads(data)
+
+    def close(self) -> None:
+        """Commit pending updates and close the database connection."""
+        with self._lock:
+            if self.conn is None:
+                return
+            try:
+                self.flush()
+            finally:
+                self.conn.close()
+                self.conn = None
+
+    def _write_base(self, workflow_id: str, state: Dict[str, Any]) -> None:
+        """Replace the stored initial state of a workflow and drop its deltas."""
+        try:
+            self.conn.execute(
+                """
+                INSERT OR REPLACE INTO workflow_state (workflow_id, state, last_updated)
+                VALUES (?, ?, ?)
+            """,
+                (workflow_id, json.dumps(state), datetime.now()),
+            )
+            self.conn.execute(
+                "DELETE FROM workflow_state_delta WHERE workflow_id = ?", (workflow_id,)
+            )
+            self.conn.commit()
+        except sqlite3.Error:
+            self.conn.rollback()
+            raise
+
+    def _drop_pending(self, workflow_id: str) -> None:
+        """Discard the uncommitted updates of a workflow."""
+        self._pending = [p for p in self._pending if p[0] != workflow_id]
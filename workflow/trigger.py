@@ -5,13 +5,21 @@ This module provides functionality for defining and managing triggers
 that initiate workflows based on time, events, or conditions.
 """
 
-import contextlib
+import functools
 import logging
-import sched
+import operator
+import re
 import threading
-import time
 from datetime import datetime, timedelta
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional
+
+from core.event_bus import TopicMatcher, is_pattern
+from workflow.scheduler import (
+    MISFIRE_FIRE_ONCE,
+    ScheduledTimer,
+    TriggerScheduler,
+    get_default_scheduler,
+)
 
 # Configure logging
 logging.basicConfig(
@@ -19,6 +27,105 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+_MISSING = object()
+
+_FILTER_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "lte": operator.le,
+    "in": lambda value, options: value in options,
+    "contains": lambda value, item: item in value,
+}
+
+
+def _get_field(event_data: Any, path: List[str]) -> Any:
+    """Look up a dotted field in event data made of dicts and objects."""
+    value = event_data
+    for name in path:
+        value = (
+            value.get(name, _MISSING)
+            if isinstance(value, dict)
+            else getattr(value, name, _MISSING)
+        )
+        if value is _MISSING:
+            break
+    return value
+
+
+def compile_event_filter(spec: Dict[str, Any]) -> Callable[[Any], bool]:
+    """Compile a declarative event filter into a predicate.
+
+    Keys are dotted field paths into the event data. A plain value must be
+    equal to the field; a dict maps operators (``eq``, ``ne``, ``gt``, ``gte``,
+    ``lt``, ``lte``, ``in``, ``contains``, ``exists``, ``regex``) to operands.
+    All clauses must hold.
+
+    Example:
+        ```python
+        matches = compile_event_filter({"status": "failed", "retries": {"gte": 3}})
+        matches({"status": "failed", "retries": 5})  # True
+        ```
+
+    Args:
+        spec (Dict[str, Any]): Field paths and the values or operators to match.
+
+    Returns:
+        Callable[[Any], bool]: Predicate over the event data.
+
+    Raises:
+        ValueError: If an operator is unknown.
+    """
+    clauses = []
+    for field, expected in spec.items():
+        path = field.split(".")
+        tests = expected.items() if isinstance(expected, dict) else [("eq", expected)]
+        for op, operand in tests:
+            if op == "exists":
+                clauses.append(functools.partial(_check_exists, path, bool(operand)))
+            elif op == "regex":
+                clauses.append(
+                    functools.partial(_check_clause, path, _search, re.compile(operand))
+                )
+            elif op in _FILTER_OPERATORS:
+                clauses.append(
+                    functools.partial(
+                        _check_clause, path, _FILTER_OPERATORS[op], operand
+                    )
+                )
+            else:
+                raise ValueError(f"Unknown event filter operator: {op}")
+
+    def matches(event_data: Any) -> bool:
+        return all(clause(event_data) for clause in clauses)
+
+    return matches
+
+
+def _check_clause(
+    path: List[str], compare: Callable[[Any, Any], bool], operand: Any, event_data: Any
+) -> bool:
+    """Apply one compiled filter clause; missing fields and type errors never match."""
+    value = _get_field(event_data, path)
+    if value is _MISSING:
+        return False
+    try:
+        return bool(compare(value, operand))
+    except TypeError:
+        return False
+
+
+def _check_exists(path: List[str], expected: bool, event_data: Any) -> bool:
+    """Check whether a field is present in the event data."""
+    return (_get_field(event_data, path) is not _MISSING) == expected
+
+
+def _search(value: Any, pattern: "re.Pattern") -> bool:
+    """Match a compiled regular expression anywhere in a string field."""
+    return isinstance(value, str) and pattern.search(value) is not None
+
 
 class Trigger:
     """Base class for workflow triggers."""
@@ -33,6 +140,18 @@ class Trigger:
         self.trigger_id = trigger_id
         self.callback = callback
         self.active = False
+        # Set by TriggerManager; triggers started on their own use the default
+        self.scheduler: Optional[TriggerScheduler] = None
+
+    def get_scheduler(self) -> TriggerScheduler:
+        """Get the scheduler that runs this trigger.
+
+        Returns:
+            TriggerScheduler: The assigned scheduler, or the shared default.
+        """
+        if self.scheduler is None:
+            self.scheduler = get_default_scheduler()
+        return self.scheduler
 
     def validate(self) -> bool:
         """Validate the trigger configuration.
@@ -60,6 +179,8 @@ class TimeBasedTrigger(Trigger):
         callback: Callable[[], None],
         trigger_time: datetime,
         interval: Optional[timedelta] = None,
+        jitter: float = 0.0,
+        misfire_policy: str = MISFIRE_FIRE_ONCE,
     ):
         """Initialize a time-based trigger.
 
@@ -68,13 +189,16 @@ class TimeBasedTrigger(Trigger):
             callback (Callable[[], None]): Function to call when the trigger is activated.
             trigger_time (datetime): The specific time to trigger the workflow.
             interval (Optional[timedelta]): If provided, repeat the trigger at this interval.
+            jitter (float): Maximum random delay in seconds added to each activation.
+            misfire_policy (str): What to do with activations missed while the
+                process was busy or suspended; see ``workflow.scheduler``.
         """
         super().__init__(trigger_id, callback)
         self.trigger_time = trigger_time
         self.interval = interval
-        self.scheduler = sched.scheduler(time.time, time.sleep)
-        self.event = None
-        self.thread = None
+        self.jitter = jitter
+        self.misfire_policy = misfire_policy
+        self.timer: Optional[ScheduledTimer] = None
 
     def validate(self) -> bool:
         """Validate the time-based trigger configuration.
@@ -108,16 +232,20 @@ class TimeBasedTrigger(Trigger):
                 )
                 return
 
-        self.event = self.scheduler.enter(delay, 1, self._activate)
-        self.thread = threading.Thread(target=self.scheduler.run)
-        self.thread.daemon = True
-        self.thread.start()
+        self.timer = self.get_scheduler().schedule(
+            self._activate,
+            delay=delay,
+            interval=self.interval.total_seconds() if self.interval else None,
+            jitter=self.jitter,
+            misfire_policy=self.misfire_policy,
+            name=self.trigger_id,
+        )
         logger.info(
             f"Started time-based trigger {self.trigger_id} for {self.trigger_time}"
         )
 
     def _activate(self) -> None:
-        """Activate the trigger and schedule the next occurrence if interval is set."""
+        """Activate the trigger; the scheduler repeats it if an interval is set."""
         if self.active:
             logger.info(f"Trigger {self.trigger_id} activated at {datetime.now()}")
             try:
@@ -129,20 +257,16 @@ class TimeBasedTrigger(Trigger):
 
             if self.interval and self.active:
                 self.trigger_time += self.interval
-                delay = self.interval.total_seconds()
-                self.event = self.scheduler.enter(delay, 1, self._activate)
-                logger.info(
-                    f"Scheduled next activation for trigger {self.trigger_id} at {self.trigger_time}"
+                logger.debug(
+                    f"Next activation for trigger {self.trigger_id} at {self.trigger_time}"
                 )
 
     def stop(self) -> None:
         """Stop the time-based trigger."""
         self.active = False
-        if self.event:
-            with contextlib.suppress(
-                ValueError
-            ):  # Event might have already been executed
-                self.scheduler.cancel(self.event)
+        if self.timer:
+            self.get_scheduler().cancel(self.timer)
+            self.timer = None
         logger.info(f"Stopped time-based trigger {self.trigger_id}")
 
 
@@ -155,18 +279,24 @@ class EventBasedTrigger(Trigger):
         callback: Callable[[], None],
         event_type: str,
         condition: Optional[Callable[[Any], bool]] = None,
+        filters: Optional[Dict[str, Any]] = None,
     ):
         """Initialize an event-based trigger.
 
         Args:
             trigger_id (str): Unique identifier for the trigger.
             callback (Callable[[], None]): Function to call when the trigger is activated.
-            event_type (str): Type of event to listen for.
+            event_type (str): Type of event to listen for; may be a wildcard
+                pattern as accepted by ``core.event_bus.EventBus``.
             condition (Optional[Callable[[Any], bool]]): Optional condition to check on the event data.
+            filters (Optional[Dict[str, Any]]): Declarative pre-filter checked
+                before ``condition``; see ``compile_event_filter``.
         """
         super().__init__(trigger_id, callback)
         self.event_type = event_type
         self.condition = condition or (lambda x: True)
+        self.filters = filters
+        self.prefilter = compile_event_filter(filters) if filters else None
         self.listeners = []
 
     def validate(self) -> bool:
@@ -186,8 +316,7 @@ class EventBasedTrigger(Trigger):
             raise ValueError(f"Invalid configuration for trigger {self.trigger_id}")
 
         self.active = True
-        # Placeholder for event listener registration
-        # In a real implementation, this would register with an event system
+        # Events are delivered by the TriggerManager that indexes this trigger
         logger.info(
             f"Started event-based trigger {self.trigger_id} for event type {self.event_type}"
         )
@@ -195,7 +324,6 @@ class EventBasedTrigger(Trigger):
     def stop(self) -> None:
         """Stop listening for the specified event."""
         self.active = False
-        # Placeholder for event listener unregistration
         logger.info(
             f"Stopped event-based trigger {self.trigger_id} for event type {self.event_type}"
         )
@@ -206,7 +334,11 @@ class EventBasedTrigger(Trigger):
         Args:
             event_data (Any): Data associated with the event.
         """
-        if self.active and self.condition(event_data):
+        if not self.active:
+            return
+        if self.prefilter and not self.prefilter(event_data):
+            return
+        if self.condition(event_data):
             logger.info(
                 f"Event trigger {self.trigger_id} activated by event {self.event_type}"
             )
@@ -230,6 +362,9 @@ class ConditionBasedTrigger(Trigger):
     ):
         """Initialize a condition-based trigger.
 
+        Conditions of all triggers with the same check interval are checked
+        together by the scheduler.
+
         Args:
             trigger_id (str): Unique identifier for the trigger.
             callback (Callable[[], None]): Function to call when the trigger is activated.
@@ -239,7 +374,6 @@ class ConditionBasedTrigger(Trigger):
         super().__init__(trigger_id, callback)
         self.condition = condition
         self.check_interval = check_interval
-        self.thread = None
 
     def validate(self) -> bool:
         """Validate the condition-based trigger configuration.
@@ -260,40 +394,56 @@ class ConditionBasedTrigger(Trigger):
             raise ValueError(f"Invalid configuration for trigger {self.trigger_id}")
 
         self.active = True
-        self.thread = threading.Thread(target=self._check_condition_loop)
-        self.thread.daemon = True
-        self.thread.start()
+        self.get_scheduler().add_condition(self)
         logger.info(
             f"Started condition-based trigger {self.trigger_id} with check interval {self.check_interval} seconds"
         )
 
-    def _check_condition_loop(self) -> None:
-        """Continuously check the condition until stopped."""
-        while self.active:
-            try:
-                if self.condition():
-                    logger.info(f"Condition trigger {self.trigger_id} activated")
-                    self.callback()
-                    # Optionally stop after first activation, could be configurable
-                    self.stop()
-                    break
-            except Exception as e:
-                logger.error(
-                    f"Error checking condition for trigger {self.trigger_id}: {e}"
-                )
-            time.sleep(self.check_interval)
+    def check(self) -> None:
+        """Check the condition once and activate the trigger if it holds."""
+        if not self.active:
+            return
+        try:
+            if self.condition():
+                logger.info(f"Condition trigger {self.trigger_id} activated")
+                self.callback()
+                # Optionally stop after first activation, could be configurable
+                self.stop()
+        except Exception as e:
+            logger.error(f"Error checking condition for trigger {self.trigger_id}: {e}")
 
     def stop(self) -> None:
         """Stop checking the condition."""
         self.active = False
+        if self.scheduler:
+            self.scheduler.remove_condition(self)
         logger.info(f"Stopped condition-based trigger {self.trigger_id}")
 
 
 class TriggerManager:
     """Manages multiple triggers for workflows."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        scheduler: Optional[TriggerScheduler] = None,
+        event_bus: Optional[Any] = None,
+    ):
+        """Initialize the trigger manager.
+
+        Args:
+            scheduler (Optional[TriggerScheduler]): Scheduler running the time and
+                condition triggers; defaults to the shared scheduler.
+            event_bus (Optional[EventBus]): Bus whose events fire the event-based
+                triggers; the manager subscribes once per event type.
+        """
         self.triggers: Dict[str, Trigger] = {}
+        self.scheduler = scheduler or get_default_scheduler()
+        self.event_bus = event_bus
+        # Event type (or pattern) -> event-based triggers listening for it
+        self._event_index: Dict[str, Dict[str, EventBasedTrigger]] = {}
+        self._pattern_matcher = TopicMatcher()
+        self._bus_handlers: Dict[str, Callable[..., None]] = {}
+        self._index_lock = threading.RLock()
 
     def add_trigger(self, trigger: Trigger) -> None:
         """Add a trigger to manage.
@@ -301,7 +451,15 @@ class TriggerManager:
         Args:
             trigger (Trigger): The trigger to add.
         """
-        self.triggers[trigger.trigger_id] = trigger
+        if trigger.scheduler is None:
+            trigger.scheduler = self.scheduler
+        with self._index_lock:
+            previous = self.triggers.get(trigger.trigger_id)
+            if previous is not None and previous is not trigger:
+                self._unindex(previous)
+            self.triggers[trigger.trigger_id] = trigger
+            if isinstance(trigger, EventBasedTrigger):
+                self._index(trigger)
         logger.info(f"Added trigger {trigger.trigger_id} to manager")
 
     def remove_trigger(self, trigger_id: str) -> None:
@@ -312,7 +470,8 @@ class TriggerManager:
         """
         if trigger_id in self.triggers:
             self.triggers[trigger_id].stop()
-            del self.triggers[trigger_id]
+            with self._index_lock:
+                self._unindex(self.triggers.pop(trigger_id))
             logger.info(f"Removed trigger {trigger_id} from manager")
 
     def start_all(self) -> None:
@@ -331,6 +490,26 @@ class TriggerManager:
             except Exception as e:
                 logger.error(f"Failed to stop trigger {trigger.trigger_id}: {e}")
 
+    def dispatch_event(self, event_type: str, event_data: Any) -> int:
+        """Deliver an event to the event-based triggers listening for its type.
+
+        Only triggers indexed under the event type, or under a wildcard pattern
+        matching it, are looked at.
+
+        Args:
+            event_type (str): Type of the event.
+            event_data (Any): Data associated with the event.
+
+        Returns:
+            int: Number of triggers the event was delivered to.
+        """
+        with self._index_lock:
+            keys = [event_type, *self._pattern_matcher.match(event_type)]
+        delivered = 0
+        for key in keys:
+            delivered += self._deliver(key, event_data)
+        return delivered
+
     def simulate_event(self, event_type: str, event_data: Any) -> None:
         """Simulate an event for testing event-based triggers.
 
@@ -338,12 +517,56 @@ class TriggerManager:
             event_type (str): Type of event to simulate.
             event_data (Any): Data associated with the event.
         """
-        for trigger in self.triggers.values():
-            if (
-                isinstance(trigger, EventBasedTrigger)
-                and trigger.event_type == event_type
-            ):
-                trigger.on_event(event_data)
-                logger.info(
-                    f"Simulated event {event_type} for trigger {trigger.trigger_id}"
-                )
+        delivered = self.dispatch_event(event_type, event_data)
+        logger.info(f"Simulated event {event_type} for {delivered} triggers")
+
+    def _deliver(self, key: str, event_data: Any) -> int:
+        """Deliver an event to the triggers indexed under one key."""
+        # Snapshot so triggers may be added or removed from their callbacks
+        with self._index_lock:
+            triggers = list(self._event_index.get(key, {}).values())
+        for trigger in triggers:
+            trigger.on_event(event_data)
+        return len(triggers)
+
+    def _on_bus_event(self, key: str, *args: Any, **kwargs: Any) -> None:
+        """Forward an EventBus publication to the triggers indexed under key."""
+        if len(args) == 1 and not kwargs:
+            event_data = args[0]
+        elif not args:
+            event_data = kwargs
+        else:
+            event_data = {"args": args, **kwargs}
+        self._deliver(key, event_data)
+
+    def _index(self, trigger: EventBasedTrigger) -> None:
+        """Add an event-based trigger to the event type index."""
+        key = trigger.event_type
+        listeners = self._event_index.get(key)
+        if listeners is None:
+            listeners = self._event_index[key] = {}
+            if is_pattern(key):
+                self._pattern_matcher.add(key)
+            if self.event_bus is not None:
+                handler = functools.partial(self._on_bus_event, key)
+                self._bus_handlers[key] = handler
+                self.event_bus.subscribe(key, handler)
+        listeners[trigger.trigger_id] = trigger
+
+    def _unindex(self, trigger: Trigger) -> None:
+        """Remove a trigger from the event type index if it is in it."""
+        if not isinstance(trigger, EventBasedTrigger):
+            return
+        key = trigger.event_type
+        listeners = self._event_index.get(key)
+        if not listeners or listeners.get(trigger.trigger_id) is not trigger:
+            return
+        del listeners[trigger.trigger_id]
+        if listeners:
+            return
+        del self._event_index[key]
+        if is_pattern(key):
+            self._pattern_matcher.remove(key)
+        handler = self._bus_handlers.pop(key, None)
+        if handler is not None:
+            self.event_bus.unsubscribe(key, handler)
@@ -3,45 +3,181 @@ Workflow Execution Analytics Module
 
 This module provides comprehensive analytics for workflow execution, including performance metrics,
 bottleneck visualization, customizable dashboards, comparative analytics, and predictive failure analysis.
+
+Metrics are aggregated incrementally: every recorded execution updates running
+statistics per workflow and per step, kept in daily buckets, so queries cost
+O(days) rather than a rebuild of the full history.
+pandas, matplotlib, seaborn and scikit-learn are only imported when a frame,
+a plot or the predictive model is first needed.
 """
 
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from collections import Counter, deque
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional, Tuple
+
+from core.metrics import LatencyHistogram
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+EXECUTION_COLUMNS = [
+    "workflow_id",
+    "execution_id",
+    "start_time",
+    "end_time",
+    "duration",
+    "success",
+    "error_message",
+    "steps",
+]
+STEP_COLUMNS = [
+    "workflow_id",
+    "execution_id",
+    "step_id",
+    "step_name",
+    "start_time",
+    "end_time",
+    "duration",
+    "success",
+    "error_message",
+]
+
+
+class RunningStats:
+    """Constant-size summary of a stream of executions.
+
+    The duration histogram also keeps the count, total, min and max.
+    """
+
+    __slots__ = ("success_count", "histogram", "errors")
 
-import matplotlib.pyplot as plt
-import pandas as pd
-import seaborn as sns
-from sklearn.ensemble import IsolationForest
+    def __init__(self):
+        self.success_count = 0
+        # Durations down to a millisecond, medians within 1%
+        self.histogram = LatencyHistogram(min_value=1e-3)
+        self.errors: Counter = Counter()
+
+    def add(self, duration: float, success: bool, error_message: str = "") -> None:
+        """Add one execution."""
+        self.success_count += int(bool(success))
+        self.histogram.record(duration)
+        if not success:
+            self.errors[error_message] += 1
+
+    def merge(self, other: "RunningStats") -> None:
+        """Add the executions summarized by another instance."""
+        self.success_count += other.success_count
+        self.histogram.merge(other.histogram)
+        self.errors.update(other.errors)
+
+    @property
+    def count(self) -> int:
+        return self.histogram.count
+
+    @property
+    def min(self) -> float:
+        return self.histogram.min
+
+    @property
+    def max(self) -> float:
+        return self.histogram.max
+
+    @property
+    def mean(self) -> float:
+        return self.histogram.mean
+
+    @property
+    def success_rate(self) -> float:
+        return self.success_count / self.count * 100 if self.count else 0
+
+    @property
+    def median(self) -> float:
+        return self.histogram.percentile(50)
+
+
+class WindowedStats:
+    """Daily buckets of running statistics for sliding windows."""
+
+    def __init__(self, retention_days: int):
+        self.retention_days = retention_days
+        self.daily: Dict[date, RunningStats] = {}
+
+    def add(
+        self, day: date, duration: float, success: bool, error_message: str = ""
+    ) -> None:
+        """Add one execution to the statistics of its day."""
+        bucket = self.daily.get(day)
+        if bucket is None:
+            bucket = self.daily[day] = RunningStats()
+            if len(self.daily) > self.retention_days:
+                del self.daily[min(self.daily)]
+        bucket.add(duration, success, error_message)
+
+    def window(self, since: date) -> RunningStats:
+        """Merge the daily buckets from ``since`` on."""
+        merged = RunningStats()
+        for day, bucket in self.daily.items():
+            if day >= since:
+                merged.merge(bucket)
+        return merged
 
 
 class WorkflowAnalytics:
-    def __init__(self):
-        self.execution_data = pd.DataFrame(
-            columns=[
-                "workflow_id",
-                "execution_id",
-                "start_time",
-                "end_time",
-                "duration",
-                "success",
-                "error_message",
-                "steps",
-            ]
+    def __init__(
+        self,
+        retention_days: int = 365,
+        history_limit: Optional[int] = 100_000,
+        training_window: int = 5000,
+        retrain_every: int = 500,
+    ):
+        """
+        Args:
+            retention_days: Number of daily buckets kept per workflow and step.
+            history_limit: Number of raw executions kept for frames and plots;
+                None keeps all of them. Metrics are not affected by this limit.
+            training_window: Number of most recent executions the predictive
+                model is trained on.
+            retrain_every: Number of new executions after which a prediction
+                retrains the model first.
+        """
+        self.retention_days = retention_days
+        self.training_window = training_window
+        self.retrain_every = retrain_every
+        self._executions: Deque[Dict[str, Any]] = deque(maxlen=history_limit)
+        self._steps: Deque[Dict[str, Any]] = deque(
+            maxlen=history_limit * 10 if history_limit else None
         )
-        self.step_data = pd.DataFrame(
-            columns=[
-                "workflow_id",
-                "execution_id",
-                "step_id",
-                "step_name",
-                "start_time",
-                "end_time",
-                "duration",
-                "success",
-                "error_message",
-            ]
+        self._execution_frame = None
+        self._step_frame = None
+        self._all_stats = WindowedStats(retention_days)
+        self._workflow_stats: Dict[str, WindowedStats] = {}
+        self._step_stats: Dict[Tuple[str, str], WindowedStats] = {}
+        # Features of recent executions: duration, success, hour, day of week
+        self._features: Deque[Tuple[float, int, int, int]] = deque(
+            maxlen=training_window
         )
-        self.predictive_model = IsolationForest(contamination=0.1, random_state=42)
+        self.predictive_model = None
+        self._samples_since_training = 0
+
+    @property
+    def execution_data(self) -> "pd.DataFrame":
+        """Recent executions as a DataFrame, rebuilt only after new records."""
+        if self._execution_frame is None:
+            import pandas as pd
+
+            self._execution_frame = pd.DataFrame(
+                list(self._executions), columns=EXECUTION_COLUMNS
+            )
+        return self._execution_frame
+
+    @property
+    def step_data(self) -> "pd.DataFrame":
+        """Recent step executions as a DataFrame, rebuilt only after new records."""
+        if self._step_frame is None:
+            import pandas as pd
+
+            self._step_frame = pd.DataFrame(list(self._steps), columns=STEP_COLUMNS)
+        return self._step_frame
 
     def record_execution(
         self,
@@ -55,21 +191,35 @@ class WorkflowAnalytics:
     ):
         """
         Record details of a workflow execution.
+
+        Updates the running statistics in O(1 + number of steps).
         """
         duration = (end_time - start_time).total_seconds()
-        new_entry = {
-            "workflow_id": workflow_id,
-            "execution_id": execution_id,
-            "start_time": start_time,
-            "end_time": end_time,
-            "duration": duration,
-            "success": success,
-            "error_message": error_message,
-            "steps": steps or [],
-        }
-        self.execution_data = pd.concat(
-            [self.execution_data, pd.DataFrame([new_entry])], ignore_index=True
+        day = start_time.date()
+        self._executions.append(
+            {
+                "workflow_id": workflow_id,
+                "execution_id": execution_id,
+                "start_time": start_time,
+                "end_time": end_time,
+                "duration": duration,
+                "success": success,
+                "error_message": error_message,
+                "steps": steps or [],
+            }
+        )
+        self._execution_frame = None
+        self._all_stats.add(day, duration, success, error_message)
+        workflow_stats = self._workflow_stats.get(workflow_id)
+        if workflow_stats is None:
+            workflow_stats = self._workflow_stats[workflow_id] = WindowedStats(
+                self.retention_days
+            )
+        workflow_stats.add(day, duration, success, error_message)
+        self._features.append(
+            (duration, int(bool(success)), start_time.hour, start_time.weekday())
         )
+        self._samples_since_training += 1
 
         # Record individual step data if provided
         if steps:
@@ -90,28 +240,51 @@ class WorkflowAnalytics:
                     "success": step.get("success", False),
                     "error_message": step.get("error_message", ""),
                 }
-                self.step_data = pd.concat(
-                    [self.step_data, pd.DataFrame([step_entry])], ignore_index=True
+                self._steps.append(step_entry)
+                key = (workflow_id, step_entry["step_name"])
+                step_stats = self._step_stats.get(key)
+                if step_stats is None:
+                    step_stats = self._step_stats[key] = WindowedStats(
+                        self.retention_days
+                    )
+                step_stats.add(
+                    step_entry["start_time"].date(),
+                    step_duration,
+                    step_entry["success"],
+                    step_entry["error_message"],
                 )
+            self._step_frame = None
 
     def get_performance_metrics(
         self, workflow_id: Optional[str] = None, days: int = 30
     ) -> Dict:
         """
         Calculate detailed performance metrics for workflows.
+
+        The window covers whole days; the median is accurate to within 1%.
         """
-        cutoff_date = datetime.now() - timedelta(days=days)
+        since = (datetime.now() - timedelta(days=days)).date()
         if workflow_id:
-            wf_executions = self.execution_data[
-                (self.execution_data["workflow_id"] == workflow_id)
-                & (self.execution_data["start_time"] >= cutoff_date)
-            ]
+            windowed = self._workflow_stats.get(workflow_id)
+            stats = windowed.window(since) if windowed else RunningStats()
         else:
-            wf_executions = self.execution_data[
-                self.execution_data["start_time"] >= cutoff_date
-            ]
+            stats = self._all_stats.window(since)
+        return self._metrics(stats)
 
-        if wf_executions.empty:
+    def get_step_metrics(self, workflow_id: str, days: int = 30) -> Dict[str, Dict]:
+        """
+        Calculate performance metrics of each step of a workflow.
+        """
+        since = (datetime.now() - timedelta(days=days)).date()
+        return {
+            step_name: self._metrics(windowed.window(since))
+            for (wf_id, step_name), windowed in self._step_stats.items()
+            if wf_id == workflow_id
+        }
+
+    @staticmethod
+    def _metrics(stats: RunningStats) -> Dict:
+        if not stats.count:
             return {
                 "total_executions": 0,
                 "success_rate": 0,
@@ -122,26 +295,15 @@ class WorkflowAnalytics:
                 "error_count": 0,
                 "common_errors": [],
             }
-
-        total_executions = len(wf_executions)
-        success_count = len(wf_executions[wf_executions["success"]])
-        error_executions = wf_executions[not wf_executions["success"]]
-        error_count = len(error_executions)
-        common_errors = (
-            error_executions["error_message"].value_counts().head(3).to_dict()
-        )
-
         return {
-            "total_executions": total_executions,
-            "success_rate": (success_count / total_executions) * 100
-            if total_executions > 0
-            else 0,
-            "average_duration": wf_executions["duration"].mean(),
-            "median_duration": wf_executions["duration"].median(),
-            "min_duration": wf_executions["duration"].min(),
-            "max_duration": wf_executions["duration"].max(),
-            "error_count": error_count,
-            "common_errors": list(common_errors.items()),
+            "total_executions": stats.count,
+            "success_rate": stats.success_rate,
+            "average_duration": stats.mean,
+            "median_duration": stats.median,
+            "min_duration": stats.min,
+            "max_duration": stats.max,
+            "error_count": stats.count - stats.success_count,
+            "common_errors": stats.errors.most_common(3),
         }
 
     def visualize_bottlenecks_heatmap(self, workflow_id: str, days: int = 30):
@@ -165,6 +327,9 @@ class WorkflowAnalytics:
             values="duration", index="step_name", columns="execution_id", aggfunc="mean"
         )
 
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
         # Create heatmap
         plt.figure(figsize=(12, 8))
         sns.heatmap(pivot_data, cmap="YlOrRd", annot=True, fmt=".1f")
@@ -201,6 +366,8 @@ class WorkflowAnalytics:
             )
             return None
 
+        import matplotlib.pyplot as plt
+
         fig = plt.figure(figsize=(15, 10))
 
         # Success Rate by Workflow
@@ -239,7 +406,7 @@ class WorkflowAnalytics:
 
         # Error Distribution
         ax4 = fig.add_subplot(2, 2, 4)
-        error_counts = wf_executions[not wf_executions["success"]][
+        error_counts = wf_executions[~wf_executions["success"].astype(bool)][
             "workflow_id"
         ].value_counts()
         if not error_counts.empty:
@@ -279,71 +446,61 @@ class WorkflowAnalytics:
         entity_type: str = "workflow",
         entity_ids: Optional[List[str]] = None,
         days: int = 30,
-    ) -> pd.DataFrame:
+    ) -> "pd.DataFrame":
         """
         Compare workflow performance across different entities (workflows, teams, or users).
         """
-        cutoff_date = datetime.now() - timedelta(days=days)
-        relevant_executions = self.execution_data[
-            self.execution_data["start_time"] >= cutoff_date
-        ]
-
-        if entity_ids:
-            relevant_executions = relevant_executions[
-                relevant_executions["workflow_id"].isin(entity_ids)
-            ]
-
-        if relevant_executions.empty:
-            print(
-                f"No data available for comparative analytics in the last {days} days"
-            )
-            return pd.DataFrame()
+        import pandas as pd
 
+        since = (datetime.now() - timedelta(days=days)).date()
         # For simplicity, we're using workflow_id as the entity for comparison
         # In a real system, you'd join with user/team metadata
-        comparison_metrics = (
-            relevant_executions.groupby("workflow_id")
-            .agg(
+        rows = []
+        for wf_id, windowed in sorted(self._workflow_stats.items()):
+            if entity_ids and wf_id not in entity_ids:
+                continue
+            stats = windowed.window(since)
+            if not stats.count:
+                continue
+            rows.append(
                 {
-                    "success": "mean",
-                    "duration": ["mean", "median", "min", "max"],
-                    "execution_id": "count",
+                    "workflow_id": wf_id,
+                    "success_rate": round(stats.success_count / stats.count, 2) * 100,
+                    "avg_duration": round(stats.mean, 2),
+                    "median_duration": round(stats.median, 2),
+                    "min_duration": round(stats.min, 2),
+                    "max_duration": round(stats.max, 2),
+                    "total_executions": stats.count,
                 }
             )
-            .round(2)
-        )
 
-        comparison_metrics.columns = [
-            "success_rate",
-            "avg_duration",
-            "median_duration",
-            "min_duration",
-            "max_duration",
-            "total_executions",
-        ]
-        comparison_metrics["success_rate"] = comparison_metrics["success_rate"] * 100
-
-        return comparison_metrics.reset_index()
+        if not rows:
+            print(
+                f"No data available for comparative analytics in the last {days} days"
+            )
+            return pd.DataFrame()
+        return pd.DataFrame(rows)
 
     def train_predictive_model(self):
         """
-        Train the predictive model for potential workflow failures based on historical data.
+        Train the predictive model for potential workflow failures on recent executions.
+
+        Only the last ``training_window`` executions are used, so training
+        time does not grow with the history.
         """
-        if len(self.execution_data) < 10:
+        if len(self._features) < 10:
             print(
                 "Insufficient data to train predictive model. Need at least 10 execution records."
             )
             return False
 
-        # Prepare features for anomaly detection
-        features = self.execution_data[["duration"]].copy()
-        features["success"] = self.execution_data["success"].astype(int)
-        # Add more features if available, e.g., time of day, day of week
-        features["hour"] = self.execution_data["start_time"].dt.hour
-        features["day_of_week"] = self.execution_data["start_time"].dt.dayofweek
+        import numpy as np
+        from sklearn.ensemble import IsolationForest
 
-        # Train the model
-        self.predictive_model.fit(features)
+        model = IsolationForest(contamination=0.1, random_state=42)
+        model.fit(np.array(self._features, dtype=float))
+        self.predictive_model = model
+        self._samples_since_training = 0
         print("Predictive model trained for anomaly detection")
         return True
 
@@ -352,21 +509,27 @@ class WorkflowAnalytics:
     ) -> Dict[str, float]:
         """
         Predict potential workflow failure based on current execution parameters.
+
+        The model is retrained first only once ``retrain_every`` executions have
+        been recorded since it was last trained.
         """
-        if not hasattr(self.predictive_model, "decision_function"):
+        if (
+            self.predictive_model is not None
+            and self._samples_since_training >= self.retrain_every
+        ):
+            self.train_predictive_model()
+        if self.predictive_model is None:
             print(
                 "Predictive model not trained yet. Call train_predictive_model first."
             )
             return {"anomaly_score": 0.0, "failure_probability": 0.0}
 
-        # Prepare features for the current execution
-        features = pd.DataFrame(
-            {
-                "duration": [current_duration],
-                "success": [1],  # Placeholder, will be ignored in prediction
-                "hour": [execution_time.hour],
-                "day_of_week": [execution_time.weekday()],
-            }
+        import numpy as np
+
+        # Prepare features for the current execution; success is a placeholder
+        features = np.array(
+            [[current_duration, 1, execution_time.hour, execution_time.weekday()]],
+            dtype=float,
         )
 
         # Get anomaly score (negative values indicate anomalies in IsolationForest)
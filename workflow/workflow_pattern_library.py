@@ -4,20 +4,45 @@ import os
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
 
+from workflow.pattern_search import PatternSearchIndex
+from workflow.pattern_store import PatternCollection, PatternStore
+
+# Field weights of the full-text search indices
+PATTERN_SEARCH_FIELDS = {"name": 3.0, "tags": 2.0, "category": 1.5, "description": 1.0}
+MARKETPLACE_SEARCH_FIELDS = dict(PATTERN_SEARCH_FIELDS, author=1.5)
+# Pattern store scopes
+LIBRARY_SCOPE = "library"
+MARKETPLACE_SCOPE = "marketplace"
+
 
 class WorkflowPatternLibrary:
-    def __init__(self, library_path: Optional[str] = None):
+    def __init__(
+        self, library_path: Optional[str] = None, store_path: Optional[str] = None
+    ):
         """
         Initialize the Workflow Pattern Library.
 
+        Patterns are stored in a SQLite database, by default next to the JSON
+        library. A JSON library or marketplace is imported into it on first
+        use and again whenever the file has changed since it was last
+        imported or exported; use the export methods to write them back out.
+
         Args:
-            library_path (Optional[str]): Path to store/load the pattern library data.
+            library_path (Optional[str]): Path of the JSON pattern library.
+            store_path (Optional[str]): Path of the pattern database; defaults
+                to the library path with a ``.db`` extension.
         """
-        self.patterns: Dict[str, Dict[str, Any]] = {}
         self.categories: Dict[str, List[str]] = {}
         self.tags: Dict[str, List[str]] = {}
         self.library_path = library_path or "workflow_patterns.json"
-        self.marketplace_patterns: Dict[str, Dict[str, Any]] = {}
+        self.store_path = store_path or os.path.splitext(self.library_path)[0] + ".db"
+        self.store = PatternStore(self.store_path)
+        self.patterns: PatternCollection
+        self.marketplace_patterns: PatternCollection
+        # Category and tags each pattern is currently listed under
+        self._indexed: Dict[str, Tuple[str, List[str]]] = {}
+        self._search_index = PatternSearchIndex(PATTERN_SEARCH_FIELDS)
+        self._marketplace_index = PatternSearchIndex(MARKETPLACE_SEARCH_FIELDS)
         self.marketplace_path = os.path.join(
             os.path.dirname(self.library_path), "marketplace_patterns.json"
         )
@@ -26,26 +51,73 @@ class WorkflowPatternLibrary:
 
     def load_library(self) -> None:
         """
-        Load the pattern library from a file if it exists.
+        Load the pattern library from the store.
+
+        The JSON library is imported if it changed since it was last synced
+        with the store; a new store without one gets the default patterns.
+        Only pattern summaries are read; full patterns are loaded when first
+        accessed.
         """
-        if os.path.exists(self.library_path):
+        self.patterns = PatternCollection(self.store, LIBRARY_SCOPE)
+        if self._json_changed(LIBRARY_SCOPE, self.library_path):
             try:
-                with open(self.library_path, "r") as f:
-                    data = json.load(f)
-                    self.patterns = data.get("patterns", {})
-                    self.categories = data.get("categories", {})
-                    self.tags = data.get("tags", {})
+                self.import_library(self.library_path)
+                return
             except Exception as e:
                 print(f"Error loading library: {e}")
-                self.initialize_default_patterns()
+        if self.store.has_scope(LIBRARY_SCOPE):
+            self._rebuild_indices()
         else:
             self.initialize_default_patterns()
 
+    def _json_changed(self, scope: str, path: str) -> bool:
+        """Check whether a JSON file changed since the store was synced with it."""
+        if not os.path.exists(path):
+            return False
+        synced = self.store.source_mtime(scope)
+        return synced is None or os.path.getmtime(path) > synced
+
+    def _mark_synced(self, scope: str, path: str, default_path: str) -> None:
+        """Record that a scope matches its JSON file, if that is the file used."""
+        if os.path.abspath(path) == os.path.abspath(default_path):
+            self.store.set_source_mtime(scope, os.path.getmtime(path))
+
+    def import_library(self, path: str) -> None:
+        """
+        Replace the library with the patterns of a JSON library file.
+
+        Args:
+            path (str): Path of a file written by ``export_library``.
+        """
+        with open(path, "r") as f:
+            data = json.load(f)
+        self.patterns.replace(data.get("patterns", {}))
+        self._mark_synced(LIBRARY_SCOPE, path, self.library_path)
+        # Category and tag lists are derived data; rebuild them so stale
+        # or duplicate entries in older files are dropped
+        self._rebuild_indices()
+
+    def export_library(self, path: Optional[str] = None) -> None:
+        """
+        Write the whole library to a JSON file.
+
+        Args:
+            path (Optional[str]): Destination path; defaults to the library path.
+        """
+        data = {
+            "patterns": dict(self.patterns),
+            "categories": self.categories,
+            "tags": self.tags,
+        }
+        with open(path or self.library_path, "w") as f:
+            json.dump(data, f, indent=2)
+        self._mark_synced(LIBRARY_SCOPE, path or self.library_path, self.library_path)
+
     def initialize_default_patterns(self) -> None:
         """
         Initialize the library with some default workflow patterns.
         """
-        self.patterns = {
+        defaults = {
             "etl_basic": {
                 "name": "Basic ETL Pipeline",
                 "description": "Extract, Transform, Load workflow for data processing.",
@@ -167,32 +239,22 @@ class WorkflowPatternLibrary:
             },
         }
 
-        # Build categories and tags index
-        self.categories = {}
-        self.tags = {}
-        for pattern_id, pattern in self.patterns.items():
-            category = pattern.get("category", "Uncategorized")
-            if category not in self.categories:
-                self.categories[category] = []
-            self.categories[category].append(pattern_id)
+        self.patterns.replace(defaults)
+        self._rebuild_indices()
 
-            for tag in pattern.get("tags", []):
-                if tag not in self.tags:
-                    self.tags[tag] = []
-                self.tags[tag].append(pattern_id)
-
-    def save_library(self) -> None:
+    def save_library(self, pattern_id: Optional[str] = None) -> None:
         """
-        Save the pattern library to a file.
+        Save the pattern library to the store.
+
+        Args:
+            pattern_id (Optional[str]): Only write this pattern (or its deletion);
+                by default every pattern changed since it was loaded is written.
         """
-        data = {
-            "patterns": self.patterns,
-            "categories": self.categories,
-            "tags": self.tags,
-        }
         try:
-            with open(self.library_path, "w") as f:
-                json.dump(data, f, indent=2)
+            if pattern_id is None:
+                self.patterns.save_all()
+            else:
+                self.patterns.save(pattern_id)
         except Exception as e:
             print(f"Error saving library: {e}")
 
@@ -236,17 +298,8 @@ class WorkflowPatternLibrary:
             "last_updated": now,
             "usage_count": 0,
         }
-
-        if category not in self.categories:
-            self.categories[category] = []
-        self.categories[category].append(pattern_id)
-
-        for tag in tags:
-            if tag not in self.tags:
-                self.tags[tag] = []
-            self.tags[tag].append(pattern_id)
-
-        self.save_library()
+        self._update_indices(pattern_id, self.patterns[pattern_id])
+        self.save_library(pattern_id)
         return True
 
     def update_pattern(
@@ -278,31 +331,14 @@ class WorkflowPatternLibrary:
             return False
 
         pattern = self.patterns[pattern_id]
-        old_category = pattern["category"]
-        old_tags = pattern["tags"]
 
         if name is not None:
             pattern["name"] = name
         if description is not None:
             pattern["description"] = description
         if category is not None:
-            if (
-                old_category in self.categories
-                and pattern_id in self.categories[old_category]
-            ):
-                self.categories[old_category].remove(pattern_id)
-            if category not in self.categories:
-                self.categories[category] = []
-            self.categories[category].append(pattern_id)
             pattern["category"] = category
         if tags is not None:
-            for tag in old_tags:
-                if tag in self.tags and pattern_id in self.tags[tag]:
-                    self.tags[tag].remove(pattern_id)
-            for tag in tags:
-                if tag not in self.tags:
-                    self.tags[tag] = []
-                self.tags[tag].append(pattern_id)
             pattern["tags"] = tags
         if structure is not None:
             pattern["structure"] = structure
@@ -310,7 +346,8 @@ class WorkflowPatternLibrary:
             pattern["version"] = version
 
         pattern["last_updated"] = datetime.now().isoformat()
-        self.save_library()
+        self._update_indices(pattern_id, pattern)
+        self.save_library(pattern_id)
         return True
 
     def delete_pattern(self, pattern_id: str) -> bool:
@@ -326,23 +363,9 @@ class WorkflowPatternLibrary:
         if pattern_id not in self.patterns:
             return False
 
-        pattern = self.patterns[pattern_id]
-        category = pattern["category"]
-        tags = pattern["tags"]
-
-        if category in self.categories and pattern_id in self.categories[category]:
-            self.categories[category].remove(pattern_id)
-            if not self.categories[category]:
-                del self.categories[category]
-
-        for tag in tags:
-            if tag in self.tags and pattern_id in self.tags[tag]:
-                self.tags[tag].remove(pattern_id)
-                if not self.tags[tag]:
-                    del self.tags[tag]
-
+        self._remove_from_indices(pattern_id)
         del self.patterns[pattern_id]
-        self.save_library()
+        self.save_library(pattern_id)
         return True
 
     def get_pattern(self, pattern_id: str) -> Optional[Dict[str, Any]]:
@@ -386,7 +409,7 @@ class WorkflowPatternLibrary:
             pattern_ids = set(self.patterns.keys())
 
         for pid in pattern_ids:
-            pattern = self.patterns[pid]
+            pattern = self.patterns.summary(pid)
             pattern_list.append(
                 {
                     "id": pid,
@@ -461,7 +484,8 @@ class WorkflowPatternLibrary:
 
         self.patterns[pattern_id]["usage_count"] += 1
         self.patterns[pattern_id]["last_updated"] = datetime.now().isoformat()
-        self.save_library()
+        self._search_index.set_usage(pattern_id, pattern["usage_count"])
+        self.save_library(pattern_id)
 
         return {
             "name": pattern["name"],
@@ -471,72 +495,115 @@ class WorkflowPatternLibrary:
             "created": datetime.now().isoformat(),
         }
 
-    def search_patterns(self, query: str) -> List[Dict[str, Any]]:
+    def search_patterns(
+        self, query: str, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
         """
         Search patterns by name, description, category, or tags.
 
+        Every word of the query must match a word of the pattern, exactly, as
+        a prefix, or inside it. Results are ranked by BM25 relevance, lifted
+        by the pattern's usage count.
+
         Args:
             query (str): Search query.
+            limit (Optional[int]): Maximum number of results to return.
 
         Returns:
-            List[Dict[str, Any]]: List of matching pattern summaries.
+            List[Dict[str, Any]]: List of matching pattern summaries, best first.
         """
-        query_lower = query.lower()
         results = []
-
-        for pattern_id, pattern in self.patterns.items():
-            if (
-                query_lower in pattern.get("name", "").lower()
-                or query_lower in pattern.get("description", "").lower()
-                or query_lower in pattern.get("category", "").lower()
-                or any(query_lower in tag.lower() for tag in pattern.get("tags", []))
-            ):
-                results.append(
-                    {
-                        "id": pattern_id,
-                        "name": pattern.get("name", "Unnamed Pattern"),
-                        "description": pattern.get("description", ""),
-                        "category": pattern.get("category", "Uncategorized"),
-                        "tags": pattern.get("tags", []),
-                        "version": pattern.get("version", "1.0.0"),
-                        "usage_count": pattern.get("usage_count", 0),
-                        "last_updated": pattern.get(
-                            "last_updated",
-                            pattern.get(
-                                "updated_at", pattern.get("created_at", "Unknown")
-                            ),
-                        ),
-                    }
-                )
-
-        return sorted(results, key=lambda x: x["usage_count"], reverse=True)
+        for pattern_id, score in self._search_index.search(query, limit):
+            pattern = self.patterns.summary(pattern_id)
+            results.append(
+                {
+                    "id": pattern_id,
+                    "name": pattern.get("name", "Unnamed Pattern"),
+                    "description": pattern.get("description", ""),
+                    "category": pattern.get("category", "Uncategorized"),
+                    "tags": pattern.get("tags", []),
+                    "version": pattern.get("version", "1.0.0"),
+                    "usage_count": pattern.get("usage_count", 0),
+                    "last_updated": pattern.get(
+                        "last_updated",
+                        pattern.get("updated_at", pattern.get("created_at", "Unknown")),
+                    ),
+                    "score": score,
+                }
+            )
+        return results
 
     def load_marketplace(self) -> None:
         """
-        Load the marketplace patterns from a file if it exists.
+        Load the marketplace patterns from the store.
+
+        The JSON marketplace is imported if it changed since it was last
+        synced with the store.
         """
-        if os.path.exists(self.marketplace_path):
+        self.marketplace_patterns = PatternCollection(self.store, MARKETPLACE_SCOPE)
+        if self._json_changed(MARKETPLACE_SCOPE, self.marketplace_path):
             try:
-                with open(self.marketplace_path, "r") as f:
-                    data = json.load(f)
-                    self.marketplace_patterns = data.get("patterns", {})
+                self.import_marketplace(self.marketplace_path)
+                return
             except Exception as e:
                 print(f"Error loading marketplace: {e}")
-                self.marketplace_patterns = {}
-        else:
-            self.marketplace_patterns = {}
+        self._marketplace_index.rebuild(dict(self.marketplace_patterns.summaries()))
 
-    def save_marketplace(self) -> None:
+    def import_marketplace(self, path: str) -> None:
         """
-        Save the marketplace patterns to a file.
+        Replace the marketplace with the patterns of a JSON marketplace file.
+
+        Args:
+            path (str): Path of a file written by ``export_marketplace``.
+        """
+        with open(path, "r") as f:
+            data = json.load(f)
+        self.marketplace_patterns.replace(data.get("patterns", {}))
+        self._mark_synced(MARKETPLACE_SCOPE, path, self.marketplace_path)
+        self._marketplace_index.rebuild(dict(self.marketplace_patterns.summaries()))
+
+    def export_marketplace(self, path: Optional[str] = None) -> None:
+        """
+        Write the whole marketplace to a JSON file.
+
+        Args:
+            path (Optional[str]): Destination path; defaults to the marketplace path.
+        """
+        with open(path or self.marketplace_path, "w") as f:
+            json.dump({"patterns": dict(self.marketplace_patterns)}, f, indent=2)
+        self._mark_synced(
+            MARKETPLACE_SCOPE, path or self.marketplace_path, self.marketplace_path
+        )
+
+    def save_marketplace(self, pattern_id: Optional[str] = None) -> None:
+        """
+        Save the marketplace patterns to the store.
+
+        Args:
+            pattern_id (Optional[str]): Only write this pattern (or its deletion);
+                by default every pattern changed since it was loaded is written.
         """
-        data = {"patterns": self.marketplace_patterns}
         try:
-            with open(self.marketplace_path, "w") as f:
-                json.dump(data, f, indent=2)
+            if pattern_id is None:
+                self.marketplace_patterns.save_all()
+            else:
+                self.marketplace_patterns.save(pattern_id)
         except Exception as e:
             print(f"Error saving marketplace: {e}")
 
+    def close(self, save: bool = True) -> None:
+        """
+        Save changed patterns and close the pattern store.
+
+        Args:
+            save (bool): Write patterns changed in place before closing; pass
+                False after read-only use.
+        """
+        if save:
+            self.save_library()
+            self.save_marketplace()
+        self.store.close()
+
     def contribute_pattern(
         self,
         pattern_id: str,
@@ -581,7 +648,8 @@ class WorkflowPatternLibrary:
             "usage_count": 0,
             "comments": [],
         }
-        self.save_marketplace()
+        self._marketplace_index.add(pattern_id, self.marketplace_patterns[pattern_id])
+        self.save_marketplace(pattern_id)
         return True
 
     def update_contributed_pattern(
@@ -628,7 +696,8 @@ class WorkflowPatternLibrary:
             pattern["version"] = version
 
         pattern["updated_at"] = datetime.now().isoformat()
-        self.save_marketplace()
+        self._marketplace_index.add(pattern_id, pattern)
+        self.save_marketplace(pattern_id)
         return True
 
     def delete_contributed_pattern(self, pattern_id: str) -> bool:
@@ -645,7 +714,8 @@ class WorkflowPatternLibrary:
             return False
 
         del self.marketplace_patterns[pattern_id]
-        self.save_marketplace()
+        self._marketplace_index.remove(pattern_id)
+        self.save_marketplace(pattern_id)
         return True
 
     def get_contributed_pattern(self, pattern_id: str) -> Optional[Dict[str, Any]]:
@@ -681,7 +751,7 @@ class WorkflowPatternLibrary:
         """
         pattern_list = []
 
-        for pattern_id, pattern in self.marketplace_patterns.items():
+        for pattern_id, pattern in self.marketplace_patterns.summaries():
             if category and pattern["category"] != category:
                 continue
             if tag and tag not in pattern["tags"]:
@@ -708,45 +778,42 @@ class WorkflowPatternLibrary:
 
         return sorted(pattern_list, key=lambda x: x[sort_by], reverse=True)
 
-    def search_contributed_patterns(self, query: str) -> List[Dict[str, Any]]:
+    def search_contributed_patterns(
+        self, query: str, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
         """
         Search contributed patterns by name, description, category, tags, or author.
 
+        Matching and ranking work as in ``search_patterns``.
+
         Args:
             query (str): Search query.
+            limit (Optional[int]): Maximum number of results to return.
 
         Returns:
-            List[Dict[str, Any]]: List of matching pattern summaries.
+            List[Dict[str, Any]]: List of matching pattern summaries, best first.
         """
-        query_lower = query.lower()
         results = []
-
-        for pattern_id, pattern in self.marketplace_patterns.items():
-            if (
-                query_lower in pattern["name"].lower()
-                or query_lower in pattern["description"].lower()
-                or query_lower in pattern["category"].lower()
-                or query_lower in pattern["author"].lower()
-                or any(query_lower in tag.lower() for tag in pattern["tags"])
-            ):
-                results.append(
-                    {
-                        "id": pattern_id,
-                        "name": pattern["name"],
-                        "description": pattern["description"],
-                        "author": pattern["author"],
-                        "version": pattern.get("version", "1.0.0"),
-                        "license": pattern["license"],
-                        "usage_count": pattern["usage_count"],
-                        "rating": pattern["rating"],
-                        "rating_count": pattern["rating_count"],
-                        "last_updated": pattern.get(
-                            "updated_at", pattern.get("created_at", "Unknown")
-                        ),
-                    }
-                )
-
-        return sorted(results, key=lambda x: x["usage_count"], reverse=True)
+        for pattern_id, score in self._marketplace_index.search(query, limit):
+            pattern = self.marketplace_patterns.summary(pattern_id)
+            results.append(
+                {
+                    "id": pattern_id,
+                    "name": pattern["name"],
+                    "description": pattern["description"],
+                    "author": pattern["author"],
+                    "version": pattern.get("version", "1.0.0"),
+                    "license": pattern["license"],
+                    "usage_count": pattern["usage_count"],
+                    "rating": pattern["rating"],
+                    "rating_count": pattern["rating_count"],
+                    "last_updated": pattern.get(
+                        "updated_at", pattern.get("created_at", "Unknown")
+                    ),
+                    "score": score,
+                }
+            )
+        return results
 
     def instantiate_contributed_pattern(
         self, pattern_id: str, custom_config: Optional[Dict[str, Any]] = None
@@ -786,7 +853,8 @@ class WorkflowPatternLibrary:
 
         self.marketplace_patterns[pattern_id]["usage_count"] += 1
         self.marketplace_patterns[pattern_id]["updated_at"] = datetime.now().isoformat()
-        self.save_marketplace()
+        self._marketplace_index.set_usage(pattern_id, pattern["usage_count"])
+        self.save_marketplace(pattern_id)
 
         return {
             "name": pattern["name"],
@@ -822,7 +890,7 @@ class WorkflowPatternLibrary:
         pattern["rating"] = round(new_rating, 2)
         pattern["rating_count"] = new_count
         pattern["updated_at"] = datetime.now().isoformat()
-        self.save_marketplace()
+        self.save_marketplace(pattern_id)
         return True
 
     def comment_on_contributed_pattern(
@@ -847,7 +915,7 @@ class WorkflowPatternLibrary:
             {"text": comment, "author": author, "timestamp": datetime.now().isoformat()}
         )
         pattern["updated_at"] = datetime.now().isoformat()
-        self.save_marketplace()
+        self.save_marketplace(pattern_id)
         return True
 
     def customize_pattern(
@@ -894,14 +962,14 @@ class WorkflowPatternLibrary:
             self.patterns[new_pattern_id]["category"] = f"Custom {pattern['category']}"
             self.patterns[new_pattern_id]["tags"].append("custom")
             self._update_indices(new_pattern_id, self.patterns[new_pattern_id])
-            self.save_library()
+            self.save_library(new_pattern_id)
             return new_pattern_id
         else:
             self.patterns[pattern_id]["structure"] = pattern["structure"]
             self.patterns[pattern_id]["description"] += " (Customized)"
             self.patterns[pattern_id]["tags"].append("customized")
             self._update_indices(pattern_id, self.patterns[pattern_id])
-            self.save_library()
+            self.save_library(pattern_id)
             return None
 
     def share_pattern(
@@ -994,7 +1062,7 @@ class WorkflowPatternLibrary:
                 ),
             }
             self._update_indices(new_id, self.patterns[new_id])
-            self.save_library()
+            self.save_library(new_id)
             return new_id
         except Exception as e:
             raise RuntimeError(f"Error importing pattern: {e}") from e
@@ -1020,23 +1088,57 @@ class WorkflowPatternLibrary:
 
     def _update_indices(self, pattern_id: str, pattern: Dict[str, Any]) -> None:
         """
-        Update the category and tag indices for a pattern.
+        Update the category, tag and search indices for a pattern.
+
+        Entries from the pattern's previous version are removed first, so this
+        can be called after any change to the pattern.
 
         Args:
             pattern_id (str): ID of the pattern.
             pattern (Dict[str, Any]): Pattern data.
         """
-        category = pattern["category"]
-        tags = pattern["tags"]
-
-        if category not in self.categories:
-            self.categories[category] = []
-        self.categories[category].append(pattern_id)
+        self._remove_from_indices(pattern_id)
+        category = pattern.get("category", "Uncategorized")
+        tags = list(dict.fromkeys(pattern.get("tags", [])))
 
+        self.categories.setdefault(category, []).append(pattern_id)
         for tag in tags:
-            if tag not in self.tags:
-                self.tags[tag] = []
-            self.tags[tag].append(pattern_id)
+            self.tags.setdefault(tag, []).append(pattern_id)
+        self._indexed[pattern_id] = (category, tags)
+        self._search_index.add(pattern_id, pattern)
+
+    def _remove_from_indices(self, pattern_id: str) -> None:
+        """
+        Remove a pattern from the category, tag and search indices.
+
+        Args:
+            pattern_id (str): ID of the pattern.
+        """
+        indexed = self._indexed.pop(pattern_id, None)
+        if indexed is None:
+            return
+        category, tags = indexed
+
+        for index, key in [(self.categories, category)] + [
+            (self.tags, tag) for tag in tags
+        ]:
+            ids = index.get(key)
+            if ids and pattern_id in ids:
+                ids.remove(pattern_id)
+                if not ids:
+                    del index[key]
+        self._search_index.remove(pattern_id)
+
+    def _rebuild_indices(self) -> None:
+        """
+        Rebuild the category, tag and search indices from the loaded patterns.
+        """
+        self.categories = {}
+        self.tags = {}
+        self._indexed = {}
+        self._search_index.clear()
+        for pattern_id, pattern in self.patterns.summaries():
+            self._update_indices(pattern_id, pattern)
 
     def validate_pattern_structure(
         self, structure: Dict[str, Any]
@@ -1261,9 +1363,9 @@ class WorkflowPatternLibrary:
         }
 
         if pattern_id in self.patterns:
-            self.save_library()
+            self.save_library(pattern_id)
         else:
-            self.save_marketplace()
+            self.save_marketplace(pattern_id)
         return new_version
 
     def list_pattern_versions(self, pattern_id: str) -> List[Dict[str, Any]]:
@@ -1376,9 +1478,11 @@ class WorkflowPatternLibrary:
         }
 
         if pattern_id in self.patterns:
-            self.save_library()
+            self._update_indices(pattern_id, self.patterns[pattern_id])
+            self.save_library(pattern_id)
         else:
-            self.save_marketplace()
+            self._marketplace_index.add(pattern_id, pattern_source[pattern_id])
+            self.save_marketplace(pattern_id)
         return True
 
     def compare_pattern_versions(
@@ -1,8 +1,12 @@
 import json
 import os
+import sys
 from datetime import datetime
 
-from workflow_pattern_library import WorkflowPatternLibrary
+# Add the parent directory to the path so we can import from modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from workflow.workflow_pattern_library import WorkflowPatternLibrary
 
 
 # Initialize the WorkflowPatternLibrary instance